@@ -1,14 +1,17 @@
 import logging
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
+from itertools import islice
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import gevent
 from more_itertools import peekable
 
+from rotkehlchen.accounting.checkpoints import PnlCheckpoints, calculate_pnl_settings_hash
 from rotkehlchen.accounting.constants import FREE_PNL_EVENTS_LIMIT
 from rotkehlchen.accounting.export.csv import CSVExporter
 from rotkehlchen.accounting.pot import AccountingPot
+from rotkehlchen.accounting.prices import prefetch_historical_prices
 from rotkehlchen.accounting.types import EventAccountingRuleStatus, MissingPrice
 from rotkehlchen.chain.evm.accounting.aggregator import EVMAccountingAggregators
 from rotkehlchen.db.reports import DBAccountingReports
@@ -24,6 +27,7 @@ from rotkehlchen.utils.data_structures import DefaultLRUCache, LRUCacheWithRemov
 
 if TYPE_CHECKING:
     from rotkehlchen.accounting.mixins.event import AccountingEventMixin
+    from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
     from rotkehlchen.chain.aggregator import ChainsAggregator
     from rotkehlchen.db.dbhandler import DBHandler
 
@@ -36,6 +40,8 @@ log = RotkehlchenLogsAdapter(logger)
 # and each event having in average 3 subevents.
 # TODO: Make this changeable depending on user's set page size
 PROCESSABLE_EVENTS_CACHE_SIZE = 1500
+# Reports with more history events than this don't keep the processed events in memory
+PNL_EVENTS_IN_MEMORY_LIMIT = 100_000
 
 
 class Accountant:
@@ -122,7 +128,9 @@ class Accountant:
 
         start_ts here is the timestamp at which to start taking trades and other
         taxable events into account. Not where processing starts from. Processing
-        always starts from the very first event we find in the history.
+        starts from the very first event we find in the history, unless a saved
+        checkpoint of the pot state before start_ts is still valid for the given
+        history. In that case processing resumes from the checkpoint.
 
         Returns the id of the generated report
         """
@@ -148,7 +156,14 @@ class Accountant:
                 end_ts=end_ts,
                 settings=db_settings,
             )
-            self.pots[0].reset(settings=db_settings, start_ts=start_ts, end_ts=end_ts, report_id=report_id)  # noqa: E501
+            self.pots[0].reset(
+                settings=db_settings,
+                start_ts=start_ts,
+                end_ts=end_ts,
+                report_id=report_id,
+                # for big reports the processed events are only kept in the DB
+                keep_processed_events=len(events) <= PNL_EVENTS_IN_MEMORY_LIMIT,
+            )
             self.end_ts = end_ts
             self.csvexporter.reset(start_ts=start_ts, end_ts=end_ts)
 
@@ -160,8 +175,36 @@ class Accountant:
             actions_length = len(events)
             prev_time = last_event_ts = Timestamp(0)
             ignored_ids = self.db.get_ignored_action_ids(cursor=cursor)
+            checkpoints = PnlCheckpoints(
+                database=self.db,
+                pot=self.pots[0],
+                settings_hash=calculate_pnl_settings_hash(
+                    cursor=cursor,
+                    settings=db_settings,
+                    start_ts=start_ts,
+                    ignored_asset_ids=self.ignored_asset_ids,
+                    ignored_action_ids=ignored_ids,
+                ),
+            )
 
-        events_iter = peekable(events)
+        resume_events_num = 0
+        if (checkpoint := checkpoints.maybe_restore(events=events, start_ts=start_ts)) is not None:
+            resume_events_num = checkpoint.events_num
+            count = checkpoint.processed_actions
+            prev_time = last_event_ts = checkpoint.timestamp
+
+        prefetch_historical_prices(  # find all the needed prices in bulk before processing
+            pot=self.pots[0],
+            events=islice(
+                events,
+                resume_events_num,
+                None if active_premium else resume_events_num + FREE_PNL_EVENTS_LIMIT - count,
+            ),
+            start_ts=start_ts,
+            end_ts=end_ts,
+            ignored_ids=ignored_ids,
+        )
+        events_iter = peekable(checkpoints.iterate_events(events=events, start=resume_events_num))
         while True:
             try:
                 (
@@ -184,6 +227,8 @@ class Accountant:
                 )
                 continue
             except NoPriceForGivenTimestamp as e:
+                # the state would be restored with the missing price if the user adds it
+                checkpoints.stop_saving(reason='rate limited price query' if e.rate_limited else 'missing price')  # noqa: E501
                 self.pots[0].cost_basis.missing_prices.add(
                     MissingPrice(
                         from_asset=e.from_asset,
@@ -194,6 +239,7 @@ class Accountant:
                 )
                 continue
             except RemoteError as e:
+                checkpoints.stop_saving(reason='remote error')
                 count = self._process_skipping_exception(
                     exception=e,
                     events=events,
@@ -203,6 +249,7 @@ class Accountant:
                 continue
             except AccountingError as e:
                 log.error(f'Found critical error {e} when processing history. Stopping.')
+                self.pots[0].flush_processed_events()
                 e.report_id = report_id
                 raise
 
@@ -210,6 +257,16 @@ class Accountant:
                 break  # we reached the period end
 
             last_event_ts = prev_time
+            # the next event is peeked so that the consumed events don't include it
+            consumed_events_num = checkpoints.consumed_events_num
+            if events_iter.peek(None) is not None:
+                consumed_events_num -= 1
+            checkpoints.maybe_save(
+                events=events,
+                events_num=consumed_events_num,
+                processed_actions=count + processed_events_num,
+                timestamp=last_event_ts,
+            )
             if count % 500 == 0:
                 # This loop can take a very long time depending on the amount of events
                 # to process. We need to yield to other greenlets or else calls to the
@@ -224,6 +281,7 @@ class Accountant:
                 )
                 break
 
+        self.pots[0].flush_processed_events()
         dbpnl.add_report_overview(
             report_id=report_id,
             last_processed_timestamp=last_event_ts,
@@ -234,6 +292,7 @@ class Accountant:
 
         for pot in self.pots:  # delete rules stored in memory since they won't be needed and can be queried again from the db  # noqa: E501
             pot.events_accountant.rules_manager.clean_rules()
+            pot.prefetched_prices.clear()
 
         self.ignored_asset_ids.clear()  # clean ignored assets from memory once PnL report run concludes  # noqa: E501
         return report_id
@@ -319,17 +378,17 @@ class Accountant:
         If a directory is given, it simply exports all event.csv in the given directory.
         If no directory is given it returns the path to a zip to export
         """
-        if len(self.pots[0].processed_events) == 0:
+        pot = self.pots[0]
+        if pot.processed_events_num == 0:
             return False, 'No history processed in order to perform an export'
 
+        events: Iterable[ProcessedAccountingEvent]
+        if pot.keep_processed_events:
+            events = pot.processed_events
+        else:  # big reports are only kept in the DB and are read while being exported
+            events = DBAccountingReports(self.db).iterate_report_data(report_id=pot.report_id)  # type: ignore[arg-type]  # report id is set since events were processed
+
         if directory_path is None:
-            return self.csvexporter.create_zip(
-                events=self.pots[0].processed_events,
-                pnls=self.pots[0].pnls,
-            )
+            return self.csvexporter.create_zip(events=events, pnls=pot.pnls)
 
-        return self.csvexporter.export(
-            events=self.pots[0].processed_events,
-            pnls=self.pots[0].pnls,
-            directory=directory_path,
-        )
+        return self.csvexporter.export(events=events, pnls=pot.pnls, directory=directory_path)
@@ -0,0 +1,205 @@
+import hashlib
+import logging
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING
+
+from rotkehlchen.accounting.types import PnlCheckpoint
+from rotkehlchen.db.reports import DBAccountingReports
+from rotkehlchen.errors.misc import InputError
+from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.types import HistoricalPriceOracle
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.types import Timestamp
+from rotkehlchen.utils.serialization import rlk_jsondumps
+
+if TYPE_CHECKING:
+    from rotkehlchen.accounting.mixins.event import AccountingEventMixin
+    from rotkehlchen.accounting.pot import AccountingPot
+    from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.drivers.gevent import DBCursor
+    from rotkehlchen.db.settings import DBSettings
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Bump when the format of the saved pot state changes so older checkpoints are not used
+PNL_CHECKPOINT_STATE_VERSION = 1
+# Number of processed events between two saved checkpoints
+PNL_CHECKPOINT_INTERVAL = 10000
+# Number of checkpoints kept per settings hash
+PNL_CHECKPOINTS_TO_KEEP = 5
+
+
+def calculate_pnl_settings_hash(
+        cursor: 'DBCursor',
+        settings: 'DBSettings',
+        start_ts: Timestamp,
+        ignored_asset_ids: set[str],
+        ignored_action_ids: set[str],
+) -> str:
+    """Calculate a hash of everything apart from the events that affects the pot state.
+
+    If past cost basis is not calculated, events before start_ts are skipped and the
+    state depends on start_ts so it's also part of the hash. So are the manual historical
+    prices since the user can add or edit them. Prices of the oracles are not, since
+    checkpoints are not saved once a price is missing and the found ones don't change.
+    """
+    hasher = hashlib.sha256(rlk_jsondumps([
+        PNL_CHECKPOINT_STATE_VERSION,
+        settings.main_currency.identifier,
+        settings.taxfree_after_period,
+        settings.include_crypto2crypto,
+        settings.calculate_past_cost_basis,
+        settings.include_gas_costs,
+        settings.cost_basis_method.serialize(),
+        settings.eth_staking_taxable_after_withdrawal_enabled,
+        settings.include_fees_in_cost_basis,
+        settings.treat_eth2_as_eth,
+        None if settings.calculate_past_cost_basis else start_ts,
+        sorted(ignored_asset_ids),
+        sorted(ignored_action_ids),
+    ]).encode())
+    for table in ('accounting_rules', 'accounting_rule_events', 'linked_rules_properties'):
+        for entry in cursor.execute(f'SELECT * FROM {table} ORDER BY identifier'):
+            hasher.update(str(entry).encode())
+
+    with GlobalDBHandler().conn.read_ctx() as global_cursor:
+        for entry in global_cursor.execute(
+            'SELECT from_asset, to_asset, timestamp, price FROM price_history '
+            'WHERE source_type=? ORDER BY from_asset, to_asset, timestamp',
+            (HistoricalPriceOracle.MANUAL.serialize_for_db(),),
+        ):
+            hasher.update(str(entry).encode())
+
+    return hasher.hexdigest()
+
+
+class PnlCheckpoints:
+    """Saves the state of an accounting pot while history is processed and restores
+    the latest valid saved state so that processing can resume from it.
+
+    A checkpoint is valid for a new report if it was created with the same settings
+    hash, the events it covers are identical to the first events of the new history
+    and it was created before the start of the report. Since no PnL is counted
+    before the start of the report only the cost basis and module accountant state
+    is needed to resume.
+    """
+
+    def __init__(
+            self,
+            database: 'DBHandler',
+            pot: 'AccountingPot',
+            settings_hash: str,
+    ) -> None:
+        self.dbpnl = DBAccountingReports(database)
+        self.pot = pot
+        self.settings_hash = settings_hash
+        self.hasher = hashlib.sha256()
+        self.digested_events_num = 0
+        self.consumed_events_num = 0
+        self.last_saved_events_num = 0
+        self.saving_stopped = False
+
+    def _digest_events(self, events: Sequence['AccountingEventMixin'], events_num: int) -> str:
+        """Extend the digest up to the first `events_num` events and return it"""
+        for event in events[self.digested_events_num:events_num]:
+            self.hasher.update(repr(event).encode())
+        self.digested_events_num = events_num
+        return self.hasher.hexdigest()
+
+    def iterate_events(
+            self,
+            events: Sequence['AccountingEventMixin'],
+            start: int,
+    ) -> Iterator['AccountingEventMixin']:
+        """Iterate the events from `start` keeping count of how many have been consumed"""
+        self.consumed_events_num = start
+        for idx in range(start, len(events)):
+            self.consumed_events_num = idx + 1
+            yield events[idx]
+
+    def maybe_restore(
+            self,
+            events: Sequence['AccountingEventMixin'],
+            start_ts: Timestamp,
+    ) -> PnlCheckpoint | None:
+        """Restore the pot from the checkpoint covering the most events that is still
+        valid for the given history. Checkpoints invalidated by history changes are deleted.
+
+        Should be called after the pot has been reset. Returns the restored checkpoint.
+        """
+        matched: PnlCheckpoint | None = None
+        matched_hasher = self.hasher.copy()
+        for checkpoint in self.dbpnl.get_checkpoints(self.settings_hash):
+            if checkpoint.timestamp >= start_ts or checkpoint.events_num > len(events):
+                break
+
+            if self._digest_events(events, checkpoint.events_num) != checkpoint.events_digest:
+                # the digest covers the whole prefix so all later checkpoints are invalid too
+                log.debug(f'PnL checkpoint at {checkpoint.events_num} events is outdated')
+                self.dbpnl.delete_checkpoints(
+                    settings_hash=self.settings_hash,
+                    from_events_num=checkpoint.events_num,
+                )
+                break
+
+            matched, matched_hasher = checkpoint, self.hasher.copy()
+
+        if matched is None:
+            self.hasher, self.digested_events_num = hashlib.sha256(), 0
+            return None
+
+        self.hasher, self.digested_events_num = matched_hasher, matched.events_num
+        try:
+            state = self.dbpnl.get_checkpoint_state(
+                settings_hash=self.settings_hash,
+                events_num=matched.events_num,
+            )
+            self.pot.restore_state(state)
+        except (InputError, DeserializationError) as e:
+            log.error(f'Could not restore PnL checkpoint at {matched.events_num} events: {e!s}')
+            self.dbpnl.delete_checkpoints(settings_hash=self.settings_hash)
+            self.hasher, self.digested_events_num = hashlib.sha256(), 0
+            return None
+
+        log.debug(
+            'Resuming PnL report from checkpoint',
+            events_num=matched.events_num,
+            timestamp=matched.timestamp,
+        )
+        self.last_saved_events_num = matched.events_num
+        return matched
+
+    def stop_saving(self, reason: str) -> None:
+        """Stop saving checkpoints for this run. Used when an event was affected by a
+        temporary failure or a missing price, so that the state after it is not reused
+        by later reports."""
+        if self.saving_stopped is False:
+            log.debug(f'Not saving any more PnL checkpoints in this run due to {reason}')
+        self.saving_stopped = True
+
+    def maybe_save(
+            self,
+            events: Sequence['AccountingEventMixin'],
+            events_num: int,
+            processed_actions: int,
+            timestamp: Timestamp,
+    ) -> None:
+        """Save a checkpoint after `events_num` events if enough events were processed
+        since the last one"""
+        if self.saving_stopped or events_num - self.last_saved_events_num < PNL_CHECKPOINT_INTERVAL:  # noqa: E501
+            return
+
+        self.dbpnl.add_checkpoint(
+            checkpoint=PnlCheckpoint(
+                settings_hash=self.settings_hash,
+                events_num=events_num,
+                timestamp=timestamp,
+                processed_actions=processed_actions,
+                events_digest=self._digest_events(events, events_num),
+                state=self.pot.serialize_state(),
+            ),
+            keep=PNL_CHECKPOINTS_TO_KEEP,
+        )
+        self.last_saved_events_num = events_num
@@ -27,6 +27,10 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Index given to acquisitions restored from a PnL checkpoint. Their processed
+# event belongs to an older report so it can't be referenced by index.
+CHECKPOINT_ACQUISITION_INDEX = -1
+
 
 @dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
 class AssetAcquisitionEvent:
@@ -74,6 +78,38 @@ class AssetAcquisitionEvent:
             'index': self.index,
         }
 
+    def serialize_for_checkpoint(self) -> dict[str, Any]:
+        """Same as serialize() but also keeps the amount not yet consumed by spends"""
+        data = self.serialize()
+        data['remaining_amount'] = str(self.remaining_amount)
+        return data
+
+    @classmethod
+    def deserialize_from_checkpoint(cls: type['AssetAcquisitionEvent'], data: dict[str, Any]) -> 'AssetAcquisitionEvent':  # noqa: E501
+        """Restore an acquisition saved with serialize_for_checkpoint()
+
+        The processed event that created the acquisition is not part of the report that
+        resumes from the checkpoint, so the index is set to CHECKPOINT_ACQUISITION_INDEX.
+
+        May raise DeserializationError
+        """
+        try:
+            acquisition = cls(
+                amount=deserialize_fval(data['full_amount'], name='full_amount', location='checkpoint'),  # noqa: E501
+                timestamp=Timestamp(data['timestamp']),
+                rate=Price(deserialize_fval(data['rate'], name='rate', location='checkpoint')),
+                index=CHECKPOINT_ACQUISITION_INDEX,
+            )
+            acquisition.remaining_amount = deserialize_fval(
+                value=data['remaining_amount'],
+                name='remaining_amount',
+                location='checkpoint',
+            )
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
+
+        return acquisition
+
     def __gt__(self, other: Any) -> bool:
         if not isinstance(other, AssetAcquisitionEvent):
             raise NotImplementedError
@@ -294,6 +330,32 @@ class BaseCostBasisMethod(ABC):
     def __len__(self) -> int:
         return len(self._acquisitions_heap)
 
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the acquisitions heap to be saved in a PnL checkpoint.
+
+        The list is kept in heap order so that restoring it does not need a heapify.
+        """
+        return {'heap': [
+            (str(entry.priority), entry.acquisition_event.serialize_for_checkpoint())
+            for entry in self._acquisitions_heap
+        ]}
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore the state saved by serialize_state()
+
+        May raise:
+        - DeserializationError if the data is malformed
+        """
+        try:
+            self._acquisitions_heap = [
+                AssetAcquisitionHeapElement(
+                    priority=deserialize_fval(priority, name='priority', location='checkpoint'),
+                    acquisition_event=AssetAcquisitionEvent.deserialize_from_checkpoint(event),
+                ) for priority, event in data['heap']
+            ]
+        except (KeyError, ValueError) as e:
+            raise DeserializationError(f'Could not restore acquisitions heap due to {e!s}') from e
+
 
 class FIFOCostBasisMethod(BaseCostBasisMethod):
     """
@@ -309,6 +371,13 @@ class FIFOCostBasisMethod(BaseCostBasisMethod):
         heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(self._count, acquisition))  # noqa: E501
         self._count += 1
 
+    def serialize_state(self) -> dict[str, Any]:
+        return super().serialize_state() | {'count': str(self._count)}
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        super().restore_state(data)
+        self._count = deserialize_fval(data['count'], name='count', location='checkpoint')
+
 
 class LIFOCostBasisMethod(BaseCostBasisMethod):
     """
@@ -324,6 +393,13 @@ class LIFOCostBasisMethod(BaseCostBasisMethod):
         heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(-self._count, acquisition))  # noqa: E501
         self._count += 1
 
+    def serialize_state(self) -> dict[str, Any]:
+        return super().serialize_state() | {'count': str(self._count)}
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        super().restore_state(data)
+        self._count = deserialize_fval(data['count'], name='count', location='checkpoint')
+
 
 class HIFOCostBasisMethod(BaseCostBasisMethod):
     """
@@ -378,6 +454,27 @@ class AverageCostBasisMethod(BaseCostBasisMethod):
         self.current_amount += acquisition.amount
         self._count += 1
 
+    def serialize_state(self) -> dict[str, Any]:
+        return super().serialize_state() | {
+            'count': str(self._count),
+            'current_amount': str(self.current_amount),
+            'current_total_acb': str(self.current_total_acb),
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        super().restore_state(data)
+        self._count = deserialize_fval(data['count'], name='count', location='checkpoint')
+        self.current_amount = deserialize_fval(
+            value=data['current_amount'],
+            name='current_amount',
+            location='checkpoint',
+        )
+        self.current_total_acb = deserialize_fval(
+            value=data['current_total_acb'],
+            name='current_total_acb',
+            location='checkpoint',
+        )
+
     def consume_result(self, used_amount: FVal, asset: Asset) -> None:
         """
         Same as its parent function but also deducts `used_amount` from `current_amount`.
@@ -591,6 +688,35 @@ class CostBasisCalculator(CustomizableDateMixin):
         self.missing_acquisitions: list[MissingAcquisition] = []
         self.missing_prices: set[MissingPrice] = set()
 
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the state needed to continue processing from this point on.
+
+        Spends and used acquisitions are only kept for bookkeeping inside a single run
+        so they are not part of the state.
+        """
+        return {
+            'acquisitions': {
+                asset.identifier: asset_events.acquisitions_manager.serialize_state()
+                for asset, asset_events in self._events.items()
+            },
+            'missing_acquisitions': [x.serialize() for x in self.missing_acquisitions],
+            'missing_prices': [x.serialize() for x in self.missing_prices],
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore a state saved by serialize_state(). Should be called after reset().
+
+        May raise:
+        - DeserializationError if the data is malformed
+        """
+        try:
+            for identifier, acquisitions_data in data['acquisitions'].items():
+                self._events[Asset(identifier)].acquisitions_manager.restore_state(acquisitions_data)
+            self.missing_acquisitions = [MissingAcquisition.deserialize(x) for x in data['missing_acquisitions']]  # noqa: E501
+            self.missing_prices = {MissingPrice.deserialize(x) for x in data['missing_prices']}
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in cost basis checkpoint') from e
+
     def get_events(self, asset: Asset) -> CostBasisEvents:
         """Custom getter for events so that we have common cost basis for some assets"""
         if asset == A_WETH:
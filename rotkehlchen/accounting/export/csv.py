@@ -1,13 +1,15 @@
+import itertools
 import json
 import logging
 import os
-from collections.abc import Collection
+from collections.abc import Collection, Iterable, Iterator
 from csv import DictWriter
 from pathlib import Path
 from tempfile import mkdtemp
 from typing import TYPE_CHECKING, Any, Literal
 from zipfile import ZIP_DEFLATED, ZipFile
 
+from rotkehlchen.accounting.cost_basis.base import CHECKPOINT_ACQUISITION_INDEX
 from rotkehlchen.accounting.pnl import PnlTotals
 from rotkehlchen.accounting.structures.processed_event import AccountingEventExportType
 from rotkehlchen.constants import ZERO
@@ -52,26 +54,27 @@ class CSVWriteError(Exception):
 
 def dict_to_csv_file(
         path: Path,
-        dictionary_list: list,
+        dictionary_list: Iterable[dict[str, Any]],
         csv_delimiter: str,
         headers: Collection | None = None,
 ) -> None:
-    """Takes a filepath and a list of dictionaries representing the rows and writes them
-    into the file as a CSV
+    """Takes a filepath and the dictionaries representing the rows and writes them
+    into the file as a CSV. The rows can be generated while they are written.
 
     May raise:
     - CSVWriteError if DictWriter.writerow() tried to write a dict contains
     fields not in fieldnames
     """
-    if len(dictionary_list) == 0:
+    rows = iter(dictionary_list)
+    if (first_row := next(rows, None)) is None:
         log.debug(f'Skipping writing empty CSV for {path}')
         return
 
     with open(path, 'w', newline='', encoding='utf-8') as f:
-        w = DictWriter(f, fieldnames=dictionary_list[0].keys() if headers is None else headers, delimiter=csv_delimiter)  # noqa: E501
+        w = DictWriter(f, fieldnames=first_row.keys() if headers is None else headers, delimiter=csv_delimiter)  # noqa: E501
         w.writeheader()
         try:
-            for dic in dictionary_list:
+            for dic in itertools.chain((first_row,), rows):
                 w.writerow(dic)
         except ValueError as e:
             raise CSVWriteError(f'Failed to write {path} CSV due to {e!s}') from e
@@ -188,23 +191,28 @@ class CSVExporter(CustomizableDateMixin):
                     if name == 'free' and acquisition.taxable is True:
                         continue
 
-                    index = acquisition.event.index + CSV_INDEX_OFFSET
                     if cost_basis == '':
                         cost_basis = '='
                     else:
                         cost_basis += '+'
 
-                    cost_basis += f'{acquisition.amount!s}*H{index}'
+                    if acquisition.event.index == CHECKPOINT_ACQUISITION_INDEX:
+                        # acquired before the checkpoint the report resumed from, so not in the csv
+                        cost_basis += f'{acquisition.amount!s}*{acquisition.event.rate!s}'
+                    else:
+                        index = acquisition.event.index + CSV_INDEX_OFFSET
+                        cost_basis += f'{acquisition.amount!s}*H{index}'
 
         dict_event[f'cost_basis_{name}'] = cost_basis
 
-    def _maybe_add_summary(self, events: list[dict[str, Any]], pnls: PnlTotals) -> None:
-        """Depending on given settings, adds a few summary lines at the end of
-        the all events PnL report"""
+    def _summary_rows(self, events_num: int, pnls: PnlTotals) -> list[dict[str, Any]]:
+        """Depending on given settings, returns a few summary lines to add at the end of
+        the all events PnL report of the given number of events"""
+        events: list[dict[str, Any]] = []
         if self.settings.pnl_csv_have_summary is False:
-            return
+            return events
 
-        length = len(events) + 1
+        length = events_num + 1
         template: dict[str, Any] = {
             'type': '',
             'notes': '',
@@ -270,9 +278,11 @@ class CSVExporter(CustomizableDateMixin):
             entry['taxable_amount'] = str(getattr(self.settings, setting))
             events.append(entry)
 
+        return events
+
     def create_zip(
             self,
-            events: list['ProcessedAccountingEvent'],
+            events: Iterable['ProcessedAccountingEvent'],
             pnls: PnlTotals,
     ) -> tuple[bool, str]:
         dirpath = Path(mkdtemp())
@@ -324,19 +334,30 @@ class CSVExporter(CustomizableDateMixin):
         self._add_pnl_type(event=event, dict_event=dict_event, amount_column='G', name='taxable')
         return dict_event
 
+    def _csv_rows(
+            self,
+            events: Iterable['ProcessedAccountingEvent'],
+            pnls: PnlTotals,
+    ) -> Iterator[dict[str, Any]]:
+        """Generate the rows of the events followed by the summary rows, so that the
+        events don't have to be all in memory while they are written"""
+        events_num = 0
+        for events_num, event in enumerate(events, start=1):  # noqa: B007
+            yield self.to_csv_entry(event)
+
+        yield from self._summary_rows(events_num=events_num, pnls=pnls)
+
     def export(
             self,
-            events: list['ProcessedAccountingEvent'],
+            events: Iterable['ProcessedAccountingEvent'],
             pnls: PnlTotals,
             directory: Path,
     ) -> tuple[bool, str]:
-        serialized_events = [self.to_csv_entry(x) for idx, x in enumerate(events)]
-        self._maybe_add_summary(events=serialized_events, pnls=pnls)
         try:
             directory.mkdir(parents=True, exist_ok=True)
             dict_to_csv_file(
                 path=directory / FILENAME_ALL_CSV,
-                dictionary_list=serialized_events,
+                dictionary_list=self._csv_rows(events=events, pnls=pnls),
                 csv_delimiter=self.settings.csv_export_delimiter,
             )
         except (CSVWriteError, PermissionError) as e:
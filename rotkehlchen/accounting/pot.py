@@ -16,7 +16,7 @@ from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.assets import A_KFEE
 from rotkehlchen.constants.prices import ZERO_PRICE
 from rotkehlchen.db.eth2 import DBEth2
-from rotkehlchen.db.reports import DBAccountingReports
+from rotkehlchen.db.reports import PnlEventsWriter
 from rotkehlchen.db.settings import DBSettings
 from rotkehlchen.errors.misc import InputError, RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
@@ -70,7 +70,13 @@ class AccountingPot(CustomizableDateMixin):
             msg_aggregator=msg_aggregator,
         )
         self.pnls = PnlTotals()
+        # Processed events are written to the report in the DB in batches by the writer.
+        # They are also kept in memory unless keep_processed_events is False, in which
+        # case they have to be read back from the DB.
         self.processed_events: list[ProcessedAccountingEvent] = []
+        self.processed_events_num = 0
+        self.keep_processed_events = True
+        self.events_writer: PnlEventsWriter | None = None
         self.events_accountant = EventsAccountant(
             evm_accounting_aggregators=evm_accounting_aggregators,
             pot=self,
@@ -80,23 +86,54 @@ class AccountingPot(CustomizableDateMixin):
         self.dbeth2 = DBEth2(database)
         self.query_start_ts = self.query_end_ts = Timestamp(0)
         self.report_id: int | None = None
+        # profit currency prices found before processing. Keys are (asset id, timestamp)
+        self.prefetched_prices: dict[tuple[str, Timestamp], Price] = {}
 
     def _add_processed_event(self, event: ProcessedAccountingEvent) -> None:
-        dbpnl = DBAccountingReports(self.database)
-        self.processed_events.append(event)
+        self.processed_events_num += 1
+        if self.keep_processed_events:
+            self.processed_events.append(event)
         try:
-            dbpnl.add_report_data(
-                report_id=self.report_id,  # type: ignore # report id is initialized by now
-                time=event.timestamp,
-                ts_converter=self.timestamp_to_date,
-                event=event,
-            )
+            if self.events_writer is not None:  # is None only if not reset for a report
+                self.events_writer.add(event)
         except (DeserializationError, InputError) as e:
             log.error(str(e))
             return
 
         log.debug(event.to_string(self.timestamp_to_date))
 
+    def flush_processed_events(self) -> None:
+        """Write any processed events that are still buffered to the DB"""
+        if self.events_writer is None:
+            return
+
+        try:
+            self.events_writer.flush()
+        except InputError as e:
+            log.error(str(e))
+
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the state needed to resume processing events from this point.
+        PnLs are not included since checkpoints are only used before the report start."""
+        return {
+            'cost_basis': self.cost_basis.serialize_state(),
+            'accountants': self.events_accountant.evm_accounting_aggregators.serialize_state(),
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore a state saved by serialize_state(). Should be called after reset().
+
+        May raise:
+        - DeserializationError if the data is malformed. The state is reset in that case.
+        """
+        try:
+            self.cost_basis.restore_state(data['cost_basis'])
+            self.events_accountant.evm_accounting_aggregators.restore_state(data['accountants'])
+        except (DeserializationError, KeyError, ValueError, TypeError) as e:
+            self.cost_basis.reset(self.settings)
+            self.events_accountant.evm_accounting_aggregators.reset()
+            raise DeserializationError(f'Could not restore accounting pot state due to {e!s}') from e  # noqa: E501
+
     def get_rate_in_profit_currency(self, asset: Asset, timestamp: Timestamp) -> Price:
         """Get the profit_currency price of asset in the given timestamp
 
@@ -109,6 +146,8 @@ class AccountingPot(CustomizableDateMixin):
         """
         if asset == self.profit_currency:
             rate = Price(ONE)
+        elif (prefetched_rate := self.prefetched_prices.get((asset.identifier, timestamp))) is not None:  # noqa: E501
+            rate = prefetched_rate
         else:
             rate = PriceHistorian().query_historical_price(
                 from_asset=asset,
@@ -123,6 +162,7 @@ class AccountingPot(CustomizableDateMixin):
             start_ts: Timestamp,
             end_ts: Timestamp,
             report_id: int,
+            keep_processed_events: bool = True,
     ) -> None:
         self.settings = settings
         with self.database.conn.read_ctx() as cursor:
@@ -135,6 +175,14 @@ class AccountingPot(CustomizableDateMixin):
         self.cost_basis.reset(settings)
         self.events_accountant.reset()
         self.processed_events = []
+        self.processed_events_num = 0
+        self.keep_processed_events = keep_processed_events
+        self.events_writer = PnlEventsWriter(
+            database=self.database,
+            report_id=report_id,
+            ts_converter=self.timestamp_to_date,
+        )
+        self.prefetched_prices = {}
 
     def add_in_event(
             self,  # pylint: disable=unused-argument
@@ -178,7 +226,7 @@ class AccountingPot(CustomizableDateMixin):
             amount=amount,
             price=price,
             ignored_asset_ids=self.ignored_asset_ids,
-            starting_index=len(self.processed_events),
+            starting_index=self.processed_events_num,
         )
         for prefork_event in prefork_events:
             self._add_processed_event(prefork_event)
@@ -200,7 +248,7 @@ class AccountingPot(CustomizableDateMixin):
             price=price,
             pnl=PNL(),  # filled out later
             cost_basis=None,
-            index=len(self.processed_events),
+            index=self.processed_events_num,
         )
         if extra_data:
             event.extra_data = extra_data
@@ -309,7 +357,7 @@ class AccountingPot(CustomizableDateMixin):
             price=price,
             pnl=PNL(),  # filled out later
             cost_basis=spend_cost,
-            index=len(self.processed_events),
+            index=self.processed_events_num,
         )
         if extra_data:
             spend_event.extra_data = extra_data
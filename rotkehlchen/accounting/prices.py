@@ -0,0 +1,150 @@
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from http import HTTPStatus
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+from gevent.pool import Pool
+
+from rotkehlchen.assets.asset import Asset
+from rotkehlchen.constants import HOUR_IN_SECONDS
+from rotkehlchen.errors.asset import (
+    UnknownAsset,
+    UnprocessableTradePair,
+    UnsupportedAsset,
+    WrongAssetType,
+)
+from rotkehlchen.errors.misc import RemoteError
+from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
+from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.events.structures.base import HistoryBaseEntry
+from rotkehlchen.history.events.structures.types import EventDirection
+from rotkehlchen.history.price import PriceHistorian
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.types import Price, Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.accounting.mixins.event import AccountingEventMixin
+    from rotkehlchen.accounting.pot import AccountingPot
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Maximum number of historical price queries to the oracles running at the same time
+PRICES_PREFETCH_CONCURRENCY = 4
+
+
+def _may_need_oracle_price(pot: 'AccountingPot', event: 'AccountingEventMixin') -> bool:
+    """Returns False for history events that the events accountant is known to skip
+    so that no remote price queries are made for them"""
+    if not isinstance(event, HistoryBaseEntry):
+        return True
+
+    if event.maybe_get_direction() in (None, EventDirection.NEUTRAL):
+        return False
+
+    event_settings, _ = pot.events_accountant.rules_manager.get_event_settings(event)
+    return event_settings is not None
+
+
+def prefetch_historical_prices(
+        pot: 'AccountingPot',
+        events: Iterable['AccountingEventMixin'],
+        start_ts: Timestamp,
+        end_ts: Timestamp,
+        ignored_ids: set[str],
+) -> None:
+    """Find the profit currency price of the assets of all the given events that will be
+    processed and keep them in the pot's prefetched prices.
+
+    The prices of each asset found in the price cache are read with a single query. The
+    remaining ones are queried from the oracles concurrently, and only for events that
+    the pot may actually process. Prices that could not be found here are queried again
+    by the pot when the event is processed, so that any error is handled there.
+
+    Should be called after the pot has been reset.
+    """
+    profit_currency = pot.profit_currency
+    cache_timestamps: defaultdict[Asset, set[Timestamp]] = defaultdict(set)
+    oracle_queries: set[tuple[Asset, Timestamp]] = set()
+    for event in events:
+        timestamp = event.get_timestamp()
+        if timestamp > end_ts:
+            break
+
+        if not pot.settings.calculate_past_cost_basis and timestamp < start_ts:
+            continue
+
+        try:
+            event_assets = event.get_assets()
+        except (UnknownAsset, UnsupportedAsset, UnprocessableTradePair):
+            continue  # will be reported when the event is processed
+
+        if (
+            any(x.identifier in pot.ignored_asset_ids for x in event_assets) or
+            event.should_ignore(ignored_ids)
+        ):
+            continue
+
+        need_oracle = _may_need_oracle_price(pot=pot, event=event)
+        for asset in event_assets:
+            if asset == profit_currency:
+                continue
+
+            cache_timestamps[asset].add(timestamp)
+            if need_oracle:
+                oracle_queries.add((asset, timestamp))
+
+    prices: dict[tuple[str, Timestamp], Price] = {}
+    for asset, timestamps in cache_timestamps.items():
+        try:
+            if PriceHistorian.is_price_cache_pair(from_asset=asset, to_asset=profit_currency) is False:  # noqa: E501
+                continue
+        except (UnknownAsset, WrongAssetType, DeserializationError):
+            continue
+
+        for timestamp, price in GlobalDBHandler.get_historical_prices_for_timestamps(
+            from_asset=asset,
+            to_asset=profit_currency,
+            timestamps=sorted(timestamps),
+            max_seconds_distance=HOUR_IN_SECONDS,
+        ).items():
+            prices[asset.identifier, timestamp] = price
+            oracle_queries.discard((asset, timestamp))
+
+    log.debug(
+        f'Found {len(prices)} prices in the cache before processing history. '
+        f'Querying {len(oracle_queries)} prices from the oracles',
+    )
+    rate_limited = False
+
+    def query_price(query: tuple[Asset, Timestamp]) -> None:
+        nonlocal rate_limited
+        if rate_limited:
+            return  # let the pot query the remaining prices sequentially
+
+        asset, timestamp = query
+        try:
+            prices[asset.identifier, timestamp] = PriceHistorian().query_historical_price(
+                from_asset=asset,
+                to_asset=profit_currency,
+                timestamp=timestamp,
+            )
+        except (
+            NoPriceForGivenTimestamp,
+            PriceQueryUnsupportedAsset,
+            RemoteError,
+            UnknownAsset,
+            WrongAssetType,
+        ) as e:
+            log.debug(f'Could not prefetch the price of {asset} at {timestamp} due to {e!s}')
+            if (
+                (isinstance(e, NoPriceForGivenTimestamp) and e.rate_limited) or
+                (isinstance(e, RemoteError) and e.error_code == HTTPStatus.TOO_MANY_REQUESTS)
+            ):
+                rate_limited = True
+
+    Pool(PRICES_PREFETCH_CONCURRENCY).map(query_price, sorted(oracle_queries, key=itemgetter(1)))
+    pot.prefetched_prices = prices
@@ -139,6 +139,24 @@ class MissingAcquisition(NamedTuple):
 
         return data  # type: ignore
 
+    @classmethod
+    def deserialize(cls, data: dict[str, Any]) -> 'MissingAcquisition':
+        """Turns a dict created by serialize() back to a MissingAcquisition
+
+        May raise:
+        - DeserializationError if a key is missing
+        """
+        try:
+            return cls(
+                originating_event_id=data.get('originating_event_id'),
+                asset=Asset(data['asset']),
+                time=Timestamp(data['time']),
+                found_amount=FVal(data['found_amount']),
+                missing_amount=FVal(data['missing_amount']),
+            )
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in missing acquisition data') from e
+
 
 class MissingPrice(NamedTuple):
     from_asset: Asset
@@ -154,6 +172,46 @@ class MissingPrice(NamedTuple):
             'rate_limited': self.rate_limited,
         }
 
+    @classmethod
+    def deserialize(cls, data: dict[str, Any]) -> 'MissingPrice':
+        """Turns a dict created by serialize() back to a MissingPrice
+
+        May raise:
+        - DeserializationError if a key is missing
+        """
+        try:
+            return cls(
+                from_asset=Asset(data['from_asset']),
+                to_asset=Asset(data['to_asset']),
+                time=Timestamp(data['time']),
+                rate_limited=data['rate_limited'],
+            )
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s} in missing price data') from e
+
+
+class PnlCheckpoint(NamedTuple):
+    """State of the accounting pot after processing the first `events_num` events
+    of the sorted history
+
+    settings_hash identifies the settings, ignored entries and accounting rules the
+    state was calculated with
+
+    timestamp is the timestamp of the last processed event
+
+    processed_actions is the number of processed actions at that point
+
+    events_digest is the digest of the processed events used to detect history changes
+
+    state is the serialized state of the pot
+    """
+    settings_hash: str
+    events_num: int
+    timestamp: Timestamp
+    processed_actions: int
+    events_digest: str
+    state: dict[str, Any]
+
 
 class EventAccountingRuleStatus(SerializableEnumNameMixin):
     HAS_RULE = auto()
@@ -35,7 +35,6 @@ from rotkehlchen.accounting.entry_type_mappings import ENTRY_TYPE_MAPPINGS
 from rotkehlchen.accounting.export.csv import (
     FILENAME_SKIPPED_EXTERNAL_EVENTS_CSV,
     CSVWriteError,
-    dict_to_csv_file,
 )
 from rotkehlchen.accounting.pot import AccountingPot
 from rotkehlchen.accounting.structures.balance import Balance, BalanceSheet, BalanceType
@@ -110,7 +109,7 @@ from rotkehlchen.chain.evm.types import (
 )
 from rotkehlchen.chain.gnosis.modules.gnosis_pay.constants import CPT_GNOSIS_PAY
 from rotkehlchen.chain.zksync_lite.constants import ZKL_IDENTIFIER
-from rotkehlchen.constants import HOUR_IN_SECONDS, ONE
+from rotkehlchen.constants import ONE
 from rotkehlchen.constants.limits import (
     FREE_USER_NOTES_LIMIT,
 )
@@ -123,7 +122,6 @@ from rotkehlchen.constants.misc import (
     DEFAULT_SQL_VM_INSTRUCTIONS_CB,
     HTTP_STATUS_INTERNAL_DB_ERROR,
     IMAGESDIR_NAME,
-    ZERO,
 )
 from rotkehlchen.constants.prices import ZERO_PRICE
 from rotkehlchen.constants.timing import ENS_AVATARS_REFRESH
@@ -214,6 +212,7 @@ from rotkehlchen.globaldb.cache import (
 )
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.globaldb.utils import set_token_spam_protocol
+from rotkehlchen.history.events.export import export_history_events_csv
 from rotkehlchen.history.events.structures.base import (
     HistoryBaseEntryType,
     get_event_type_identifier,
@@ -303,7 +302,9 @@ from rotkehlchen.types import (
     Timestamp,
     UserNote,
 )
-from rotkehlchen.utils.misc import combine_dicts, ts_ms_to_sec, ts_now
+from rotkehlchen.utils.misc import combine_dicts, ts_now
+from rotkehlchen.utils.profiling import Profiler
+from rotkehlchen.utils.rate_limiter import RateLimiter
 from rotkehlchen.utils.snapshots import parse_import_snapshot_data
 from rotkehlchen.utils.version_check import get_current_version
 
@@ -615,6 +616,16 @@ class RestAPI:
         self.rotkehlchen.api_task_greenlets.pop(idx)  # also pop from greenlets
         return api_response(OK_RESULT, status_code=HTTPStatus.OK)
 
+    def get_background_tasks_stats(self) -> Response:
+        """Return the scheduling stats of the periodic background tasks"""
+        if (task_manager := self.rotkehlchen.task_manager) is None:
+            stats = {}
+        else:
+            with task_manager.schedule_lock:
+                stats = task_manager.get_task_stats()
+
+        return api_response(_wrap_in_ok_result(stats), status_code=HTTPStatus.OK)
+
     @async_api_call()
     def get_exchange_rates(self, given_currencies: list[AssetWithOracles]) -> dict[str, Any]:
         currencies = given_currencies
@@ -695,6 +706,14 @@ class RestAPI:
         self.rotkehlchen.data.db.delete_external_service_credentials(services)
         return self._return_external_services_response()
 
+    @staticmethod
+    def get_external_services_rate_limits() -> Response:
+        """Return the learned rate limits and the queues of the external services"""
+        return api_response(
+            _wrap_in_ok_result(RateLimiter().stats()),
+            status_code=HTTPStatus.OK,
+        )
+
     def get_exchanges(self) -> Response:
         return api_response(
             _wrap_in_ok_result(self.rotkehlchen.exchange_manager.get_connected_exchanges_info()),
@@ -3100,9 +3119,15 @@ class RestAPI:
         """
         with self.rotkehlchen.data.db.user_write() as write_cursor:
             concerning_address = write_cursor.execute('DELETE FROM zksynclite_transactions WHERE tx_hash=? RETURNING from_address', (tx_ref,)).fetchone()  # noqa: E501
+            event_identifier = ZKL_IDENTIFIER.format(tx_hash=str(tx_ref))
+            DBHistoryEvents.mark_balances_stale(
+                write_cursor=write_cursor,
+                where_str='WHERE event_identifier=?',
+                bindings=(event_identifier,),
+            )
             deleted_event_data = write_cursor.execute(
                 'DELETE FROM history_events WHERE event_identifier=? RETURNING location_label',
-                (ZKL_IDENTIFIER.format(tx_hash=str(tx_ref)),),
+                (event_identifier,),
             ).fetchone()
             if deleted_event_data is not None:
                 concerning_address = deleted_event_data[0]
@@ -3750,6 +3775,14 @@ class RestAPI:
 
         return api_response(OK_RESULT)
 
+    @staticmethod
+    def get_current_price_cache_stats() -> Response:
+        """Return the size and the hit/miss counters of the current prices cache"""
+        return api_response(
+            _wrap_in_ok_result(Inquirer._cached_current_price.stats()),
+            status_code=HTTPStatus.OK,
+        )
+
     def delete_manual_latest_price(
             self,
             asset: Asset,
@@ -4051,7 +4084,7 @@ class RestAPI:
             limit_type=UserLimitType.HISTORY_EVENTS,
         )
 
-        with self.rotkehlchen.data.db.conn.read_ctx() as cursor:
+        with self.rotkehlchen.data.db.conn.threaded_read_ctx() as cursor:
             events_result, entries_found, entries_with_limit = dbevents.get_history_events_and_limit_info(  # noqa: E501
                 cursor=cursor,
                 filter_query=filter_query,
@@ -4500,6 +4533,31 @@ class RestAPI:
 
         return self.get_config_arguments()
 
+    @staticmethod
+    def get_profiling_data() -> Response:
+        """Return the flame graph data and greenlet stats of the profiler"""
+        return api_response(_wrap_in_ok_result(Profiler().serialize()), status_code=HTTPStatus.OK)
+
+    @staticmethod
+    def start_profiling(sample_interval: float, window: int) -> Response:
+        if Profiler().start(sample_interval=sample_interval, window=window) is False:
+            return api_response(
+                wrap_in_fail_result('Profiling is already running'),
+                status_code=HTTPStatus.CONFLICT,
+            )
+
+        return api_response(OK_RESULT, status_code=HTTPStatus.OK)
+
+    @staticmethod
+    def stop_profiling() -> Response:
+        if Profiler().stop() is False:
+            return api_response(
+                wrap_in_fail_result('Profiling is not running'),
+                status_code=HTTPStatus.CONFLICT,
+            )
+
+        return api_response(OK_RESULT, status_code=HTTPStatus.OK)
+
     def get_user_notes(self, filter_query: UserNotesFilterQuery) -> Response:
         with self.rotkehlchen.data.db.conn.read_ctx() as cursor:
             user_notes, entries_found = self.rotkehlchen.data.db.get_user_notes_and_limit_info(
@@ -5153,95 +5211,54 @@ class RestAPI:
             filter_query: HistoryBaseEntryFilterQuery,
             directory_path: Path | None,
             match_exact_events: bool,
+            compress: bool,
     ) -> dict[str, Any] | Response:
         """Export history events data to a CSV file."""
-        dbevents = DBHistoryEvents(self.rotkehlchen.data.db)
         entries_limit, _ = get_user_limit(
             premium=self.rotkehlchen.premium,
             limit_type=UserLimitType.HISTORY_EVENTS,
         )
-        with self.rotkehlchen.data.db.conn.read_ctx() as cursor:
-            history_events, _, _ = dbevents.get_history_events_and_limit_info(
-                cursor=cursor,
-                filter_query=filter_query,
-                match_exact_events=match_exact_events,
-                entries_limit=entries_limit,
-            )
-
-        if len(history_events) == 0:
-            return wrap_in_fail_result(
-                message='No history processed in order to perform an export',
-                status_code=HTTPStatus.CONFLICT,
-            )
-
         with self.rotkehlchen.data.db.conn.read_ctx() as cursor:
             settings = self.rotkehlchen.get_settings(cursor)
             currency = settings.main_currency.resolve_to_asset_with_oracles()
 
-        serialized_history_events = []
-        headers: dict[str, None] = {}
-        query_data, unique_data = [], set()
-        for event in history_events:
-            if (entry := (event.asset, currency, ts_ms_to_sec(event.timestamp))) not in unique_data:  # noqa: E501
-                unique_data.add(entry)
-                query_data.append(entry)
-
-        prices_from_db = GlobalDBHandler.get_historical_prices(
-            query_data=query_data,  # type: ignore[arg-type]  # currency is a subclass of Asset
-            max_seconds_distance=HOUR_IN_SECONDS,
-        )
-        missing_prices: list[tuple[Asset, Timestamp]] = []
-        cached_db_prices: defaultdict[Asset, defaultdict[Timestamp, FVal]] = defaultdict(lambda: defaultdict(lambda: ZERO))  # noqa: E501
-        for idx, (asset, _, timestamp) in enumerate(query_data):
-            if (db_price := prices_from_db[idx]) is not None:
-                cached_db_prices[db_price.from_asset][db_price.timestamp] = db_price.price
-            elif (asset, timestamp) not in missing_prices:
-                missing_prices.append((asset, timestamp))
-
-        for asset, timestamped_prices in PriceHistorian.query_multiple_prices(
-            assets_timestamp=missing_prices,
-            target_asset=currency,
-            msg_aggregator=self.rotkehlchen.msg_aggregator,
-        ).items():
-            cached_db_prices[asset].update(timestamped_prices)
-
-        for event in history_events:
-            serialized_event = event.serialize_for_csv(
-                fiat_value=event.amount * cached_db_prices[event.asset][ts_ms_to_sec(event.timestamp)],  # noqa: E501
-                settings=settings,
-            )
-            serialized_history_events.append(serialized_event)
-            # maintain insertion order without storing extra info
-            headers.update(dict.fromkeys(serialized_event))
-
         try:
             filename = generate_events_export_filename(filter_query=filter_query, use_localtime=settings.display_date_in_localtime)  # noqa: E501
             if directory_path is None:  # file will be downloaded later via download_history_events_csv endpoint  # noqa: E501
                 file_path = Path(tempfile.mkdtemp()) / filename
-                dict_to_csv_file(
-                    path=file_path,
-                    dictionary_list=serialized_history_events,
-                    csv_delimiter=settings.csv_export_delimiter,
-                    headers=headers.keys(),
-                )
-                return {
-                    'result': {'file_path': str(file_path)},
-                    'message': '',
-                    'status_code': HTTPStatus.OK,
-                }
+            else:  # else do a direct export to filesystem
+                directory_path.mkdir(parents=True, exist_ok=True)
+                file_path = directory_path / filename
 
-            # else do a direct export to filesystem
-            directory_path.mkdir(parents=True, exist_ok=True)
-            file_path = directory_path / filename
-            dict_to_csv_file(
+            exported_path = export_history_events_csv(
+                database=self.rotkehlchen.data.db,
+                filter_query=filter_query,
+                entries_limit=entries_limit,
+                match_exact_events=match_exact_events,
                 path=file_path,
-                dictionary_list=serialized_history_events,
-                csv_delimiter=settings.csv_export_delimiter,
-                headers=headers.keys(),
+                settings=settings,
+                currency=currency,
+                msg_aggregator=self.rotkehlchen.msg_aggregator,
+                compress=compress,
             )
         except (CSVWriteError, PermissionError) as e:
             return wrap_in_fail_result(message=str(e), status_code=HTTPStatus.CONFLICT)
 
+        if exported_path is None:
+            if directory_path is None:
+                file_path.parent.rmdir()
+            return wrap_in_fail_result(
+                message='No history processed in order to perform an export',
+                status_code=HTTPStatus.CONFLICT,
+            )
+
+        if directory_path is None:
+            return {
+                'result': {'file_path': str(exported_path)},
+                'message': '',
+                'status_code': HTTPStatus.OK,
+            }
+
         return OK_RESULT
 
     @staticmethod
@@ -5250,7 +5267,7 @@ class RestAPI:
         register_post_download_cleanup(path := Path(file_path))
         return send_file(
             path_or_file=file_path,
-            mimetype='text/csv',
+            mimetype='application/gzip' if path.suffix == '.gz' else 'text/csv',
             as_attachment=True,
             download_name=path.name,
         )
@@ -55,9 +55,15 @@ def edit_grouped_events_with_optional_fee(
     if (new_event_count := len(events)) == no_fee_num and existing_event_count == with_fee_num:
         # in the db we had a fee entry and now we have removed it
         events_to_edit = events[:new_event_count]
+        bindings = (events[0].event_identifier, events[0].sequence_index + no_fee_num)
+        events_db.mark_balances_stale(
+            write_cursor=write_cursor,
+            where_str='WHERE event_identifier=? and sequence_index=?',
+            bindings=bindings,
+        )
         write_cursor.execute(
             'DELETE FROM history_events WHERE event_identifier=? and sequence_index=?',
-            (events[0].event_identifier, events[0].sequence_index + no_fee_num),
+            bindings,
         )
     elif new_event_count == with_fee_num and existing_event_count == no_fee_num:
         # we didn't have a fee in the db and we have it now
@@ -102,9 +108,15 @@ def edit_grouped_swap_events(
             edited_identifiers.append(event.identifier)
 
     if identifiers != edited_identifiers:  # There are identifiers with no corresponding events - these events need to be deleted.  # noqa: E501
+        to_delete = list(set(identifiers) - set(edited_identifiers))
+        events_db.mark_balances_stale(
+            write_cursor=write_cursor,
+            where_str=f'WHERE identifier IN ({",".join(["?"] * len(to_delete))})',
+            bindings=to_delete,
+        )
         write_cursor.executemany(
             'DELETE FROM history_events WHERE identifier=?',
-            [(identifier,) for identifier in set(identifiers) - set(edited_identifiers)],
+            [(identifier,) for identifier in to_delete],
         )
 
     for event in new_events:
@@ -42,6 +42,7 @@ from rotkehlchen.api.v1.resources import (
     AssetUpdatesResource,
     AssociatedLocations,
     AsyncTasksResource,
+    BackgroundTasksResource,
     BinanceAvailableMarkets,
     BinanceSavingsResource,
     BinanceUserMarkets,
@@ -87,6 +88,7 @@ from rotkehlchen.api.v1.resources import (
     ExchangesResource,
     ExportHistoryDownloadResource,
     ExportHistoryEventResource,
+    ExternalServicesRateLimitsResource,
     ExternalServicesResource,
     FalsePositiveSpamTokenResource,
     GnosisPayNonceResource,
@@ -109,6 +111,7 @@ from rotkehlchen.api.v1.resources import (
     IgnoredActionsResource,
     IgnoredAssetsResource,
     InfoResource,
+    LatestAssetsPriceCacheResource,
     LatestAssetsPriceResource,
     LiquityStabilityPoolResource,
     LiquityStakingResource,
@@ -133,6 +136,7 @@ from rotkehlchen.api.v1.resources import (
     PingResource,
     PremiumCapabilitiesResource,
     PremiumDevicesResource,
+    ProfilingResource,
     ProtocolDataRefreshResource,
     QueriedAddressesResource,
     RefetchTransactionsResource,
@@ -188,10 +192,13 @@ URLS_V1: URLS = [
     ('/premium/sync', UserPremiumSyncResource),
     ('/settings', SettingsResource),
     ('/settings/configuration', ConfigurationsResource),
+    ('/profiling', ProfilingResource),
     ('/tasks', AsyncTasksResource),
     ('/tasks/<int:task_id>', AsyncTasksResource, 'specific_async_tasks_resource'),
+    ('/tasks/background', BackgroundTasksResource),
     ('/exchange_rates', ExchangeRatesResource),
     ('/external_services', ExternalServicesResource),
+    ('/external_services/rate_limits', ExternalServicesRateLimitsResource),
     ('/oracles', OraclesResource),
     ('/oracles/<string:oracle>/cache', NamedOracleCacheResource),
     ('/exchanges', ExchangesResource),
@@ -299,6 +306,7 @@ URLS_V1: URLS = [
     ('/assets/search/levenshtein', AssetsSearchLevenshteinResource),
     ('/assets/prices/latest', LatestAssetsPriceResource),
     ('/assets/prices/latest/all', AllLatestAssetsPriceResource),
+    ('/assets/prices/latest/cache', LatestAssetsPriceCacheResource),
     ('/assets/prices/historical', HistoricalAssetsPriceResource),
     ('/assets/ignored', IgnoredAssetsResource),
     ('/assets/ignored/whitelist', FalsePositiveSpamTokenResource),
@@ -143,6 +143,7 @@ from rotkehlchen.api.v1.schemas import (
     NFTLpFilterSchema,
     OptionalAddressesWithBlockchainsListSchema,
     PendingTransactionDecodingSchema,
+    ProfilingStartSchema,
     QueriedAddressesSchema,
     QueryAddressbookSchema,
     QueryCalendarSchema,
@@ -525,6 +526,13 @@ class AsyncTasksResource(BaseMethodView):
         return self.rest_api.delete_async_task(task_id=task_id)
 
 
+class BackgroundTasksResource(BaseMethodView):
+
+    @require_loggedin_user()
+    def get(self) -> Response:
+        return self.rest_api.get_background_tasks_stats()
+
+
 class ExchangeRatesResource(BaseMethodView):
 
     get_schema = ExchangeRatesSchema()
@@ -854,6 +862,13 @@ class ExternalServicesResource(BaseMethodView):
         return self.rest_api.delete_external_services(services=services)
 
 
+class ExternalServicesRateLimitsResource(BaseMethodView):
+
+    @require_loggedin_user()
+    def get(self) -> Response:
+        return self.rest_api.get_external_services_rate_limits()
+
+
 class AllBalancesResource(BaseMethodView):
 
     get_schema = AllBalancesQuerySchema()
@@ -2469,6 +2484,13 @@ class LatestAssetsPriceResource(BaseMethodView):
         return self.rest_api.delete_manual_latest_price(asset=asset)
 
 
+class LatestAssetsPriceCacheResource(BaseMethodView):
+
+    @require_loggedin_user()
+    def get(self) -> Response:
+        return self.rest_api.get_current_price_cache_stats()
+
+
 class HistoricalAssetsPriceResource(BaseMethodView):
 
     post_schema = HistoricalAssetsPriceSchema()
@@ -2952,6 +2974,20 @@ class ConfigurationsResource(BaseMethodView):
         return self.rest_api.update_log_level(loglevel=loglevel)
 
 
+class ProfilingResource(BaseMethodView):
+    put_schema = ProfilingStartSchema()
+
+    def get(self) -> Response:
+        return self.rest_api.get_profiling_data()
+
+    @use_kwargs(put_schema, location='json')
+    def put(self, sample_interval: float, window: int) -> Response:
+        return self.rest_api.start_profiling(sample_interval=sample_interval, window=window)
+
+    def delete(self) -> Response:
+        return self.rest_api.stop_profiling()
+
+
 class UserNotesResource(BaseMethodView):
     get_schema = UserNotesGetSchema()
     put_schema = UserNotesPutSchema()
@@ -3127,22 +3163,25 @@ class ExportHistoryEventResource(BaseMethodView):
             filter_query: 'HistoryBaseEntryFilterQuery',
             directory_path: Path,
             match_exact_events: bool,
+            compress: bool,
     ) -> dict[str, Any]:
         return self.rest_api.export_history_events(
             filter_query=filter_query,
             directory_path=directory_path,
             async_query=async_query,
             match_exact_events=match_exact_events,
+            compress=compress,
         )
 
     @require_loggedin_user()
     @use_kwargs(put_schema, location='json_and_query')
-    def put(self, async_query: bool, filter_query: 'HistoryBaseEntryFilterQuery', match_exact_events: bool) -> Response | dict[str, Any]:  # noqa: E501
+    def put(self, async_query: bool, filter_query: 'HistoryBaseEntryFilterQuery', match_exact_events: bool, compress: bool) -> Response | dict[str, Any]:  # noqa: E501
         return self.rest_api.export_history_events(
             filter_query=filter_query,
             directory_path=None,
             async_query=async_query,
             match_exact_events=match_exact_events,
+            compress=compress,
         )
 
 
@@ -163,6 +163,7 @@ from rotkehlchen.types import (
 )
 from rotkehlchen.utils.hexbytes import hexstring_to_bytes
 from rotkehlchen.utils.misc import create_order_by_rules_list, ts_now
+from rotkehlchen.utils.profiling import DEFAULT_PROFILING_WINDOW, DEFAULT_SAMPLE_INTERVAL
 
 from .fields import (
     AmountField,
@@ -1634,6 +1635,7 @@ class ModifiableSettingsSchema(Schema):
     ask_user_upon_size_discrepancy = fields.Boolean(load_default=None)
     auto_detect_tokens = fields.Boolean(load_default=None)
     csv_export_delimiter = EmptyAsNoneStringField(load_default=None)
+    hedge_rpc_requests = fields.Boolean(load_default=None)
 
     @validates_schema
     def validate_settings_schema(
@@ -1698,6 +1700,7 @@ class ModifiableSettingsSchema(Schema):
             ask_user_upon_size_discrepancy=data['ask_user_upon_size_discrepancy'],
             auto_detect_tokens=data['auto_detect_tokens'],
             csv_export_delimiter=data['csv_export_delimiter'],
+            hedge_rpc_requests=data['hedge_rpc_requests'],
         )
 
 
@@ -3864,12 +3867,16 @@ class ExportHistoryEventSchema(HistoryEventSchema, AsyncQueryArgumentSchema):
     """Schema for querying history events"""
     directory_path = DirectoryField(required=True)
     match_exact_events = fields.Boolean(load_default=False)
+    compress = fields.Boolean(load_default=False)
 
     def make_extra_filtering_arguments(self, data: dict[str, Any]) -> dict[str, Any]:
         return {}
 
     def generate_fields_post_validation(self, data: dict[str, Any]) -> dict[str, Any]:
-        extra_fields = {'match_exact_events': data['match_exact_events']}
+        extra_fields = {
+            'match_exact_events': data['match_exact_events'],
+            'compress': data['compress'],
+        }
         if (directory_path := data.get('directory_path')) is not None:
             extra_fields['directory_path'] = directory_path
         if (async_query := data.get('async_query')) is not None:
@@ -4475,6 +4482,17 @@ class EditPremiumDeviceSchema(Schema):
     device_name = NonEmptyStringField(required=True)
 
 
+class ProfilingStartSchema(Schema):
+    sample_interval = fields.Float(
+        load_default=DEFAULT_SAMPLE_INTERVAL,
+        validate=validate.Range(min=0.001, max=1),
+    )
+    window = fields.Integer(
+        load_default=DEFAULT_PROFILING_WINDOW,
+        validate=validate.Range(min=1, max=3600),
+    )
+
+
 class ConfigurationUpdateSchema(Schema):
     loglevel = fields.String(
         required=True,
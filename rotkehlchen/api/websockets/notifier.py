@@ -1,5 +1,4 @@
 import contextlib
-import json
 import logging
 from collections.abc import Callable
 from contextlib import suppress
@@ -11,7 +10,7 @@ from geventwebsocket.exceptions import WebSocketError
 from geventwebsocket.websocket import WebSocket
 
 from rotkehlchen.logging import RotkehlchenLogsAdapter
-from rotkehlchen.serialization.serialize import process_result
+from rotkehlchen.serialization.serialize import result_to_json
 
 if TYPE_CHECKING:
     from rotkehlchen.api.websockets.typedefs import WSMessageType
@@ -70,15 +69,17 @@ class RotkiNotifier:
             success_callback_args: dict[str, Any] | None = None,
             failure_callback: Callable | None = None,
             failure_callback_args: dict[str, Any] | None = None,
+            message: str | None = None,
     ) -> None:
         """Broadcasts a websocket message
 
         A callback to run on message success and a callback to run on message
-        failure can be optionally provided.
+        failure can be optionally provided. If the caller already serialized the
+        message it can be given so that it's not serialized again.
         """
-        message_data = process_result({'type': message_type, 'data': to_send_data})
         try:
-            message = json.dumps(message_data)
+            if message is None:
+                message = result_to_json({'type': message_type, 'data': to_send_data})
         except TypeError as e:
             log.error(f'Failed to broadcast websocket {message_type} message due to {e!s}')
             if failure_callback is not None:
@@ -143,5 +143,10 @@ def app_args(prog: str, description: str) -> argparse.ArgumentParser:
         help="If given then task manager won't schedule new tasks",
         action='store_true',
     )
+    p.add_argument(
+        '--profiling',
+        help='If given then the backend is profiled and the flame graph data can be queried via the API',  # noqa: E501
+        action='store_true',
+    )
 
     return p
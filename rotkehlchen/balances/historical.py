@@ -1,13 +1,16 @@
 import logging
+from bisect import bisect_left
 from collections import defaultdict
 from typing import TYPE_CHECKING, TypedDict
 
 from rotkehlchen.assets.asset import Asset
-from rotkehlchen.constants import DAY_IN_SECONDS, ONE, ZERO
+from rotkehlchen.constants import DAY_IN_SECONDS, ZERO
 from rotkehlchen.constants.prices import ZERO_PRICE
+from rotkehlchen.db.daily_balances import DBDailyBalances, timestamp_to_day
 from rotkehlchen.db.filtering import (
     HistoryEventFilterQuery,
 )
+from rotkehlchen.db.utils import get_query_chunks
 from rotkehlchen.errors.misc import NotFoundError, RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp
 from rotkehlchen.errors.serialization import DeserializationError
@@ -50,15 +53,10 @@ class HistoricalBalancesManager:
         - NotFoundError if balance for the given timestamp does not exist.
         - DeserializationError if there is a problem deserializing an event from DB.
         """
-        events, main_currency = self._get_events_and_currency(to_ts=timestamp)
-        if len(events) == 0:
+        current_balances, main_currency = self._get_indexed_balances(timestamp=timestamp)
+        if current_balances is None:
             raise NotFoundError('No historical data found until the given timestamp.')
 
-        current_balances: dict[Asset, FVal] = defaultdict(FVal)
-        for event in events:
-            if self._update_balances(event=event, current_balances=current_balances) is not None:
-                break
-
         result: dict[Asset, HistoricalBalance] = {}
         for asset, amount in current_balances.items():
             try:
@@ -105,18 +103,13 @@ class HistoricalBalancesManager:
         - NotFoundError if balance for the asset at the given timestamp does not exist.
         - DeserializationError if there is a problem deserializing an event from DB.
         """
-        events, main_currency = self._get_events_and_currency(to_ts=timestamp, assets=(asset,))
-        if len(events) == 0:
+        current_balances, main_currency = self._get_indexed_balances(
+            timestamp=timestamp,
+            assets=(asset,),
+        )
+        if current_balances is None:
             raise NotFoundError(f'No historical data found for {asset} until the given timestamp.')
 
-        current_balances: dict[Asset, FVal] = defaultdict(FVal)
-        for event in events:
-            if self._update_balances(
-                event=event,
-                current_balances=current_balances,
-            ) is not None:
-                break
-
         try:
             price = PriceHistorian.query_historical_price(
                 from_asset=asset,
@@ -126,7 +119,7 @@ class HistoricalBalancesManager:
         except (RemoteError, NoPriceForGivenTimestamp):
             price = ZERO_PRICE
 
-        return {'amount': current_balances[asset], 'price': price}
+        return {'amount': current_balances.get(asset, ZERO), 'price': price}
 
     def get_assets_amounts(
             self,
@@ -193,56 +186,163 @@ class HistoricalBalancesManager:
 
         negative_balance_data = None
         current_balances: dict[Asset, FVal] = defaultdict(FVal)
-        daily_balances: dict[Timestamp, dict[Asset, FVal]] = {}
+        # For each day with events only the balances of the assets that changed are kept
+        daily_changes: dict[Timestamp, dict[Asset, FVal]] = {}
+        day_changes: dict[Asset, FVal] = {}
         current_day = timestamp_to_daystart_timestamp(ts_ms_to_sec(events[0].timestamp))
-        daily_balances[current_day] = current_balances.copy()
         for event in events:
             if (day_ts := timestamp_to_daystart_timestamp(ts_ms_to_sec(event.timestamp))) > current_day:  # noqa: E501
-                daily_balances[current_day] = current_balances.copy()
-                current_day = day_ts
+                daily_changes[current_day] = day_changes
+                day_changes, current_day = {}, day_ts
 
             if (negative_balance_data := self._update_balances(event=event, current_balances=current_balances)) is not None:  # noqa: E501
                 break
-        else:  # no negative balance happened so update the last day's balance.
-            daily_balances[current_day] = current_balances.copy()
 
-        # For each day, calculate net worth by multiplying non-zero asset
-        # balances with their prices. Store any missing price data in missing_price_points.
+            day_changes[event.asset] = current_balances.get(event.asset, ZERO)
+        else:  # no negative balance happened so keep the last day's changes.
+            daily_changes[current_day] = day_changes
+
+        if len(daily_changes) == 0:
+            return {}, [], negative_balance_data
+
+        price_entries = self._get_price_entries(
+            assets={asset for changes in daily_changes.values() for asset in changes},
+            main_currency=main_currency,
+            from_ts=Timestamp(min(daily_changes) - DAY_IN_SECONDS),
+            to_ts=Timestamp(max(daily_changes) + DAY_IN_SECONDS),
+        )
+        # Sweep through the days applying the balance changes and calculate the net worth
+        # by multiplying non-zero asset balances with their closest price. Store any missing
+        # price data in missing_price_points.
         net_worth_per_day: dict[Timestamp, FVal] = {}
         missing_price_points: list[tuple[str, Timestamp]] = []
-        for day_ts, asset_balances in daily_balances.items():
-            assets = [
-                asset for asset, balance in asset_balances.items()
-                if balance != ZERO
-            ]
-            if len(assets) == 0:
+        asset_balances: dict[Asset, FVal] = {}
+        for day_ts, changes in daily_changes.items():
+            for asset, balance in changes.items():
+                if balance == ZERO:
+                    asset_balances.pop(asset, None)
+                else:
+                    asset_balances[asset] = balance
+
+            if len(asset_balances) == 0:
                 continue
 
-            prices, missing = self._get_prices(
-                timestamp=day_ts,
-                assets=assets,
-                main_currency=main_currency,
-            )
-            missing_price_points.extend(missing)
-
-            day_total = sum(
-                (
-                    balance * prices[asset]
-                    for asset, balance in asset_balances.items()
-                    if asset in prices and balance != ZERO
-                 ),
-                ZERO,
-            )
+            day_total = ZERO
+            for asset, balance in asset_balances.items():
+                if asset == main_currency:
+                    day_total += balance
+                elif (price := self._find_closest_price(
+                    entries=price_entries.get(asset),
+                    timestamp=day_ts,
+                )) is not None:
+                    day_total += balance * price
+                else:
+                    missing_price_points.append((asset.identifier, day_ts))
+
             net_worth_per_day[day_ts] = day_total
 
         return net_worth_per_day, missing_price_points, negative_balance_data
 
+    def _get_indexed_balances(
+            self,
+            timestamp: Timestamp,
+            assets: tuple[Asset, ...] | None = None,
+    ) -> tuple[dict[Asset, FVal] | None, Asset]:
+        """Get the balances of all assets, or only the given ones, at the given timestamp
+        by starting from the daily balances index and replaying only the events after it.
+
+        Returns None as balances if no events exist until the given timestamp.
+
+        May raise:
+        - DeserializationError if there is a problem deserializing an event from DB.
+        """
+        indexed_until = self._update_daily_balances(timestamp=timestamp)
+        with self.db.conn.read_ctx() as cursor:
+            ignored_asset_ids = self.db.get_ignored_asset_ids(cursor=cursor)
+
+        indexed_balances = {
+            asset_id: amount for asset_id, amount in DBDailyBalances(self.db).get_balances(
+                day_ts=indexed_until,
+                asset_ids=None if assets is None else [x.identifier for x in assets],
+            ).items() if asset_id not in ignored_asset_ids
+        }
+        current_balances: dict[Asset, FVal] = defaultdict(FVal)
+        for asset_id, amount in indexed_balances.items():
+            if amount != ZERO:
+                current_balances[Asset(asset_id)] = amount
+
+        events, main_currency = self._get_events_and_currency(
+            from_ts=indexed_until,
+            to_ts=timestamp,
+            assets=assets,
+        )
+        if len(indexed_balances) == 0 and len(events) == 0:
+            return None, main_currency
+
+        for event in events:
+            if self._update_balances(event=event, current_balances=current_balances) is not None:
+                break
+
+        return current_balances, main_currency
+
+    def _update_daily_balances(self, timestamp: Timestamp) -> Timestamp:
+        """Extend the daily balances index until the start of the day of the given timestamp.
+
+        The balances of all assets, including ignored ones, are indexed so that the index
+        does not depend on the ignored assets. Indexing stops at the day in which a negative
+        balance occurs since the balances after it are not calculated.
+
+        Returns the timestamp of the day until which the index can be used.
+
+        May raise:
+        - DeserializationError if there is a problem deserializing an event from DB.
+        """
+        day_ts = timestamp_to_day(timestamp)
+        daily_balances = DBDailyBalances(self.db)
+        with self.db.daily_balances_lock:
+            if (indexed_until := daily_balances.refresh()) >= day_ts:
+                return day_ts
+
+            current_balances: dict[Asset, FVal] = defaultdict(FVal)
+            for asset_id, amount in daily_balances.get_balances(day_ts=indexed_until).items():
+                if amount != ZERO:
+                    current_balances[Asset(asset_id)] = amount
+
+            events, _ = self._get_events_and_currency(
+                from_ts=indexed_until,
+                to_ts=day_ts,
+                exclude_ignored_assets=False,
+            )
+            new_entries: list[tuple[str, Timestamp, FVal]] = []
+            day_changes: dict[str, FVal] = {}
+            current_day = indexed_until
+            for event in events:
+                if (event_ts := ts_ms_to_sec(event.timestamp)) >= day_ts:
+                    break
+
+                if (event_day := timestamp_to_day(event_ts)) > current_day:
+                    new_entries.extend((x, current_day, y) for x, y in day_changes.items())
+                    day_changes, current_day = {}, event_day
+
+                if self._update_balances(event=event, current_balances=current_balances) is not None:  # noqa: E501
+                    day_ts, day_changes = current_day, {}  # this day's balances can't be indexed
+                    break
+
+                day_changes[event.asset.identifier] = current_balances.get(event.asset, ZERO)
+
+            new_entries.extend((x, current_day, y) for x, y in day_changes.items())
+
+            daily_balances.add_days(balances=new_entries, indexed_until=day_ts)
+
+        return day_ts
+
     def _get_events_and_currency(
             self,
             from_ts: Timestamp | None = None,
             to_ts: Timestamp | None = None,
             assets: tuple[Asset, ...] | None = None,
             address: 'ChecksumEvmAddress | None' = None,
+            exclude_ignored_assets: bool = True,
     ) -> tuple[list[HistoryEvent], Asset]:
         """Helper method to get events and main currency from DB.
 
@@ -259,7 +359,7 @@ class HistoricalBalancesManager:
                 from_ts=from_ts,
                 to_ts=to_ts,
                 order_by_rules=[('timestamp', True)],
-                exclude_ignored_assets=True,
+                exclude_ignored_assets=exclude_ignored_assets,
                 assets=assets,
                 exclude_subtypes=[
                     HistoryEventSubType.DEPOSIT_ASSET,
@@ -286,50 +386,53 @@ class HistoricalBalancesManager:
         return events, main_currency
 
     @staticmethod
-    def _get_prices(
-            assets: list[Asset],
+    def _get_price_entries(
+            assets: set[Asset],
             main_currency: Asset,
-            timestamp: Timestamp,
-    ) -> tuple[dict[Asset, FVal], list[tuple[str, Timestamp]]]:
-        """Gets cached historical prices for multiple assets at once.
+            from_ts: Timestamp,
+            to_ts: Timestamp,
+    ) -> dict[Asset, tuple[list[Timestamp], list[FVal]]]:
+        """Gets all cached historical prices of the given assets in main currency within
+        the time range with a single ordered scan of the price history.
 
-        Returns:
-            - A mapping of asset to price in main currency
-            - A list of (asset_id, timestamp) tuples for missing prices
+        Returns a mapping of asset to its price timestamps and prices sorted by timestamp.
         """
-        prices: dict[Asset, FVal] = {}
-        missing_prices: list[tuple[str, Timestamp]] = []
-        querystr = """
-        SELECT ph1.from_asset, ph1.price
-        FROM price_history AS ph1
-        LEFT JOIN price_history AS ph2
-            ON ph1.from_asset = ph2.from_asset
-            AND ABS(ph1.timestamp - ?) > ABS(ph2.timestamp - ?)
-        WHERE ph1.from_asset IN ({})
-            AND ph1.to_asset = ?
-            AND ph1.timestamp BETWEEN ? AND ?
-            AND ph2.from_asset IS NULL;
-        """.format(','.join('?' * len(assets)))
-        bindings = [
-            timestamp,
-            timestamp,
-            *(asset.identifier for asset in assets),
-            main_currency.identifier,
-            timestamp - DAY_IN_SECONDS,
-            timestamp + DAY_IN_SECONDS,
-        ]
-
+        assets_by_id = {asset.identifier: asset for asset in assets if asset != main_currency}
+        entries: dict[Asset, tuple[list[Timestamp], list[FVal]]] = {}
         with GlobalDBHandler().conn.read_ctx() as cursor:
-            found_prices = {row[0]: FVal(row[1]) for row in cursor.execute(querystr, bindings)}
-            for asset in assets:
-                if asset.identifier in found_prices:
-                    prices[asset] = found_prices[asset.identifier]
-                elif asset == main_currency:
-                    prices[asset] = ONE
-                else:
-                    missing_prices.append((asset.identifier, timestamp))
+            for chunk, placeholders in get_query_chunks(data=list(assets_by_id)):
+                for from_asset, timestamp, price in cursor.execute(
+                    'SELECT from_asset, timestamp, price FROM price_history '
+                    f'WHERE from_asset IN ({placeholders}) AND to_asset=? '
+                    'AND timestamp BETWEEN ? AND ? ORDER BY from_asset, timestamp',
+                    (*chunk, main_currency.identifier, from_ts, to_ts),
+                ):
+                    timestamps, prices = entries.setdefault(assets_by_id[from_asset], ([], []))
+                    timestamps.append(timestamp)
+                    prices.append(FVal(price))
+
+        return entries
+
+    @staticmethod
+    def _find_closest_price(
+            entries: tuple[list[Timestamp], list[FVal]] | None,
+            timestamp: Timestamp,
+    ) -> FVal | None:
+        """Finds the price closest to the timestamp within a day from the sorted price
+        entries of an asset. Returns None if there is no such price."""
+        if entries is None:
+            return None
+
+        timestamps, prices = entries
+        idx = bisect_left(timestamps, timestamp)
+        closest = min(
+            (x for x in (idx - 1, idx) if 0 <= x < len(timestamps)),
+            key=lambda x: abs(timestamps[x] - timestamp),
+        )
+        if abs(timestamps[closest] - timestamp) > DAY_IN_SECONDS:
+            return None
 
-        return prices, missing_prices
+        return prices[closest]
 
     @staticmethod
     def _update_balances(
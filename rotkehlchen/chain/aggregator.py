@@ -2,13 +2,14 @@ import logging
 import operator
 from collections import defaultdict
 from collections.abc import Callable, Iterator, Sequence
-from functools import reduce
+from functools import partial, reduce
 from importlib import import_module
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Optional, TypeVar, cast, overload
 
 import requests
 from gevent.lock import Semaphore
+from gevent.pool import Pool
 from web3.exceptions import BadFunctionCallOutput, Web3Exception
 
 from rotkehlchen.accounting.structures.balance import Balance, BalanceSheet
@@ -73,6 +74,8 @@ from rotkehlchen.constants.assets import A_DAI, A_ETH, A_ETH2
 from rotkehlchen.db.addressbook import DBAddressbook
 from rotkehlchen.db.cache import DBCacheStatic
 from rotkehlchen.db.eth2 import DBEth2
+from rotkehlchen.db.evmtx import DBEvmTx
+from rotkehlchen.db.filtering import EvmTransactionsNotDecodedFilterQuery
 from rotkehlchen.db.queried_addresses import QueriedAddresses
 from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
 from rotkehlchen.errors.misc import (
@@ -85,6 +88,7 @@ from rotkehlchen.errors.misc import (
 from rotkehlchen.externalapis.etherscan_like import HasChainActivity
 from rotkehlchen.fval import FVal
 from rotkehlchen.greenlets.manager import GreenletManager
+from rotkehlchen.greenlets.utils import run_concurrently
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.premium.premium import Premium
 from rotkehlchen.types import (
@@ -158,6 +162,13 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Maximum number of EVM chains whose transactions are decoded at the same time
+EVM_DECODING_CONCURRENCY = 4
+# Maximum number of chains whose balances are queried at the same time and the
+# seconds after which the balance query of a single chain is considered failed
+BALANCE_QUERY_CONCURRENCY = 6
+CHAIN_BALANCE_QUERY_TIMEOUT = 600
+
 
 def _module_name_to_class(module_name: ModuleName) -> type[EthereumModule]:
     class_name = ''.join(word.title() for word in module_name.split('_'))
@@ -552,20 +563,41 @@ class ChainsAggregator(CacheableMixIn, LockableQueryMixIn):
         - RemoteError if an external service such as Etherscan or blockchain.info
         is queried and there is a problem with its query.
         - EthSyncError if querying the token balances through a provided ethereum
-        client and the chain is not synced
+        client and the chain is not synced. When querying all chains any error of
+        a chain is raised as a RemoteError after the rest of the chains are queried.
         """
         xpub_manager = XpubManager(chains_aggregator=self)
-        for chain in SupportedBlockchain if blockchain is None else [blockchain]:
+
+        def query_chain(chain: SupportedBlockchain) -> None:
             if chain == SupportedBlockchain.ETHEREUM_BEACONCHAIN:
                 self.query_eth2_balances(ignore_cache=ignore_cache)
-                continue
+                return
 
             if ignore_cache is True and chain.is_bitcoin():
                 xpub_manager.check_for_new_xpub_addresses(blockchain=chain)  # type: ignore[arg-type] # mypy doesn't understand is_bitcoin()
 
             self._query_chain_balances(blockchain=chain, ignore_cache=ignore_cache, addresses=addresses)  # noqa: E501
 
+        if blockchain is not None:
+            query_chain(blockchain)
+            self.totals = self.balances.recalculate_totals()
+            return self.get_balances_update(blockchain)
+
+        # The chains are queried concurrently. If some of them fail the others are still
+        # queried and the totals are updated with them before raising.
+        _, errors = run_concurrently(
+            tasks={chain: partial(query_chain, chain) for chain in SupportedBlockchain},
+            concurrency=BALANCE_QUERY_CONCURRENCY,
+            timeout=CHAIN_BALANCE_QUERY_TIMEOUT,
+            expected_errors=(RemoteError, EthSyncError),
+        )
         self.totals = self.balances.recalculate_totals()
+        if len(errors) != 0:
+            raise RemoteError('. '.join(
+                f'Querying {chain} balances failed due to: {error!s}'
+                for chain, error in errors.items()
+            ))
+
         return self.get_balances_update(blockchain)
 
     @protect_with_lock(arguments_matter=True, skip_ignore_cache=True)
@@ -995,6 +1027,43 @@ class ChainsAggregator(CacheableMixIn, LockableQueryMixIn):
     def get_evm_manager(self, chain_id: SUPPORTED_CHAIN_IDS) -> 'EvmManager':
         return self.get_chain_manager(chain_id.to_blockchain())  # type: ignore[call-overload]  # SUPPORTED_CHAIN_IDS only includes chains with chain managers.
 
+    def decode_undecoded_evm_transactions(
+            self,
+            limit: int | None = None,
+            send_ws_notifications: bool = False,
+    ) -> dict[SUPPORTED_EVM_CHAINS_TYPE, int]:
+        """Decode up to `limit` undecoded transactions of each EVM chain that has any.
+
+        Each chain is decoded by its own decoder in a separate greenlet so that the remote
+        queries done while decoding a chain's transactions don't block decoding the others.
+        Each decoder already holds its own lock so this is safe to run along other decoding.
+
+        Returns the number of transactions that were decoded per chain.
+        """
+        dbevmtx = DBEvmTx(self.database)
+        chains = [
+            blockchain for blockchain in EVM_CHAINS_WITH_TRANSACTIONS
+            if dbevmtx.count_hashes_not_decoded(
+                filter_query=EvmTransactionsNotDecodedFilterQuery.make(chain_id=blockchain.to_chain_id()),
+            ) != 0
+        ]
+        if len(chains) == 0:
+            return {}
+
+        def decode_chain(blockchain: SUPPORTED_EVM_CHAINS_TYPE) -> tuple[SUPPORTED_EVM_CHAINS_TYPE, int]:  # noqa: E501
+            decoder = self.get_chain_manager(blockchain).transactions_decoder
+            return blockchain, len(decoder.get_and_decode_undecoded_transactions(
+                limit=limit,
+                send_ws_notifications=send_ws_notifications,
+            ))
+
+        log.debug(f'Decoding undecoded transactions of {len(chains)} EVM chains concurrently')
+        pool = Pool(EVM_DECODING_CONCURRENCY)
+        try:
+            return dict(pool.imap_unordered(decode_chain, chains))
+        finally:  # make sure no chain keeps decoding if this gets killed or a chain fails
+            pool.kill()
+
     def renable_etherscan_indixer(self) -> None:
         """Make sure that etherscan is among the indexers for a chain.
         It is used when a new api key is added and we need to ensure that it will
@@ -404,20 +404,60 @@ class HDKey:
         )
         return self._child_from_xpub(index=index, child_xpub=child_xpub)
 
-    def address(self) -> BTCAddress:
+    def derive_addresses(self, start_index: int, count: int) -> list[tuple[int, BTCAddress]]:
+        """Derives the addresses of the non-hardened children in
+        [start_index, start_index + count) of the current node.
+
+        Only the child public keys are calculated and not the full child nodes, which
+        avoids serializing and parsing an xpub and hashing the key for the fingerprint
+        of each child. Meant for bulk derivation of addresses.
+
+        Returns a list of (index, address) tuples
+        """
+        if not self.chain_code:
+            raise XPUBError('Cannot derive XPUB child without chain_code')
+        if start_index + count > BIP32_HARDEN:
+            raise XPUBError('Need private key to derive XPUB hardened children')
+
+        own_pubkey = self.pubkey.format(COMPRESSED_PUBKEY)
+        addresses = []
+        for idx in range(start_index, start_index + count):
+            index = idx
+            while True:
+                tweak = hmac.new(
+                    self.chain_code,
+                    own_pubkey + index.to_bytes(4, byteorder='big'),
+                    digestmod=hashlib.sha512,
+                ).digest()[:32]
+                try:
+                    child_pubkey = self.pubkey.add(tweak)
+                except ValueError:
+                    # impossible key. Same as derive_child, use the next index
+                    index += 1
+                    continue
+                break
+
+            addresses.append((idx, self._pubkey_to_address(child_pubkey)))
+
+        return addresses
+
+    def _pubkey_to_address(self, pubkey: PublicKey) -> BTCAddress:
         if self.hint == 'xpub' and self.xpub_type == XpubType.P2TR:
             return pubkey_to_bech32_address(
-                data=self.pubkey.format(COMPRESSED_PUBKEY),
+                data=pubkey.format(COMPRESSED_PUBKEY),
                 witver=WitnessVersion.BECH32M,
             )
         if self.hint == 'xpub':
-            return pubkey_to_base58_address(self.pubkey.format(COMPRESSED_PUBKEY))
+            return pubkey_to_base58_address(pubkey.format(COMPRESSED_PUBKEY))
         if self.hint == 'ypub':
-            return pubkey_to_p2sh_p2wpkh_address(self.pubkey.format(COMPRESSED_PUBKEY))
+            return pubkey_to_p2sh_p2wpkh_address(pubkey.format(COMPRESSED_PUBKEY))
         if self.hint == 'zpub':
             return pubkey_to_bech32_address(
-                data=self.pubkey.format(COMPRESSED_PUBKEY),
+                data=pubkey.format(COMPRESSED_PUBKEY),
                 witver=WitnessVersion.BECH32,
             )
         # else
         raise AssertionError(f'Unknown hint {self.hint} ended up in an HDKey')
+
+    def address(self) -> BTCAddress:
+        return self._pubkey_to_address(self.pubkey)
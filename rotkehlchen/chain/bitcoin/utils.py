@@ -1,5 +1,4 @@
 import hashlib
-import platform
 from collections.abc import Sequence
 from enum import Enum, auto
 from typing import Any
@@ -48,7 +47,9 @@ class OpCodes(bytes, Enum):
     OP_CHECKSIG = b'\xac'
 
 
-if platform.system() == 'Linux':
+try:
+    hashlib.new('ripemd160')
+except ValueError:  # ripemd160 is not provided by some OpenSSL 3 builds
     from .ripemd160 import ripemd160
     def hash160(msg: bytes) -> bytes:
         return ripemd160(hashlib.sha256(msg).digest())
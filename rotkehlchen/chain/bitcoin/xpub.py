@@ -1,6 +1,8 @@
 import logging
+from functools import partial
 from typing import TYPE_CHECKING, Any, Literal, NamedTuple
 
+import gevent
 from gevent.lock import Semaphore
 
 from rotkehlchen.accounting.structures.balance import Balance
@@ -10,11 +12,14 @@ from rotkehlchen.constants.assets import A_BCH, A_BTC
 from rotkehlchen.db.utils import replace_tag_mappings
 from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.fval import FVal
+from rotkehlchen.greenlets.utils import run_concurrently
 from rotkehlchen.inquirer import Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import BTCAddress, SupportedBlockchain
 
 if TYPE_CHECKING:
+    from gevent.event import AsyncResult
+
     from rotkehlchen.chain.aggregator import ChainsAggregator
     from rotkehlchen.db.drivers.gevent import DBCursor
 
@@ -88,15 +93,18 @@ class XpubManager:
         """May raise:
         - RemoteError: if blockstream/blockchain.info can't be reached
         """
+        def derive_batch(from_index: int) -> 'AsyncResult':
+            """Derive the batch in the threadpool so that it runs while waiting for
+            the activity check of the previous batch"""
+            return gevent.get_hub().threadpool.spawn(root.derive_addresses, from_index, gap_limit)
+
         step_index = start_index
         addresses: list[XpubDerivedAddressData] = []
         should_continue = True
+        next_batch = derive_batch(step_index)
         while should_continue:
-            batch_addresses: list[tuple[int, BTCAddress]] = []
-            for idx in range(step_index, step_index + gap_limit):
-                child = root.derive_child(idx)
-                batch_addresses.append((idx, child.address()))
-
+            batch_addresses: list[tuple[int, BTCAddress]] = next_batch.get()
+            next_batch = derive_batch(step_index + gap_limit)
             have_tx_mapping = self.chains_aggregator.get_chain_manager(
                 blockchain=blockchain,
             ).have_transactions(accounts=[x[1] for x in batch_addresses])
@@ -149,28 +157,25 @@ class XpubManager:
         else:
             account_xpub = xpub_data.xpub
 
-        addresses = []
-        receiving_xpub = account_xpub.derive_child(0)
-        addresses.extend(
-            self._derive_addresses_loop(
-                account_index=0,
-                start_index=start_receiving_index,
-                root=receiving_xpub,
-                gap_limit=gap_limit,
-                blockchain=xpub_data.blockchain,
-            ),
+        # the receiving and the change addresses are scanned concurrently
+        results, errors = run_concurrently(
+            tasks={
+                account_index: partial(
+                    self._derive_addresses_loop,
+                    account_index=account_index,
+                    start_index=start_index,
+                    root=account_xpub.derive_child(account_index),
+                    gap_limit=gap_limit,
+                    blockchain=xpub_data.blockchain,
+                ) for account_index, start_index in ((0, start_receiving_index), (1, start_change_index))  # noqa: E501
+            },
+            concurrency=2,
+            timeout=None,
         )
-        change_xpub = account_xpub.derive_child(1)
-        addresses.extend(
-            self._derive_addresses_loop(
-                account_index=1,
-                start_index=start_change_index,
-                root=change_xpub,
-                gap_limit=gap_limit,
-                blockchain=xpub_data.blockchain,
-            ),
-        )
-        return addresses
+        if len(errors) != 0:
+            raise next(iter(errors.values()))
+
+        return results[0] + results[1]
 
     def _derive_xpub_addresses(
             self,
@@ -2,11 +2,15 @@ import importlib
 import logging
 import pkgutil
 from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Sequence
 from contextlib import suppress
 from typing import TYPE_CHECKING, Generic, Literal, TypeVar
 
+import gevent
 from gevent.lock import Semaphore
 from more_itertools import peekable
+from pysqlcipher3 import dbapi2 as sqlcipher
 
 from rotkehlchen.api.websockets.typedefs import ProgressUpdateSubType, WSMessageType
 from rotkehlchen.db.constants import TX_DECODED, TX_SPAM
@@ -19,6 +23,7 @@ from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import BLOCKCHAIN_LOCATIONS_TYPE
+from rotkehlchen.utils.misc import get_chunks
 from rotkehlchen.utils.mixins.customizable_date import CustomizableDateMixin
 
 from .constants import CPT_GAS
@@ -29,6 +34,8 @@ from .types import CounterpartyDetails, SupportsAddition
 if TYPE_CHECKING:
     from types import ModuleType
 
+    from greenlet import greenlet
+
     from rotkehlchen.assets.asset import AssetWithOracles
     from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.db.drivers.gevent import DBCursor
@@ -37,6 +44,42 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Number of transactions whose decoding contexts are loaded with the same cursor and
+# whose decoded events are written to the DB in a single write transaction
+DECODING_BATCH_SIZE = 50
+
+# Subpackages of each package of decoder modules along with whether they contain a decoder
+# module. Finding them requires walking the package directories and trying to import a
+# decoder module from each subpackage, so it is done only once per process.
+_DECODER_PACKAGES: dict[str, list[tuple[str, bool]]] = {}
+
+
+def discover_decoder_packages(package: 'str | ModuleType') -> list[tuple[str, bool]]:
+    """Return the full names of the subpackages of the given package and whether each
+    of them has a decoder module. Decoder modules are imported and the result is cached."""
+    package_name = package if isinstance(package, str) else package.__name__
+    if (subpackages := _DECODER_PACKAGES.get(package_name)) is not None:
+        return subpackages
+
+    if isinstance(package, str):
+        package = importlib.import_module(package)
+
+    subpackages = []
+    for _, name, is_pkg in pkgutil.walk_packages(package.__path__):
+        full_name = package_name + '.' + name
+        if full_name == __name__ or is_pkg is False:
+            continue  # skip
+
+        has_decoder = False
+        with suppress(ModuleNotFoundError):
+            importlib.import_module(full_name + '.decoder')
+            has_decoder = True
+
+        subpackages.append((full_name, has_decoder))
+
+    _DECODER_PACKAGES[package_name] = subpackages
+    return subpackages
+
 
 T_DecodingRules = TypeVar('T_DecodingRules', bound=SupportsAddition)
 T_DecoderInterface = TypeVar('T_DecoderInterface')
@@ -101,6 +144,11 @@ class TransactionDecoder(ABC, Generic[T_Transaction, T_DecodingRules, T_DecoderI
         # Recursively check all submodules to get all decoder address mappings and rules
         self.rules += self._recursively_initialize_decoders(self.chain_modules_root)
         self.undecoded_tx_query_lock = Semaphore()
+        # Decoded events of transactions waiting to be written to the DB as a batch and
+        # the greenlets whose writes are buffered along with their number of decoding runs
+        self.pending_tx_events: list[tuple[list[T_Event], str, int]] = []
+        self.buffering_greenlets: Counter[gevent.Greenlet | greenlet] = Counter()
+        self.base.flush_decoded_events = self._flush_pending_tx_events
 
     @abstractmethod
     def _add_builtin_decoders(self, rules: T_DecodingRules) -> None:
@@ -131,25 +179,16 @@ class TransactionDecoder(ABC, Generic[T_Transaction, T_DecodingRules, T_DecoderI
             package: 'str | ModuleType',
     ) -> T_DecodingRules:
         """Discover decoder modules under `package` and merge their rules.
+        The decoder modules of each package are only discovered once per process.
         May raise:
          - ModuleLoadingError if a decoder is registered more than once
          - ImportError for unexpected import failures while loading submodules
         """
-        if isinstance(package, str):
-            package = importlib.import_module(package)
-
         rules = self._load_default_decoding_rules()
-        for _, name, is_pkg in pkgutil.walk_packages(package.__path__):
-            full_name = package.__name__ + '.' + name
-            if full_name == __name__ or is_pkg is False:
-                continue  # skip
-
-            submodule = None
-            with suppress(ModuleNotFoundError):
-                submodule = importlib.import_module(full_name + '.decoder')
-
-            if submodule is not None:
+        for full_name, has_decoder in discover_decoder_packages(package):
+            if has_decoder:
                 # take module name, transform it and find decoder if exists
+                submodule = importlib.import_module(full_name + '.decoder')
                 class_name = full_name[self.chain_modules_prefix_length:].translate({ord('.'): None})  # noqa: E501
                 parts = class_name.split('_')
                 class_name = ''.join([x.capitalize() for x in parts])
@@ -158,9 +197,8 @@ class TransactionDecoder(ABC, Generic[T_Transaction, T_DecodingRules, T_DecoderI
                 if submodule_decoder:
                     self._add_single_decoder(class_name=class_name, decoder_class=submodule_decoder, rules=rules)  # noqa: E501
 
-            if is_pkg:
-                recursive_results = self._recursively_initialize_decoders(full_name)
-                rules += recursive_results
+            recursive_results = self._recursively_initialize_decoders(full_name)
+            rules += recursive_results
 
         return rules
 
@@ -368,43 +406,50 @@ class TransactionDecoder(ABC, Generic[T_Transaction, T_DecodingRules, T_DecoderI
         refresh_balances, new_events = False, []
         total_transactions = len(tx_hashes)
         log.debug(f'Started logic to decode {total_transactions} transactions from {self.chain_name}')  # noqa: E501
-        for tx_index, tx_hash in enumerate(tx_hashes):
-            log.debug(f'Decoding logic started for {tx_hash!s} ({self.chain_name})')
-            if send_ws_notifications and tx_index % 10 == 0:
-                log.debug(f'Processed {tx_index} out of {total_transactions} transactions from {self.chain_name}')  # noqa: E501
-                self.msg_aggregator.add_message(
-                    message_type=WSMessageType.PROGRESS_UPDATES,
-                    data={
-                        'chain': self.chain_name,
-                        'subtype': str(ProgressUpdateSubType.UNDECODED_TRANSACTIONS),
-                        'total': total_transactions,
-                        'processed': tx_index,
-                    },
-                )
-
-            # TODO: Change this if transaction filter query can accept multiple hashes
-            with self.database.conn.read_ctx() as cursor:
-                context = self._load_transaction_context(
-                    cursor=cursor,
-                    tx_hash=tx_hash,
-                )
+        current_greenlet = gevent.getcurrent()
+        self.buffering_greenlets[current_greenlet] += 1
+        try:
+            for chunk_idx, hashes_chunk in enumerate(get_chunks(tx_hashes, n=DECODING_BATCH_SIZE)):
+                contexts, load_error = self._load_transaction_contexts(tx_hashes=hashes_chunk)
+                for tx_index, (tx_hash, context) in enumerate(zip(hashes_chunk, contexts, strict=False), start=chunk_idx * DECODING_BATCH_SIZE):  # noqa: E501
+                    log.debug(f'Decoding logic started for {tx_hash!s} ({self.chain_name})')
+                    if send_ws_notifications and tx_index % 10 == 0:
+                        log.debug(f'Processed {tx_index} out of {total_transactions} transactions from {self.chain_name}')  # noqa: E501
+                        self.msg_aggregator.add_message(
+                            message_type=WSMessageType.PROGRESS_UPDATES,
+                            data={
+                                'chain': self.chain_name,
+                                'subtype': str(ProgressUpdateSubType.UNDECODED_TRANSACTIONS),
+                                'total': total_transactions,
+                                'processed': tx_index,
+                            },
+                        )
+
+                    fresh_events, new_refresh_balances, reload_decoders = self._decode_transaction_from_context(  # noqa: E501
+                        context=context,
+                        ignore_cache=ignore_cache,
+                        delete_customized=delete_customized,
+                    )
 
-            fresh_events, new_refresh_balances, reload_decoders = self._decode_transaction_from_context(  # noqa: E501
-                context=context,
-                ignore_cache=ignore_cache,
-                delete_customized=delete_customized,
-            )
+                    if events is not None:
+                        events.extend(fresh_events)
 
-            if events is not None:
-                events.extend(fresh_events)
+                    new_events.extend(fresh_events)
+                    if new_refresh_balances is True:
+                        refresh_balances = True
 
-            new_events.extend(fresh_events)
-            if new_refresh_balances is True:
-                refresh_balances = True
+                    if reload_decoders is not None:
+                        # decoders reload their data from the DB, which has to include the
+                        # events decoded so far for the next transactions of the batch
+                        self._flush_pending_tx_events()
+                        with self.database.conn.read_ctx() as cursor:
+                            self.reload_specific_decoders(cursor, decoders=reload_decoders)
 
-            if reload_decoders is not None:
-                with self.database.conn.read_ctx() as cursor:
-                    self.reload_specific_decoders(cursor, decoders=reload_decoders)
+                if load_error is not None:
+                    raise load_error
+        finally:  # write what has been decoded even if decoding stopped with an error
+            self.buffering_greenlets -= Counter({current_greenlet: 1})
+            self._flush_pending_tx_events()
 
         if send_ws_notifications:
             self.msg_aggregator.add_message(
@@ -419,6 +464,25 @@ class TransactionDecoder(ABC, Generic[T_Transaction, T_DecodingRules, T_DecoderI
 
         return refresh_balances, new_events
 
+    def _load_transaction_contexts(
+            self,
+            tx_hashes: Sequence[T_TxHash],
+    ) -> tuple[list[T_TransactionDecodingContext], InputError | RemoteError | DeserializationError | None]:  # noqa: E501
+        """Load the decoding contexts of the given transactions using a single DB cursor.
+
+        If the context of a transaction can't be loaded, the contexts loaded up to it are
+        returned along with the error so that the caller can decode them before raising it.
+        """
+        contexts: list[T_TransactionDecodingContext] = []
+        with self.database.conn.read_ctx() as cursor:
+            for tx_hash in tx_hashes:
+                try:
+                    contexts.append(self._load_transaction_context(cursor=cursor, tx_hash=tx_hash))
+                except (InputError, RemoteError, DeserializationError) as e:
+                    return contexts, e
+
+        return contexts, None
+
     def _write_new_tx_events_to_the_db(
             self,
             events: list[T_Event],
@@ -430,26 +494,90 @@ class TransactionDecoder(ABC, Generic[T_Transaction, T_DecodingRules, T_DecoderI
         `action_id` uniquely identifies the tx (for example, chain id + tx hash for EVM txs)
         which is added to the ignored_action_ids if there are no events.
         `db_id` is the id of the transaction in the DB, used in the tx mappings table.
+
+        While transactions are decoded in batches the events are only buffered here and
+        are written together with the events of the other transactions of the batch.
         """
+        if gevent.getcurrent() in self.buffering_greenlets:
+            self.pending_tx_events.append((events, action_id, db_id))
+            if len(self.pending_tx_events) >= DECODING_BATCH_SIZE:
+                self._flush_pending_tx_events()
+            return
+
         with self.database.user_write() as write_cursor:
-            if len(events) > 0:
-                self.dbevents.add_history_events(
+            self._write_tx_events(
+                write_cursor=write_cursor,
+                events=events,
+                action_id=action_id,
+                db_id=db_id,
+            )
+
+    def _write_tx_events(
+            self,
+            write_cursor: 'DBCursor',
+            events: list[T_Event],
+            action_id: str,
+            db_id: int,
+    ) -> None:
+        """Writes the events of a single tx and sets the decoded flag in the same transaction
+        so that a tx is never marked as decoded without its events."""
+        if len(events) > 0:
+            self.dbevents.add_history_events(
+                write_cursor=write_cursor,
+                history=events,
+            )
+        else:
+            # This is probably a phishing zero value token transfer tx.
+            # Details here: https://github.com/rotki/rotki/issues/5749
+            with suppress(InputError):  # We don't care if it's already in the DB
+                self.database.add_to_ignored_action_ids(
                     write_cursor=write_cursor,
-                    history=events,
+                    identifiers=[action_id],
                 )
-            else:
-                # This is probably a phishing zero value token transfer tx.
-                # Details here: https://github.com/rotki/rotki/issues/5749
-                with suppress(InputError):  # We don't care if it's already in the DB
-                    self.database.add_to_ignored_action_ids(
+
+        write_cursor.execute(
+            f'INSERT OR IGNORE INTO {self.tx_mappings_table}(tx_id, value) VALUES(?, ?)',
+            (db_id, TX_DECODED),
+        )
+
+    def _flush_pending_tx_events(self) -> None:
+        """Write the events of all the buffered decoded transactions in a single DB transaction.
+
+        If that fails they are written again one transaction at a time so that only the events
+        of the failing transaction are lost. That transaction stays undecoded.
+        """
+        if len(self.pending_tx_events) == 0:
+            return
+
+        pending, self.pending_tx_events = self.pending_tx_events, []
+        try:
+            with self.database.user_write() as write_cursor:
+                for events, action_id, db_id in pending:
+                    self._write_tx_events(
                         write_cursor=write_cursor,
-                        identifiers=[action_id],
+                        events=events,
+                        action_id=action_id,
+                        db_id=db_id,
                     )
-
-            write_cursor.execute(
-                f'INSERT OR IGNORE INTO {self.tx_mappings_table}(tx_id, value) VALUES(?, ?)',
-                (db_id, TX_DECODED),
+        except (sqlcipher.IntegrityError, DeserializationError) as e:  # pylint: disable=no-member
+            log.warning(
+                f'Failed to write the events of {len(pending)} decoded {self.chain_name} '
+                f'transactions together due to {e!s}. Writing them one by one',
             )
+            for events, action_id, db_id in pending:
+                try:
+                    with self.database.user_write() as write_cursor:
+                        self._write_tx_events(
+                            write_cursor=write_cursor,
+                            events=events,
+                            action_id=action_id,
+                            db_id=db_id,
+                        )
+                except (sqlcipher.IntegrityError, DeserializationError) as tx_error:  # pylint: disable=no-member
+                    log.error(
+                        f'Failed to write the decoded events of {self.chain_name} '
+                        f'transaction {action_id} due to {tx_error!s}. Skipping it',
+                    )
 
     def _process_swaps(
             self,
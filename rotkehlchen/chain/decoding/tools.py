@@ -41,6 +41,9 @@ class BaseDecoderTools(ABC, Generic[T, A, R, E]):
             self.tracked_accounts = self.database.get_blockchain_accounts(cursor)
         self.sequence_counter = 0
         self.sequence_offset = 0
+        # Writes any decoded events that are buffered by the transaction decoder to the DB.
+        # Decoders should call it before reading events of other transactions from the DB.
+        self.flush_decoded_events: Callable[[], None] = lambda: None
 
     def reset_sequence_counter(self, tx_data: T) -> None:
         """Reset the sequence index counter before decoding a transaction.
@@ -15,6 +15,7 @@ from rotkehlchen.chain.evm.decoding.structures import (
     ActionItem,
     EvmDecodingOutput,
 )
+from rotkehlchen.chain.evm.decoding.utils import event_rule_topics
 from rotkehlchen.chain.evm.structures import EvmTxReceiptLog
 from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.constants.assets import A_1INCH, A_ETH, A_GTC
@@ -91,6 +92,7 @@ class EthereumTransactionDecoder(EVMTransactionDecoderWithDSProxy):
             beacon_chain=beacon_chain,
         )
 
+    @event_rule_topics(AIRDROP_CLAIM, MERKLE_CLAIM)
     def _maybe_enrich_transfers(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
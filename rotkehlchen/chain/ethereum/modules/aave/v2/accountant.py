@@ -1,8 +1,9 @@
 from collections import defaultdict
 from collections.abc import Iterator
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
+from rotkehlchen.assets.asset import Asset
 from rotkehlchen.chain.evm.accounting.interfaces import ModuleAccountantInterface
 from rotkehlchen.chain.evm.accounting.structures import EventsAccountantCallback
 from rotkehlchen.chain.evm.decoding.aave.constants import CPT_AAVE_V2
@@ -14,7 +15,6 @@ from rotkehlchen.history.events.structures.types import HistoryEventSubType, His
 
 if TYPE_CHECKING:
     from rotkehlchen.accounting.pot import AccountingPot
-    from rotkehlchen.assets.asset import Asset
     from rotkehlchen.history.events.structures.evm_event import EvmEvent
     from rotkehlchen.types import ChecksumEvmAddress
 
@@ -25,6 +25,21 @@ class Aavev2Accountant(ModuleAccountantInterface):
         self.assets_borrowed: dict[tuple[ChecksumEvmAddress, Asset], FVal] = defaultdict(FVal)
         self.assets_supplied: dict[tuple[ChecksumEvmAddress, Asset], FVal] = defaultdict(FVal)
 
+    def serialize_state(self) -> dict[str, Any]:
+        return {
+            name: [(address, asset.identifier, str(amount)) for (address, asset), amount in balances.items()]  # noqa: E501
+            for name, balances in (
+                ('assets_borrowed', self.assets_borrowed),
+                ('assets_supplied', self.assets_supplied),
+            )
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        for address, identifier, amount in data['assets_borrowed']:
+            self.assets_borrowed[string_to_evm_address(address), Asset(identifier)] = FVal(amount)
+        for address, identifier, amount in data['assets_supplied']:
+            self.assets_supplied[string_to_evm_address(address), Asset(identifier)] = FVal(amount)
+
     def _process_borrow(
             self,
             pot: 'AccountingPot',  # pylint: disable=unused-argument
@@ -327,6 +327,7 @@ class EigenlayerDecoder(CliqueAirdropDecoderInterface, ReloadableDecoderMixin):
             event_subtypes=[HistoryEventSubType.REMOVE_ASSET],
         )
         dbevents = DBHistoryEvents(self.base.database)
+        self.base.flush_decoded_events()  # the queued withdrawal may be in the same batch
         with self.base.database.conn.read_ctx() as cursor:
             events = dbevents.get_history_events_internal(
                 cursor=cursor,
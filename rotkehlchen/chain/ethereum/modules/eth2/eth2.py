@@ -774,6 +774,11 @@ class Eth2(EthereumModule):
            if the fee recipient is the newly added address and vice versa if the fee recipient
            is the removed address then turn to informational."""
         with self.database.user_write() as write_cursor:
+            DBHistoryEvents.mark_balances_stale(
+                write_cursor=write_cursor,
+                where_str='WHERE entry_type=? AND sequence_index=0 AND location_label=?',
+                bindings=(HistoryBaseEntryType.ETH_BLOCK_EVENT.serialize_for_db(), address),
+            )
             write_cursor.execute(
                 'UPDATE history_events SET type=? WHERE entry_type=? AND sequence_index=0 AND location_label=?',  # noqa: E501
                 (
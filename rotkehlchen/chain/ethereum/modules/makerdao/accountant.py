@@ -1,6 +1,6 @@
 from collections import defaultdict
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.chain.evm.accounting.interfaces import ModuleAccountantInterface
@@ -25,6 +25,16 @@ class MakerdaoAccountant(ModuleAccountantInterface):
         self.vault_balances: dict[str, FVal] = defaultdict(FVal)
         self.dsr_balances: dict[ChecksumEvmAddress, FVal] = defaultdict(FVal)
 
+    def serialize_state(self) -> dict[str, Any]:
+        return {
+            'vault_balances': {k: str(v) for k, v in self.vault_balances.items()},
+            'dsr_balances': {k: str(v) for k, v in self.dsr_balances.items()},
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        self.vault_balances.update({k: FVal(v) for k, v in data['vault_balances'].items()})
+        self.dsr_balances.update({k: FVal(v) for k, v in data['dsr_balances'].items()})
+
     def _process_vault_dai_generation(
             self,
             pot: 'AccountingPot',  # pylint: disable=unused-argument
@@ -1,6 +1,6 @@
 from collections import defaultdict
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.chain.evm.accounting.interfaces import ModuleAccountantInterface
@@ -21,6 +21,12 @@ class ThegraphAccountant(ModuleAccountantInterface):
     def reset(self) -> None:
         self.assets_supplied: dict[ChecksumEvmAddress, FVal] = defaultdict(FVal)
 
+    def serialize_state(self) -> dict[str, Any]:
+        return {'assets_supplied': {k: str(v) for k, v in self.assets_supplied.items()}}
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        self.assets_supplied.update({k: FVal(v) for k, v in data['assets_supplied'].items()})
+
     def _process_deposit(
             self,
             pot: 'AccountingPot',  # pylint: disable=unused-argument
@@ -41,6 +41,8 @@ log = RotkehlchenLogsAdapter(logger)
 
 ENS_METADATA_URL = 'https://metadata.ens.domains/mainnet'
 MULTICALL_CHUNKS = 20
+# Number of multicall chunks that are queried at the same time
+MULTICALL_CONCURRENCY = 4
 
 
 def token_normalized_value_decimals(token_amount: int, token_decimals: int | None) -> FVal:
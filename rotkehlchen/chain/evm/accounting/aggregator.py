@@ -3,7 +3,7 @@ import logging
 import pkgutil
 from contextlib import suppress
 from types import ModuleType
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.errors.misc import ModuleLoadingError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
@@ -94,6 +94,19 @@ class EVMAccountingAggregator:
         for accountant in self.accountants.values():
             accountant.reset()
 
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the state of the submodule accountants that keep any"""
+        return {
+            name: state for name, accountant in self.accountants.items()
+            if len(state := accountant.serialize_state()) != 0
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore the state of the submodule accountants saved by serialize_state()"""
+        for name, state in data.items():
+            if (accountant := self.accountants.get(name)) is not None:
+                accountant.restore_state(state)
+
 
 class EVMAccountingAggregators:
     """
@@ -120,3 +133,16 @@ class EVMAccountingAggregators:
         """Reset the state of all initialized submodule accountants"""
         for aggregator in self.aggregators:
             aggregator.reset()
+
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the state of the accountants of all chains, keyed by chain name"""
+        return {
+            aggregator.node_inquirer.chain_name: state for aggregator in self.aggregators
+            if len(state := aggregator.serialize_state()) != 0
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore the state of the accountants of all chains saved by serialize_state()"""
+        for aggregator in self.aggregators:
+            if (state := data.get(aggregator.node_inquirer.chain_name)) is not None:
+                aggregator.restore_state(state)
@@ -1,6 +1,6 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 
@@ -46,3 +46,12 @@ class ModuleAccountantInterface(ABC):
     def reset(self) -> None:
         """Subclasses may implement this to reset state between accounting runs"""
         return None
+
+    def serialize_state(self) -> dict[str, Any]:
+        """Subclasses that keep state between events implement this so that the
+        state can be saved in a PnL checkpoint"""
+        return {}
+
+    def restore_state(self, data: dict[str, Any]) -> None:  # pylint: disable=unused-argument
+        """Restore the state saved by serialize_state(). Called right after reset()"""
+        return None
@@ -90,7 +90,7 @@ from .structures import (
     EvmDecodingOutput,
     TransferEnrichmentOutput,
 )
-from .utils import maybe_reshuffle_events
+from .utils import event_rule_topics, maybe_reshuffle_events
 
 if TYPE_CHECKING:
     from rotkehlchen.assets.asset import AssetWithOracles, EvmToken
@@ -158,6 +158,29 @@ class EvmDecodingRules:
             addresses_to_counterparties=self.addresses_to_counterparties | other.addresses_to_counterparties,  # noqa: E501
         )
 
+    def index_event_rules(self) -> tuple[dict[bytes, list[EventDecoderFunction]], list[EventDecoderFunction]]:  # noqa: E501
+        """Index the event rules by the topic0 values they declare via event_rule_topics.
+
+        Returns a mapping of each declared topic to the rules to try for logs with that topic
+        and the list of rules to try for logs with any other topic. Rules that declare no
+        topics are part of all lists and the original order of the rules is kept in each.
+        """
+        rules_by_topic: dict[bytes, list[EventDecoderFunction]] = {
+            topic: [] for rule in self.event_rules
+            for topic in getattr(rule, 'event_rule_topics', ())
+        }
+        fallback_rules: list[EventDecoderFunction] = []
+        for rule in self.event_rules:
+            if (rule_topics := getattr(rule, 'event_rule_topics', None)) is None:
+                fallback_rules.append(rule)
+                for topic_rules in rules_by_topic.values():
+                    topic_rules.append(rule)
+            else:
+                for topic in set(rule_topics):
+                    rules_by_topic[topic].append(rule)
+
+        return rules_by_topic, fallback_rules
+
 
 class EvmTransactionContext(NamedTuple):
     transaction: EvmTransaction
@@ -229,6 +252,8 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
             misc_counterparties=misc_counterparties,
             possible_decoding_exceptions=(NotERC721Conformant, NotERC20Conformant, Web3Exception),
         )
+        # event rules to try for each log topic0. Built once all decoders are initialized
+        self.event_rules_by_topic, self.fallback_event_rules = self.rules.index_event_rules()
 
     def _add_builtin_decoders(self, rules: EvmDecodingRules) -> None:
         """Adds decoders that should be built-in for every EVM decoding run
@@ -408,10 +433,10 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
         Execute event rules for the current tx log. Returns None when no
         new event or actions need to be propagated.
         """
-        for rule in self.rules.event_rules:
-            if len(tx_log.topics) == 0:
-                continue  # ignore anonymous events
+        if len(tx_log.topics) == 0:
+            return None  # ignore anonymous events
 
+        for rule in self.event_rules_by_topic.get(tx_log.topics[0], self.fallback_event_rules):
             decoding_output, err = decode_safely(
                 handled_exceptions=self.possible_decoding_exceptions,
                 msg_aggregator=self.msg_aggregator,
@@ -863,6 +888,7 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
             log.debug(f'Failed to decode token with address {tx_log.address} due to inability to match token type')  # noqa: E501
             return None
 
+    @event_rule_topics(ERC20_OR_ERC721_APPROVE)
     def _maybe_decode_erc20_approve(
             self,
             token: 'EvmToken | None',
@@ -1026,6 +1052,7 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
             events.append(eth_event)
         return events
 
+    @event_rule_topics(ERC20_OR_ERC721_TRANSFER)
     def _maybe_decode_erc20_721_transfer(
             self,
             token: 'EvmToken | None',
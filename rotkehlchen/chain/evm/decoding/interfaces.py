@@ -95,7 +95,8 @@ class EvmDecoderInterface(DecoderInterface['ChecksumEvmAddress', 'EvmNodeInquire
     def decoding_rules(self) -> list[Callable]:
         """
         Subclasses may implement this to add new generic decoding rules to be attempted
-        by the decoding process
+        by the decoding process. Rules should declare the topics of the logs they decode
+        with the event_rule_topics decorator so that they are only tried for these logs.
         """
         return []
 
@@ -16,6 +16,7 @@ from rotkehlchen.chain.evm.decoding.uniswap.v2.utils import (
     decode_uniswap_like_deposit_and_withdrawals,
     decode_uniswap_v2_like_swap,
 )
+from rotkehlchen.chain.evm.decoding.utils import event_rule_topics
 from rotkehlchen.chain.evm.structures import EvmTxReceiptLog
 from rotkehlchen.constants import ZERO
 from rotkehlchen.types import EvmTransaction
@@ -79,6 +80,7 @@ class Uniswapv2CommonDecoder(EvmDecoderInterface):
             native_currency=self.node_inquirer.native_token,
         )
 
+    @event_rule_topics(UNISWAP_V2_SWAP_SIGNATURE)
     def _maybe_decode_v2_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -110,6 +112,7 @@ class Uniswapv2CommonDecoder(EvmDecoderInterface):
 
         return DEFAULT_EVM_DECODING_OUTPUT
 
+    @event_rule_topics(MINT_TOPIC, BURN_TOPIC)
     def _maybe_decode_v2_liquidity_addition_and_removal(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -34,6 +34,7 @@ from rotkehlchen.chain.evm.decoding.uniswap.v3.constants import (
 from rotkehlchen.chain.evm.decoding.uniswap.v3.utils import (
     decode_uniswap_v3_like_deposit_or_withdrawal,
 )
+from rotkehlchen.chain.evm.decoding.utils import event_rule_topics
 from rotkehlchen.chain.evm.structures import EvmTxReceiptLog, SwapData
 from rotkehlchen.constants import ZERO
 from rotkehlchen.errors.misc import RemoteError
@@ -181,6 +182,7 @@ class Uniswapv3CommonDecoder(EvmDecoderInterface):
             evm_inquirer=self.node_inquirer,
         )
 
+    @event_rule_topics(SWAP_SIGNATURE)
     def _maybe_decode_v3_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
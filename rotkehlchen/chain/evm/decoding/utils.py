@@ -1,6 +1,6 @@
 import logging
 from collections.abc import Callable, Iterable, Sequence
-from typing import TYPE_CHECKING, Any, Literal, Optional, overload
+from typing import TYPE_CHECKING, Any, Literal, Optional, TypeVar, overload
 
 from eth_typing import ABI
 
@@ -40,6 +40,21 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+T_EventRule = TypeVar('T_EventRule', bound=Callable)
+
+
+def event_rule_topics(*topics: bytes) -> Callable[[T_EventRule], T_EventRule]:
+    """Decorator to declare the topic0 values of the logs that an event rule decodes.
+
+    Event rules declaring their topics are only tried for logs with one of these topics.
+    Rules without declared topics are tried for all logs.
+    """
+    def decorator(func: T_EventRule) -> T_EventRule:
+        func.event_rule_topics = topics  # type: ignore[attr-defined]
+        return func
+
+    return decorator
+
 
 @overload
 def maybe_reshuffle_events(
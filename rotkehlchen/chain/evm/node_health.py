@@ -0,0 +1,191 @@
+"""Health of the RPC nodes queried by the evm node inquirers.
+
+Each node keeps an exponentially weighted moving average (EWMA) of the latency of its
+responses and of its error rate, which give it a score. The nodes of a call order are
+queried starting from the one with the best score. A node that keeps failing has its
+circuit breaker opened and is not queried until a cooldown passes. Then a single query is
+let through and depending on its outcome the breaker closes or opens again for a longer
+cooldown.
+"""
+import logging
+import time
+from collections import deque
+from collections.abc import Sequence
+from typing import Any, Final
+
+from rotkehlchen.chain.ethereum.constants import ETHEREUM_ETHERSCAN_NODE_NAME
+from rotkehlchen.chain.evm.types import WeightedNode
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Weight of the latest response in the moving averages
+NODE_HEALTH_EWMA_ALPHA: Final = 0.2
+# Latency in seconds assumed for nodes that have not been queried yet. Nodes known to be
+# faster are queried before them and nodes known to be slower after them.
+DEFAULT_NODE_LATENCY: Final = 1.0
+# Seconds of latency added to the score of a node for each unit of its error rate
+NODE_ERROR_RATE_PENALTY: Final = 10.0
+CIRCUIT_BREAKER_FAILURES: Final = 3
+CIRCUIT_BREAKER_COOLDOWN: Final = 60.0
+CIRCUIT_BREAKER_MAX_COOLDOWN: Final = 3600.0
+# Latencies kept per node for the percentile used as the delay of hedged requests
+NODE_LATENCY_SAMPLES: Final = 100
+HEDGE_MIN_SAMPLES: Final = 10
+HEDGE_PERCENTILE: Final = 0.95
+DEFAULT_HEDGE_DELAY: Final = 2.0
+MIN_HEDGE_DELAY: Final = 0.05
+
+
+class NodeHealth:
+    """Latency and error statistics of a node along with the state of its circuit breaker.
+    Times are monotonic seconds."""
+
+    def __init__(self, has_circuit_breaker: bool = True) -> None:
+        self.has_circuit_breaker = has_circuit_breaker
+        self.latency = DEFAULT_NODE_LATENCY
+        self.error_rate = 0.0
+        self.latencies: deque[float] = deque(maxlen=NODE_LATENCY_SAMPLES)
+        self.queries = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.cooldown = CIRCUIT_BREAKER_COOLDOWN
+        self.open_until: float | None = None
+        self.trial_in_flight = False
+        self.in_flight = 0
+
+    @property
+    def score(self) -> float:
+        """The lower the better. Queries in flight raise it so that concurrent queries
+        are spread to other nodes once the latency of this one is expected to grow."""
+        return self.latency * (1 + self.in_flight) + self.error_rate * NODE_ERROR_RATE_PENALTY
+
+    def is_available(self, now: float) -> bool:
+        """Closed breakers let all queries through. Open ones let a single trial query
+        through after their cooldown."""
+        return self.open_until is None or (now >= self.open_until and not self.trial_in_flight)
+
+    def hedge_delay(self) -> float:
+        """Seconds after which a query to this node should be hedged"""
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+
+        latencies = sorted(self.latencies)
+        return max(latencies[int(HEDGE_PERCENTILE * (len(latencies) - 1))], MIN_HEDGE_DELAY)
+
+    def _update_latency(self, latency: float | None) -> None:
+        if latency is None:
+            return
+
+        self.latencies.append(latency)
+        if len(self.latencies) == 1:  # first response replaces the default latency
+            self.latency = latency
+        else:
+            self.latency += NODE_HEALTH_EWMA_ALPHA * (latency - self.latency)
+
+    def record_success(self, latency: float | None) -> bool:
+        """Returns True if the node recovered from an open circuit breaker"""
+        self.queries += 1
+        self._update_latency(latency)
+        self.error_rate *= 1 - NODE_HEALTH_EWMA_ALPHA
+        self.consecutive_failures = 0
+        if self.open_until is None:
+            return False
+
+        self.open_until = None
+        self.cooldown = CIRCUIT_BREAKER_COOLDOWN
+        return True
+
+    def record_failure(self, latency: float | None, open_circuit: bool) -> bool:
+        """Returns True if the circuit breaker of the node opened"""
+        self.queries += 1
+        self.failures += 1
+        self._update_latency(latency)
+        self.error_rate += NODE_HEALTH_EWMA_ALPHA * (1 - self.error_rate)
+        self.consecutive_failures += 1
+        if self.trial_in_flight:  # still failing after the cooldown
+            self.cooldown = min(self.cooldown * 2, CIRCUIT_BREAKER_MAX_COOLDOWN)
+        elif self.has_circuit_breaker is False or (
+            open_circuit is False and self.consecutive_failures < CIRCUIT_BREAKER_FAILURES
+        ):
+            return False
+
+        self.open_until = time.monotonic() + self.cooldown
+        return True
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            'latency': self.latency,
+            'error_rate': self.error_rate,
+            'queries': self.queries,
+            'failures': self.failures,
+            'in_flight': self.in_flight,
+            'circuit_open_for': max(self.open_until - time.monotonic(), 0.0) if self.open_until is not None else None,  # noqa: E501
+        }
+
+
+class NodesHealth:
+    """Health of the nodes of a chain by node name"""
+
+    def __init__(self, chain_name: str) -> None:
+        self.chain_name = chain_name
+        self.nodes: dict[str, NodeHealth] = {}
+
+    def get(self, name: str) -> NodeHealth:
+        if (health := self.nodes.get(name)) is None:
+            # etherscan is the last resort for most queries and is paced by the rate limiter
+            health = self.nodes[name] = NodeHealth(has_circuit_breaker=name != ETHEREUM_ETHERSCAN_NODE_NAME)  # noqa: E501
+        return health
+
+    def order(self, call_order: Sequence[WeightedNode]) -> list[WeightedNode]:
+        """Sort the nodes of the call order by their score. Owned nodes and etherscan keep
+        their position since they are put there on purpose, the former to always be
+        preferred and the latter to minimize etherscan queries."""
+        ordered = list(call_order)
+        positions = [
+            idx for idx, node in enumerate(ordered)
+            if node.node_info.owned is False and node.node_info.name != ETHEREUM_ETHERSCAN_NODE_NAME  # noqa: E501
+        ]
+        by_score = sorted((ordered[idx] for idx in positions), key=lambda x: self.get(x.node_info.name).score)  # noqa: E501
+        for idx, node in zip(positions, by_score, strict=True):
+            ordered[idx] = node
+
+        return ordered
+
+    def is_available(self, name: str) -> bool:
+        return self.get(name).is_available(time.monotonic())
+
+    def start_query(self, name: str) -> None:
+        """Called right before querying the node. If its breaker is open this is the trial
+        query and no other query is let through until it finishes."""
+        health = self.get(name)
+        health.in_flight += 1
+        if health.open_until is not None:
+            health.trial_in_flight = True
+
+    def finish_query(self, name: str) -> None:
+        """Called after the query to the node finished, even if it was killed. The
+        outcome of the query should be recorded before calling this."""
+        health = self.get(name)
+        health.in_flight -= 1
+        health.trial_in_flight = False
+
+    def record_success(self, name: str, latency: float | None) -> None:
+        if self.get(name).record_success(latency):
+            log.info(f'{self.chain_name} node {name} recovered. Querying it again.')
+
+    def record_failure(self, name: str, latency: float | None, open_circuit: bool = False) -> None:
+        """Record a failed query. If open_circuit is True the circuit breaker opens right
+        away instead of after a few consecutive failures."""
+        if (health := self.get(name)).record_failure(latency, open_circuit):
+            log.warning(
+                f'{self.chain_name} node {name} failed {health.consecutive_failures} '
+                f'consecutive times. Skipping it for the next {health.cooldown} seconds.',
+            )
+
+    def hedge_delay(self, name: str) -> float:
+        return self.get(name).hedge_delay()
+
+    def serialize(self) -> dict[str, dict[str, Any]]:
+        return {name: health.serialize() for name, health in self.nodes.items()}
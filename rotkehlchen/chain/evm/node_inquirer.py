@@ -1,15 +1,21 @@
 import itertools
 import json
 import logging
+import time
 from collections import defaultdict
 from collections.abc import Callable, Iterator, Sequence
+from functools import partial
 from itertools import zip_longest
 from typing import TYPE_CHECKING, Any, Literal, TypeVar, overload
 
+import gevent
 import requests
 from eth_abi.exceptions import DecodingError
 from eth_typing.abi import ABI
 from eth_utils.abi import get_abi_output_types
+from gevent import Greenlet
+from gevent.event import AsyncResult
+from gevent.queue import Empty, Queue
 from web3 import Web3
 from web3._utils.contracts import find_matching_event_abi
 from web3._utils.filters import construct_event_filter_params
@@ -24,7 +30,11 @@ from rotkehlchen.chain.ethereum.constants import (
     ETHEREUM_ETHERSCAN_NODE_NAME,
 )
 from rotkehlchen.chain.ethereum.types import LogIterationCallback
-from rotkehlchen.chain.ethereum.utils import MULTICALL_CHUNKS, should_update_protocol_cache
+from rotkehlchen.chain.ethereum.utils import (
+    MULTICALL_CHUNKS,
+    MULTICALL_CONCURRENCY,
+    should_update_protocol_cache,
+)
 from rotkehlchen.chain.evm.constants import (
     DEFAULT_TOKEN_DECIMALS,
     ERC20_PROPERTIES,
@@ -35,8 +45,14 @@ from rotkehlchen.chain.evm.constants import (
 )
 from rotkehlchen.chain.evm.contracts import EvmContract, EvmContracts
 from rotkehlchen.chain.evm.l2_with_l1_fees.types import L2_CHAINIDS_WITH_L1_FEES
+from rotkehlchen.chain.evm.node_health import NodesHealth
 from rotkehlchen.chain.evm.proxies_inquirer import EvmProxiesInquirer
-from rotkehlchen.chain.evm.types import EvmIndexer, RemoteDataQueryStatus, WeightedNode
+from rotkehlchen.chain.evm.types import (
+    EvmIndexer,
+    NodeName,
+    RemoteDataQueryStatus,
+    WeightedNode,
+)
 from rotkehlchen.chain.mixins.rpc_nodes import EVMRPCMixin
 from rotkehlchen.chain.structures import TimestampOrBlockRange
 from rotkehlchen.constants import ONE
@@ -46,6 +62,7 @@ from rotkehlchen.errors.misc import (
     ChainNotSupported,
     EventNotInABI,
     NoAvailableIndexers,
+    NodeQueryError,
     NotERC20Conformant,
     NotERC721Conformant,
     RemoteError,
@@ -57,6 +74,7 @@ from rotkehlchen.externalapis.etherscan_like import EtherscanLikeApi
 from rotkehlchen.externalapis.routescan import Routescan
 from rotkehlchen.fval import FVal
 from rotkehlchen.greenlets.manager import GreenletManager
+from rotkehlchen.greenlets.utils import run_concurrently
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import (
     deserialize_evm_address,
@@ -96,6 +114,17 @@ def _connect_task_prefix(chain_name: str) -> str:
 
 
 WEB3_LOGQUERY_BLOCK_RANGE = 250000
+# Result of calls that another greenlet was going to query for a multicall but didn't
+_MULTICALL_NOT_QUERIED = object()
+# parts of the node errors for multicalls that may succeed if split in smaller ones
+MULTICALL_SPLIT_ERRORS = (
+    'gas',  # out of gas, gas required exceeds allowance or the block gas limit
+    'too large',
+    'too big',
+    'size',  # response size exceeded
+    'limit exceeded',
+    'timeout',
+)
 MAX_NODE_LOG_QUERY_CALLS = 500  # max queries for a node that can query logs from up to 1000/10_000 blocks  # noqa: E501
 
 
@@ -208,6 +237,9 @@ class EvmNodeInquirer(EVMRPCMixin, LockableQueryMixIn):
         '_get_transaction_by_hash',
         '_get_logs',
     )
+    # Log queries are long and call their iteration callback as they go, so they are
+    # not raced against other nodes
+    methods_not_to_hedge = ('_get_logs',)
 
     def __init__(
             self,
@@ -254,8 +286,11 @@ class EvmNodeInquirer(EVMRPCMixin, LockableQueryMixIn):
         self.contract_info_erc721_cache: LRUCacheWithRemove[ChecksumEvmAddress, dict[str, Any]] = LRUCacheWithRemove(maxsize=512)  # noqa: E501
         # cache used by is_safe_proxy_or_eoa
         self._known_accounts_cache: LRUCacheWithRemove[ChecksumEvmAddress, bool] = LRUCacheWithRemove(maxsize=50)  # noqa: E501
+        # multicall calls being queried by method, require_success, block and call
+        self._multicalls_in_flight: dict[tuple[Any, ...], AsyncResult] = {}
         LockableQueryMixIn.__init__(self)
         EVMRPCMixin.__init__(self)
+        self.nodes_health = NodesHealth(chain_name=self.chain_name)
         # Log the available nodes so we have extra information when debugging connection errors.
         nodes = '\n'.join([str(x.serialize()) for x in self.default_call_order()])  # variable because \ is not valid in f-strings  # noqa: E501
         log.debug(f'RPC nodes at startup {nodes}')
@@ -331,27 +366,38 @@ class EvmNodeInquirer(EVMRPCMixin, LockableQueryMixIn):
             web3=web3,
         ) == expected_balance
 
-    def _query(self, method: Callable, call_order: Sequence[WeightedNode], **kwargs: Any) -> Any:
-        """Queries evm related data by performing a query of the provided method to all given nodes
-
-        The first node in the call order that gets a successful response returns.
-        If none get a result then RemoteError is raised
-        """
-        for node_idx, weighted_node in enumerate(call_order):
+    def _iterate_query_nodes(
+            self,
+            method: Callable,
+            call_order: Sequence[WeightedNode],
+            kwargs: dict[str, Any],
+    ) -> Iterator[tuple[int, NodeName, Web3 | None]]:
+        """Yield the position, info and client of each node of the call order that can be
+        queried for the given method, sorted by the health of the nodes. Nodes are
+        connected to only when they are reached."""
+        for node_idx, weighted_node in enumerate(self.nodes_health.order(call_order)):
             node_info = weighted_node.node_info
-            if (rpc_node := self.rpc_mapping.get(node_info, None)) is None:
-                if node_info.name in self.failed_to_connect_nodes:
-                    continue
-
-                if node_info.name != ETHEREUM_ETHERSCAN_NODE_NAME:
-                    success, _ = self.attempt_connect(node=node_info)
-                    if success is False:
+            if not self.nodes_health.is_available(node_info.name):
+                continue  # circuit breaker is open
+
+            if (
+                (rpc_node := self.rpc_mapping.get(node_info, None)) is None and
+                node_info.name != ETHEREUM_ETHERSCAN_NODE_NAME
+            ):
+                self.nodes_health.start_query(node_info.name)
+                try:
+                    if (success := self.attempt_connect(node=node_info)[0]) is False:
                         self.failed_to_connect_nodes.add(node_info.name)
-                        continue
+                        self.nodes_health.record_failure(node_info.name, latency=None, open_circuit=True)  # noqa: E501
+                finally:
+                    self.nodes_health.finish_query(node_info.name)
+
+                if success is False:
+                    continue
 
-                    if (rpc_node := self.rpc_mapping.get(node_info, None)) is None:
-                        log.error(f'Unexpected missing node {node_info} at {self.chain_id}')
-                        continue
+                if (rpc_node := self.rpc_mapping.get(node_info, None)) is None:
+                    log.error(f'Unexpected missing node {node_info} at {self.chain_id}')
+                    continue
 
             if rpc_node is not None and ((
                 method.__name__ in self.methods_that_query_past_data and
@@ -364,50 +410,209 @@ class EvmNodeInquirer(EVMRPCMixin, LockableQueryMixIn):
                 # this query should be routed to an archive node
                 continue
 
-            try:
-                web3 = rpc_node.rpc_client if rpc_node is not None else None
-                result = method(web3, **kwargs)
-            except TransactionNotFound:
-                if kwargs.get('must_exist', False) is True:
-                    continue  # try other nodes, as transaction has to exist
-                return None
-            except InvalidAddress as e:
-                raise RemoteError(  # no need to try other nodes since its not a node problem.
-                    f'Failed to query {node_info.name} for {method!s}: '
-                    f'non-checksum address {e.args[1]}',
-                ) from e
-            except requests.Timeout as e:  # Add node to failed_to_connect_nodes to prevent repeatedly timing out on the same node.  # noqa: E501
-                log.warning(
-                    f'Timed out while querying {node_info.name} for '
-                    f'{method.__name__}: {e!s}. Skipping this node in future queries.',
-                )
-                self.failed_to_connect_nodes.add(node_info.name)
-                self.rpc_mapping.pop(node_info, None)
-                continue
-            except (
-                    RemoteError,
-                    requests.exceptions.RequestException,
-                    BlockchainQueryError,
-                    Web3Exception,
-                    TypeError,  # happened at the web3 level calling `apply_result_formatters` when the RPC node returned `None` in the response's result # noqa: E501
-                    ValueError,  # not removing yet due to possibility of raising from missing trie error  # noqa: E501
-                    AttributeError,  # happened at the web3 level when response is a string instead of dict # noqa: E501
-                    json.JSONDecodeError,  # happens when RPC returns empty or invalid JSON responses # noqa: E501
+            yield node_idx, node_info, rpc_node.rpc_client if rpc_node is not None else None
+
+    def _query_node(
+            self,
+            method: Callable,
+            node_idx: int,
+            node_info: NodeName,
+            web3: Web3 | None,
+            kwargs: dict[str, Any],
+    ) -> tuple[bool, Any]:
+        """Query the given node and record how it went in its health.
+
+        Returns True and the result if the node answered. Otherwise False, meaning that
+        the next node should be queried, and the error the node responded with for the
+        query itself or None if it did not respond.
+
+        May raise:
+        - RemoteError if the query failed for a reason that is not a node problem
+        """
+        self.nodes_health.start_query(node_info.name)
+        try:
+            return self._query_node_and_record(method, node_idx, node_info, web3, kwargs)
+        finally:
+            self.nodes_health.finish_query(node_info.name)
+
+    def _query_node_and_record(
+            self,
+            method: Callable,
+            node_idx: int,
+            node_info: NodeName,
+            web3: Web3 | None,
+            kwargs: dict[str, Any],
+    ) -> tuple[bool, Any]:
+        """Query the given node and record how it went in its health. Called by _query_node.
+
+        May raise:
+        - RemoteError if the query failed for a reason that is not a node problem
+        """
+        start = time.monotonic()
+
+        def latency() -> float | None:
+            # latency of the methods that are not hedged is not comparable to the rest
+            return time.monotonic() - start if method.__name__ not in self.methods_not_to_hedge else None  # noqa: E501
+
+        try:
+            result = method(web3, **kwargs)
+        except TransactionNotFound:
+            self.nodes_health.record_success(node_info.name, latency=latency())
+            if kwargs.get('must_exist', False) is True:
+                return False, None  # try other nodes, as transaction has to exist
+            return True, None
+        except InvalidAddress as e:
+            self.nodes_health.record_success(node_info.name, latency=latency())
+            raise RemoteError(  # no need to try other nodes since its not a node problem.
+                f'Failed to query {node_info.name} for {method!s}: '
+                f'non-checksum address {e.args[1]}',
+            ) from e
+        except requests.Timeout as e:  # Open the circuit breaker to prevent repeatedly timing out on the same node.  # noqa: E501
+            log.warning(
+                f'Timed out while querying {node_info.name} for '
+                f'{method.__name__}: {e!s}. Skipping this node until it recovers.',
+            )
+            self.nodes_health.record_failure(node_info.name, latency=latency(), open_circuit=True)
+            self.failed_to_connect_nodes.add(node_info.name)
+            self.rpc_mapping.pop(node_info, None)
+            return False, None
+        except (
+                RemoteError,
+                requests.exceptions.RequestException,
+                TypeError,  # happened at the web3 level calling `apply_result_formatters` when the RPC node returned `None` in the response's result # noqa: E501
+                AttributeError,  # happened at the web3 level when response is a string instead of dict # noqa: E501
+                json.JSONDecodeError,  # happens when RPC returns empty or invalid JSON responses # noqa: E501
             ) as e:
-                log.warning(
-                    f'Failed to query {node_info.name} with position on the query list {node_idx} '
-                    f'for {method.__name__} due to {e!s}',
-                )
-                # Catch all possible errors here and just try next node call
-                continue
+            log.warning(
+                f'Failed to query {node_info.name} with position on the query list {node_idx} '
+                f'for {method.__name__} due to {e!s}',
+            )
+            self.nodes_health.record_failure(node_info.name, latency=latency())
+            return False, None
+        except (
+                BlockchainQueryError,
+                Web3Exception,
+                ValueError,  # not removing yet due to possibility of raising from missing trie error  # noqa: E501
+        ) as e:
+            # the node responded, so these don't count against its health since they are
+            # usually errors of the query itself, like a reverted contract call
+            log.warning(
+                f'Failed to query {node_info.name} with position on the query list {node_idx} '
+                f'for {method.__name__} due to {e!s}',
+            )
+            self.nodes_health.record_success(node_info.name, latency=latency())
+            return False, str(e)
+
+        self.nodes_health.record_success(node_info.name, latency=latency())
+        self.failed_to_connect_nodes.discard(node_info.name)
+        return True, result
+
+    def _query_node_or_error(
+            self,
+            method: Callable,
+            node_idx: int,
+            node_info: NodeName,
+            web3: Web3 | None,
+            kwargs: dict[str, Any],
+    ) -> tuple[bool, Any] | Exception:
+        """Same as _query_node but returns the exception instead of raising it, so that
+        it's raised by the greenlet waiting for the hedged queries"""
+        try:
+            return self._query_node(method, node_idx, node_info, web3, kwargs)
+        except Exception as e:  # pylint: disable=broad-except  # raised by the caller
+            return e
+
+    def _hedged_query(
+            self,
+            method: Callable,
+            nodes: Iterator[tuple[int, NodeName, Web3 | None]],
+            kwargs: dict[str, Any],
+    ) -> tuple[bool, Any]:
+        """Query the nodes one by one like _query, but if a node takes longer than the
+        usual latency of its slowest responses also query the next node and use the
+        answer that comes first. At most two nodes are queried at the same time.
+
+        Returns the same as _query_node, for the first node that answered or for all of
+        them if none did.
+
+        May raise:
+        - RemoteError if the query failed for a reason that is not a node problem
+        """
+        finished: Queue[Greenlet] = Queue()
+        running: dict[Greenlet, tuple[NodeName, float]] = {}
+        exhausted, query_error = False, None
+
+        def query_next_node() -> None:
+            nonlocal exhausted
+            if (node := next(nodes, None)) is None:
+                exhausted = True
+                return
+
+            greenlet = gevent.spawn(self._query_node_or_error, method, *node, kwargs)
+            greenlet.link(finished.put)
+            running[greenlet] = (node[1], time.monotonic())
+
+        try:
+            query_next_node()
+            while len(running) != 0:
+                timeout = None
+                if exhausted is False and len(running) == 1:
+                    node_info, started = next(iter(running.values()))
+                    timeout = max(self.nodes_health.hedge_delay(node_info.name) - (time.monotonic() - started), 0)  # noqa: E501
+
+                try:
+                    greenlet = finished.get(timeout=timeout)
+                except Empty:
+                    log.debug(f'Hedging {method.__name__} query to {node_info.name} at {self.chain_name}')  # noqa: E501
+                    query_next_node()
+                    continue
 
-            return result
+                del running[greenlet]
+                if isinstance(outcome := greenlet.get(), Exception):
+                    raise outcome
+
+                if outcome[0] is True:
+                    return outcome
+
+                query_error = outcome[1] or query_error
+                if len(running) == 0:
+                    query_next_node()
+        finally:
+            gevent.killall(list(running), block=False)
+
+        return False, query_error
+
+    def _query(self, method: Callable, call_order: Sequence[WeightedNode], **kwargs: Any) -> Any:
+        """Queries evm related data by performing a query of the provided method to all given nodes
+
+        Nodes are queried in order of their health and the first node that gets a successful
+        response returns. If hedged requests are enabled, slow nodes are raced against the
+        next node. If none get a result then RemoteError is raised, or NodeQueryError with
+        the error of the last node that responded with an error for the query itself.
+        """
+        nodes, query_error = self._iterate_query_nodes(method, call_order, kwargs), None
+        if (
+            method.__name__ not in self.methods_not_to_hedge and
+            CachedSettings().get_settings().hedge_rpc_requests is True
+        ):
+            answered, result = self._hedged_query(method, nodes, kwargs)
+            if answered is True:
+                return result
+            query_error = result
+        else:
+            for node_idx, node_info, web3 in nodes:
+                answered, result = self._query_node(method, node_idx, node_info, web3, kwargs)
+                if answered is True:
+                    return result
+                query_error = result or query_error
 
         # no node in the call order list was successfully queried
         log.error(
             f'Failed to query {method.__name__} after trying the following '
             f'nodes: {[x.node_info.name for x in call_order]}. Call parameters were {kwargs}',
         )
+        if query_error is not None:
+            raise NodeQueryError(f'Error querying information from {self.blockchain!s}: {query_error}')  # noqa: E501
         raise RemoteError(f'Error querying information from {self.blockchain!s}. Checks logs to obtain more information')  # noqa: E501
 
     def _get_latest_block_number(self, web3: Web3 | None) -> int:
@@ -926,6 +1131,138 @@ class EvmNodeInquirer(EVMRPCMixin, LockableQueryMixIn):
 
         return events
 
+    def _query_multicall_chunk(
+            self,
+            method_name: Literal['aggregate', 'tryAggregate'],
+            calls: list[tuple[ChecksumEvmAddress, str]],
+            require_success: bool,
+            call_order: Sequence['WeightedNode'] | None,
+            block_identifier: BlockIdentifier,
+    ) -> dict[tuple[ChecksumEvmAddress, str], Any]:
+        """Query a chunk of multicall calls and return the result of each call.
+
+        If the nodes respond with an error for the chunk that may be due to running out of
+        gas or to the response being too big for a node, it's split in halves that are
+        queried separately. So are the chunks of tryAggregate without require_success since
+        the failure of a call does not fail them. Other errors, like a call that reverts,
+        fail the chunk right away since they would fail a part of it as well.
+
+        May raise:
+        - RemoteError
+        """
+        try:
+            output = self.contract_multicall.call(
+                node_inquirer=self,
+                method_name=method_name,
+                arguments=[calls] if method_name == 'aggregate' else [require_success, calls],
+                call_order=call_order,
+                block_identifier=block_identifier,
+            )
+        except NodeQueryError as e:
+            if len(calls) == 1 or (
+                (method_name == 'aggregate' or require_success is True) and
+                not any(x in str(e).lower() for x in MULTICALL_SPLIT_ERRORS)
+            ):
+                raise
+
+            log.debug(
+                f'{self.chain_name} multicall of {len(calls)} calls failed due to {e!s}. '
+                f'Splitting it in two halves',
+            )
+            middle = len(calls) // 2
+            return self._query_multicall_chunk(
+                method_name=method_name,
+                calls=calls[:middle],
+                require_success=require_success,
+                call_order=call_order,
+                block_identifier=block_identifier,
+            ) | self._query_multicall_chunk(
+                method_name=method_name,
+                calls=calls[middle:],
+                require_success=require_success,
+                call_order=call_order,
+                block_identifier=block_identifier,
+            )
+
+        if method_name == 'aggregate':
+            output = output[1]  # aggregate also returns the block number
+
+        return dict(zip(calls, output, strict=True))
+
+    def _execute_multicall(
+            self,
+            method_name: Literal['aggregate', 'tryAggregate'],
+            calls: list[tuple[ChecksumEvmAddress, str]],
+            require_success: bool,
+            call_order: Sequence['WeightedNode'] | None,
+            block_identifier: BlockIdentifier,
+            calls_chunk_size: int,
+    ) -> list[Any]:
+        """Execute the calls with the given method of the multicall contract and return
+        the result of each call in the same order.
+
+        Identical calls are only queried once, even if another greenlet is already
+        querying them. The rest are split in chunks of calls_chunk_size that are queried
+        concurrently.
+
+        May raise:
+        - RemoteError
+        """
+        results: dict[tuple[ChecksumEvmAddress, str], Any] = {}
+        queried_by_others: dict[tuple[ChecksumEvmAddress, str], AsyncResult] = {}
+        queried: dict[tuple[ChecksumEvmAddress, str], AsyncResult] = {}
+        for call in dict.fromkeys(calls):
+            key = (method_name, require_success, block_identifier, *call)
+            if (in_flight := self._multicalls_in_flight.get(key)) is not None:
+                queried_by_others[call] = in_flight
+            else:
+                queried[call] = self._multicalls_in_flight[key] = AsyncResult()
+
+        try:
+            chunk_results, errors = run_concurrently(
+                tasks={
+                    idx: partial(
+                        self._query_multicall_chunk,
+                        method_name=method_name,
+                        calls=chunk,
+                        require_success=require_success,
+                        call_order=call_order,
+                        block_identifier=block_identifier,
+                    ) for idx, chunk in enumerate(get_chunks(list(queried), n=calls_chunk_size))
+                },
+                concurrency=MULTICALL_CONCURRENCY,
+                timeout=None,
+            )
+            for chunk_result in chunk_results.values():
+                results.update(chunk_result)
+
+            if len(errors) != 0:
+                raise errors[min(errors)]
+        finally:
+            for call, in_flight in queried.items():
+                del self._multicalls_in_flight[method_name, require_success, block_identifier, *call]  # noqa: E501
+                # calls not queried due to an error are queried by the greenlets waiting for them
+                in_flight.set(results.get(call, _MULTICALL_NOT_QUERIED))
+
+        not_queried = []
+        for call, in_flight in queried_by_others.items():
+            if (result := in_flight.get()) is _MULTICALL_NOT_QUERIED:
+                not_queried.append(call)
+            else:
+                results[call] = result
+
+        if len(not_queried) != 0:
+            results.update(zip(not_queried, self._execute_multicall(
+                method_name=method_name,
+                calls=not_queried,
+                require_success=require_success,
+                call_order=call_order,
+                block_identifier=block_identifier,
+                calls_chunk_size=calls_chunk_size,
+            ), strict=True))
+
+        return [results[call] for call in calls]
+
     def multicall(
             self,
             calls: list[tuple[ChecksumEvmAddress, str]],
@@ -940,19 +1277,14 @@ class EvmNodeInquirer(EVMRPCMixin, LockableQueryMixIn):
         Can raise:
         - RemoteError
         """
-        calls_chunked = list(get_chunks(calls, n=calls_chunk_size))
-        output = []
-        for call_chunk in calls_chunked:
-            multicall_result = self.contract_multicall.call(
-                node_inquirer=self,
-                method_name='aggregate',
-                arguments=[call_chunk],
-                call_order=call_order,
-                block_identifier=block_identifier,
-            )
-            _, chunk_output = multicall_result
-            output += chunk_output
-        return output
+        return self._execute_multicall(
+            method_name='aggregate',
+            calls=calls,
+            require_success=True,
+            call_order=call_order,
+            block_identifier=block_identifier,
+            calls_chunk_size=calls_chunk_size,
+        )
 
     def multicall_2(
             self,
@@ -960,19 +1292,19 @@ class EvmNodeInquirer(EVMRPCMixin, LockableQueryMixIn):
             require_success: bool,
             call_order: Sequence['WeightedNode'] | None = None,
             block_identifier: BlockIdentifier = 'latest',
-            # only here to comply with multicall
-            calls_chunk_size: int = MULTICALL_CHUNKS,  # pylint: disable=unused-argument
+            calls_chunk_size: int = MULTICALL_CHUNKS,
     ) -> list[tuple[bool, bytes]]:
         """
         Uses MULTICALL_2 contract. If require success is set to False any call in the list
         of calls is allowed to fail.
         source: https://etherscan.io/address/0x5BA1e12693Dc8F9c48aAD8770482f4739bEeD696#code"""
-        return self.contract_multicall.call(
-            node_inquirer=self,
+        return self._execute_multicall(
             method_name='tryAggregate',
-            arguments=[require_success, calls],
+            calls=calls,
+            require_success=require_success,
             call_order=call_order,
             block_identifier=block_identifier,
+            calls_chunk_size=calls_chunk_size,
         )
 
     def multicall_specific(
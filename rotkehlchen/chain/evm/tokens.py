@@ -2,11 +2,13 @@ import logging
 from abc import ABC
 from collections import defaultdict
 from collections.abc import Mapping, Sequence
+from functools import partial
 from typing import TYPE_CHECKING, TypeVar, cast
 
 from rotkehlchen.assets.asset import Asset, EvmToken, Nft
 from rotkehlchen.balances.historical import HistoricalBalancesManager
 from rotkehlchen.chain.ethereum.utils import (
+    MULTICALL_CONCURRENCY,
     token_normalized_value,
     token_normalized_value_decimals,
 )
@@ -19,6 +21,7 @@ from rotkehlchen.errors.misc import NotFoundError, RemoteError
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.greenlets.utils import run_concurrently
 from rotkehlchen.inquirer import Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import deserialize_evm_address
@@ -30,7 +33,7 @@ from rotkehlchen.types import (
     Timestamp,
     TokenKind,
 )
-from rotkehlchen.utils.misc import combine_dicts, get_chunks
+from rotkehlchen.utils.misc import get_chunks
 
 from .constants import ZERO_ADDRESS
 from .contracts import EvmContract
@@ -261,27 +264,6 @@ class EvmTokens(ABC):  # noqa: B024
                 balances[address][token] += normalized_balance
         return balances
 
-    def _query_chunks(
-            self,
-            address: ChecksumEvmAddress,
-            tokens: list[EvmTokenDetectionData],
-            chunk_size: int,
-            call_order: list[WeightedNode],
-    ) -> dict[Asset, FVal]:
-        """Processes token balance queries in batches of chunk_size to avoid hitting gas limits.
-        Uses Asset objects directly instead of EvmToken to minimize database queries.
-        """
-        total_token_balances: dict[Asset, FVal] = defaultdict(FVal)
-        chunks = get_chunks(tokens, n=chunk_size)
-        for chunk in chunks:
-            new_token_balances = self.get_token_balances(
-                address=address,
-                tokens=chunk,
-                call_order=call_order,
-            )
-            total_token_balances = combine_dicts(total_token_balances, new_token_balances)
-        return total_token_balances
-
     def _compute_detected_tokens_info(self, addresses: Sequence[ChecksumEvmAddress]) -> DetectedTokensType:  # noqa: E501
         """
         Generate a structure that contains information about the addresses that tokens
@@ -422,16 +404,28 @@ class EvmTokens(ABC):  # noqa: B024
           token has no code. That means the chain is not synced
         """
         chunk_size, call_order = get_chunk_size_call_order(self.evm_inquirer)
-        tokens_per_address = defaultdict(list)
-        for address in addresses:
-            token_balances = self._query_chunks(
+        # token balances are queried in batches of chunk_size to avoid hitting gas limits
+        tasks = {
+            (address, chunk_idx): partial(
+                self.get_token_balances,
                 address=address,
-                tokens=tokens_to_check,
-                chunk_size=chunk_size,
+                tokens=chunk,
                 call_order=call_order,
             )
-            detected_tokens = list(token_balances.keys())
-            tokens_per_address[address] = detected_tokens
+            for address in addresses
+            for chunk_idx, chunk in enumerate(get_chunks(tokens_to_check, n=chunk_size))
+        }
+        results, errors = run_concurrently(
+            tasks=tasks,
+            concurrency=MULTICALL_CONCURRENCY,
+            timeout=None,
+        )
+        if len(errors) != 0:  # don't let the partial token lists be saved
+            raise errors[min(errors)]
+
+        tokens_per_address: dict[ChecksumEvmAddress, list[Asset]] = {address: [] for address in addresses}  # noqa: E501
+        for task_key in tasks:
+            tokens_per_address[task_key[0]].extend(results.get(task_key, {}))
 
         return tokens_per_address
 
@@ -482,12 +476,22 @@ class EvmTokens(ABC):  # noqa: B024
             addresses_to_tokens=addresses_to_tokens,
             chunk_length=chunk_size,
         )
-        for chunk in multicall_chunks:
-            new_balances = self._get_multicall_token_balances(
-                chunk=chunk,
-                call_order=call_order,
-            )
-            for address, balances in new_balances.items():
+        chunk_balances, errors = run_concurrently(
+            tasks={
+                chunk_idx: partial(
+                    self._get_multicall_token_balances,
+                    chunk=chunk,
+                    call_order=call_order,
+                ) for chunk_idx, chunk in enumerate(multicall_chunks)
+            },
+            concurrency=MULTICALL_CONCURRENCY,
+            timeout=None,
+        )
+        if len(errors) != 0:
+            raise errors[min(errors)]
+
+        for chunk_idx in range(len(multicall_chunks)):
+            for address, balances in chunk_balances[chunk_idx].items():
                 for token, balance in balances.items():
                     if balance == ZERO:
                         continue  # skip any zero balance tokens
@@ -76,10 +76,10 @@ class RPCManagerMixin(ABC, Generic[WEB3_NODE_TYPE]):
 
     def __init__(self) -> None:
         self.rpc_mapping: dict[NodeName, RPCNode[WEB3_NODE_TYPE]] = {}
-        # failed_to_connect_nodes keeps the nodes that we couldn't connect while
-        # doing remote queries so they aren't tried again if they get chosen. At the
-        # moment of writing this we don't remove entries from the set after some time.
-        # To force the app to retry a node a restart is needed.
+        # failed_to_connect_nodes keeps the nodes that we couldn't connect to or that
+        # timed out while doing remote queries. For solana they aren't tried again
+        # until a restart. EVM nodes are retried once the cooldown of their circuit
+        # breaker passes (see NodesHealth) and are removed from the set when they recover.
         self.failed_to_connect_nodes: set[str] = set()
 
     def connected_to_any_node(self) -> bool:
@@ -837,9 +837,15 @@ class ZksyncLiteManager(ChainManagerWithTransactions[ChecksumEvmAddress], ChainW
         total_transactions = len(transactions)
         for tx_index, transaction in enumerate(transactions):
             with self.database.user_write() as write_cursor:  # delete old tx events
+                event_identifier = ZKL_IDENTIFIER.format(tx_hash=transaction.tx_hash.hex())
+                DBHistoryEvents.mark_balances_stale(
+                    write_cursor=write_cursor,
+                    where_str='WHERE event_identifier=?',
+                    bindings=(event_identifier,),
+                )
                 write_cursor.execute(
                     'DELETE FROM history_events WHERE event_identifier=?',
-                    (ZKL_IDENTIFIER.format(tx_hash=transaction.tx_hash.hex()),),
+                    (event_identifier,),
                 )
 
             self.decode_transaction(transaction, tracked_addresses)
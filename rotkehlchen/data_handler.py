@@ -239,14 +239,28 @@ class DataHandler:
         - SystemPermissionError if the DB file permissions are not correct
         """
         log.info('Decompress and decrypt DB')
-        # First make a backup of the DB we are about to replace
+        self._backup_user_db()  # First make a backup of the DB we are about to replace
+        decrypted_data = decrypt(self.db.password.encode(), encrypted_data)
+        decompressed_data = zlib.decompress(decrypted_data)
+        self.db.import_unencrypted(decompressed_data)
+
+    def replace_db(self, unencrypted_db_data: bytes) -> None:
+        """Replace our local Database with the given plaintext DB after making a backup of it
+
+        May Raise:
+        - DBUpgradeError if the rotki DB version is newer than the software or
+        there is a DB upgrade and there is an error or if the version is older
+        than the one supported.
+        - SystemPermissionError if the DB file permissions are not correct
+        """
+        log.info('Replace DB with the DB received from the server')
+        self._backup_user_db()
+        self.db.import_unencrypted(unencrypted_db_data)
+
+    def _backup_user_db(self) -> None:
         date = timestamp_to_date(ts=ts_now(), formatstr='%Y_%m_%d_%H_%M_%S', treat_as_local=True)
         users_dir = self.data_directory / USERSDIR_NAME
         shutil.copyfile(
             users_dir / self.username / USERDB_NAME,
             users_dir / self.username / f'rotkehlchen_db_{date}.backup',
         )
-
-        decrypted_data = decrypt(self.db.password.encode(), encrypted_data)
-        decompressed_data = zlib.decompress(decrypted_data)
-        self.db.import_unencrypted(decompressed_data)
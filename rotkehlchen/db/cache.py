@@ -27,6 +27,7 @@ class DBCacheStatic(Enum):
     LAST_GNOSISPAY_QUERY_TS: Final = 'last_gnosispay_query_ts'
     LAST_SPARK_ASSETS_UPDATE: Final = 'last_spark_assets_update'
     LAST_DB_UPGRADE: Final = 'last_db_upgrade'
+    DAILY_BALANCES_STALE_FROM_TS: Final = 'daily_balances_stale_from_ts'
     DOCKER_DEVICE_INFO: Final = 'docker_device_info'
     MONERIUM_OAUTH_CREDENTIALS: Final = 'monerium_oauth_credentials'
 
@@ -122,6 +123,10 @@ class DBCacheDynamic(Enum):
     def get_db_key(self, **kwargs: Unpack[IndexArgType]) -> str:
         ...
 
+    @overload
+    def get_db_key(self, **kwargs: Unpack[BinancePairLastTradeArgsType]) -> str:
+        ...
+
     def get_db_key(self, **kwargs: Any) -> str:
         """Get the key that is used in the DB schema for the given kwargs.
 
@@ -0,0 +1,148 @@
+import logging
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from rotkehlchen.constants import DAY_IN_SECONDS
+from rotkehlchen.db.cache import DBCacheStatic
+from rotkehlchen.db.settings import ROTKEHLCHEN_DB_VERSION
+from rotkehlchen.fval import FVal
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.types import Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.drivers.gevent import DBCursor
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Keys of the transient DB settings table that hold the state of the index
+DAILY_BALANCES_INDEXED_UNTIL_KEY = 'daily_balances_indexed_until'
+DAILY_BALANCES_SOURCE_KEY = 'daily_balances_source'
+
+
+def timestamp_to_day(timestamp: Timestamp) -> Timestamp:
+    """Faster version of timestamp_to_daystart_timestamp for UTC days"""
+    return Timestamp(timestamp - timestamp % DAY_IN_SECONDS)
+
+
+class DBDailyBalances:
+    """Index of the balance of each asset at the end of each day in which it changed.
+
+    The index is calculated by replaying the history events and is kept in the transient DB
+    since it can always be recreated. It covers all the days before `indexed_until`.
+
+    Whenever history events change, the index is marked as stale from the earliest affected
+    timestamp in the user DB, in the same transaction as the change. Before each use the stale
+    part of the index is deleted so that it gets recalculated.
+    """
+
+    def __init__(self, database: 'DBHandler') -> None:
+        self.db = database
+
+    @staticmethod
+    def mark_stale(write_cursor: 'DBCursor', from_ts: Timestamp) -> None:
+        """Mark the index as stale from the day of the given timestamp on"""
+        write_cursor.execute(
+            'INSERT INTO key_value_cache(name, value) VALUES(?, ?) ON CONFLICT(name) '
+            'DO UPDATE SET value=MIN(CAST(value AS INTEGER), CAST(excluded.value AS INTEGER))',
+            (DBCacheStatic.DAILY_BALANCES_STALE_FROM_TS.value, max(from_ts, 0)),
+        )
+
+    def _get_source(self) -> str:
+        """Identifies the user DB state that the index was calculated from, so that
+        it's recreated after DB upgrades and data migrations that can modify events"""
+        with self.db.conn.read_ctx() as cursor:
+            last_data_migration = self.db.get_setting(cursor=cursor, name='last_data_migration')
+        return f'{ROTKEHLCHEN_DB_VERSION}_{last_data_migration}'
+
+    def refresh(self) -> Timestamp:
+        """Delete any stale part of the index and return the timestamp of the day until
+        which the index can be used. Should be called with the daily balances lock held."""
+        with self.db.conn.read_ctx() as cursor:
+            stale_from_ts = self.db.get_static_cache(
+                cursor=cursor,
+                name=DBCacheStatic.DAILY_BALANCES_STALE_FROM_TS,
+            )
+
+        source = self._get_source()
+        with self.db.conn_transient.write_ctx() as write_cursor:
+            state = dict(write_cursor.execute(
+                'SELECT name, value FROM settings WHERE name IN (?, ?)',
+                (DAILY_BALANCES_INDEXED_UNTIL_KEY, DAILY_BALANCES_SOURCE_KEY),
+            ).fetchall())
+            indexed_until = Timestamp(int(state.get(DAILY_BALANCES_INDEXED_UNTIL_KEY, 0)))
+            if state.get(DAILY_BALANCES_SOURCE_KEY) != source:
+                stale_from_ts = Timestamp(0)
+                write_cursor.execute(
+                    'INSERT OR REPLACE INTO settings(name, value) VALUES(?, ?)',
+                    (DAILY_BALANCES_SOURCE_KEY, source),
+                )
+
+            if stale_from_ts is not None and (stale_day := timestamp_to_day(stale_from_ts)) < indexed_until:  # noqa: E501
+                log.debug(f'Deleting daily balances index from {stale_day}')
+                write_cursor.execute(
+                    'DELETE FROM history_events_daily_balances WHERE timestamp >= ?',
+                    (stale_day,),
+                )
+                indexed_until = stale_day
+                write_cursor.execute(
+                    'INSERT OR REPLACE INTO settings(name, value) VALUES(?, ?)',
+                    (DAILY_BALANCES_INDEXED_UNTIL_KEY, str(indexed_until)),
+                )
+
+        if stale_from_ts is not None:
+            # only clear the mark if it was not lowered by a change in the meantime
+            with self.db.conn.write_ctx() as write_cursor:
+                write_cursor.execute(
+                    'DELETE FROM key_value_cache WHERE name=? AND CAST(value AS INTEGER) >= ?',
+                    (DBCacheStatic.DAILY_BALANCES_STALE_FROM_TS.value, stale_from_ts),
+                )
+
+        return indexed_until
+
+    def add_days(
+            self,
+            balances: Sequence[tuple[str, Timestamp, FVal]],
+            indexed_until: Timestamp,
+    ) -> None:
+        """Save the (asset, day, balance) entries and extend the index until the given day"""
+        with self.db.conn_transient.write_ctx() as write_cursor:
+            write_cursor.executemany(
+                'INSERT OR REPLACE INTO history_events_daily_balances(asset, timestamp, amount) '
+                'VALUES(?, ?, ?)',
+                [(asset, day_ts, str(amount)) for asset, day_ts, amount in balances],
+            )
+            write_cursor.execute(
+                'INSERT OR REPLACE INTO settings(name, value) VALUES(?, ?)',
+                (DAILY_BALANCES_INDEXED_UNTIL_KEY, str(indexed_until)),
+            )
+
+    def get_balances(
+            self,
+            day_ts: Timestamp,
+            asset_ids: Sequence[str] | None = None,
+    ) -> dict[str, FVal]:
+        """Get the balances at the start of the given day. If asset ids are given only
+        the balances of these assets are returned. Assets whose balance went back to zero
+        are included, so an empty result means that no events happened before that day."""
+        with self.db.conn_transient.read_ctx() as cursor:
+            if asset_ids is None:
+                return {
+                    asset: FVal(amount) for asset, amount, _ in cursor.execute(
+                        'SELECT asset, amount, MAX(timestamp) FROM '
+                        'history_events_daily_balances WHERE timestamp < ? GROUP BY asset',
+                        (day_ts,),
+                    )
+                }
+
+            balances = {}
+            for asset in asset_ids:
+                if (result := cursor.execute(
+                    'SELECT amount FROM history_events_daily_balances WHERE asset=? AND '
+                    'timestamp < ? ORDER BY timestamp DESC LIMIT 1',
+                    (asset, day_ts),
+                ).fetchone()) is not None:
+                    balances[asset] = FVal(result[0])
+
+        return balances
@@ -56,6 +56,7 @@ from rotkehlchen.db.constants import (
     OKX_LOCATION_KEY,
     USER_CREDENTIAL_MAPPING_KEYS,
 )
+from rotkehlchen.db.daily_balances import DBDailyBalances
 from rotkehlchen.db.drivers.gevent import DBConnection, DBConnectionType, DBCursor
 from rotkehlchen.db.evmtx import DBEvmTx
 from rotkehlchen.db.filtering import UserNotesFilterQuery
@@ -89,6 +90,7 @@ from rotkehlchen.db.utils import (
     deserialize_tags_from_db,
     form_query_to_filter_timestamps,
     get_query_chunks,
+    get_unlock_script,
     insert_tag_mappings,
     is_valid_db_blockchain_account,
     protect_password_sqlcipher,
@@ -216,6 +218,8 @@ class DBHandler:
         self.conn_transient: DBConnection = None  # type: ignore
         # Lock to make sure that 2 callers of get_or_create_evm_token do not go in at the same time
         self.get_or_create_token_lock = Semaphore()
+        # Lock to make sure that the daily balances index is only updated by one caller at a time
+        self.daily_balances_lock = Semaphore()
         self.password = password
         self._connect()
         self._check_unfinished_upgrades(resume_from_backup=resume_from_backup)
@@ -492,6 +496,8 @@ class DBHandler:
                 'Wrong password or invalid/corrupt database for user',
             ) from e
 
+        if conn_attribute == 'conn':
+            conn.enable_read_pool(init_script=get_unlock_script(self.password, self.sqlcipher_version))  # noqa: E501
         setattr(self, conn_attribute, conn)
 
     def _change_password(
@@ -529,6 +535,7 @@ class DBHandler:
         )
         if result is True:
             self.password = new_password
+            self.conn.enable_read_pool(init_script=get_unlock_script(new_password, self.sqlcipher_version))  # noqa: E501
         return result
 
     def disconnect(self, conn_attribute: Literal['conn', 'conn_transient'] = 'conn') -> None:
@@ -608,6 +615,8 @@ class DBHandler:
                 f'Permission error when reopening the DB. {e!s}. Should never happen here',
             ) from e
         self._run_actions_after_first_connection()
+        with self.conn.write_ctx() as write_cursor:  # the index was created from the old DB
+            DBDailyBalances.mark_stale(write_cursor=write_cursor, from_ts=Timestamp(0))
         # all went okay, remove the original temp backup
         (self.user_data_dir / 'rotkehlchen_temp_backup.db').unlink()
 
@@ -693,6 +702,7 @@ class DBHandler:
                 DBCacheStatic.LAST_GNOSISPAY_QUERY_TS,
                 DBCacheStatic.LAST_SPARK_ASSETS_UPDATE,
                 DBCacheStatic.LAST_DB_UPGRADE,
+                DBCacheStatic.DAILY_BALANCES_STALE_FROM_TS,
             ],
     ) -> Timestamp | None:
         ...
@@ -1260,6 +1270,11 @@ class DBHandler:
     def purge_exchange_data(self, write_cursor: 'DBCursor', location: Location) -> None:
         self.delete_used_query_range_for_exchange(write_cursor=write_cursor, location=location)
         serialized_location = location.serialize_for_db()
+        DBHistoryEvents.mark_balances_stale(
+            write_cursor=write_cursor,
+            where_str='WHERE location = ?',
+            bindings=(serialized_location,),
+        )
         write_cursor.execute('DELETE FROM history_events WHERE location = ?;', (serialized_location,))  # noqa: E501
 
     def update_used_query_range(self, write_cursor: 'DBCursor', name: str, start_ts: Timestamp, end_ts: Timestamp) -> None:  # noqa: E501
@@ -2416,13 +2431,19 @@ class DBHandler:
                 f'({",".join("?" * len(hashes_chunk))})',
                 hashes_chunk,
             )
-            write_cursor.execute(
-                f'DELETE FROM history_events WHERE identifier IN (SELECT H.identifier '
-                f'FROM history_events H INNER JOIN chain_events_info C '
-                f'ON H.identifier=C.identifier AND C.tx_ref IN '
-                f'({", ".join(["?"] * len(hashes_chunk))}) AND H.location=?)',
-                hashes_chunk + [Location.ZKSYNC_LITE.serialize_for_db()],
+            where_str = (
+                'WHERE identifier IN (SELECT H.identifier '
+                'FROM history_events H INNER JOIN chain_events_info C '
+                'ON H.identifier=C.identifier AND C.tx_ref IN '
+                f'({", ".join(["?"] * len(hashes_chunk))}) AND H.location=?)'
+            )
+            bindings = hashes_chunk + [Location.ZKSYNC_LITE.serialize_for_db()]
+            DBHistoryEvents.mark_balances_stale(
+                write_cursor=write_cursor,
+                where_str=where_str,
+                bindings=bindings,
             )
+            write_cursor.execute(f'DELETE FROM history_events {where_str}', bindings)
 
     def delete_data_for_bitcoin_address(
             self,
@@ -2907,6 +2928,8 @@ class DBHandler:
                     'UPDATE assets SET identifier=? WHERE identifier=?;',
                     (target_asset.identifier, source_identifier),
                 )
+                # the cascade changed the asset of the history events
+                DBDailyBalances.mark_stale(write_cursor=write_cursor, from_ts=Timestamp(0))
 
     def get_latest_location_value_distribution(self) -> list[LocationData]:
         """Gets the latest location data
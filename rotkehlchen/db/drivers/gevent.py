@@ -3,16 +3,19 @@
 but heavily modified"""
 
 import random
-from collections.abc import Generator, Sequence
+from collections import deque
+from collections.abc import Callable, Generator, Sequence
 from contextlib import contextmanager
 from enum import Enum, auto
 from pathlib import Path
 from types import TracebackType
-from typing import TYPE_CHECKING, Any, Literal, Optional, TypeAlias
+from typing import TYPE_CHECKING, Any, Final, Literal, Optional, TypeAlias
 from uuid import uuid4
 
 import gevent
 import rsqlite
+from gevent.queue import Empty, Queue
+from gevent.threadpool import ThreadPool
 from pysqlcipher3 import dbapi2 as sqlcipher
 
 from rotkehlchen.db.checks import sanity_check_impl
@@ -25,12 +28,20 @@ from rotkehlchen.greenlets.utils import get_greenlet_name
 from rotkehlchen.utils.misc import ts_now
 
 if TYPE_CHECKING:
+    from gevent.event import AsyncResult
+
     from rotkehlchen.logging import RotkehlchenLogger
 
 UnderlyingCursor: TypeAlias = rsqlite.Cursor | sqlcipher.Cursor  # pylint: disable=no-member
 UnderlyingConnection: TypeAlias = rsqlite.Connection | sqlcipher.Connection  # pylint: disable=no-member
 
 CONTEXT_SWITCH_WAIT = 1  # seconds to wait for a status change in a DB context switch
+# Read only connections kept per DB for the queries that run in threads
+DB_READ_POOL_SIZE: Final = 3
+# Rows fetched at once when iterating a cursor of the read pool
+DB_READ_POOL_FETCH_ROWS: Final = 256
+# Milliseconds the read only connections wait for a lock, e.g. during a WAL checkpoint
+DB_READ_POOL_BUSY_TIMEOUT: Final = 5000
 import logging
 
 logger: 'RotkehlchenLogger' = logging.getLogger(__name__)  # type: ignore
@@ -238,6 +249,172 @@ CALLBACK_MAP = {
 }
 
 
+def _call_catching_errors(function: Callable[..., Any], *args: Any) -> tuple[Any, Exception | None]:  # noqa: E501
+    """Runs in a thread of the read pool. The errors are raised in the calling greenlet
+    instead of being printed by the threadpool."""
+    try:
+        return function(*args), None
+    except Exception as e:  # pylint: disable=broad-except  # raised by the caller
+        return None, e
+
+
+class DBReadCursor(DBCursor):
+    """Cursor of a connection of the read pool. Its queries and fetches run in the
+    thread of the pool that the connection is used from, so that only the calling
+    greenlet waits for them. Rows are fetched in batches when iterating."""
+
+    def __init__(
+            self,
+            connection: 'DBConnection',
+            cursor: UnderlyingCursor,
+            pool: 'DBReadConnectionPool',
+    ) -> None:
+        super().__init__(connection=connection, cursor=cursor)
+        self.pool = pool
+        self.pending: AsyncResult | None = None  # the function running in the thread
+        self.rows: deque[Any] = deque()
+
+    def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        self.pending = self.pool.threadpool.spawn(_call_catching_errors, function, *args)
+        result, error = self.pending.get()
+        if error is not None:
+            raise error
+        return result
+
+    def __next__(self) -> Any:
+        if len(self.rows) == 0:
+            self.rows.extend(self._run(super().fetchmany, DB_READ_POOL_FETCH_ROWS))
+            if len(self.rows) == 0:
+                raise StopIteration
+
+        return self.rows.popleft()
+
+    def execute(self, statement: str, *bindings: Sequence) -> 'DBCursor':
+        self.rows.clear()
+        self._run(super().execute, statement, *bindings)
+        return self
+
+    def executemany(
+            self,
+            statement: str,
+            *bindings: Sequence[Sequence] | Generator[Sequence, None, None],
+    ) -> 'DBCursor':
+        self.rows.clear()
+        self._run(super().executemany, statement, *bindings)
+        return self
+
+    def executescript(self, script: str) -> 'DBCursor':
+        self.rows.clear()
+        self._run(super().executescript, script)
+        return self
+
+    def fetchone(self) -> Any:
+        if len(self.rows) != 0:
+            return self.rows.popleft()
+        return self._run(super().fetchone)
+
+    def fetchmany(self, size: int | None = None) -> list[Any]:
+        if size is None:
+            size = self._cursor.arraysize
+        result = [self.rows.popleft() for _ in range(min(size, len(self.rows)))]
+        if len(result) < size:
+            result.extend(self._run(super().fetchmany, size - len(result)))
+        return result
+
+    def fetchall(self) -> list[Any]:
+        result = list(self.rows)
+        self.rows.clear()
+        result.extend(self._run(super().fetchall))
+        return result
+
+
+class DBReadConnectionPool:
+    """Read only connections to the DB of a DBConnection whose queries run in OS threads.
+
+    sqlite releases the GIL while running queries so long reads on these connections
+    don't block the greenlets that use the main connection. Each connection is only
+    used from one thread at a time. They are opened when first needed and see the DB as
+    of the last commit of the main connection, which needs to be in WAL mode so that
+    readers don't block it. The pool has its own threadpool so that long reads don't
+    delay other users of the hub threadpool such as DNS resolution.
+    """
+
+    def __init__(self, path: str | Path, connection_type: DBConnectionType, init_script: str, size: int) -> None:  # noqa: E501
+        self.path = path
+        self.connection_type = connection_type
+        self.init_script = init_script
+        self.size = size
+        self.threadpool = ThreadPool(maxsize=size)
+        self.idle: Queue[UnderlyingConnection] = Queue()
+        self.opened = 0
+        self.closed = False
+
+    def _open(self) -> UnderlyingConnection:
+        """Runs in a thread of the pool"""
+        connection: UnderlyingConnection
+        if self.connection_type == DBConnectionType.GLOBAL:
+            connection = rsqlite.connect(
+                database=self.path,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+        else:
+            connection = sqlcipher.connect(  # pylint: disable=no-member
+                database=str(self.path),
+                check_same_thread=False,
+                isolation_level=None,
+            )
+        try:
+            connection.executescript(
+                f'{self.init_script}PRAGMA query_only=ON;'
+                f'PRAGMA busy_timeout={DB_READ_POOL_BUSY_TIMEOUT};',
+            )
+        except Exception:
+            connection.close()
+            raise
+
+        return connection
+
+    def acquire(self) -> UnderlyingConnection:
+        """Get an idle connection, open a new one if there are less than the pool's size
+        or wait for one to be released"""
+        try:
+            return self.idle.get_nowait()
+        except Empty:
+            pass
+
+        if self.opened >= self.size:
+            return self.idle.get()
+
+        self.opened += 1
+        try:
+            connection, error = self.threadpool.apply(_call_catching_errors, (self._open,))
+            if error is not None:
+                raise error
+        except BaseException:
+            self.opened -= 1
+            raise
+
+        return connection
+
+    def release(self, connection: UnderlyingConnection) -> None:
+        if self.closed:
+            connection.close()
+        else:
+            self.idle.put(connection)
+
+    def close(self) -> None:
+        """Close the idle connections. The ones in use are closed when released."""
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except Empty:
+                break
+
+        self.threadpool.kill()
+
+
 class DBConnection:
 
     def _set_progress_handler(self) -> None:
@@ -252,6 +429,8 @@ class DBConnection:
     ) -> None:
         CONNECTION_MAP[connection_type] = self
         self._conn: UnderlyingConnection
+        self.path = path
+        self.read_pool: DBReadConnectionPool | None = None
         self.in_callback = gevent.lock.Semaphore()
         self.transaction_lock = gevent.lock.Semaphore()
         self.in_critical_section = gevent.lock.Semaphore()
@@ -310,9 +489,34 @@ class DBConnection:
         return DBCursor(connection=self, cursor=self._conn.cursor())
 
     def close(self) -> None:
+        self.disable_read_pool()
         self._conn.close()
         CONNECTION_MAP.pop(self.connection_type, None)
 
+    def enable_read_pool(self, init_script: str = '', size: int = DB_READ_POOL_SIZE) -> None:
+        """Create the pool of read only connections used by threaded_read_ctx. The
+        init_script is run when opening each of them, e.g. to unlock an encrypted DB.
+        Only done if the DB is in WAL mode since otherwise readers block the writes."""
+        self.disable_read_pool()
+        with self.read_ctx() as cursor:
+            journal_mode = cursor.execute('PRAGMA journal_mode').fetchone()[0]
+
+        if journal_mode.lower() != 'wal':
+            logger.debug(f'Not using a read pool for the {self.connection_type.name.lower()} DB since its journal mode is {journal_mode}')  # noqa: E501
+            return
+
+        self.read_pool = DBReadConnectionPool(
+            path=self.path,
+            connection_type=self.connection_type,
+            init_script=init_script,
+            size=size,
+        )
+
+    def disable_read_pool(self) -> None:
+        if self.read_pool is not None:
+            self.read_pool.close()
+            self.read_pool = None
+
     @contextmanager
     def read_ctx(self) -> Generator['DBCursor', None, None]:
         cursor = self.cursor()
@@ -321,6 +525,41 @@ class DBConnection:
         finally:
             cursor.close()
 
+    @contextmanager
+    def threaded_read_ctx(self) -> Generator['DBCursor', None, None]:
+        """Same as read_ctx but the queries run in a thread on a connection of the read
+        pool, so that long reads don't block the other greenlets. Should be used for
+        queries that read a lot of data.
+
+        Only data committed before the queries is seen. So if the current greenlet has a
+        write transaction or savepoint open, or there is no read pool, this is the same
+        as read_ctx.
+        """
+        current_id = get_greenlet_name(gevent.getcurrent())
+        if (
+            (pool := self.read_pool) is None or
+            current_id in (self.write_greenlet_id, self.savepoint_greenlet_id)
+        ):
+            with self.read_ctx() as cursor:
+                yield cursor
+            return
+
+        connection = pool.acquire()
+        cursor = DBReadCursor(connection=self, cursor=connection.cursor(), pool=pool)
+        try:
+            yield cursor
+        finally:
+            if cursor.pending is None or cursor.pending.ready():
+                cursor.close()
+                pool.release(connection)
+            else:  # the greenlet was killed while waiting for the thread
+                def release(_: 'AsyncResult') -> None:
+                    cursor.close()
+                    pool.release(connection)
+
+                connection.interrupt()
+                cursor.pending.rawlink(release)
+
     @contextmanager
     def write_ctx(self, commit_ts: bool = False) -> Generator['DBCursor', None, None]:
         """Opens a transaction to the database. This should be used kept open for
@@ -291,12 +291,18 @@ class DBEth2:
 
             # Delete from the events table, all staking events except for deposits.
             # We keep deposits since they are associated with the address and are EVM transactions
-            cursor.execute(
-                f'DELETE FROM history_events WHERE identifier in (SELECT S.identifier '
+            where_str = (
+                f'WHERE identifier in (SELECT S.identifier '
                 f'FROM eth_staking_events_info S WHERE S.validator_index IN '
-                f'({",".join(question_marks)})) AND entry_type != ?',
-                (*validator_indices, HistoryBaseEntryType.ETH_DEPOSIT_EVENT.serialize_for_db()),
+                f'({",".join(question_marks)})) AND entry_type != ?'
+            )
+            bindings = (*validator_indices, HistoryBaseEntryType.ETH_DEPOSIT_EVENT.serialize_for_db())  # noqa: E501
+            DBHistoryEvents.mark_balances_stale(
+                write_cursor=cursor,
+                where_str=where_str,
+                bindings=bindings,
             )
+            cursor.execute(f'DELETE FROM history_events {where_str}', bindings)
 
             # Delete cached timestamps
             cursor.execute(
@@ -769,11 +775,10 @@ class DBEth2:
                 (HistoryEventType.INFORMATIONAL, 'NOT IN'),
             ):
                 query = (
-                    'UPDATE history_events SET type=? WHERE entry_type=? AND subtype=? '
+                    'WHERE entry_type=? AND subtype=? '
                     f"AND location_label {operation} ({','.join('?' * len(tracked_addresses))})"
                 )
                 bindings = [
-                    event_type.serialize(),
                     HistoryBaseEntryType.ETH_BLOCK_EVENT.value,
                     HistoryEventSubType.BLOCK_PRODUCTION.serialize(),
                     *tracked_addresses,
@@ -785,7 +790,15 @@ class DBEth2:
                     )
                     bindings += block_numbers
 
-                write_cursor.execute(query, bindings)
+                DBHistoryEvents.mark_balances_stale(
+                    write_cursor=write_cursor,
+                    where_str=f'{query} AND type != ?',
+                    bindings=[*bindings, event_type.serialize()],
+                )
+                write_cursor.execute(
+                    f'UPDATE history_events SET type=? {query}',
+                    [event_type.serialize(), *bindings],
+                )
 
         self.combine_block_with_tx_events(block_numbers=block_numbers)
 
@@ -843,6 +856,11 @@ class DBEth2:
         log.debug(f'Will combine {change_count} tx events with block events')
         with self.db.user_write() as write_cursor:
             for changes_entry in changes:
+                DBHistoryEvents.mark_balances_stale(
+                    write_cursor=write_cursor,
+                    where_str='WHERE identifier=?',
+                    bindings=(changes_entry[6],),
+                )
                 result = write_cursor.execute(
                     'SELECT COUNT(*) FROM history_events HE LEFT JOIN chain_events_info CE ON '
                     'HE.identifier = CE.identifier WHERE HE.event_identifier=? AND CE.tx_ref=?',
@@ -490,10 +490,18 @@ class DBEvmTx(DBCommonTx[ChecksumEvmAddress, EvmTransaction, EVMTxHash, EvmTrans
             tx_refs=tx_hashes,
             location=Location.from_chain_id(chain_id),
         )
+        genesis_where = (
+            'WHERE identifier IN (SELECT H.identifier from history_events H INNER JOIN '
+            'chain_events_info C ON H.identifier=C.identifier WHERE C.tx_ref=? AND '
+            'H.location_label=?)'
+        )
+        DBHistoryEvents.mark_balances_stale(
+            write_cursor=write_cursor,
+            where_str=genesis_where,
+            bindings=(GENESIS_HASH, address),
+        )
         write_cursor.execute(  # delete genesis tx events related to the provided address
-            'DELETE FROM history_events WHERE identifier IN ('
-            'SELECT H.identifier from history_events H INNER JOIN chain_events_info C '
-            'ON H.identifier=C.identifier WHERE C.tx_ref=? AND H.location_label=?)',
+            f'DELETE FROM history_events {genesis_where}',
             (GENESIS_HASH, address),
         )
         genesis_events_count = write_cursor.execute(
@@ -1,7 +1,8 @@
 import json
 import logging
 from collections import defaultdict
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import islice
 from typing import TYPE_CHECKING, Any, Literal, Optional, overload
 
 from pysqlcipher3 import dbapi2 as sqlcipher
@@ -25,6 +26,7 @@ from rotkehlchen.db.constants import (
     HISTORY_MAPPING_STATE_CUSTOMIZED,
     TX_DECODED,
 )
+from rotkehlchen.db.daily_balances import DBDailyBalances
 from rotkehlchen.db.filtering import (
     ALL_EVENTS_DATA_JOIN,
     EVENTS_WITH_COUNTERPARTY_JOIN,
@@ -130,6 +132,7 @@ class DBHistoryEvents:
                 [(identifier, k, v) for k, v in mapping_values.items()],
             )
 
+        DBDailyBalances.mark_stale(write_cursor=write_cursor, from_ts=ts_ms_to_sec(event.timestamp))  # noqa: E501
         return identifier
 
     def add_history_events(
@@ -155,6 +158,14 @@ class DBHistoryEvents:
         May raise:
             - InputError if an error occurred.
         """
+        if (result := write_cursor.execute(
+            'SELECT timestamp FROM history_events WHERE identifier=?', (event.identifier,),
+        ).fetchone()) is not None:  # the balances change from the earliest of the two timestamps
+            DBDailyBalances.mark_stale(
+                write_cursor=write_cursor,
+                from_ts=ts_ms_to_sec(TimestampMS(min(result[0], event.timestamp))),
+            )
+
         for idx, (_, updatestr, bindings) in enumerate(event.serialize_for_db()):
             if idx == 0:  # base history event data
                 try:
@@ -215,6 +226,13 @@ class DBHistoryEvents:
                         )
 
             with self.db.user_write() as write_cursor:
+                if (result := write_cursor.execute(
+                    'SELECT timestamp FROM history_events WHERE identifier=?', (identifier,),
+                ).fetchone()) is not None:
+                    DBDailyBalances.mark_stale(
+                        write_cursor=write_cursor,
+                        from_ts=ts_ms_to_sec(TimestampMS(result[0])),
+                    )
                 write_cursor.execute(
                     'DELETE FROM history_events WHERE identifier=?', (identifier,),
                 )
@@ -235,6 +253,11 @@ class DBHistoryEvents:
         cache entries to enable fresh data retrieval.
         """
         with self.db.conn.write_ctx() as write_cursor:
+            DBHistoryEvents.mark_balances_stale(
+                write_cursor=write_cursor,
+                where_str='WHERE entry_type=?',
+                bindings=(entry_type.serialize_for_db(),),
+            )
             write_cursor.execute('DELETE FROM history_events WHERE entry_type=?', (entry_type.serialize_for_db(),))  # noqa: E501
             if entry_type == HistoryBaseEntryType.ETH_BLOCK_EVENT:
                 key_parts = [DBCacheDynamic.LAST_PRODUCED_BLOCKS_QUERY_TS.value[0][:30]]
@@ -273,7 +296,7 @@ class DBHistoryEvents:
             )
 
         querystr = (
-            'DELETE FROM history_events WHERE identifier IN ('
+            'WHERE identifier IN ('
             f'SELECT H.identifier from history_events H {join_or_where} H.location = ?)'
         )
         bindings: tuple = (location.serialize_for_db(),)
@@ -284,7 +307,12 @@ class DBHistoryEvents:
             querystr += ' AND location_label = ?'
             bindings += (address,)
 
-        write_cursor.execute(querystr, bindings)
+        DBHistoryEvents.mark_balances_stale(
+            write_cursor=write_cursor,
+            where_str=querystr,
+            bindings=bindings,
+        )
+        write_cursor.execute(f'DELETE FROM history_events {querystr}', bindings)
 
     @staticmethod
     def reset_events_for_redecode(
@@ -358,8 +386,29 @@ class DBHistoryEvents:
             where_str += f' AND identifier NOT IN ({", ".join(["?"] * length)})'
             bindings.extend(customized_event_ids)  # type: ignore  # different type of elements in the list
 
+        DBHistoryEvents.mark_balances_stale(
+            write_cursor=write_cursor,
+            where_str=where_str,
+            bindings=bindings,
+        )
         write_cursor.execute(f'DELETE FROM history_events {where_str}', bindings)
 
+    @staticmethod
+    def mark_balances_stale(
+            write_cursor: 'DBCursor',
+            where_str: str,
+            bindings: Sequence[Any],
+    ) -> None:
+        """Mark the daily balances index as stale from the earliest of the history events
+        matching the given where clause. Should be called before these events are modified."""
+        if (min_ts := write_cursor.execute(
+            f'SELECT MIN(timestamp) FROM history_events {where_str}', bindings,
+        ).fetchone()[0]) is not None:
+            DBDailyBalances.mark_stale(
+                write_cursor=write_cursor,
+                from_ts=ts_ms_to_sec(TimestampMS(min_ts)),
+            )
+
     def get_customized_event_identifiers(
             self,
             cursor: 'DBCursor',
@@ -640,6 +689,66 @@ class DBHistoryEvents:
         TODO: To not query all columns with all joins for all cases, we perhaps can
         peek on the entry type of the filter and adjust the SELECT fields accordingly?
         """
+        cursor.execute(*self._prepare_history_events_query(
+            filter_query=filter_query,
+            entries_limit=entries_limit,
+            group_by_event_ids=group_by_event_ids,
+            match_exact_events=match_exact_events,
+        ))
+        return list(self._deserialize_history_events(rows=cursor, group_by_event_ids=group_by_event_ids))  # type: ignore[return-value]  # the type of the events depends on the filter query  # noqa: E501
+
+    def iterate_history_events(
+            self,
+            filter_query: HistoryBaseEntryFilterQuery,
+            entries_limit: int | None,
+            chunk_size: int,
+            match_exact_events: bool = True,
+            report_failures: bool = True,
+    ) -> Iterator[list[HistoryBaseEntry]]:
+        """Same as get_history_events but yields the events in chunks of chunk_size
+        instead of reading all of them at once. The events are ordered by timestamp.
+
+        Each chunk is read in its own short read transaction of the read pool using keyset
+        pagination, so that no connection is held while the caller processes a chunk.
+
+        If report_failures is False no error is shown for events that fail to be
+        deserialized, e.g. when iterating over the same events more than once."""
+        query, bindings = self._prepare_history_events_query(
+            filter_query=filter_query,
+            entries_limit=entries_limit,
+            match_exact_events=match_exact_events,
+        )
+        query = (
+            f'SELECT * FROM ({query}) WHERE (timestamp, history_events_identifier) > (?, ?) '
+            'ORDER BY timestamp, history_events_identifier LIMIT ?'
+        )
+
+        def iterate_rows() -> Iterator[tuple]:
+            last_key: tuple[int, int] = (-1, -1)
+            while True:
+                with self.db.conn.threaded_read_ctx() as cursor:
+                    rows = cursor.execute(query, (*bindings, *last_key, chunk_size)).fetchall()
+                yield from rows
+                if len(rows) < chunk_size:
+                    return
+                last_key = rows[-1][4], rows[-1][1]  # timestamp, history_events_identifier
+
+        events = self._deserialize_history_events(
+            rows=iterate_rows(),
+            group_by_event_ids=False,
+            report_failures=report_failures,
+        )
+        while len(chunk := list(islice(events, chunk_size))) != 0:
+            yield chunk  # type: ignore[misc]  # not grouped so they are only events
+
+    def _prepare_history_events_query(
+            self,
+            filter_query: HistoryBaseEntryFilterQuery,
+            entries_limit: int | None,
+            group_by_event_ids: bool = False,
+            match_exact_events: bool = True,
+    ) -> tuple[str, list]:
+        """Returns the sql query and bindings for the history events with pagination"""
         base_query, filters_bindings = self._create_history_events_query(
             filter_query=filter_query,
             group_by_event_ids=group_by_event_ids,
@@ -649,13 +758,22 @@ class DBHistoryEvents:
         if filter_query.pagination is not None:
             base_query = f'SELECT * FROM ({base_query}) {filter_query.pagination.prepare()}'
 
+        return base_query, filters_bindings
+
+    def _deserialize_history_events(
+            self,
+            rows: Iterable[tuple],
+            group_by_event_ids: bool,
+            report_failures: bool = True,
+    ) -> Iterator[HistoryBaseEntry | tuple[int, HistoryBaseEntry]]:
+        """Deserialize the rows of a history events query depending on the event type.
+        Rows that fail to be deserialized are skipped and if report_failures is True an
+        error is shown at the end."""
         ethereum_tracked_accounts: set[ChecksumEvmAddress] | None = None
-        cursor.execute(base_query, filters_bindings)
-        output: list[HistoryBaseEntry] | list[tuple[int, HistoryBaseEntry]] = []
         type_idx = 1 if group_by_event_ids else 0
         data_start_idx = type_idx + 1
         failed_to_deserialize = False
-        for entry in cursor:
+        for entry in rows:
             entry_type = HistoryBaseEntryType(entry[type_idx])
             try:
                 deserialized_event: HistoryEvent | AssetMovement | SwapEvent | SolanaEvent | (EvmEvent | (EthWithdrawalEvent | EthBlockEvent))  # noqa: E501
@@ -720,18 +838,16 @@ class DBHistoryEvents:
                 continue
 
             if group_by_event_ids is True:
-                output.append((entry[0], deserialized_event))  # type: ignore
+                yield entry[0], deserialized_event
             else:
-                output.append(deserialized_event)  # type: ignore
+                yield deserialized_event
 
-        if failed_to_deserialize:
+        if failed_to_deserialize and report_failures:
             self.db.msg_aggregator.add_error(
                 'Could not deserialize one or more history event(s). '
                 'Try redecoding the event(s) or check the logs for more details.',
             )
 
-        return output
-
     @overload
     def get_history_events_internal(
             self,
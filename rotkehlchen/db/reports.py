@@ -1,5 +1,6 @@
+import json
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from copy import deepcopy
 from typing import TYPE_CHECKING, Any, Literal, overload
 
@@ -7,6 +8,7 @@ from pysqlcipher3 import dbapi2 as sqlcipher
 
 from rotkehlchen.accounting.pnl import PnlTotals
 from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
+from rotkehlchen.accounting.types import PnlCheckpoint
 from rotkehlchen.db.settings import DBSettings
 from rotkehlchen.errors.asset import WrongAssetType
 from rotkehlchen.errors.misc import InputError
@@ -14,10 +16,14 @@ from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import Timestamp
 from rotkehlchen.utils.misc import ts_now
+from rotkehlchen.utils.serialization import jsonloads_dict, rlk_jsondumps
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Number of pnl events written to or read from the DB at once
+PNL_EVENTS_WRITE_BATCH_SIZE = 5000
+
 if TYPE_CHECKING:
     from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.db.filtering import ReportDataFilterQuery
@@ -78,6 +84,81 @@ def _get_reports_or_events_maybe_limit(
     return entries[:returning_entries_length], entries_found, entries_total
 
 
+def _serialize_report_data(
+        report_id: int,
+        time: Timestamp,
+        ts_converter: Callable[[Timestamp], str],
+        event: ProcessedAccountingEvent,
+) -> tuple[int, Timestamp, str, str, str, str | None]:
+    """Serialize a processed event to a pnl_events row.
+
+    May raise:
+    - DeserializationError if there is a conflict at serialization of the event
+    """
+    try:
+        asset_symbol = event.asset.symbol_or_name()
+    except WrongAssetType:
+        asset_symbol = None
+
+    return (
+        report_id,
+        time,
+        event.serialize_for_db(ts_converter),
+        str(event.pnl.taxable),
+        str(event.pnl.free),
+        asset_symbol,
+    )
+
+
+class PnlEventsWriter:
+    """Buffers the processed events of a report and writes them to the DB in batches,
+    each in a single transaction, instead of one transaction per event.
+
+    The events are serialized when added so later changes to them are not saved,
+    same as when they are written one by one. flush() needs to be called at the end.
+    """
+
+    def __init__(
+            self,
+            database: 'DBHandler',
+            report_id: int,
+            ts_converter: Callable[[Timestamp], str],
+            batch_size: int = PNL_EVENTS_WRITE_BATCH_SIZE,
+    ) -> None:
+        self.dbreports = DBAccountingReports(database)
+        self.report_id = report_id
+        self.ts_converter = ts_converter
+        self.batch_size = batch_size
+        self.rows: list[tuple] = []
+
+    def add(self, event: ProcessedAccountingEvent) -> None:
+        """May raise:
+        - DeserializationError if there is a conflict at serialization of the event
+        - InputError if a batch of events can not be written to the DB
+        """
+        self.rows.append(_serialize_report_data(
+            report_id=self.report_id,
+            time=event.timestamp,
+            ts_converter=self.ts_converter,
+            event=event,
+        ))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all the buffered events to the DB. The buffer is emptied even if
+        writing fails so that a failed batch is not retried with every event.
+
+        May raise:
+        - InputError if the events can not be written to the DB
+        """
+        if len(self.rows) == 0:
+            return
+
+        rows, self.rows = self.rows, []
+        self.dbreports.add_report_data_rows(report_id=self.report_id, rows=rows)
+
+
 class DBAccountingReports:
 
     def __init__(self, database: 'DBHandler'):
@@ -245,37 +326,52 @@ class DBAccountingReports:
         - DeserializationError if there is a conflict at serialization of the event
         - InputError if the event can not be written to the DB. Probably report id does not exist.
         """
-        data = event.serialize_for_db(ts_converter)
+        self.add_report_data_rows(
+            report_id=report_id,
+            rows=[_serialize_report_data(report_id, time, ts_converter, event)],
+        )
 
-        try:
-            asset_symbol = event.asset.symbol_or_name()
-        except WrongAssetType:
-            asset_symbol = None
+    def add_report_data_rows(self, report_id: int, rows: list[tuple]) -> None:
+        """Adds the already serialized pnl events of a report in a single transaction
 
-        query = """
-        INSERT INTO pnl_events(
-            report_id, timestamp, data, pnl_taxable, pnl_free, asset
-        )
-        VALUES(?, ?, ?, ?, ?, ?);"""
+        May raise:
+        - InputError if the events can not be written to the DB. Probably report id does not exist.
+        """
         with self.db.transient_write() as cursor:
             try:
-                cursor.execute(
-                    query,
-                    (
-                        report_id,
-                        time,
-                        data,
-                        str(event.pnl.taxable),
-                        str(event.pnl.free),
-                        asset_symbol,
-                    ),
+                cursor.executemany(
+                    'INSERT INTO pnl_events(report_id, timestamp, data, pnl_taxable, pnl_free, '
+                    'asset) VALUES(?, ?, ?, ?, ?, ?)',
+                    rows,
                 )
             except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
                 raise InputError(
-                    f'Could not write {event} data to the DB due to {e!s}. '
+                    f'Could not write {len(rows)} events to the DB due to {e!s}. '
                     f'Probably report {report_id} does not exist?',
                 ) from e
 
+    def iterate_report_data(self, report_id: int) -> Iterator[ProcessedAccountingEvent]:
+        """Iterate the events of a report in the order they were processed, reading
+        them from the DB in pages so that they are not all in memory at once"""
+        last_identifier = 0
+        while True:
+            with self.db.conn_transient.read_ctx() as cursor:
+                rows = cursor.execute(
+                    'SELECT identifier, timestamp, data FROM pnl_events WHERE report_id=? AND '
+                    'identifier > ? ORDER BY identifier LIMIT ?',
+                    (report_id, last_identifier, PNL_EVENTS_WRITE_BATCH_SIZE),
+                ).fetchall()
+
+            for identifier, timestamp, data in rows:
+                last_identifier = identifier
+                try:
+                    yield ProcessedAccountingEvent.deserialize_from_db(timestamp, data)
+                except DeserializationError as e:
+                    log.error(f'Could not deserialize pnl event {identifier} due to {e!s}')
+
+            if len(rows) < PNL_EVENTS_WRITE_BATCH_SIZE:
+                break
+
     def get_report_data(
             self,
             filter_: 'ReportDataFilterQuery',
@@ -328,3 +424,80 @@ class DBAccountingReports:
             entries=records,
             limit=limit,
         )
+
+    def add_checkpoint(self, checkpoint: PnlCheckpoint, keep: int) -> None:
+        """Saves a PnL checkpoint and only keeps the `keep` latest ones for its settings hash"""
+        with self.db.transient_write() as cursor:
+            cursor.execute(
+                'INSERT OR REPLACE INTO pnl_checkpoints(settings_hash, events_num, timestamp, '
+                'processed_actions, events_digest, state) VALUES(?, ?, ?, ?, ?, ?)',
+                (
+                    checkpoint.settings_hash,
+                    checkpoint.events_num,
+                    checkpoint.timestamp,
+                    checkpoint.processed_actions,
+                    checkpoint.events_digest,
+                    rlk_jsondumps(checkpoint.state),
+                ),
+            )
+            cursor.execute(
+                'DELETE FROM pnl_checkpoints WHERE settings_hash=? AND events_num NOT IN '
+                '(SELECT events_num FROM pnl_checkpoints WHERE settings_hash=? '
+                'ORDER BY events_num DESC LIMIT ?)',
+                (checkpoint.settings_hash, checkpoint.settings_hash, keep),
+            )
+
+    def get_checkpoints(self, settings_hash: str) -> list[PnlCheckpoint]:
+        """Returns the saved checkpoints for the given settings hash ordered by the number
+        of events they cover. The state is not loaded and is left empty."""
+        with self.db.conn_transient.read_ctx() as cursor:
+            cursor.execute(
+                'SELECT events_num, timestamp, processed_actions, events_digest '
+                'FROM pnl_checkpoints WHERE settings_hash=? ORDER BY events_num ASC',
+                (settings_hash,),
+            )
+            return [PnlCheckpoint(
+                settings_hash=settings_hash,
+                events_num=entry[0],
+                timestamp=Timestamp(entry[1]),
+                processed_actions=entry[2],
+                events_digest=entry[3],
+                state={},
+            ) for entry in cursor]
+
+    def get_checkpoint_state(self, settings_hash: str, events_num: int) -> dict[str, Any]:
+        """Returns the saved pot state of a checkpoint
+
+        May raise:
+        - InputError if the checkpoint does not exist
+        - DeserializationError if the saved state is not a valid json dict
+        """
+        with self.db.conn_transient.read_ctx() as cursor:
+            result = cursor.execute(
+                'SELECT state FROM pnl_checkpoints WHERE settings_hash=? AND events_num=?',
+                (settings_hash, events_num),
+            ).fetchone()
+
+        if result is None:
+            raise InputError(f'PnL checkpoint at {events_num} events does not exist')
+
+        try:
+            return jsonloads_dict(result[0])
+        except json.JSONDecodeError as e:
+            raise DeserializationError(f'Could not decode PnL checkpoint state: {e!s}') from e
+
+    def delete_checkpoints(self, settings_hash: str | None = None, from_events_num: int = 0) -> None:  # noqa: E501
+        """Deletes the checkpoints that cover at least `from_events_num` events.
+
+        If no settings hash is given the checkpoints of all settings are deleted."""
+        with self.db.transient_write() as cursor:
+            if settings_hash is None:
+                cursor.execute(
+                    'DELETE FROM pnl_checkpoints WHERE events_num >= ?',
+                    (from_events_num,),
+                )
+            else:
+                cursor.execute(
+                    'DELETE FROM pnl_checkpoints WHERE settings_hash=? AND events_num >= ?',
+                    (settings_hash, from_events_num),
+                )
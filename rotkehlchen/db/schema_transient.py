@@ -50,6 +50,44 @@ CREATE TABLE IF NOT EXISTS pnl_events (
 );
 """
 
+# Saved state of the accounting pot after processing a prefix of the sorted history events.
+# Used so that PnL reports can resume processing instead of starting from the first event.
+DB_CREATE_PNL_CHECKPOINTS = """
+CREATE TABLE IF NOT EXISTS pnl_checkpoints (
+    settings_hash TEXT NOT NULL,
+    events_num INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    processed_actions INTEGER NOT NULL,
+    events_digest TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY(settings_hash, events_num)
+);
+"""
+
+# Balance of each asset at the end of each day in which it changed as calculated by replaying
+# the history events. Used so that historical balance queries don't replay all events.
+DB_CREATE_DAILY_BALANCES = """
+CREATE TABLE IF NOT EXISTS history_events_daily_balances (
+    asset TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    amount TEXT NOT NULL,
+    PRIMARY KEY(asset, timestamp)
+);
+CREATE INDEX IF NOT EXISTS idx_daily_balances_timestamp ON history_events_daily_balances(timestamp);
+"""  # noqa: E501
+
+# Results of remote queries that are cached in memory and are also kept here so
+# that they can be used after a restart while they are still fresh.
+DB_CREATE_CACHED_RESULTS = """
+CREATE TABLE IF NOT EXISTS cached_results (
+    namespace TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY(namespace, signature)
+);
+"""
+
 DB_CREATE_SETTINGS = """
 CREATE TABLE IF NOT EXISTS settings (
     name VARCHAR[24] NOT NULL PRIMARY KEY,
@@ -64,6 +102,9 @@ BEGIN TRANSACTION;
 {DB_CREATE_REPORT_SETTINGS}
 {DB_CREATE_REPORT_TOTALS}
 {DB_CREATE_PNL_EVENTS}
+{DB_CREATE_PNL_CHECKPOINTS}
+{DB_CREATE_DAILY_BALANCES}
+{DB_CREATE_CACHED_RESULTS}
 {DB_CREATE_SETTINGS}
 COMMIT;
 PRAGMA foreign_keys=on;
@@ -77,6 +77,7 @@ DEFAULT_AUTO_CREATE_CALENDAR_REMINDERS = True
 DEFAULT_ASK_USER_UPON_SIZE_DISCREPANCY = True
 DEFAULT_AUTO_DETECT_TOKENS = True
 DEFAULT_CSV_EXPORT_DELIMITER = ','
+DEFAULT_HEDGE_RPC_REQUESTS = False
 
 LIST_KEYS = (
     'current_price_oracles',
@@ -104,6 +105,7 @@ BOOLEAN_KEYS = (
     'auto_create_calendar_reminders',
     'ask_user_upon_size_discrepancy',
     'auto_detect_tokens',
+    'hedge_rpc_requests',
 )
 INTEGER_KEYS = (
     'version',
@@ -173,6 +175,7 @@ CachedDBSettingsFieldNames = Literal[
     'auto_delete_calendar_entries',
     'auto_create_calendar_reminders',
     'ask_user_upon_size_discrepancy',
+    'hedge_rpc_requests',
 ]
 
 DBSettingsFieldTypes = (
@@ -238,6 +241,7 @@ class DBSettings:
     ask_user_upon_size_discrepancy: bool = DEFAULT_ASK_USER_UPON_SIZE_DISCREPANCY
     auto_detect_tokens: bool = DEFAULT_AUTO_DETECT_TOKENS
     csv_export_delimiter: str = DEFAULT_CSV_EXPORT_DELIMITER
+    hedge_rpc_requests: bool = DEFAULT_HEDGE_RPC_REQUESTS
 
     def serialize(self) -> dict[str, Any]:
         settings_dict = {}
@@ -300,6 +304,7 @@ class ModifiableDBSettings(NamedTuple):
     ask_user_upon_size_discrepancy: bool | None = None
     auto_detect_tokens: bool | None = None
     csv_export_delimiter: str | None = None
+    hedge_rpc_requests: bool | None = None
 
     def serialize(self) -> dict[str, Any]:
         settings_dict = {}
@@ -427,6 +427,14 @@ def get_query_chunks(data: Sequence[T]) -> list[tuple[Sequence[T], str]]:
     ]
 
 
+def get_unlock_script(password: str, sqlcipher_version: int) -> str:
+    """Get the script that sets the decryption key of an SQLCipher encrypted database"""
+    script = f"PRAGMA key='{protect_password_sqlcipher(password)}';"
+    if sqlcipher_version == 3:
+        script += f'PRAGMA kdf_iter={KDF_ITER};'
+    return script
+
+
 def unlock_database(
         db_connection: 'DBConnection',
         password: str,
@@ -446,12 +454,8 @@ def unlock_database(
     May raise:
     - sqlcipher.DatabaseError if the password is incorrect or database is corrupted
     """
-    script = f"PRAGMA key='{protect_password_sqlcipher(password)}';"
-    if sqlcipher_version == 3:
-        script += f'PRAGMA kdf_iter={KDF_ITER};'
-
     with db_connection.write_ctx() as write_cursor:
-        write_cursor.executescript(script)
+        write_cursor.executescript(get_unlock_script(password, sqlcipher_version))
         # the following will fail with DatabaseError in case of wrong password.
         # If this goes away at any point it needs to be replaced by something
         # that checks the password is correct at this same point in the code
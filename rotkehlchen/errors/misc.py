@@ -82,6 +82,12 @@ class BlockchainQueryError(Exception):
     """
 
 
+class NodeQueryError(RemoteError):
+    """Raised when no blockchain node could be queried and at least one of them responded
+    with an error for the query itself, like a contract call running out of gas, instead
+    of not responding at all"""
+
+
 class EventNotInABI(Exception):
     """Raised when trying to query an event and that is not found in the ABI"""
 
@@ -2,9 +2,11 @@ import hashlib
 import json
 import logging
 import operator
+import time
 from collections import defaultdict
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from contextlib import suppress
+from functools import partial
 from json.decoder import JSONDecodeError
 from typing import TYPE_CHECKING, Any, Final, Literal
 from urllib.parse import urlencode
@@ -25,6 +27,7 @@ from rotkehlchen.db.constants import BINANCE_MARKETS_KEY
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.db.ranges import DBQueryRanges
 from rotkehlchen.db.settings import CachedSettings
+from rotkehlchen.db.utils import get_query_chunks
 from rotkehlchen.errors.asset import UnknownAsset, UnsupportedAsset
 from rotkehlchen.errors.misc import InputError, RemoteError
 from rotkehlchen.errors.serialization import DeserializationError
@@ -41,6 +44,7 @@ from rotkehlchen.exchanges.utils import (
     query_binance_exchange_pairs,
 )
 from rotkehlchen.fval import FVal
+from rotkehlchen.greenlets.utils import run_concurrently
 from rotkehlchen.history.deserialization import deserialize_price
 from rotkehlchen.history.events.structures.asset_movement import (
     AssetMovement,
@@ -116,6 +120,64 @@ BINANCEUS_BASE_URL: Final = 'binance.us/'
 
 BINANCE_ASSETS_STARTING_WITH_LD: Final = ('LDO',)
 
+# Request weight allowed per minute by the spot api of each exchange. Binance reports the
+# weight used in the current minute in the X-MBX-USED-WEIGHT-1M header of the responses.
+# https://developers.binance.com/docs/binance-spot-api-docs/rest-api/limits
+BINANCE_REQUEST_WEIGHT_LIMIT: Final = 6000
+BINANCEUS_REQUEST_WEIGHT_LIMIT: Final = 1200
+USED_WEIGHT_HEADER: Final = 'X-MBX-USED-WEIGHT-1M'
+# Part of the request weight limit the trades crawler uses, leaving the rest to other queries
+TRADES_CRAWL_WEIGHT_RATIO: Final = 0.8
+MY_TRADES_WEIGHT: Final = 20
+# Max trades returned by a myTrades query
+MY_TRADES_LIMIT: Final = 1000
+MAX_CONCURRENT_MARKETS: Final = 16
+
+
+class RequestWeightBudget:
+    """Request weight binance allows per minute. The weight used in the current minute is
+    updated from the responses and the weight of requests in flight is reserved, so that
+    concurrent requests wait for the next minute instead of getting rate limited."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.used = 0
+        self.reserved = 0
+        self.minute = 0
+
+    def _refresh(self) -> float:
+        """Reset the used weight if a new minute started. Returns the current time"""
+        if (minute := int((now := time.time()) // 60)) != self.minute:
+            self.minute, self.used = minute, 0
+        return now
+
+    def acquire(self, weight: int, ratio: float = 1.0) -> None:
+        """Wait until the weight fits in the given ratio of the budget and reserve it"""
+        while True:
+            now = self._refresh()
+            if self.used + self.reserved + weight <= self.limit * ratio or self.used + self.reserved == 0:  # noqa: E501
+                self.reserved += weight
+                return
+
+            log.debug(f'Binance request weight budget of {self.limit} is used. Waiting for the next minute')  # noqa: E501
+            gevent.sleep(60 - now % 60)
+
+    def release(self, weight: int) -> None:
+        self.reserved -= weight
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        if (used := headers.get(USED_WEIGHT_HEADER)) is None:
+            return
+
+        self._refresh()
+        with suppress(ValueError):
+            self.used = max(self.used, int(used))
+
+    def exhaust(self) -> None:
+        """Called when binance rate limits us so that the budget waits for the next minute"""
+        self._refresh()
+        self.used = self.limit
+
 
 class BinancePermissionError(RemoteError):
     """Exception raised when a binance permission problem is detected
@@ -224,6 +286,9 @@ class Binance(ExchangeInterface, ExchangeWithExtras, SignatureGeneratorMixin):
         })
         self.offset_ms = 0
         self.selected_pairs = binance_selected_trade_pairs
+        self.request_weight = RequestWeightBudget(
+            limit=BINANCEUS_REQUEST_WEIGHT_LIMIT if uri == BINANCEUS_BASE_URL else BINANCE_REQUEST_WEIGHT_LIMIT,  # noqa: E501
+        )
 
     def first_connection(self) -> None:
         if self.first_connection_made:
@@ -363,6 +428,9 @@ class Binance(ExchangeInterface, ExchangeWithExtras, SignatureGeneratorMixin):
                     f'{self.name} API request failed due to {e!s}',
                 ) from e
 
+            if api_type == 'api':  # the weight limits of the other apis are separate
+                self.request_weight.update(response.headers)
+
             if response.status_code not in {200, 418, 429}:
                 code = 'no code found'
                 msg = 'no message found'
@@ -406,6 +474,8 @@ class Binance(ExchangeInterface, ExchangeWithExtras, SignatureGeneratorMixin):
                     f'{response.status_code} and headers {response.headers}. '
                     f'Retries left: {tries_left}',
                 )
+                if api_type == 'api':
+                    self.request_weight.exhaust()
                 if tries_left >= 1:
                     backoff_seconds = 10 / tries_left
                     gevent.sleep(backoff_seconds)
@@ -1143,7 +1213,8 @@ class Binance(ExchangeInterface, ExchangeWithExtras, SignatureGeneratorMixin):
         For trades coming from api/myTrades this function won't respect the provided range and
         will always query all the trades until now. The reason is that binance forces us to query
         all the pairs and we use the cache at BINANCE_PAIR_LAST_ID to remember which one was the
-        last trade queried on each market speeding up the queries. For fiat payments the time
+        last trade queried on each market speeding up the queries. The markets are queried
+        concurrently within the request weight budget of binance. For fiat payments the time
         range is respected.
 
         May raise due to api query, unexpected id, or missing market pairs:
@@ -1161,53 +1232,49 @@ class Binance(ExchangeInterface, ExchangeWithExtras, SignatureGeneratorMixin):
 
         iter_markets = list(set(self.selected_pairs).intersection(set(self._symbols_to_pair.keys())))  # noqa: E501
         log.debug(f'Will query the following binance markets: {iter_markets}')
-        raw_data = []
-        # Limit of results to return. 1000 is max limit according to docs
-        limit = 1000
-        for symbol in iter_markets:
-            if force_refresh:
-                last_trade_id = 0  # Bypass cache when force_refresh is True
-            else:
-                with self.db.conn.read_ctx() as cursor:
-                    last_trade_id = self.db.get_dynamic_cache(  # api returns trades with id >= last_trade_id  # noqa: E501
-                        cursor=cursor,
-                        name=DBCacheDynamic.BINANCE_PAIR_LAST_ID,
-                        location=self.location.serialize(),
-                        location_name=self.name,
-                        queried_pair=symbol,
-                    ) or 0
-
-            log.debug(
-                f'Will query binance trades on {self.name} for {symbol=} after {last_trade_id=}',
+        if force_refresh:
+            last_trade_ids = {}  # Bypass cache when force_refresh is True
+        else:
+            with self.db.conn.read_ctx() as cursor:
+                last_trade_ids = self._get_pairs_last_trade_id(cursor=cursor, symbols=iter_markets)
+
+        # trades of each market are kept even if its crawl fails midway. Since the last
+        # trade id of the market is then saved, the next query resumes from there.
+        market_trades: dict[str, list[dict[str, Any]]] = {symbol: [] for symbol in iter_markets}
+        _, errors = run_concurrently(
+            tasks={
+                symbol: partial(
+                    self._query_market_trades,
+                    symbol=symbol,
+                    last_trade_id=last_trade_ids.get(symbol, 0),
+                    trades=market_trades[symbol],
+                )
+                for symbol in iter_markets
+            },
+            concurrency=max(1, min(
+                MAX_CONCURRENT_MARKETS,
+                int(self.request_weight.limit * TRADES_CRAWL_WEIGHT_RATIO) // MY_TRADES_WEIGHT,
+            )),
+            timeout=None,
+        )
+        if len(errors) != 0:
+            log.error(
+                f'Failed to query all {self.name} trades of the markets {list(errors)}. '
+                f'The next query will continue after their last queried trade. '
+                f'Errors: {[str(x) for x in errors.values()]}',
             )
-            len_result = limit
-            while len_result == limit:
-                # We know that myTrades returns a list from the api docs
-                result = self.api_query_list(
-                    'api',
-                    'myTrades',
-                    options={
-                        'symbol': symbol,
-                        'fromId': last_trade_id,
-                        'limit': limit,
-                        # Not specifying them since binance does not seem to
-                        # respect them and always return all trades
-                    })
-                if result:
-                    try:
-                        last_trade_id = int(result[-1]['id']) + 1
-                    except (ValueError, KeyError, IndexError) as e:
-                        raise RemoteError(
-                            f'Could not parse id from Binance myTrades api query result: {result}',
-                        ) from e
+            if len(errors) == len(iter_markets) and not any(market_trades.values()):
+                raise next(iter(errors.values()))
 
-                len_result = len(result)
-                log.debug(f'{self.name} myTrades query result', results_num=len_result)
-                for r in result:
-                    r['symbol'] = symbol
-                raw_data.extend(result)
+            self.msg_aggregator.add_warning(
+                f'Failed to query all {self.name} trades of the markets '
+                f'{", ".join(sorted(errors))}. Their query will resume on the next sync.',
+            )
 
-            raw_data.sort(key=operator.itemgetter('time'))
+        raw_data = sorted(
+            (trade for trades in market_trades.values() for trade in trades),
+            key=operator.itemgetter('time'),
+        )
 
         events: list[SwapEvent] = []
         last_pair_to_tradeid: dict[str, str] = {}
@@ -1253,15 +1320,10 @@ class Binance(ExchangeInterface, ExchangeWithExtras, SignatureGeneratorMixin):
 
         if not force_refresh:  # Only update cache when not forcing refresh
             with self.db.conn.write_ctx() as write_cursor:
-                for symbol, unique_id in last_pair_to_tradeid.items():
-                    self.db.set_dynamic_cache(
-                        write_cursor=write_cursor,
-                        name=DBCacheDynamic.BINANCE_PAIR_LAST_ID,
-                        value=int(unique_id),
-                        location=self.location.serialize(),
-                        location_name=self.name,
-                        queried_pair=symbol,
-                    )
+                self._save_pairs_last_trade_id(
+                    write_cursor=write_cursor,
+                    last_trade_ids={symbol: int(unique_id) for symbol, unique_id in last_pair_to_tradeid.items()},  # noqa: E501
+                )
 
         fiat_payments = self._query_online_fiat_payments(start_ts=start_ts, end_ts=end_ts)
         if fiat_payments:
@@ -1270,6 +1332,84 @@ class Binance(ExchangeInterface, ExchangeWithExtras, SignatureGeneratorMixin):
 
         return events
 
+    def _pair_last_trade_id_key(self, symbol: str) -> str:
+        return DBCacheDynamic.BINANCE_PAIR_LAST_ID.get_db_key(
+            location=self.location.serialize(),
+            location_name=self.name,
+            queried_pair=symbol,
+        )
+
+    def _get_pairs_last_trade_id(self, cursor: 'DBCursor', symbols: list[str]) -> dict[str, int]:
+        """Read the id of the last queried trade of each of the given markets"""
+        symbol_by_key = {self._pair_last_trade_id_key(symbol): symbol for symbol in symbols}
+        last_trade_ids = {}
+        for chunk, placeholders in get_query_chunks(list(symbol_by_key)):
+            for key, value in cursor.execute(
+                f'SELECT name, value FROM key_value_cache WHERE name IN ({placeholders})',
+                chunk,
+            ):
+                last_trade_ids[symbol_by_key[key]] = int(value)
+
+        return last_trade_ids
+
+    def _save_pairs_last_trade_id(
+            self,
+            write_cursor: 'DBCursor',
+            last_trade_ids: dict[str, int],
+    ) -> None:
+        write_cursor.executemany(
+            'INSERT OR REPLACE INTO key_value_cache(name, value) VALUES(?, ?)',
+            [(self._pair_last_trade_id_key(symbol), value) for symbol, value in last_trade_ids.items()],  # noqa: E501
+        )
+
+    def _query_market_trades(
+            self,
+            symbol: str,
+            last_trade_id: int,
+            trades: list[dict[str, Any]],
+    ) -> None:
+        """Query the trades of a market with an id greater than or equal to last_trade_id
+        and append them to the given list. Each page waits for the request weight budget.
+
+        May raise:
+        - RemoteError
+        - BinancePermissionError
+        """
+        log.debug(
+            f'Will query binance trades on {self.name} for {symbol=} after {last_trade_id=}',
+        )
+        len_result = MY_TRADES_LIMIT
+        while len_result == MY_TRADES_LIMIT:
+            self.request_weight.acquire(weight=MY_TRADES_WEIGHT, ratio=TRADES_CRAWL_WEIGHT_RATIO)
+            try:
+                # We know that myTrades returns a list from the api docs
+                result = self.api_query_list(
+                    'api',
+                    'myTrades',
+                    options={
+                        'symbol': symbol,
+                        'fromId': last_trade_id,
+                        'limit': MY_TRADES_LIMIT,
+                        # Not specifying them since binance does not seem to
+                        # respect them and always return all trades
+                    })
+            finally:
+                self.request_weight.release(weight=MY_TRADES_WEIGHT)
+
+            if result:
+                try:
+                    last_trade_id = int(result[-1]['id']) + 1
+                except (ValueError, KeyError, IndexError) as e:
+                    raise RemoteError(
+                        f'Could not parse id from Binance myTrades api query result: {result}',
+                    ) from e
+
+            len_result = len(result)
+            log.debug(f'{self.name} myTrades query result', symbol=symbol, results_num=len_result)
+            for r in result:
+                r['symbol'] = symbol
+            trades.extend(result)
+
     def _query_online_fiat_payments(
             self,
             start_ts: Timestamp,
@@ -9,11 +9,12 @@ from rotkehlchen.api.websockets.typedefs import (
     HistoryEventsStep,
     WSMessageType,
 )
-from rotkehlchen.assets.asset import AssetWithOracles
+from rotkehlchen.assets.asset import Asset, AssetWithOracles
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.db.ranges import DBQueryRanges
 from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.exchanges.data_structures import MarginPosition
+from rotkehlchen.fval import FVal
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import (
     ApiKey,
@@ -26,7 +27,7 @@ from rotkehlchen.types import (
     Timestamp,
 )
 from rotkehlchen.utils.misc import set_user_agent, ts_now
-from rotkehlchen.utils.mixins.cacheable import CacheableMixIn
+from rotkehlchen.utils.mixins.cacheable import CacheableMixIn, PersistedMethod
 from rotkehlchen.utils.mixins.lockable import LockableQueryMixIn, protect_with_lock
 from rotkehlchen.utils.network import create_session
 
@@ -41,6 +42,24 @@ log = RotkehlchenLogsAdapter(logger)
 
 ExchangeQueryBalances = tuple[dict[AssetWithOracles, Balance] | None, str]
 
+
+def _serialize_query_balances(result: ExchangeQueryBalances) -> dict[str, dict[str, str]] | None:
+    """Serialize successful balance queries to be kept in the transient DB"""
+    if result[0] is None:
+        return None  # failed queries are not kept across restarts
+    return {asset.identifier: balance.serialize() for asset, balance in result[0].items()}
+
+
+def _deserialize_query_balances(data: dict[str, dict[str, str]]) -> ExchangeQueryBalances:
+    """May raise any of the asset resolution or deserialization errors"""
+    return {
+        Asset(identifier).resolve_to_asset_with_oracles(): Balance(
+            amount=FVal(balance['amount']),
+            usd_value=FVal(balance['usd_value']),
+        ) for identifier, balance in data.items()
+    }, ''
+
+
 ExchangeHistoryFailCallback = Callable[[str], None]
 ExchangeHistoryNewStepCallback = Callable[[str], None]
 
@@ -89,6 +108,15 @@ class ExchangeWithoutApiSecret(CacheableMixIn, LockableQueryMixIn):
         self.first_connection_made = False
         self.session = create_session()
         set_user_agent(self.session)
+        # keep the balances across restarts to not requery all exchanges after one
+        self.results_cache.enable_persistence(
+            database=database,
+            namespace=lambda: f'{self.location!s}_{self.name}',
+            methods={'query_balances': PersistedMethod(
+                serialize=_serialize_query_balances,
+                deserialize=_deserialize_query_balances,
+            )},
+        )
         log.info(f'Initialized {location!s} exchange {name}')
 
     def reset_to_db_credentials(self) -> None:
@@ -142,7 +142,9 @@ class ExchangeManager:
                 exchangeobj.reset_to_db_extras()
             return False, f"Couldn't update exchange properties in the DB. {e!s}"
 
-        # Finally edit the name of the exchange object
+        # Finally edit the name of the exchange object. Cached balances may be from
+        # the old credentials or saved under the old name so clear them.
+        exchangeobj.results_cache.clear()
         if new_name is not None:
             exchangeobj.name = new_name
 
@@ -153,7 +155,7 @@ class ExchangeManager:
         Deletes an exchange with the specified name + location from both connected_exchanges
         and the DB.
         """
-        if self.get_exchange(name=name, location=location) is None:
+        if (exchangeobj := self.get_exchange(name=name, location=location)) is None:
             return False, f'{location!s} exchange {name} is not registered'
 
         exchanges_list = self.connected_exchanges.get(location)
@@ -164,6 +166,7 @@ class ExchangeManager:
             self.connected_exchanges.pop(location)
         else:
             self.connected_exchanges[location] = [x for x in exchanges_list if x.name != name]
+        exchangeobj.results_cache.clear()
         with self.database.user_write() as write_cursor:  # Also remove it from the db
             self.database.remove_exchange(write_cursor=write_cursor, name=name, location=location)
             self.database.delete_used_query_range_for_exchange(
@@ -2,7 +2,6 @@ import json
 import logging
 from typing import TYPE_CHECKING, Any, Final
 
-import gevent
 from pysqlcipher3 import dbapi2 as sqlcipher
 from requests import Response
 
@@ -30,6 +29,7 @@ from rotkehlchen.types import (
     deserialize_evm_tx_hash,
 )
 from rotkehlchen.utils.misc import from_gwei, hexstr_to_int, ts_sec_to_ms
+from rotkehlchen.utils.rate_limiter import RateLimiter
 
 if TYPE_CHECKING:
     from rotkehlchen.db.dbhandler import DBHandler
@@ -111,9 +111,11 @@ class Etherscan(ExternalServiceWithRecommendedApiKey, EtherscanLikeApi):
                 )):
                     log.debug(
                         f'Got response: {response.text} from {self.name} while '
-                        f'querying chain {chain_id}. Will backoff for {current_backoff} seconds.',
+                        f'querying chain {chain_id}. Will retry after backing off.',
                     )
-                    gevent.sleep(current_backoff)
+                    # these come with a 200 status, which already reset the backoff of the
+                    # rate limiter, so the backoff of this query is the pause to take
+                    RateLimiter().throttle(url=response.url, retry_after=current_backoff)
                     return current_backoff * 2
 
                 elif result.startswith('Max daily'):
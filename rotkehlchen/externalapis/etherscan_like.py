@@ -8,7 +8,6 @@ from http import HTTPStatus
 from json.decoder import JSONDecodeError
 from typing import TYPE_CHECKING, Any, Final, Literal, overload
 
-import gevent
 import requests
 from requests import Response
 
@@ -134,6 +133,8 @@ class EtherscanLikeApi(ExternalServiceWithApiKey, ABC):
     ) -> int:
         """Handles rate limiting errors from etherscan-like services. May be overridden in
         subclasses to handle anything special from a given service. Returns the new backoff time.
+        The session's rate limiter already paused the requests to the service so the next try
+        waits for as long as needed, together with any other request to the same service.
         May raise RemoteError if the rate limit is exceeded even after backing off.
         """
         if current_backoff >= backoff_limit:
@@ -142,11 +143,7 @@ class EtherscanLikeApi(ExternalServiceWithApiKey, ABC):
                 f'even after we incrementally backed off while querying {chain_id}',
             )
 
-        log.debug(
-            f'Got too many requests error from {chain_id} {self.name}. Will '
-            f'backoff for {current_backoff} seconds.',
-        )
-        gevent.sleep(current_backoff)
+        log.debug(f'Got too many requests error from {chain_id} {self.name}. Will retry.')
         return current_backoff * 2
 
     def _additional_json_response_handling(
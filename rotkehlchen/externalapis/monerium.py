@@ -229,6 +229,12 @@ class Monerium:
             querystr += 'WHERE identifier=?'
             bindings.append(event.identifier)
             with self.database.user_write() as write_cursor:
+                if new_type:
+                    DBHistoryEvents.mark_balances_stale(
+                        write_cursor=write_cursor,
+                        where_str='WHERE identifier=?',
+                        bindings=(event.identifier,),
+                    )
                 write_cursor.execute(querystr, bindings)
 
     def update_events(self, events: list['EvmEvent']) -> None:
@@ -1,7 +1,6 @@
 import logging
 from typing import TYPE_CHECKING, Final
 
-import gevent
 from requests import Response
 
 from rotkehlchen.chain.evm.l2_with_l1_fees.types import L2ChainIdsWithL1FeesType
@@ -18,6 +17,7 @@ from rotkehlchen.types import (
     EVMTxHash,
     ExternalService,
 )
+from rotkehlchen.utils.rate_limiter import RateLimiter
 
 if TYPE_CHECKING:
     from rotkehlchen.db.dbhandler import DBHandler
@@ -96,7 +96,7 @@ class Routescan(EtherscanLikeApi):
                     f'while max backoff is {backoff_limit} seconds.',
                 )
             else:
-                gevent.sleep(time_until_reset)
+                RateLimiter().pause(url=response.url, seconds=time_until_reset)
                 return time_until_reset
 
         # If the ratelimit headers are missing or still have requests remaining (shouldn't happen),
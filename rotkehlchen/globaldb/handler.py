@@ -1,6 +1,8 @@
 import logging
 import shutil
-from collections.abc import Callable
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Optional, Union, cast, overload
 
@@ -169,6 +171,7 @@ class GlobalDBHandler:
             globaldb=GlobalDBHandler.__instance if perform_assets_updates else None,
             connection=GlobalDBHandler.__instance.conn,
         )
+        GlobalDBHandler.__instance.conn.enable_read_pool()
         return GlobalDBHandler.__instance
 
     def filepath(self) -> Path:
@@ -311,7 +314,7 @@ class GlobalDBHandler:
         with userdb.conn.read_ctx() as cursor:
             ignored_assets = userdb.get_ignored_asset_ids(cursor)
 
-        with GlobalDBHandler().conn.read_ctx() as cursor:
+        with GlobalDBHandler().conn.threaded_read_ctx() as cursor:
             cursor.execute(query, bindings)
             for entry in cursor:
                 if should_skip(entry[0], ignored_assets):
@@ -469,7 +472,7 @@ class GlobalDBHandler:
 
         query, bindings = filter_query.prepare(without_ignored_asset_filter=True)
         query = ALL_ASSETS_TABLES_QUERY + query
-        with GlobalDBHandler().conn.read_ctx() as cursor:
+        with GlobalDBHandler().conn.threaded_read_ctx() as cursor:
             cursor.execute(query, bindings)
             found_eth = False
             for entry in cursor:
@@ -1512,6 +1515,69 @@ class GlobalDBHandler:
 
         return HistoricalPrice.deserialize_from_db(result)
 
+    @staticmethod
+    def _query_nearest_prices(
+            cursor: DBCursor,
+            from_asset: str,
+            to_asset: str,
+            timestamps: Iterable[Timestamp],
+            max_seconds_distance: int,
+            source_type: str | None = None,
+    ) -> dict[Timestamp, tuple[str, str]]:
+        """Find the cached price entry of a pair closest to each of the given timestamps,
+        prioritizing manual prices in the same way as get_historical_price.
+
+        The timestamps are sorted and split in groups whose search ranges overlap or are
+        close. The cached prices of each group are read with a single range scan of the
+        (from_asset, to_asset, timestamp) index and the entry of each timestamp is picked
+        by bisecting them, so far apart timestamps don't read all the prices in between.
+
+        Returns the source type and price of the entry found for each timestamp.
+        Timestamps without a price within max_seconds_distance are missing.
+        """
+        querystr = (
+            'SELECT timestamp, source_type, price FROM price_history WHERE from_asset=? '
+            'AND to_asset=? AND timestamp BETWEEN ? AND ?'
+        )
+        if source_type is not None:
+            querystr += ' AND source_type=?'
+        querystr += ' ORDER BY timestamp'
+
+        _, manual_type = _prioritize_manual_balances_query()
+        result: dict[Timestamp, tuple[str, str]] = {}
+        sorted_timestamps = sorted(set(timestamps))
+        group_start = 0
+        for idx, timestamp in enumerate(sorted_timestamps, start=1):
+            if idx != len(sorted_timestamps) and sorted_timestamps[idx] - timestamp <= 2 * max_seconds_distance:  # noqa: E501
+                continue  # the next timestamp's range overlaps with this one's
+
+            group = sorted_timestamps[group_start:idx]
+            group_start = idx
+            bindings: tuple = (
+                from_asset,
+                to_asset,
+                group[0] - max_seconds_distance,
+                group[-1] + max_seconds_distance,
+            )
+            entries = cursor.execute(
+                querystr,
+                bindings if source_type is None else (*bindings, source_type),
+            ).fetchall()
+            if len(entries) == 0:
+                continue
+
+            entry_timestamps = [x[0] for x in entries]
+            for group_timestamp in group:
+                candidates = entries[
+                    bisect_left(entry_timestamps, group_timestamp - max_seconds_distance):
+                    bisect_right(entry_timestamps, group_timestamp + max_seconds_distance)
+                ]
+                if len(candidates) != 0:
+                    best = min(candidates, key=lambda x: (x[1] != manual_type, abs(x[0] - group_timestamp)))  # noqa: E501
+                    result[group_timestamp] = best[1], best[2]
+
+        return result
+
     @staticmethod
     def get_historical_prices(
             query_data: list[tuple['Asset', 'Asset', Timestamp]],
@@ -1520,44 +1586,89 @@ class GlobalDBHandler:
     ) -> list[HistoricalPrice | None]:
         """Given a list of from/to/timestamp data to query returns all values
         that could be found in the DB and None for those that could not be found.
+
+        The lookups are grouped by pair and the prices of each pair are found with
+        a few range queries instead of one query per lookup.
         """
-        querystr = (
-            'SELECT from_asset, to_asset, source_type, timestamp, price '
-            'FROM price_history WHERE from_asset=? AND to_asset=? AND timestamp BETWEEN ? AND ?'
-        )
-        querylist: list[tuple] = []
-        if source is not None:
-            querystr += ' AND source_type=? '
-            serialized_source = source.serialize_for_db()
-            for from_asset, to_asset, timestamp in query_data:
-                querylist.append((from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance, serialized_source))  # noqa: E501
+        timestamps_by_pair: defaultdict[tuple[str, str], list[Timestamp]] = defaultdict(list)
+        for from_asset, to_asset, timestamp in query_data:
+            timestamps_by_pair[from_asset.identifier, to_asset.identifier].append(timestamp)
 
-        else:
-            for from_asset, to_asset, timestamp in query_data:
-                querylist.append((from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance))  # noqa: E501
+        source_type = source.serialize_for_db() if source is not None else None
+        with GlobalDBHandler().conn.read_ctx() as cursor:
+            pair_entries = {
+                pair: GlobalDBHandler._query_nearest_prices(
+                    cursor=cursor,
+                    from_asset=pair[0],
+                    to_asset=pair[1],
+                    timestamps=timestamps,
+                    max_seconds_distance=max_seconds_distance,
+                    source_type=source_type,
+                ) for pair, timestamps in timestamps_by_pair.items()
+            }
 
-        order_str, priority_type = _prioritize_manual_balances_query()
-        querystr += order_str
         prices_results: list[HistoricalPrice | None] = []
-        with GlobalDBHandler().conn.read_ctx() as cursor:
-            for query_entry, (_, _, queried_timestamp) in zip(querylist, query_data, strict=True):
-                # to the params add the arguments to prioritize manual prices
-                result = cursor.execute(querystr, query_entry + (priority_type, queried_timestamp)).fetchone()  # below last index of the result tuple is ignored in deserialize  # noqa: E501
-                if result is None:
-                    prices_results.append(None)
-                    continue
+        for from_asset, to_asset, timestamp in query_data:
+            if (entry := pair_entries[from_asset.identifier, to_asset.identifier].get(timestamp)) is None:  # noqa: E501
+                prices_results.append(None)
+                continue
 
-                db_price = HistoricalPrice.deserialize_from_db(result)
+            try:
                 prices_results.append(HistoricalPrice(
-                    from_asset=db_price.from_asset,
-                    to_asset=db_price.to_asset,
-                    source=db_price.source,
-                    timestamp=queried_timestamp,  # Use original queried timestamp
-                    price=db_price.price,
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    source=HistoricalPriceOracle.deserialize_from_db(entry[0]),
+                    timestamp=timestamp,  # Use original queried timestamp
+                    price=deserialize_price(entry[1]),
                 ))
+            except DeserializationError as e:
+                log.error(
+                    f'Failed to read cached price of {from_asset} -> {to_asset} '
+                    f'at {timestamp} due to {e!s}. Skipping',
+                )
+                prices_results.append(None)
 
         return prices_results
 
+    @staticmethod
+    def get_historical_prices_for_timestamps(
+            from_asset: 'Asset',
+            to_asset: 'Asset',
+            timestamps: Sequence[Timestamp],
+            max_seconds_distance: int,
+    ) -> dict[Timestamp, Price]:
+        """Find the cached prices of a single pair at all the given timestamps.
+
+        Instead of a query per timestamp the cached prices around them are read with
+        a few range queries and the entry of each timestamp is selected in the same way
+        as in get_historical_price, prioritizing manual prices and then the closest
+        timestamp. Timestamps without a price within max_seconds_distance are missing
+        from the result.
+        """
+        if len(timestamps) == 0:
+            return {}
+
+        with GlobalDBHandler().conn.read_ctx() as cursor:
+            entries = GlobalDBHandler._query_nearest_prices(
+                cursor=cursor,
+                from_asset=from_asset.identifier,
+                to_asset=to_asset.identifier,
+                timestamps=timestamps,
+                max_seconds_distance=max_seconds_distance,
+            )
+
+        prices: dict[Timestamp, Price] = {}
+        for timestamp, (_, price) in entries.items():
+            try:
+                prices[timestamp] = deserialize_price(price)
+            except DeserializationError as e:
+                log.error(
+                    f'Failed to read cached price of {from_asset} -> {to_asset} '
+                    f'at {timestamp} due to {e!s}. Skipping',
+                )
+
+        return prices
+
     @staticmethod
     def add_historical_prices(entries: list['HistoricalPrice']) -> None:
         """Adds the given historical price entries in the DB
@@ -2277,6 +2388,25 @@ class GlobalDBHandler:
 
         return collection_assets
 
+    @staticmethod
+    def get_collections_assets() -> dict[str, tuple[Asset, ...]]:
+        """Query the assets of all collections. Returns a mapping of the identifier of each
+        asset that belongs to a collection to all the assets of its collection."""
+        collections: defaultdict[int, list[Asset]] = defaultdict(list)
+        with GlobalDBHandler().conn.read_ctx() as cursor:
+            for collection_id, identifier in cursor.execute(
+                'SELECT MM.collection_id, MM.asset FROM multiasset_mappings AS MM JOIN '
+                'asset_collections AS AC ON MM.collection_id = AC.id',
+            ):
+                collections[collection_id].append(Asset(identifier))
+
+        result = {}
+        for assets in collections.values():
+            collection_assets = tuple(assets)
+            result.update({asset.identifier: collection_assets for asset in collection_assets})
+
+        return result
+
     @staticmethod
     def get_assetid_from_exchange_name(exchange: Location | None, symbol: str, default: str) -> str:  # noqa: E501
         """Returns the asset's identifier from the ticker symbol of the given exchange according to
@@ -34,7 +34,7 @@ MINIMIZED_GLOBAL_DB_INDEXES = {
     "idx_asset_collections_main_asset": "createindexifnotexistsidx_asset_collections_main_assetonasset_collections(main_asset)",
     "idx_user_owned_assets_asset_id": "createindexifnotexistsidx_user_owned_assets_asset_idonuser_owned_assets(asset_id)",
     "idx_common_assets_identifier": "createindexifnotexistsidx_common_assets_identifieroncommon_asset_details(identifier)",
-    "idx_price_history_identifier": "createindexifnotexistsidx_price_history_identifieronprice_history(from_asset,to_asset)",
+    "idx_price_history_pair_timestamp": "createindexifnotexistsidx_price_history_pair_timestamponprice_history(from_asset,to_asset,timestamp,source_type,price)",
     "idx_location_mappings_identifier": "createindexifnotexistsidx_location_mappings_identifieronlocation_asset_mappings(local_id)",
     "idx_underlying_tokens_lists_identifier": "createindexifnotexistsidx_underlying_tokens_lists_identifieronunderlying_tokens_list(identifier,parent_token_entry)",
     "idx_binance_pairs_identifier": "createindexifnotexistsidx_binance_pairs_identifieronbinance_pairs(base_asset,quote_asset)",
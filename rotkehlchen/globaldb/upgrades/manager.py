@@ -34,6 +34,7 @@ from .v10_v11 import migrate_to_v11
 from .v11_v12 import migrate_to_v12
 from .v12_v13 import migrate_to_v13
 from .v13_v14 import migrate_to_v14
+from .v14_v15 import migrate_to_v15
 
 if TYPE_CHECKING:
     from rotkehlchen.db.drivers.gevent import DBConnection
@@ -94,6 +95,10 @@ UPGRADES_LIST = [
         from_version=13,
         function=migrate_to_v14,
     ),
+    UpgradeRecord(
+        from_version=14,
+        function=migrate_to_v15,
+    ),
 ]
 
 
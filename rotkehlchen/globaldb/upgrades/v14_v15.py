@@ -0,0 +1,31 @@
+import logging
+from typing import TYPE_CHECKING
+
+from rotkehlchen.logging import RotkehlchenLogsAdapter, enter_exit_debug_log
+from rotkehlchen.utils.progress import perform_globaldb_upgrade_steps, progress_step
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.drivers.gevent import DBConnection, DBCursor
+    from rotkehlchen.db.upgrade_manager import DBUpgradeProgressHandler
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+
+@enter_exit_debug_log(name='globaldb v14->v15 upgrade')
+def migrate_to_v15(connection: 'DBConnection', progress_handler: 'DBUpgradeProgressHandler') -> None:  # noqa: E501
+    """This globalDB upgrade does the following:
+    - Replace the price history index on the pair with a covering index on the pair
+    and the timestamp so that the prices around a timestamp are read from the index.
+
+    This upgrade takes place in v1.42.0"""
+
+    @progress_step('Replace the price history index with a covering index')
+    def _replace_price_history_index(write_cursor: 'DBCursor') -> None:
+        write_cursor.execute('DROP INDEX IF EXISTS idx_price_history_identifier')
+        write_cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_price_history_pair_timestamp ON price_history '
+            '(from_asset, to_asset, timestamp, source_type, price)',
+        )
+
+    perform_globaldb_upgrade_steps(connection, progress_handler)
@@ -1,10 +1,16 @@
-from typing import TYPE_CHECKING, Union
+from collections.abc import Callable, Hashable, Mapping
+from typing import TypeVar
 
-if TYPE_CHECKING:
-    import gevent
+import gevent
+from gevent.pool import Pool
 
+from rotkehlchen.errors.misc import RemoteError
 
-def get_greenlet_name(greenlet: Union['gevent.Greenlet', 'gevent.greenlet']) -> str:
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+
+def get_greenlet_name(greenlet: 'gevent.Greenlet | gevent.greenlet') -> str:
     if greenlet.parent is None:
         greenlet_name = 'Main Greenlet'
     else:
@@ -13,3 +19,47 @@ def get_greenlet_name(greenlet: Union['gevent.Greenlet', 'gevent.greenlet']) ->
         except AttributeError:  # means it's a raw greenlet
             greenlet_name = f'Greenlet with id {id(greenlet)}'
     return greenlet_name
+
+
+def run_concurrently(
+        tasks: Mapping[K, Callable[[], T]],
+        concurrency: int,
+        timeout: float | None,
+        expected_errors: tuple[type[Exception], ...] = (RemoteError,),
+        timeouts: Mapping[K, float | None] | None = None,
+) -> tuple[dict[K, T], dict[K, Exception]]:
+    """Run the given tasks in a pool of at most `concurrency` greenlets and wait for all
+    of them to finish. A task that runs for more than `timeout` seconds is stopped and
+    counts as failed with a RemoteError. `timeouts` can override the timeout of specific
+    tasks. A None timeout means that the task has no timeout.
+
+    Returns the results of the tasks that succeeded and the expected errors of the ones
+    that failed, both by the key of the task. Any other error is raised after all tasks
+    finish. If this gets killed the tasks that still run are killed too.
+    """
+    results: dict[K, T] = {}
+    errors: dict[K, Exception] = {}
+    unexpected_errors: list[Exception] = []
+
+    def run_task(key: K, task: Callable[[], T]) -> None:
+        task_timeout = timeout if timeouts is None else timeouts.get(key, timeout)
+        try:
+            with gevent.Timeout(task_timeout, RemoteError(f'Did not finish within {task_timeout} seconds')):  # noqa: E501
+                results[key] = task()
+        except expected_errors as e:
+            errors[key] = e
+        except Exception as e:  # raised after the other tasks finish
+            unexpected_errors.append(e)
+
+    pool = Pool(concurrency)
+    try:
+        for key, task in tasks.items():
+            pool.spawn(run_task, key, task)
+        pool.join()
+    finally:
+        pool.kill()
+
+    if len(unexpected_errors) != 0:
+        raise unexpected_errors[0]
+
+    return results, errors
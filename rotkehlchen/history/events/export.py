@@ -0,0 +1,147 @@
+"""Export of history events to CSV.
+
+The events are read from the DB in chunks and written to the file as they are read, so
+exporting many events doesn't need to keep all of them in memory. A first pass over the
+events only finds the columns of the CSV, since they depend on the events. The second
+pass queries the prices of each chunk at once and writes its rows. No DB connection is
+held while the prices are queried, since that can take long.
+"""
+import gzip
+import logging
+from collections.abc import Sequence
+from csv import DictWriter
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Final
+
+from rotkehlchen.accounting.export.csv import CSVWriteError
+from rotkehlchen.constants import HOUR_IN_SECONDS, ZERO
+from rotkehlchen.db.history_events import DBHistoryEvents
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.price import PriceHistorian
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.utils.misc import ts_ms_to_sec
+
+if TYPE_CHECKING:
+    from rotkehlchen.assets.asset import Asset, AssetWithOracles
+    from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.filtering import HistoryBaseEntryFilterQuery
+    from rotkehlchen.db.settings import DBSettings
+    from rotkehlchen.fval import FVal
+    from rotkehlchen.history.events.structures.base import HistoryBaseEntry
+    from rotkehlchen.types import Timestamp
+    from rotkehlchen.user_messages import MessagesAggregator
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Events read from the DB and whose prices are queried at once
+HISTORY_EVENTS_EXPORT_CHUNK_SIZE: Final = 1000
+
+
+def _open_csv(path: Path, compress: bool) -> IO[str]:
+    if compress:
+        return gzip.open(path, 'wt', newline='', encoding='utf-8')
+    return open(path, 'w', newline='', encoding='utf-8')
+
+
+def _query_events_prices(
+        events: Sequence['HistoryBaseEntry'],
+        currency: 'AssetWithOracles',
+        msg_aggregator: 'MessagesAggregator',
+) -> dict[tuple['Asset', 'Timestamp'], 'FVal']:
+    """Find the prices of the assets of the events at their timestamps. Prices cached in
+    the global DB are used if possible and the rest are queried from the price oracles."""
+    query_data = list(dict.fromkeys(
+        (event.asset, currency, ts_ms_to_sec(event.timestamp)) for event in events
+    ))
+    prices: dict[tuple[Asset, Timestamp], FVal] = {}
+    missing_prices: list[tuple[Asset, Timestamp]] = []
+    for (asset, _, timestamp), db_price in zip(query_data, GlobalDBHandler.get_historical_prices(
+        query_data=query_data,  # type: ignore[arg-type]  # currency is a subclass of Asset
+        max_seconds_distance=HOUR_IN_SECONDS,
+    ), strict=True):
+        if db_price is not None:
+            prices[asset, timestamp] = db_price.price
+        else:
+            missing_prices.append((asset, timestamp))
+
+    if len(missing_prices) == 0:
+        return prices
+
+    for asset, timestamped_prices in PriceHistorian.query_multiple_prices(
+        assets_timestamp=missing_prices,
+        target_asset=currency,
+        msg_aggregator=msg_aggregator,
+    ).items():
+        for timestamp, price in timestamped_prices.items():
+            prices[asset, timestamp] = price
+
+    return prices
+
+
+def export_history_events_csv(
+        database: 'DBHandler',
+        filter_query: 'HistoryBaseEntryFilterQuery',
+        entries_limit: int | None,
+        match_exact_events: bool,
+        path: Path,
+        settings: 'DBSettings',
+        currency: 'AssetWithOracles',
+        msg_aggregator: 'MessagesAggregator',
+        compress: bool,
+) -> Path | None:
+    """Export the history events matching the filter to a CSV file at the given path.
+    If compress is True the file is gzip compressed and .gz is appended to its name.
+
+    Returns the path of the file or None if no events match the filter.
+
+    May raise:
+    - CSVWriteError if writing a row fails
+    - PermissionError if the file can't be written
+    """
+    dbevents = DBHistoryEvents(database)
+    headers: dict[str, None] = {}  # dict to keep the order in which columns are found
+    for events in dbevents.iterate_history_events(
+        filter_query=filter_query,
+        entries_limit=entries_limit,
+        chunk_size=HISTORY_EVENTS_EXPORT_CHUNK_SIZE,
+        match_exact_events=match_exact_events,
+        report_failures=False,
+    ):
+        for event in events:
+            headers.update(dict.fromkeys(event.serialize_for_csv(fiat_value=ZERO, settings=settings)))  # noqa: E501
+
+    if len(headers) == 0:
+        return None
+
+    if compress:
+        path = path.with_name(f'{path.name}.gz')
+
+    written = 0
+    with _open_csv(path=path, compress=compress) as file:
+        # columns of events added after the first pass are skipped
+        writer = DictWriter(file, fieldnames=headers.keys(), delimiter=settings.csv_export_delimiter, extrasaction='ignore')  # noqa: E501
+        writer.writeheader()
+        for events in dbevents.iterate_history_events(
+            filter_query=filter_query,
+            entries_limit=entries_limit,
+            chunk_size=HISTORY_EVENTS_EXPORT_CHUNK_SIZE,
+            match_exact_events=match_exact_events,
+        ):
+            prices = _query_events_prices(
+                events=events,
+                currency=currency,
+                msg_aggregator=msg_aggregator,
+            )
+            try:
+                writer.writerows(event.serialize_for_csv(
+                    fiat_value=event.amount * prices.get((event.asset, ts_ms_to_sec(event.timestamp)), ZERO),  # noqa: E501
+                    settings=settings,
+                ) for event in events)
+            except ValueError as e:
+                raise CSVWriteError(f'Failed to write {path} CSV due to {e!s}') from e
+
+            written += len(events)
+
+    log.debug(f'Exported {written} history events to {path}')
+    return path
@@ -35,7 +35,7 @@ log = RotkehlchenLogsAdapter(logger)
 # base history entries
 #
 # Please, update this number each time a history query step is either added or removed
-NUM_HISTORY_QUERY_STEPS_EXCL_EXCHANGES = 3 + 3 * len(EVM_CHAINS_WITH_TRANSACTIONS)
+NUM_HISTORY_QUERY_STEPS_EXCL_EXCHANGES = 4 + 2 * len(EVM_CHAINS_WITH_TRANSACTIONS)
 STEPS_PER_CEX = 5
 
 
@@ -207,9 +207,9 @@ class HistoryQueryingManager:
             evm_manager.transactions.get_receipts_for_transactions_missing_them()
             step = self._increase_progress(step, total_steps)
 
-            self.processing_state_name = f'Decoding {str_blockchain} raw transactions'
-            evm_manager.transactions_decoder.get_and_decode_undecoded_transactions(limit=None)
-            step = self._increase_progress(step, total_steps)
+        self.processing_state_name = 'Decoding EVM raw transactions'
+        self.chains_aggregator.decode_undecoded_evm_transactions(limit=None)
+        step = self._increase_progress(step, total_steps)
 
         # include eth2 staking events
         eth2 = self.chains_aggregator.get_module('eth2')
@@ -222,7 +222,7 @@ class HistoryQueryingManager:
         self.processing_state_name = 'Querying base history events'
         # Include all base history entries
         history_events_db = DBHistoryEvents(self.db)
-        with self.db.conn.read_ctx() as cursor:
+        with self.db.conn.threaded_read_ctx() as cursor:
             base_entries = history_events_db.get_history_events_internal(  # ignore limits here. Limit applied at processing  # noqa: E501
                 cursor=cursor,
                 filter_query=HistoryEventFilterQuery.make(
@@ -224,6 +224,26 @@ class PriceHistorian:
 
         return None
 
+    @staticmethod
+    def is_price_cache_pair(from_asset: Asset, to_asset: Asset) -> bool:
+        """Returns whether query_historical_price checks the price cache directly for
+        the pair, i.e. the pair needs neither the special asset nor the forex handling.
+        Has to be kept in sync with get_price_for_special_asset.
+        """
+        if from_asset in (A_ETH2, A_KFEE) or GlobalDBHandler.asset_in_collection(collection_id=240, asset_id=from_asset.identifier):  # noqa: E501
+            return False
+
+        if from_asset.is_evm_token() and from_asset.resolve_to_evm_token().protocol in {CPT_UNISWAP_V2, CPT_UNISWAP_V3}:  # noqa: E501
+            return False
+
+        try:
+            from_asset.resolve_to_fiat_asset()
+            to_asset.resolve_to_fiat_asset()
+        except (UnknownAsset, WrongAssetType):
+            return True
+
+        return False
+
     @staticmethod
     def query_historical_price(
             from_asset: Asset,
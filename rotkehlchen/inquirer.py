@@ -1,11 +1,14 @@
 import logging
 import operator
+from collections import defaultdict
 from collections.abc import Callable, Iterable, Sequence
 from contextlib import suppress
+from functools import partial
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
+    Final,
     Literal,
     NamedTuple,
     Optional,
@@ -15,6 +18,8 @@ from typing import (
     overload,
 )
 
+from eth_abi.exceptions import DecodingError
+
 from rotkehlchen.assets.asset import Asset, AssetWithOracles, EvmToken, FiatAsset, UnderlyingToken
 from rotkehlchen.assets.utils import TokenEncounterInfo, get_or_create_evm_token
 from rotkehlchen.chain.arbitrum_one.modules.umami.constants import CPT_UMAMI
@@ -25,7 +30,7 @@ from rotkehlchen.chain.ethereum.modules.yearn.constants import (
     CPT_YEARN_V2,
     CPT_YEARN_V3,
 )
-from rotkehlchen.chain.ethereum.utils import token_normalized_value_decimals
+from rotkehlchen.chain.ethereum.utils import MULTICALL_CHUNKS, token_normalized_value_decimals
 from rotkehlchen.chain.evm.constants import ETH_SPECIAL_ADDRESS
 from rotkehlchen.chain.evm.contracts import EvmContract
 from rotkehlchen.chain.evm.decoding.aura_finance.constants import CPT_AURA_FINANCE
@@ -138,12 +143,13 @@ from rotkehlchen.serialization.deserialize import deserialize_evm_address
 from rotkehlchen.types import (
     CacheType,
     ChainID,
+    ChecksumEvmAddress,
     Price,
     Timestamp,
     TokenKind,
 )
 from rotkehlchen.utils.data_structures import LRUCacheWithRemove
-from rotkehlchen.utils.misc import timestamp_to_daystart_timestamp, ts_now
+from rotkehlchen.utils.misc import get_chunks, timestamp_to_daystart_timestamp, ts_now
 from rotkehlchen.utils.mixins.penalizable_oracle import PenalizablePriceOracleMixin
 
 if TYPE_CHECKING:
@@ -155,6 +161,7 @@ if TYPE_CHECKING:
     from rotkehlchen.chain.gnosis.manager import GnosisManager
     from rotkehlchen.chain.optimism.manager import OptimismManager
     from rotkehlchen.chain.polygon_pos.manager import PolygonPOSManager
+    from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.externalapis.alchemy import Alchemy
     from rotkehlchen.externalapis.coingecko import Coingecko
     from rotkehlchen.externalapis.cryptocompare import Cryptocompare
@@ -167,6 +174,9 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 CURRENT_PRICE_CACHE_SECS = 300  # 5 mins
+CURRENT_PRICE_CACHE_SIZE: Final = 4096
+# Fresh prices are evicted only after the current prices cache grows to this size
+CURRENT_PRICE_CACHE_HARD_MAXSIZE: Final = 65536
 DEFAULT_RATE_LIMIT_WAITING_TIME = 60  # seconds
 BTC_PER_BSQ = FVal('0.00000100')  # 1 BST == 100 satoshi https://docs.bisq.network/dao/specification#bsq-token
 
@@ -178,6 +188,17 @@ ASSETS_UNDERLYING_BTC = (
     A_CRV_RENWBTC,
     A_CRVP_RENWSBTC,
 )
+# Tokens that get_underlying_asset_price prices as another asset regardless of their protocol
+ASSETS_WITH_PRICE_OF_OTHER_ASSET = (
+    A_FARM_DAI,
+    A_FARM_WETH,
+    A_FARM_USDT,
+    A_FARM_USDC,
+    A_FARM_TUSD,
+    *ASSETS_UNDERLYING_BTC,
+    Asset('eip155:1/erc20:0x815C23eCA83261b6Ec689b60Cc4a58b54BC24D8D'),  # vTHOR
+)
+SCRVUSD_IDENTIFIER: Final = 'eip155:1/erc20:0x0655977FEb2f289A4aB78af67BAB0d17aAb84367'
 
 
 CurrentPriceOracleInstance = Union[
@@ -205,6 +226,57 @@ def _check_curve_contract_call(decoded: tuple[Any, ...]) -> bool:
     )
 
 
+def _calculate_curve_lp_price(
+        lp_token: EvmToken,
+        pool_contract: EvmContract,
+        tokens: list[EvmToken],
+        prices: Sequence[Price],
+        total_supply: int,
+        balances_output: Sequence[tuple[bool, bytes]],
+) -> Price | None:
+    """Calculate the price of a curve lp token from the total supply of the lp token and the
+    output of the multicall of the balances method of its pool for each of the pool tokens"""
+    # Check that the output has the correct structure
+    if not all(len(call_result) == 2 for call_result in balances_output):
+        log.debug(
+            f'Failed to query contract methods while finding curve pool price. '
+            f'Not every outcome has length 2. {balances_output}',
+        )
+        return None
+    # Check that all the requests were successful
+    if not all(contract_output[0] for contract_output in balances_output):
+        log.debug(f'Failed to query contract methods while finding curve price. {balances_output}')
+        return None
+    # Deserialize information obtained in the multicall execution
+    data = []
+    for i, token in enumerate(tokens):
+        amount_decoded = pool_contract.decode(balances_output[i][1], 'balances', arguments=[i])
+        if not _check_curve_contract_call(amount_decoded):
+            log.debug(f'Failed to decode balances {i} while finding curve price. {balances_output}')  # noqa: E501
+            return None
+        # https://github.com/PyCQA/pylint/issues/4739
+        amount = amount_decoded[0]
+        normalized_amount = token_normalized_value_decimals(amount, token.decimals)
+        data.append(normalized_amount)
+
+    # Prices and data should verify this relation for the following operations
+    if len(prices) != len(data):
+        log.debug(
+            f'Length of prices {len(prices)} does not match len of data {len(data)} '
+            f'while querying curve pool price.',
+        )
+        return None
+    # Total number of assets price in the pool
+    total_assets_value = sum(map(operator.mul, data, prices))
+    if total_assets_value == 0:
+        log.error(
+            f'Curve pool price returned unexpected data {data} that lead to a zero price.',
+        )
+        return None
+
+    return (total_assets_value / total_supply) * (10 ** lp_token.get_decimals())
+
+
 def get_underlying_asset_price(token: EvmToken) -> tuple[Price | None, CurrentPriceOracle]:
     """Gets the underlying asset price for the given evm token
 
@@ -215,7 +287,7 @@ def get_underlying_asset_price(token: EvmToken) -> tuple[Price | None, CurrentPr
     if token.protocol in LP_TOKEN_AS_POOL_PROTOCOLS:
         price = Inquirer().find_lp_price_from_uniswaplike_pool(token)
     elif (
-            token == 'eip155:1/erc20:0x0655977FEb2f289A4aB78af67BAB0d17aAb84367' or  # scrvUSD
+            token == SCRVUSD_IDENTIFIER or
             (token.protocol == CPT_CURVE and token.symbol == CURVE_LEND_VAULT_SYMBOL)
     ):
         price = get_curve_vault_token_price(
@@ -325,10 +397,159 @@ class CachedPriceEntry(NamedTuple):
     oracle: CurrentPriceOracle
 
 
+class BatchedPriceQuery(NamedTuple):
+    """Contract calls and underlying tokens needed to price an evm token. The calls of all
+    the tokens of a chain are made in one multicall and the usd prices of all the underlying
+    tokens are found together. `calculate` gets the (success, data) output of each call and
+    the usd price of each underlying token, in order, and returns the price of the token."""
+    token: EvmToken
+    calls: list[tuple[ChecksumEvmAddress, str]]
+    underlying_tokens: list[EvmToken]
+    calculate: Callable[[Sequence[tuple[bool, bytes]], Sequence[Price]], Price | None]
+
+
+def _calculate_vault_token_price(
+        contract: EvmContract,
+        method_name: str,
+        arguments: list[Any],
+        decimals: int,
+        outputs: Sequence[tuple[bool, bytes]],
+        prices: Sequence[Price],
+) -> Price | None:
+    """Calculate the price of a vault token from the amount of the underlying token that one
+    vault token is worth, as returned by the given method of the vault contract"""
+    if outputs[0][0] is False or prices[0] == ZERO_PRICE:
+        return None
+
+    return Price(contract.decode(outputs[0][1], method_name, arguments)[0] * prices[0] / 10 ** decimals)  # noqa: E501
+
+
+def _calculate_batched_curve_lp_price(
+        lp_token: EvmToken,
+        lp_contract: EvmContract,
+        pool_contract: EvmContract,
+        tokens: list[EvmToken],
+        outputs: Sequence[tuple[bool, bytes]],
+        prices: Sequence[Price],
+) -> Price | None:
+    """Calculate the price of a curve lp token from the output of its totalSupply call
+    followed by the output of the balances call of its pool for each pool token"""
+    if ZERO_PRICE in prices:
+        log.error(f'Could not calculate price for {lp_token} due to inability to fetch price for one of its pool tokens.')  # noqa: E501
+        return None
+
+    if outputs[0][0] is False or (total_supply := lp_contract.decode(outputs[0][1], 'totalSupply')[0]) == 0:  # noqa: E501
+        return None  # failed call or empty pool
+
+    return _calculate_curve_lp_price(
+        lp_token=lp_token,
+        pool_contract=pool_contract,
+        tokens=tokens,
+        prices=prices,
+        total_supply=total_supply,
+        balances_output=outputs[1:],
+    )
+
+
+class CurrentPriceCache(LRUCacheWithRemove[tuple[Asset, Asset], CachedPriceEntry]):
+    """LRU cache of the current prices of asset pairs.
+
+    Keeps an index of the cached pairs of each asset so that the prices of an asset are
+    invalidated without going through the whole cache, and the assets of each collection
+    so that a price is saved for all the assets of its collection without a DB query.
+
+    When the cache is full the least recently used prices are evicted only if they are
+    stale or the cache has reached hard_maxsize. So the prices of one big balance query
+    don't evict each other.
+    """
+
+    def __init__(
+            self,
+            maxsize: int = CURRENT_PRICE_CACHE_SIZE,
+            hard_maxsize: int = CURRENT_PRICE_CACHE_HARD_MAXSIZE,
+    ) -> None:
+        super().__init__(maxsize=maxsize)
+        self.hard_maxsize = hard_maxsize
+        self.asset_pairs: defaultdict[Asset, set[tuple[Asset, Asset]]] = defaultdict(set)
+        self.collections: dict[str, tuple[Asset, ...]] | None = None
+        self.collections_queried_ts = Timestamp(0)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_fresh(self, key: tuple[Asset, Asset]) -> CachedPriceEntry | None:
+        """Get the cached price if it's not older than CURRENT_PRICE_CACHE_SECS"""
+        if (entry := self.get(key)) is None or ts_now() - entry.time > CURRENT_PRICE_CACHE_SECS:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def add(self, key: tuple[Asset, Asset], value: CachedPriceEntry) -> None:
+        self.cache[key] = value
+        self.cache.move_to_end(key)
+        self.asset_pairs[key[0]].add(key)
+        self.asset_pairs[key[1]].add(key)
+        if len(self.cache) <= self.maxsize:
+            return
+
+        now = ts_now()
+        while len(self.cache) > self.maxsize:
+            oldest_key, oldest_entry = next(iter(self.cache.items()))
+            if now - oldest_entry.time <= CURRENT_PRICE_CACHE_SECS and len(self.cache) <= self.hard_maxsize:  # noqa: E501
+                break  # still fresh, so let the cache grow instead
+
+            self.remove(oldest_key)
+            self.evictions += 1
+
+    def remove(self, key: tuple[Asset, Asset]) -> None:
+        if self.cache.pop(key, None) is None:
+            return
+
+        for asset in key:
+            if (pairs := self.asset_pairs.get(asset)) is not None:
+                pairs.discard(key)
+                if len(pairs) == 0:
+                    del self.asset_pairs[asset]
+
+    def remove_assets(self, assets: set[Asset]) -> None:
+        """Remove the cached prices of all the pairs that contain any of the given assets"""
+        for pair in set().union(*(self.asset_pairs.get(asset, ()) for asset in assets)):
+            self.remove(pair)
+
+    def clear(self) -> None:
+        super().clear()
+        self.asset_pairs.clear()
+        self.collections = None
+
+    def get_collection_assets(self, asset: Asset) -> tuple[Asset, ...]:
+        """Get the assets in the same collection as the given asset, including itself.
+
+        The collections are queried all together and requeried after CURRENT_PRICE_CACHE_SECS
+        so that changes to them are picked up at the same time as new prices.
+        """
+        if self.collections is None or ts_now() - self.collections_queried_ts > CURRENT_PRICE_CACHE_SECS:  # noqa: E501
+            self.collections = GlobalDBHandler.get_collections_assets()
+            self.collections_queried_ts = ts_now()
+
+        return self.collections.get(asset.identifier, (asset,))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'entries': len(self.cache),
+            'maxsize': self.maxsize,
+            'hard_maxsize': self.hard_maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
 class Inquirer:
     __instance: Optional['Inquirer'] = None
     _cached_forex_data: dict
-    _cached_current_price: LRUCacheWithRemove[tuple[Asset, Asset], CachedPriceEntry]
+    _cached_current_price: CurrentPriceCache
     _data_directory: Path
     _cryptocompare: 'Cryptocompare'
     _coingecko: 'Coingecko'
@@ -378,7 +599,7 @@ class Inquirer:
         Inquirer._defillama = defillama
         Inquirer._alchemy = alchemy
         Inquirer._manualcurrent = manualcurrent
-        Inquirer._cached_current_price = LRUCacheWithRemove(maxsize=1024)
+        Inquirer._cached_current_price = CurrentPriceCache()
         Inquirer._evm_managers = {}
         Inquirer._msg_aggregator = msg_aggregator
         Inquirer.special_tokens = {
@@ -458,18 +679,45 @@ class Inquirer:
     def get_cached_current_price_entry(
             cache_key: tuple[Asset, Asset],
     ) -> CachedPriceEntry | None:
-        cache = Inquirer._cached_current_price.get(cache_key)
-        if cache is None or ts_now() - cache.time > CURRENT_PRICE_CACHE_SECS:
-            return None
-
-        return cache
+        return Inquirer._cached_current_price.get_fresh(cache_key)
 
     @staticmethod
     def remove_cache_prices_for_asset(assets_to_invalidate: set[Asset]) -> None:
         """Deletes all prices cache that contains any asset in the possible pairs."""
-        for asset_pair in list(Inquirer._cached_current_price.cache):  # create a list to avoid mutating the map while iterating it  # noqa: E501
-            if asset_pair[0] in assets_to_invalidate or asset_pair[1] in assets_to_invalidate:
-                Inquirer._cached_current_price.remove(asset_pair)
+        Inquirer._cached_current_price.remove_assets(assets_to_invalidate)
+
+    @staticmethod
+    def warm_up_cache(database: 'DBHandler') -> None:
+        """Fill the current prices cache with the prices of the last balance snapshot
+        if it was taken recently enough for its prices to be used. This is so that the
+        balances queried right after a restart don't need to query prices again."""
+        with database.conn.read_ctx() as cursor:
+            if ts_now() - (snapshot_ts := database.get_last_balance_save_time(cursor)) > CURRENT_PRICE_CACHE_SECS:  # noqa: E501
+                return
+
+            rows = cursor.execute(
+                'SELECT currency, amount, usd_value FROM timed_balances WHERE timestamp=?',
+                (snapshot_ts,),
+            ).fetchall()
+
+        added = 0
+        for identifier, amount, usd_value in rows:
+            try:
+                price = Price(FVal(usd_value) / FVal(amount))
+            except (ValueError, ArithmeticError):  # zero or missing amounts
+                continue
+
+            if price == ZERO_PRICE or (key := (Asset(identifier), A_USD)) in Inquirer._cached_current_price:  # noqa: E501
+                continue
+
+            Inquirer.set_cached_price(
+                cache_key=key,
+                # prices derived from our own balances, like the other blockchain prices
+                cached_price=CachedPriceEntry(price=price, time=snapshot_ts, oracle=CurrentPriceOracle.BLOCKCHAIN),  # noqa: E501
+            )
+            added += 1
+
+        log.debug(f'Warmed up the current prices cache with {added} prices of the snapshot at {snapshot_ts}')  # noqa: E501
 
     @staticmethod
     def set_oracles_order(oracles: Sequence[CurrentPriceOracle]) -> None:
@@ -489,8 +737,7 @@ class Inquirer:
     @staticmethod
     def set_cached_price(cache_key: tuple[Asset, Asset], cached_price: CachedPriceEntry) -> None:
         """Save cached price for the key provided and all the assets in the same collection"""
-        related_assets = GlobalDBHandler.get_assets_in_same_collection(cache_key[0].identifier)
-        for related_asset in related_assets:
+        for related_asset in Inquirer._cached_current_price.get_collection_assets(cache_key[0]):
             Inquirer._cached_current_price.add((related_asset, cache_key[1]), cached_price)
 
     @staticmethod
@@ -638,7 +885,7 @@ class Inquirer:
         if to_asset != A_USD:
             return from_assets, {}
 
-        found_prices, assets_without_special_price = {}, []
+        found_prices, assets_without_special_price, evm_tokens = {}, [], []
         for from_asset in from_assets:
             if from_asset == A_BSQ:
                 # BSQ is defined as 100 satohis but can be traded. Before we were using an api
@@ -648,13 +895,203 @@ class Inquirer:
                 found_prices[from_asset] = Price(BTC_PER_BSQ * btc_price), CurrentPriceOracle.BLOCKCHAIN  # noqa: E501
             elif from_asset == A_KFEE:  # KFEE is a kraken special asset where 1000 KFEE = 10 USD
                 found_prices[from_asset] = Price(FVal(0.01)), CurrentPriceOracle.FIAT
-            elif (price_and_oracle := Inquirer._maybe_get_evm_token_usd_price(asset=from_asset)) is not None:  # noqa: E501
+            else:
+                try:
+                    evm_tokens.append((from_asset, from_asset.resolve_to_evm_token()))
+                except (UnknownAsset, WrongAssetType):
+                    assets_without_special_price.append(from_asset)
+
+        if len(evm_tokens) == 0:
+            return assets_without_special_price, found_prices
+
+        batched_prices = Inquirer._find_batched_evm_token_usd_prices([x[1] for x in evm_tokens])
+        for from_asset, token in evm_tokens:
+            if (
+                (price_and_oracle := batched_prices.get(token)) is not None or
+                (price_and_oracle := Inquirer._maybe_get_evm_token_usd_price(asset=token)) is not None  # noqa: E501
+            ):
                 found_prices[from_asset] = price_and_oracle
             else:
                 assets_without_special_price.append(from_asset)
 
         return assets_without_special_price, found_prices
 
+    @staticmethod
+    def _get_batched_price_query(
+            token: EvmToken,
+            gearbox_farming_tokens: dict[ChainID, set[EvmToken]],
+    ) -> BatchedPriceQuery | None:
+        """Get the contract calls and the underlying tokens needed to price the given token
+        in a batch. Returns None for tokens that have to be priced one by one.
+        gearbox_farming_tokens is filled with the farming tokens of each chain once needed.
+
+        May raise:
+        - RemoteError if the curve pools had to be queried and that failed
+        """
+        if (
+            token.identifier in Inquirer.special_tokens or
+            token in ASSETS_WITH_PRICE_OF_OTHER_ASSET or
+            ((underlying_tokens := token.underlying_tokens) is not None and
+            token.evm_address in (x.address for x in underlying_tokens))
+        ):
+            return None
+
+        is_vault_token = token.protocol in (CPT_YEARN_V2, CPT_YEARN_V3, CPT_GEARBOX)
+        is_curve_lp_token = (
+            token.protocol == CPT_CURVE and
+            token.chain_id in CURVE_CHAIN_IDS and
+            token != SCRVUSD_IDENTIFIER and
+            token.symbol != CURVE_LEND_VAULT_SYMBOL
+        )
+        if (
+            (is_vault_token is False and is_curve_lp_token is False) or
+            (evm_manager := Inquirer._evm_managers.get(token.chain_id)) is None
+        ):
+            return None  # plain tokens and tokens of chains without an evm manager
+
+        node_inquirer = evm_manager.node_inquirer
+        if is_vault_token:
+            if underlying_tokens is None or len(underlying_tokens) != 1:
+                return None  # needs a query for the underlying token. Done one by one
+
+            if token.protocol == CPT_GEARBOX:
+                if token.chain_id not in gearbox_farming_tokens:
+                    gearbox_farming_tokens[token.chain_id] = {
+                        x.farming_pool_token for x in read_gearbox_data_from_cache(token.chain_id)[0].values()  # noqa: E501
+                    }
+                if token in gearbox_farming_tokens[token.chain_id]:
+                    return None  # the price comes from the staked lp token
+
+                contract = EvmContract(
+                    address=token.evm_address,
+                    abi=node_inquirer.contracts.abi('GEARBOX_LP'),
+                    deployed_block=0,
+                )
+                method_name, arguments = 'convertToAssets', [10 ** token.get_decimals()]
+            elif token.chain_id == ChainID.ETHEREUM:
+                contract = EvmContract(
+                    address=token.evm_address,
+                    abi=node_inquirer.contracts.abi('YEARN_VAULT_V2' if token.protocol == CPT_YEARN_V2 else 'YEARN_VAULT_V3'),  # noqa: E501
+                    deployed_block=0,
+                )
+                method_name, arguments = 'pricePerShare', []
+            else:
+                return None
+
+            try:
+                underlying_token = EvmToken(underlying_tokens[0].get_identifier(parent_chain=token.chain_id))  # noqa: E501
+            except (UnknownAsset, WrongAssetType):
+                return None
+
+            return BatchedPriceQuery(
+                token=token,
+                calls=[(token.evm_address, contract.encode(method_name=method_name, arguments=arguments))],  # noqa: E501
+                underlying_tokens=[underlying_token],
+                calculate=partial(_calculate_vault_token_price, contract, method_name, arguments, token.get_decimals()),  # noqa: E501
+            )
+
+        # else it is a curve lp token
+        if (pool_data := Inquirer()._get_curve_pool_tokens(token)) is None:
+            return None
+
+        pool_address, pool_tokens = pool_data
+        lp_contract = EvmContract(
+            address=token.evm_address,
+            abi=node_inquirer.contracts.abi('ERC20_TOKEN'),
+            deployed_block=0,
+        )
+        pool_contract = EvmContract(
+            address=pool_address,
+            abi=node_inquirer.contracts.abi('CURVE_POOL'),
+            deployed_block=0,
+        )
+        return BatchedPriceQuery(
+            token=token,
+            calls=[(token.evm_address, lp_contract.encode(method_name='totalSupply'))] + [
+                (pool_address, pool_contract.encode(method_name='balances', arguments=[i]))
+                for i in range(len(pool_tokens))
+            ],
+            underlying_tokens=pool_tokens,
+            calculate=partial(_calculate_batched_curve_lp_price, token, lp_contract, pool_contract, pool_tokens),  # noqa: E501
+        )
+
+    @staticmethod
+    def _find_batched_evm_token_usd_prices(
+            tokens: list[EvmToken],
+    ) -> dict[EvmToken, tuple[Price, CurrentPriceOracle]]:
+        """Find the usd prices of the given evm tokens that can be priced in a batch.
+
+        The usd prices of the underlying tokens of all the given tokens are found at once so
+        that each oracle is queried once for all of them. This also caches them for the tokens
+        that are then priced one by one. The contract calls needed for vault and lp tokens
+        are made in one multicall per chain.
+
+        Tokens that could not be priced this way are missing from the result.
+        """
+        queries: defaultdict[ChainID, list[BatchedPriceQuery]] = defaultdict(list)
+        underlying_tokens: set[EvmToken] = set()
+        gearbox_farming_tokens: dict[ChainID, set[EvmToken]] = {}
+        for token in tokens:
+            try:
+                query = Inquirer._get_batched_price_query(token, gearbox_farming_tokens)
+            except RemoteError as e:
+                log.error(f'Failed to prepare the price query of {token} due to {e!s}')
+                continue
+
+            if query is not None:
+                queries[token.chain_id].append(query)
+                underlying_tokens.update(query.underlying_tokens)
+            elif token.underlying_tokens is not None:
+                for underlying_token in token.underlying_tokens:
+                    with suppress(UnknownAsset, WrongAssetType):
+                        underlying_tokens.add(EvmToken(underlying_token.get_identifier(parent_chain=token.chain_id)))
+
+        underlying_prices: dict[Asset, Price] = {}
+        if len(underlying_tokens := underlying_tokens.difference(tokens)) != 0:
+            underlying_prices = Inquirer.find_usd_prices(assets=list(underlying_tokens))
+
+        found_prices: dict[EvmToken, tuple[Price, CurrentPriceOracle]] = {}
+        now = ts_now()
+        for chain_id, chain_queries in queries.items():
+            node_inquirer = Inquirer.get_evm_manager(chain_id=chain_id).node_inquirer
+            calls = [call for query in chain_queries for call in query.calls]
+            try:
+                outputs = [
+                    output
+                    for calls_chunk in get_chunks(calls, n=MULTICALL_CHUNKS)
+                    for output in node_inquirer.multicall_2(require_success=False, calls=calls_chunk)  # noqa: E501
+                ]
+            except RemoteError as e:
+                log.error(f'Failed to query the contracts to price {len(chain_queries)} {chain_id} tokens due to {e!s}')  # noqa: E501
+                continue
+
+            offset = 0
+            for query in chain_queries:
+                query_outputs = outputs[offset:(offset := offset + len(query.calls))]
+                try:
+                    price = query.calculate(query_outputs, [
+                        underlying_prices[x] if x in underlying_prices else Inquirer.find_usd_price(x)  # noqa: E501
+                        for x in query.underlying_tokens
+                    ])
+                except (DeserializationError, DecodingError) as e:
+                    log.error(f'Failed to decode the contract calls to price {query.token} due to {e!s}')  # noqa: E501
+                    continue
+
+                if price is None or price == ZERO_PRICE:
+                    continue
+
+                Inquirer.set_cached_price(
+                    cache_key=(query.token, A_USD),
+                    cached_price=CachedPriceEntry(
+                        price=price,
+                        time=now,
+                        oracle=CurrentPriceOracle.BLOCKCHAIN,
+                    ),
+                )
+                found_prices[query.token] = price, CurrentPriceOracle.BLOCKCHAIN
+
+        return found_prices
+
     @staticmethod
     def _maybe_get_evm_token_usd_price(asset: Asset) -> tuple[Price, CurrentPriceOracle] | None:
         """Maybe get an evm token's usd price via its underlying tokens or protocol logic.
@@ -919,19 +1356,15 @@ class Inquirer:
             block_identifier='latest',
         )
 
-    def find_curve_pool_price(self, lp_token: EvmToken) -> Price | None:
-        """
-        1. Obtain the pool for this token
-        2. Obtain total supply of lp tokens
-        3. Obtain value (in USD) for all assets in the pool
-        4. Calculate the price for an LP token
-
-        logic source: https://medium.com/coinmonks/the-joys-of-valuing-curve-lp-tokens-4e4a148eaeb9
-
-        Returns the price of 1 LP token from the pool
+    def _get_curve_pool_tokens(
+            self,
+            lp_token: EvmToken,
+    ) -> tuple[ChecksumEvmAddress, list[EvmToken]] | None:
+        """Get the address of the curve pool of the given lp token and the tokens in it.
+        Returns None if the pool or any of its tokens are not known.
 
         May raise:
-        - RemoteError
+        - RemoteError if the curve cache had to be queried and that failed
         """
         assert lp_token.chain_id in CURVE_CHAIN_IDS, f'{lp_token} is not on a curve supported chain'  # noqa: E501
         chain_id = cast('CURVE_CHAIN_ID_TYPE', lp_token.chain_id)
@@ -971,6 +1404,26 @@ class Inquirer:
         except UnknownAsset:
             return None
 
+        return pool_address, tokens
+
+    def find_curve_pool_price(self, lp_token: EvmToken) -> Price | None:
+        """
+        1. Obtain the pool for this token
+        2. Obtain total supply of lp tokens
+        3. Obtain value (in USD) for all assets in the pool
+        4. Calculate the price for an LP token
+
+        logic source: https://medium.com/coinmonks/the-joys-of-valuing-curve-lp-tokens-4e4a148eaeb9
+
+        Returns the price of 1 LP token from the pool
+
+        May raise:
+        - RemoteError
+        """
+        if (pool_data := self._get_curve_pool_tokens(lp_token)) is None:
+            return None
+
+        pool_address, tokens = pool_data
         # Get price for each token in the pool
         prices = []
         for token in tokens:
@@ -984,6 +1437,7 @@ class Inquirer:
             prices.append(price)
 
         # Query total supply of the LP token
+        evm_manager = self.get_evm_manager(chain_id=lp_token.chain_id)
         contract = EvmContract(
             address=lp_token.evm_address,
             abi=evm_manager.node_inquirer.contracts.abi('ERC20_TOKEN'),
@@ -1010,46 +1464,14 @@ class Inquirer:
             require_success=False,
             calls=calls,
         )
-
-        # Check that the output has the correct structure
-        if not all(len(call_result) == 2 for call_result in output):
-            log.debug(
-                f'Failed to query contract methods while finding curve pool price. '
-                f'Not every outcome has length 2. {output}',
-            )
-            return None
-        # Check that all the requests were successful
-        if not all(contract_output[0] for contract_output in output):
-            log.debug(f'Failed to query contract methods while finding curve price. {output}')
-            return None
-        # Deserialize information obtained in the multicall execution
-        data = []
-        for i, token in enumerate(tokens):
-            amount_decoded = contract.decode(output[i][1], 'balances', arguments=[i])
-            if not _check_curve_contract_call(amount_decoded):
-                log.debug(f'Failed to decode balances {i} while finding curve price. {output}')
-                return None
-            # https://github.com/PyCQA/pylint/issues/4739
-            amount = amount_decoded[0]
-            normalized_amount = token_normalized_value_decimals(amount, token.decimals)
-            data.append(normalized_amount)
-
-        # Prices and data should verify this relation for the following operations
-        if len(prices) != len(data):
-            log.debug(
-                f'Length of prices {len(prices)} does not match len of data {len(data)} '
-                f'while querying curve pool price.',
-            )
-            return None
-        # Total number of assets price in the pool
-        total_assets_value = sum(map(operator.mul, data, prices))
-        if total_assets_value == 0:
-            log.error(
-                f'Curve pool price returned unexpected data {data} that lead to a zero price.',
-            )
-            return None
-
-        return (total_assets_value / total_supply) * (10 ** lp_token.get_decimals())
+        return _calculate_curve_lp_price(
+            lp_token=lp_token,
+            pool_contract=contract,
+            tokens=tokens,
+            prices=prices,
+            total_supply=total_supply,
+            balances_output=output,
+        )
 
     def find_gearbox_price(self, token: EvmToken) -> Price | None:
         node_inquirer = self.get_evm_manager(chain_id=token.chain_id).node_inquirer
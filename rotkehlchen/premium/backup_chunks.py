@@ -0,0 +1,162 @@
+"""Content addressed chunks of the user DB for uploading backups incrementally.
+
+The plaintext DB export is split at page boundaries chosen by the content of the pages
+themselves, so that pages inserted or removed in one part of the DB only change the
+chunks around them and not every chunk after them. Each chunk is identified by a keyed
+hash of its contents and only the chunks the server does not already have are compressed,
+encrypted and uploaded. The ordered list of the chunk ids is the backup manifest from which
+the DB is reassembled when pulling.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import zlib
+from pathlib import Path
+from typing import Final, NamedTuple
+
+from rotkehlchen.crypto import decrypt, encrypt
+from rotkehlchen.errors.misc import UnableToDecryptRemoteData
+from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+BACKUP_MANIFEST_VERSION: Final = 1
+DEFAULT_DB_PAGE_SIZE: Final = 4096
+# A chunk ends after a page whose hash is divisible by this, which gives chunks of
+# around 16 pages (64KB for the default page size). Chunks are small since moving pages
+# changes the b-tree interior pages pointing to them, and each chunk that contains one of
+# them has to be uploaded again. Chunks are kept between a min and a max number of pages
+# so that very small or huge chunks are not created by chance.
+CHUNK_BOUNDARY_DIVISOR: Final = 16
+MIN_CHUNK_PAGES: Final = 4
+MAX_CHUNK_PAGES: Final = 256
+
+
+class BackupChunk(NamedTuple):
+    chunk_id: str
+    offset: int
+    size: int
+
+
+class BackupManifest(NamedTuple):
+    chunks: list[BackupChunk]
+
+    @property
+    def total_size(self) -> int:
+        return sum(chunk.size for chunk in self.chunks)
+
+    def serialize(self) -> bytes:
+        return json.dumps({
+            'version': BACKUP_MANIFEST_VERSION,
+            'chunks': [[chunk.chunk_id, chunk.size] for chunk in self.chunks],
+        }, separators=(',', ':')).encode()
+
+    def get_hash(self) -> str:
+        """The hash identifying the DB contents of this manifest"""
+        return base64.b64encode(hashlib.sha256(self.serialize()).digest()).decode()
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> 'BackupManifest':
+        """May raise DeserializationError if the manifest is not in the expected format"""
+        try:
+            manifest = json.loads(data)
+            if manifest['version'] != BACKUP_MANIFEST_VERSION:
+                raise DeserializationError(
+                    f'Unsupported backup manifest version {manifest["version"]}',
+                )
+
+            chunks, offset = [], 0
+            for chunk_id, size in manifest['chunks']:
+                chunks.append(BackupChunk(chunk_id=chunk_id, offset=offset, size=size))
+                offset += size
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            raise DeserializationError(f'Invalid backup manifest: {e!s}') from e
+
+        return cls(chunks=chunks)
+
+
+def _get_chunk_key(password: str) -> bytes:
+    """Chunk ids are keyed with the DB password so that the server can't use them to check
+    whether a chunk has some given contents"""
+    return hashlib.sha256(b'rotki backup chunks' + password.encode()).digest()
+
+
+def get_chunk_id(password: str, data: bytes) -> str:
+    return hmac.new(_get_chunk_key(password), data, hashlib.sha256).hexdigest()
+
+
+def _read_page_size(dbpath: Path) -> int:
+    """Read the page size from the header of the plaintext sqlite DB"""
+    with open(dbpath, 'rb') as f:
+        header = f.read(18)
+
+    if len(header) != 18 or not header.startswith(b'SQLite format 3\x00'):
+        return DEFAULT_DB_PAGE_SIZE
+
+    page_size = int.from_bytes(header[16:18], byteorder='big')
+    return 65536 if page_size == 1 else page_size
+
+
+def build_backup_manifest(dbpath: Path, password: str) -> BackupManifest:
+    """Split the plaintext DB at the given path in chunks and return their manifest.
+
+    Only the hashes of the chunks are calculated, nothing is kept in memory.
+    """
+    key = _get_chunk_key(password)
+    page_size = _read_page_size(dbpath)
+    chunks: list[BackupChunk] = []
+    chunk_hash, chunk_offset, chunk_pages, offset = hmac.new(key, digestmod=hashlib.sha256), 0, 0, 0  # noqa: E501
+    with open(dbpath, 'rb') as f:
+        while page := f.read(page_size):
+            chunk_hash.update(page)
+            chunk_pages += 1
+            offset += len(page)
+            if chunk_pages >= MAX_CHUNK_PAGES or (
+                chunk_pages >= MIN_CHUNK_PAGES and
+                int.from_bytes(hashlib.sha256(page).digest()[:4]) % CHUNK_BOUNDARY_DIVISOR == 0
+            ):
+                chunks.append(BackupChunk(
+                    chunk_id=chunk_hash.hexdigest(),
+                    offset=chunk_offset,
+                    size=offset - chunk_offset,
+                ))
+                chunk_hash, chunk_offset, chunk_pages = hmac.new(key, digestmod=hashlib.sha256), offset, 0  # noqa: E501
+
+    if chunk_pages != 0:
+        chunks.append(BackupChunk(
+            chunk_id=chunk_hash.hexdigest(),
+            offset=chunk_offset,
+            size=offset - chunk_offset,
+        ))
+
+    return BackupManifest(chunks=chunks)
+
+
+def read_chunk(dbpath: Path, chunk: BackupChunk) -> bytes:
+    with open(dbpath, 'rb') as f:
+        f.seek(chunk.offset)
+        return f.read(chunk.size)
+
+
+def compress_and_encrypt_chunk(dbpath: Path, chunk: BackupChunk, password: str) -> bytes:
+    return encrypt(password.encode(), zlib.compress(read_chunk(dbpath, chunk), level=9))
+
+
+def decrypt_and_decompress_chunk(encrypted_data: bytes, chunk_id: str, password: str) -> bytes:
+    """May raise:
+    - UnableToDecryptRemoteData if the chunk can't be decrypted or does not have
+    the contents its id says it has
+    """
+    try:
+        data = zlib.decompress(decrypt(password.encode(), encrypted_data))
+    except zlib.error as e:
+        raise UnableToDecryptRemoteData(f'Could not decompress backup chunk {chunk_id}') from e
+
+    if not hmac.compare_digest(get_chunk_id(password, data), chunk_id):
+        raise UnableToDecryptRemoteData(f'Backup chunk {chunk_id} has unexpected contents')
+
+    return data
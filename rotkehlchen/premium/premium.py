@@ -63,6 +63,8 @@ class RemoteMetadata(NamedTuple):
     data_hash: str
     # This is the size in bytes of the remote DB data
     data_size: int
+    # Whether the server stores the backups as content addressed chunks
+    supports_chunks: bool = False
 
 
 class UserLimits(TypedDict):
@@ -129,7 +131,7 @@ KNOWN_STATUS_CODES: Final = (
     HTTPStatus.BAD_REQUEST,
     HTTPStatus.CREATED,
 )
-NEST_API_ENDPOINTS: Final = ('backup', 'backup/range', 'devices', 'limits')
+NEST_API_ENDPOINTS: Final = ('backup', 'backup/range', 'backup/chunks', 'backup/chunks/missing', 'backup/manifest', 'devices', 'limits')  # noqa: E501
 UPLOAD_CHUNK_SIZE: Final = 10_000_000  # 10 MB
 MAX_UPLOAD_CHUNK_RETRIES: Final = 1
 
@@ -766,6 +768,151 @@ class Premium:
 
         return response.content
 
+    def query_missing_backup_chunks(self, chunk_ids: Sequence[str]) -> set[str]:
+        """Query which of the given backup chunks are not stored in the server
+
+        May raise:
+        - RemoteError if there are problems reaching the server or if
+        there is an error returned by the server
+        - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
+        """
+        try:
+            response = self.session.post(
+                self.rotki_nest + (method := 'backup/chunks/missing'),
+                data=self.sign(method=method, chunk_ids=','.join(chunk_ids)),
+                timeout=ROTKEHLCHEN_SERVER_TIMEOUT,
+            )
+        except requests.exceptions.RequestException as e:
+            log.error(msg := f'Could not connect to rotki server due to {e!s}')
+            raise RemoteError(msg) from e
+
+        result = _process_dict_response(response)
+        try:
+            return set(result['missing'])
+        except (KeyError, TypeError) as e:
+            log.error(msg := f'Invalid response from server when querying missing backup chunks: {result}')  # noqa: E501
+            raise RemoteError(msg) from e
+
+    def upload_backup_chunk(self, chunk_id: str, data_blob: bytes) -> None:
+        """Uploads an encrypted backup chunk to the server
+
+        May raise:
+        - RemoteError if there are problems reaching the server or if
+        there is an error returned by the server
+        - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
+        """
+        retry_count = 0
+        while True:
+            try:
+                response = self.session.post(
+                    self.rotki_nest + (method := 'backup/chunks'),
+                    files={'chunk_data': ('chunk', data_blob)},
+                    data=self.sign(method=method, chunk_id=chunk_id),
+                    timeout=ROTKEHLCHEN_SERVER_BACKUP_TIMEOUT,
+                )
+            except requests.exceptions.RequestException as e:
+                log.error(msg := f'Could not connect to rotki server due to {e!s}')
+                raise RemoteError(msg) from e
+
+            if response.status_code == HTTPStatus.OK:
+                return
+
+            if response.status_code != HTTPStatus.REQUEST_ENTITY_TOO_LARGE and retry_count < MAX_UPLOAD_CHUNK_RETRIES:  # noqa: E501
+                retry_count += 1
+                continue  # retry chunk upload
+
+            _process_dict_response(
+                response=response,
+                status_codes=(HTTPStatus.OK,),
+                user_msg='Size limit reached' if response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE else f'Could not upload database backup due to: {response.text}',  # noqa: E501
+            )
+            return
+
+    def upload_backup_manifest(
+            self,
+            manifest_blob: bytes,
+            manifest_hash: str,
+            last_modify_ts: Timestamp,
+            total_size: int,
+    ) -> None:
+        """Uploads the encrypted manifest of a chunked backup. All of its chunks should have
+        been uploaded before. The server keeps the manifest as the latest backup.
+
+        May raise:
+        - RemoteError if there are problems reaching the server or if
+        there is an error returned by the server
+        - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
+        """
+        try:
+            response = self.session.post(
+                self.rotki_nest + (method := 'backup/manifest'),
+                files={'manifest_data': ('manifest', manifest_blob)},
+                data=self.sign(
+                    method=method,
+                    file_hash=manifest_hash,
+                    last_modify_ts=last_modify_ts,
+                    total_size=total_size,
+                    compression='zlib',
+                ),
+                timeout=ROTKEHLCHEN_SERVER_BACKUP_TIMEOUT,
+            )
+        except requests.exceptions.RequestException as e:
+            log.error(msg := f'Could not connect to rotki server due to {e!s}')
+            raise RemoteError(msg) from e
+
+        _process_dict_response(
+            response=response,
+            status_codes=(HTTPStatus.OK,),
+            user_msg=f'Could not upload database backup due to: {response.text}',
+        )
+
+    def pull_backup_manifest(self) -> bytes | None:
+        """Pulls the encrypted manifest of the latest backup if it is a chunked backup
+
+        Returns None if there is no chunked backup saved in the server.
+
+        May raise:
+        - RemoteError if there are problems reaching the server or if
+        there is an error returned by the server
+        - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
+        """
+        try:
+            response = self.session.get(
+                self.rotki_nest + (method := 'backup/manifest'),
+                params=self.sign(method=method),
+                timeout=ROTKEHLCHEN_SERVER_BACKUP_TIMEOUT,
+            )
+        except requests.exceptions.RequestException as e:
+            log.error(msg := f'Could not connect to rotki server due to {e!s}')
+            raise RemoteError(msg) from e
+
+        check_response_status_code(response, (HTTPStatus.OK, HTTPStatus.NOT_FOUND))
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return None
+
+        return response.content
+
+    def pull_backup_chunk(self, chunk_id: str) -> bytes:
+        """Pulls an encrypted backup chunk from the server
+
+        May raise:
+        - RemoteError if there are problems reaching the server or if
+        there is an error returned by the server
+        - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
+        """
+        try:
+            response = self.session.get(
+                self.rotki_nest + (method := 'backup/chunks'),
+                params=self.sign(method=method, chunk_id=chunk_id),
+                timeout=ROTKEHLCHEN_SERVER_BACKUP_TIMEOUT,
+            )
+        except requests.exceptions.RequestException as e:
+            log.error(msg := f'Could not connect to rotki server due to {e!s}')
+            raise RemoteError(msg) from e
+
+        check_response_status_code(response, (HTTPStatus.OK,))
+        return response.content
+
     def query_last_data_metadata(self) -> RemoteMetadata:
         """Queries last metadata from the server and returns the response
         as a RemoteMetadata object.
@@ -795,6 +942,7 @@ class Premium:
                 last_modify_ts=Timestamp(result['last_modify_ts']),
                 data_hash=result['data_hash'],
                 data_size=result['data_size'],
+                supports_chunks=result.get('supports_chunks', False),
             )
         except KeyError as e:
             msg = f'Problem connecting to rotki server. last_data_metadata response missing {e!s} key'  # noqa: E501
@@ -2,12 +2,14 @@ import logging
 import shutil
 import tempfile
 from enum import Enum
+from pathlib import Path
 from typing import Any, Literal, NamedTuple
 
 import gevent
 
-from rotkehlchen.api.websockets.typedefs import WSMessageType
+from rotkehlchen.api.websockets.typedefs import DBUploadStatusStep, WSMessageType
 from rotkehlchen.constants.misc import USERSDIR_NAME
+from rotkehlchen.crypto import decrypt, encrypt
 from rotkehlchen.data_handler import DataHandler
 from rotkehlchen.data_migrations.manager import DataMigrationManager
 from rotkehlchen.db.cache import DBCacheStatic
@@ -17,7 +19,15 @@ from rotkehlchen.errors.api import (
     RotkehlchenPermissionError,
 )
 from rotkehlchen.errors.misc import RemoteError, UnableToDecryptRemoteData
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.premium.backup_chunks import (
+    BackupManifest,
+    build_backup_manifest,
+    compress_and_encrypt_chunk,
+    decrypt_and_decompress_chunk,
+    read_chunk,
+)
 from rotkehlchen.premium.premium import (
     Premium,
     PremiumCredentials,
@@ -60,6 +70,8 @@ class PremiumSyncManager(LockableQueryMixIn):
             self.last_upload_attempt_ts = self.last_data_upload_ts
         # This contains the last known successful DB upload timestamp in the remote.
         self.last_remote_data_upload_ts = 0  # gets populated only after the first API call
+        # Whether the server stores backups in chunks. Populated by the metadata API call
+        self.remote_supports_chunks = False
         self.data = data
         self.migration_manager = migration_manager
         self.premium: Premium | None = None
@@ -69,8 +81,56 @@ class PremiumSyncManager(LockableQueryMixIn):
         assert self.premium is not None, 'caller should make sure premium exists'
         metadata = self.premium.query_last_data_metadata()
         self.last_remote_data_upload_ts = metadata.upload_ts
+        self.remote_supports_chunks = metadata.supports_chunks
         return metadata
 
+    def _pull_chunked_db(self) -> bytes | None:
+        """Pull the latest chunked backup from the server and reassemble the plaintext DB.
+        Chunks that are also part of the local DB are not downloaded.
+
+        Returns None if there is no chunked backup in the server.
+
+        May raise:
+        - RemoteError if there are problems reaching the server or the backup is invalid
+        - PremiumAuthenticationError if the given key is rejected by the server
+        - UnableToDecryptRemoteData if the backup can't be decrypted with our password
+        """
+        assert self.premium is not None, 'caller should make sure premium exists'
+        if (encrypted_manifest := self.premium.pull_backup_manifest()) is None:
+            return None
+
+        password = self.data.db.password
+        try:
+            manifest = BackupManifest.deserialize(decrypt(password.encode(), encrypted_manifest))
+        except DeserializationError as e:
+            raise RemoteError(f'Could not read the backup received from the server. {e!s}') from e
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tempdbfile:
+            tempdbpath = self.data.db.export_unencrypted(tempdbfile)
+
+        try:
+            local_manifest = gevent.get_hub().threadpool.spawn(build_backup_manifest, tempdbpath, password).get()  # noqa: E501
+            local_chunks = {chunk.chunk_id: chunk for chunk in local_manifest.chunks}
+            db_data = bytearray()
+            for chunk in manifest.chunks:
+                if (local_chunk := local_chunks.get(chunk.chunk_id)) is not None:
+                    db_data += read_chunk(dbpath=tempdbpath, chunk=local_chunk)
+                else:
+                    db_data += decrypt_and_decompress_chunk(
+                        encrypted_data=self.premium.pull_backup_chunk(chunk.chunk_id),
+                        chunk_id=chunk.chunk_id,
+                        password=password,
+                    )
+        finally:
+            tempdbpath.unlink()
+
+        log.debug(
+            f'Reassembled DB from {len(manifest.chunks)} backup chunks. '
+            f'{len(set(local_chunks).intersection(x.chunk_id for x in manifest.chunks))} '
+            f'of them were found locally',
+        )
+        return bytes(db_data)
+
     def _can_sync_data_from_server(self, new_account: bool) -> SyncCheckResult:
         """
         Checks if the remote data can be pulled from the server.
@@ -130,17 +190,29 @@ class PremiumSyncManager(LockableQueryMixIn):
         if self.premium is None:
             return False, 'Pulling failed. User does not have active premium.'
 
+        result = chunked_db = None
         try:
-            result = self.premium.pull_data()
+            if self.remote_supports_chunks:
+                chunked_db = self._pull_chunked_db()
+            if chunked_db is None:
+                result = self.premium.pull_data()
         except (RemoteError, PremiumAuthenticationError) as e:
             log.debug('sync from server -- pulling failed.', error=str(e))
             return False, f'Pulling failed: {e!s}'
+        except UnableToDecryptRemoteData as e:
+            raise PremiumAuthenticationError(
+                'The given password can not unlock the database that was retrieved  from '
+                'the server. Make sure to use the same password as when the account was created.',
+            ) from e
 
-        if result is None:
+        if chunked_db is None and result is None:
             return False, 'No data found'
 
         try:
-            self.data.decompress_and_decrypt_db(result)
+            if chunked_db is not None:
+                self.data.replace_db(chunked_db)
+            elif result is not None:
+                self.data.decompress_and_decrypt_db(result)
         except UnableToDecryptRemoteData as e:
             raise PremiumAuthenticationError(
                 'The given password can not unlock the database that was retrieved  from '
@@ -210,6 +282,13 @@ class PremiumSyncManager(LockableQueryMixIn):
             self.last_upload_attempt_ts = ts_now()
             return False, message
 
+        if metadata.supports_chunks:
+            return self._upload_chunked_backup(
+                metadata=metadata,
+                last_modify_ts=our_last_write_ts,
+                force_upload=force_upload,
+            )
+
         with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tempdbfile:
             tempdbpath = self.data.db.export_unencrypted(tempdbfile)
             greenlet = gevent.get_hub().threadpool.spawn(self.data.compress_and_encrypt_db, tempdbpath)  # noqa: E501
@@ -266,7 +345,11 @@ class PremiumSyncManager(LockableQueryMixIn):
             self.last_upload_attempt_ts = ts_now()
             return False, message
 
-        # update the last data upload value
+        self._mark_upload_success()
+        return True, None
+
+    def _mark_upload_success(self) -> None:
+        """Update the last data upload value and notify the frontend"""
         self.last_data_upload_ts = ts_now()
         self.last_upload_attempt_ts = self.last_data_upload_ts
         self.last_remote_data_upload_ts = self.last_data_upload_ts
@@ -282,6 +365,116 @@ class PremiumSyncManager(LockableQueryMixIn):
             data={'uploaded': True, 'actionable': False, 'message': None},
         )
         log.debug('upload to server -- success')
+
+    def _upload_failed(self, message: str, actionable: bool) -> tuple[bool, str]:
+        self.data.msg_aggregator.add_message(
+            message_type=WSMessageType.DATABASE_UPLOAD_RESULT,
+            data={'uploaded': False, 'actionable': actionable, 'message': message},
+        )
+        self.last_upload_attempt_ts = ts_now()
+        return False, message
+
+    def _upload_chunked_backup(
+            self,
+            metadata: RemoteMetadata,
+            last_modify_ts: Timestamp,
+            force_upload: bool,
+    ) -> tuple[bool, str | None]:
+        """Upload the DB to a server that stores backups in content addressed chunks.
+
+        The plaintext DB export is split in chunks and only the ones that the server does
+        not have are compressed, encrypted and uploaded, followed by the manifest of the DB.
+        """
+        assert self.premium is not None, 'caller should make sure premium exists'
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tempdbfile:
+            tempdbpath = self.data.db.export_unencrypted(tempdbfile)
+
+        try:
+            return self._upload_chunks_and_manifest(
+                tempdbpath=tempdbpath,
+                metadata=metadata,
+                last_modify_ts=last_modify_ts,
+                force_upload=force_upload,
+            )
+        finally:
+            tempdbpath.unlink()
+
+    def _upload_chunks_and_manifest(
+            self,
+            tempdbpath: Path,
+            metadata: RemoteMetadata,
+            last_modify_ts: Timestamp,
+            force_upload: bool,
+    ) -> tuple[bool, str | None]:
+        assert self.premium is not None, 'caller should make sure premium exists'
+        self.data.msg_aggregator.add_message(
+            message_type=WSMessageType.DATABASE_UPLOAD_PROGRESS,
+            data={'type': str(DBUploadStatusStep.COMPRESSING)},
+        )
+        password = self.data.db.password
+        manifest = gevent.get_hub().threadpool.spawn(build_backup_manifest, tempdbpath, password).get()  # noqa: E501
+        manifest_hash = manifest.get_hash()
+        log.debug('CAN_PUSH', ours=manifest_hash, theirs=metadata.data_hash)
+        if manifest_hash == metadata.data_hash and not force_upload:
+            log.debug('upload to server stopped -- same hash')
+            return self._upload_failed(message='Remote database is up to date', actionable=True)
+
+        if manifest.total_size < metadata.data_size and not force_upload:
+            with self.data.db.conn.read_ctx() as cursor:
+                ask_user_upon_size_discrepancy = self.data.db.get_setting(
+                    cursor=cursor, name='ask_user_upon_size_discrepancy',
+                )
+            if ask_user_upon_size_discrepancy is True:
+                log.debug(
+                    f'upload to server stopped -- remote db({metadata.data_size}) '
+                    f'bigger than local({manifest.total_size})',
+                )
+                return self._upload_failed(
+                    message='Remote database bigger than the local one',
+                    actionable=True,
+                )
+
+        try:
+            missing_ids = self.premium.query_missing_backup_chunks(
+                chunk_ids=list(dict.fromkeys(chunk.chunk_id for chunk in manifest.chunks)),
+            )
+            missing_chunks = list({
+                chunk.chunk_id: chunk for chunk in manifest.chunks
+                if chunk.chunk_id in missing_ids
+            }.values())
+            log.debug(
+                f'Uploading {len(missing_chunks)} out of {len(manifest.chunks)} DB chunks',
+            )
+            for idx, chunk in enumerate(missing_chunks):
+                self.data.msg_aggregator.add_message(
+                    message_type=WSMessageType.DATABASE_UPLOAD_PROGRESS,
+                    data={
+                        'type': str(DBUploadStatusStep.UPLOADING),
+                        'current_chunk': idx + 1,
+                        'total_chunks': len(missing_chunks),
+                    },
+                )
+                self.premium.upload_backup_chunk(
+                    chunk_id=chunk.chunk_id,
+                    data_blob=gevent.get_hub().threadpool.spawn(
+                        compress_and_encrypt_chunk,
+                        tempdbpath,
+                        chunk,
+                        password,
+                    ).get(),
+                )
+
+            self.premium.upload_backup_manifest(
+                manifest_blob=encrypt(password.encode(), manifest.serialize()),
+                manifest_hash=manifest_hash,
+                last_modify_ts=last_modify_ts,
+                total_size=manifest.total_size,
+            )
+        except (RemoteError, PremiumAuthenticationError) as e:
+            log.debug('upload to server -- upload error', error=str(e))
+            return self._upload_failed(message=str(e), actionable=False)
+
+        self._mark_upload_success()
         return True, None
 
     def sync_data(
@@ -302,6 +495,12 @@ class PremiumSyncManager(LockableQueryMixIn):
                     msg += f' {error_msg}'
             return success, msg
 
+        if self.premium is not None:
+            try:  # the server may have started storing backups in chunks since last checked
+                self._query_last_data_metadata()
+            except (RemoteError, PremiumAuthenticationError) as e:
+                return False, f'Pulling failed: {e!s}'
+
         return self._sync_data_from_server_and_replace_local(perform_migrations)
 
     def _sync_if_allowed(
@@ -7,6 +7,7 @@ import os
 import time
 from collections import defaultdict
 from collections.abc import Callable, Sequence
+from functools import partial
 from pathlib import Path
 from types import FunctionType
 from typing import TYPE_CHECKING, Any, Literal, Optional, cast, overload
@@ -23,7 +24,7 @@ from rotkehlchen.balances.manual import (
     get_manually_tracked_balances,
 )
 from rotkehlchen.chain.accounts import OptionalBlockchainAccount, SingleBlockchainAccountData
-from rotkehlchen.chain.aggregator import ChainsAggregator
+from rotkehlchen.chain.aggregator import BALANCE_QUERY_CONCURRENCY, ChainsAggregator
 from rotkehlchen.chain.arbitrum_one.manager import ArbitrumOneManager
 from rotkehlchen.chain.arbitrum_one.node_inquirer import ArbitrumOneInquirer
 from rotkehlchen.chain.avalanche.manager import AvalancheManager
@@ -89,6 +90,7 @@ from rotkehlchen.globaldb.asset_updates.manager import AssetsUpdater
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.globaldb.manual_price_oracles import ManualCurrentOracle
 from rotkehlchen.greenlets.manager import GreenletManager
+from rotkehlchen.greenlets.utils import run_concurrently
 from rotkehlchen.history.manager import HistoryQueryingManager
 from rotkehlchen.history.price import PriceHistorian
 from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
@@ -129,10 +131,12 @@ from rotkehlchen.usage_analytics import maybe_submit_usage_analytics
 from rotkehlchen.user_messages import MessagesAggregator
 from rotkehlchen.utils.datadir import maybe_restructure_rotki_data_directory
 from rotkehlchen.utils.misc import combine_dicts, ts_now
+from rotkehlchen.utils.profiling import Profiler
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.bitcoin.xpub import XpubData
     from rotkehlchen.db.drivers.gevent import DBConnection, DBCursor
+    from rotkehlchen.exchanges.exchange import ExchangeInterface
     from rotkehlchen.exchanges.kraken import KrakenAccountType
     from rotkehlchen.exchanges.okx import OkxLocation
 
@@ -140,6 +144,8 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 MAIN_LOOP_SECS_DELAY = 10
+# Seconds after which the balance query of an exchange is considered failed
+EXCHANGE_BALANCE_QUERY_TIMEOUT = 180
 
 
 class Rotkehlchen:
@@ -171,6 +177,10 @@ class Rotkehlchen:
             raise SystemPermissionError(
                 f'The given data directory {self.data_dir} is not readable or writable',
             )
+
+        if self.args.profiling is True:
+            Profiler().start()
+
         self.main_loop_spawned = False
         self.api_task_greenlets: list[gevent.Greenlet] = []
         self.msg_aggregator = MessagesAggregator()
@@ -522,6 +532,7 @@ class Rotkehlchen:
             uniswap_v3=uniswap_v3_oracle,
         )
         Inquirer().set_oracles_order(settings.current_price_oracles)
+        Inquirer.warm_up_cache(self.data.db)
 
         self.accountant = Accountant(
             db=self.data.db,
@@ -1077,10 +1088,34 @@ class Rotkehlchen:
         if self.task_manager is not None:
             self.task_manager.last_balance_query_ts = ts_now()
 
+        # Exchanges and blockchains are queried concurrently, each with its own timeout.
+        # The blockchain query has no overall timeout since each chain has its own.
+        exchanges = list(self.exchange_manager.iterate_exchanges())
+        tasks: dict[ExchangeInterface | Location, Callable[[], Any]] = {
+            exchange: partial(exchange.query_balances, ignore_cache=ignore_cache)
+            for exchange in exchanges
+        }
+        tasks[Location.BLOCKCHAIN] = partial(
+            self.chains_aggregator.query_balances,
+            blockchain=None,
+            ignore_cache=ignore_cache,
+        )
+        timeouts: dict[ExchangeInterface | Location, float | None] = {Location.BLOCKCHAIN: None}
+        results, errors = run_concurrently(
+            tasks=tasks,
+            concurrency=BALANCE_QUERY_CONCURRENCY,
+            timeout=EXCHANGE_BALANCE_QUERY_TIMEOUT,
+            expected_errors=(RemoteError, EthSyncError),
+            timeouts=timeouts,
+        )
+
         balances: dict[str, dict[Asset, Balance]] = {}
         problem_free = True
-        for exchange in self.exchange_manager.iterate_exchanges():
-            exchange_balances, error_msg = exchange.query_balances(ignore_cache=ignore_cache)
+        for exchange in exchanges:
+            if exchange in errors:
+                exchange_balances, error_msg = None, str(errors[exchange])
+            else:
+                exchange_balances, error_msg = results[exchange]
             # If we got an error, disregard that exchange but make sure we don't save data
             if not isinstance(exchange_balances, dict):
                 problem_free = False
@@ -1095,43 +1130,39 @@ class Rotkehlchen:
                 else:  # multiple exchange of same type. Combine balances
                     balances[location_str] = combine_dicts(
                         balances[location_str],
-                        exchange_balances,  # type: ignore
+                        exchange_balances,
                     )
 
-        liabilities: dict[Asset, Balance]
-        try:
-            blockchain_result = self.chains_aggregator.query_balances(
-                blockchain=None,
-                ignore_cache=ignore_cache,
-            )  # copies below since if cache is used we end up modifying the balance sheet object
-
-            blockchain_assets: dict[Asset, Balance] = {}
-            for asset, asset_balances in blockchain_result.totals.assets.items():
-                total_balance = Balance()
-                for balance in asset_balances.values():
-                    total_balance += balance
-                if total_balance.amount != ZERO:
-                    blockchain_assets[asset] = total_balance
-
-            if len(blockchain_assets) != 0:
-                balances[str(Location.BLOCKCHAIN)] = blockchain_assets
-
-            liabilities = {}
-            for asset, asset_balances in blockchain_result.totals.liabilities.items():
-                total_balance = Balance()
-                for balance in asset_balances.values():
-                    total_balance += balance
-                if total_balance.amount != ZERO:
-                    liabilities[asset] = total_balance
-
-        except (RemoteError, EthSyncError) as e:
+        if (blockchain_error := errors.get(Location.BLOCKCHAIN)) is not None:
             problem_free = False
-            liabilities = {}
-            log.error(f'Querying blockchain balances failed due to: {e!s}')
+            log.error(f'Querying blockchain balances failed due to: {blockchain_error!s}')
             self.msg_aggregator.add_message(
                 message_type=WSMessageType.BALANCE_SNAPSHOT_ERROR,
-                data={'location': 'blockchain balances query', 'error': str(e)},
+                data={'location': 'blockchain balances query', 'error': str(blockchain_error)},
             )
+            # the totals still contain the balances of the chains that were queried
+            blockchain_totals = self.chains_aggregator.get_balances_update(chain=None).totals
+        else:  # copies since if cache is used we end up modifying the balance sheet object
+            blockchain_totals = results[Location.BLOCKCHAIN].totals
+
+        blockchain_assets: dict[Asset, Balance] = {}
+        for asset, asset_balances in blockchain_totals.assets.items():
+            total_balance = Balance()
+            for balance in asset_balances.values():
+                total_balance += balance
+            if total_balance.amount != ZERO:
+                blockchain_assets[asset] = total_balance
+
+        if len(blockchain_assets) != 0:
+            balances[str(Location.BLOCKCHAIN)] = blockchain_assets
+
+        liabilities: dict[Asset, Balance] = {}
+        for asset, asset_balances in blockchain_totals.liabilities.items():
+            total_balance = Balance()
+            for balance in asset_balances.values():
+                total_balance += balance
+            if total_balance.amount != ZERO:
+                liabilities[asset] = total_balance
 
         manually_tracked_liabilities = get_manually_tracked_balances(
             db=self.data.db,
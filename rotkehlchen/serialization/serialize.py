@@ -1,4 +1,7 @@
-from typing import Any
+import json
+from collections.abc import Callable
+from types import NoneType
+from typing import Any, Final
 
 from hexbytes import HexBytes
 from packaging.version import Version
@@ -60,116 +63,179 @@ from rotkehlchen.types import (
 )
 from rotkehlchen.utils.version_check import VersionCheckResult
 
+# Types that are sent as they are. Checked by exact type so that their subclasses, such
+# as enums deriving from int or str, still get converted.
+JSON_NATIVE_TYPES: Final = frozenset((str, int, float, bool, NoneType))
+# Types of dict keys that are converted like values
+_CONVERTED_KEY_TYPES: Final = (HistoryEventType, HistoryEventSubType, EventCategory, Location, AccountingEventType)  # noqa: E501
+
+# Converters in the order they are matched against the type of an entry
+_serializers: list[tuple[tuple[type, ...], Callable[[Any], Any]]] = []
+# Converter of each type that was serialized, found once from the registered ones
+_converters: dict[type, Callable[[Any], Any]] = {}
+
+
+def register_serializer(*types: type, converter: Callable[[Any], Any]) -> None:
+    """Register the converter of the given types and their subclasses. If a type matches
+    many registered serializers the one registered first is used."""
+    _serializers.append((types, converter))
+    _converters.clear()
+
+
+def _get_converter(cls: type) -> Callable[[Any], Any]:
+    if (converter := _converters.get(cls)) is None:
+        for types, registered_converter in _serializers:
+            if issubclass(cls, types):
+                converter = registered_converter
+                break
+        else:  # unknown types are sent as they are
+            converter = _identity
+
+        _converters[cls] = converter
+
+    return converter
+
+
+def _identity(entry: Any) -> Any:
+    return entry
+
 
 def _process_entry(entry: Any) -> str | (list[Any] | (dict[str, Any] | Any)):
-    if isinstance(entry, FVal):
-        return str(entry)
-    if isinstance(entry, list):
-        return [_process_entry(x) for x in entry]
-
-    if isinstance(entry, dict | AttributeDict):
-        new_dict = {}
-        for k, v in entry.items():
-            if isinstance(k, Asset) is True:
+    if type(entry) in JSON_NATIVE_TYPES:
+        return entry
+
+    return _get_converter(type(entry))(entry)
+
+
+def _process_list(entry: list[Any]) -> list[Any]:
+    return [x if type(x) in JSON_NATIVE_TYPES else _process_entry(x) for x in entry]
+
+
+def _process_dict(entry: dict[Any, Any] | AttributeDict) -> dict[Any, Any]:
+    new_dict = {}
+    for k, v in entry.items():
+        if type(k) not in JSON_NATIVE_TYPES:
+            if isinstance(k, Asset):
                 k = k.identifier  # noqa: PLW2901
-            elif isinstance(k, HistoryEventType | HistoryEventSubType | EventCategory | Location | AccountingEventType) is True:  # noqa: E501
+            elif isinstance(k, _CONVERTED_KEY_TYPES):
                 k = _process_entry(k)  # noqa: PLW2901
-            new_dict[k] = _process_entry(v)
-        return new_dict
-    if isinstance(entry, HexBytes):
-        return entry.to_0x_hex()
-    if isinstance(entry, LocationData):
-        return {
-            'time': entry.time,
-            'location': str(Location.deserialize_from_db(entry.location)),
-            'usd_value': entry.usd_value,
-        }
-    if isinstance(entry, SingleDBAssetBalance):
-        return {
-            'time': entry.time,
-            'category': str(entry.category),
-            'amount': str(entry.amount),
-            'usd_value': str(entry.usd_value),
-        }
-    if isinstance(entry, DBAssetBalance):
-        return {
-            'time': entry.time,
-            'category': str(entry.category),
-            'asset': entry.asset.identifier,
-            'amount': str(entry.amount),
-            'usd_value': str(entry.usd_value),
-        }
-    if isinstance(entry, (
-            AddressbookEntry |
-            AddressbookEntryWithSource |
-            AssetBalance |
-            DefiProtocol |
-            MakerdaoVault |
-            XpubData |
-            NodeName |
-            NodeName |
-            SingleBlockchainAccountData |
-            SupportedBlockchain |
-            HistoryEventType |
-            HistoryEventSubType |
-            EventDirection |
-            DBSettings |
-            TxAccountingTreatment |
-            EventCategoryDetails |
-            CalendarEntry |
-            ReminderEntry |
-            CounterpartyDetails
-    )):
-        return entry.serialize()
-    if isinstance(entry, (
-            MakerdaoVault |
-            Balance |
-            CompoundBalance |
-            LiquidityPool |
-            LiquidityPoolAsset |
-            ManuallyTrackedBalanceWithValue |
-            Trove |
-            DillBalance |
-            NFTResult |
-            ExchangeLocationID |
-            WeightedNode
-    )):
-        return process_result(entry.serialize())
-    if isinstance(entry, (
-            VersionCheckResult |
-            DSRCurrentBalances |
-            VaultEvent |
-            DefiBalance |
-            DefiProtocolBalances |
-            BlockchainAccountData
-    )):
-        return process_result(entry._asdict())
-    if isinstance(entry, tuple):
-        return list(entry)
-    if isinstance(entry, Asset):
-        return entry.identifier
-    if isinstance(entry, (
-            Location |
-            KrakenAccountType |
-            Location |
-            VaultEventType |
-            CurrentPriceOracle |
-            HistoricalPriceOracle |
-            BalanceType |
-            CostBasisMethod |
-            TokenKind |
-            HistoryBaseEntryType |
-            EventCategory |
-            AccountingEventType |
-            Version |
-            WSMessageType
-    )):
-        return str(entry)
-    if isinstance(entry, ChainID):
-        return entry.to_name()
-
-    # else
-    return entry
+        new_dict[k] = v if type(v) in JSON_NATIVE_TYPES else _process_entry(v)
+    return new_dict
+
+
+def _serialize_location_data(entry: LocationData) -> dict[str, Any]:
+    return {
+        'time': entry.time,
+        'location': str(Location.deserialize_from_db(entry.location)),
+        'usd_value': entry.usd_value,
+    }
+
+
+def _serialize_single_db_asset_balance(entry: SingleDBAssetBalance) -> dict[str, Any]:
+    return {
+        'time': entry.time,
+        'category': str(entry.category),
+        'amount': str(entry.amount),
+        'usd_value': str(entry.usd_value),
+    }
+
+
+def _serialize_db_asset_balance(entry: DBAssetBalance) -> dict[str, Any]:
+    return {
+        'time': entry.time,
+        'category': str(entry.category),
+        'asset': entry.asset.identifier,
+        'amount': str(entry.amount),
+        'usd_value': str(entry.usd_value),
+    }
+
+
+register_serializer(FVal, converter=str)
+register_serializer(list, converter=_process_list)
+register_serializer(dict, AttributeDict, converter=_process_dict)
+register_serializer(HexBytes, converter=lambda x: x.to_0x_hex())
+register_serializer(LocationData, converter=_serialize_location_data)
+register_serializer(SingleDBAssetBalance, converter=_serialize_single_db_asset_balance)
+register_serializer(DBAssetBalance, converter=_serialize_db_asset_balance)
+register_serializer(
+    AddressbookEntry,
+    AddressbookEntryWithSource,
+    AssetBalance,
+    DefiProtocol,
+    MakerdaoVault,
+    XpubData,
+    NodeName,
+    SingleBlockchainAccountData,
+    SupportedBlockchain,
+    HistoryEventType,
+    HistoryEventSubType,
+    EventDirection,
+    DBSettings,
+    TxAccountingTreatment,
+    EventCategoryDetails,
+    CalendarEntry,
+    ReminderEntry,
+    CounterpartyDetails,
+    converter=lambda x: x.serialize(),
+)
+register_serializer(
+    Balance,
+    CompoundBalance,
+    LiquidityPool,
+    LiquidityPoolAsset,
+    ManuallyTrackedBalanceWithValue,
+    Trove,
+    DillBalance,
+    NFTResult,
+    ExchangeLocationID,
+    WeightedNode,
+    converter=lambda x: _process_entry(x.serialize()),
+)
+register_serializer(
+    VersionCheckResult,
+    DSRCurrentBalances,
+    VaultEvent,
+    DefiBalance,
+    DefiProtocolBalances,
+    BlockchainAccountData,
+    converter=lambda x: _process_entry(x._asdict()),
+)
+register_serializer(tuple, converter=list)
+register_serializer(Asset, converter=lambda x: x.identifier)
+register_serializer(
+    Location,
+    KrakenAccountType,
+    VaultEventType,
+    CurrentPriceOracle,
+    HistoricalPriceOracle,
+    BalanceType,
+    CostBasisMethod,
+    TokenKind,
+    HistoryBaseEntryType,
+    EventCategory,
+    AccountingEventType,
+    Version,
+    WSMessageType,
+    converter=str,
+)
+register_serializer(ChainID, converter=lambda x: x.to_name())
+
+
+def _json_default(entry: Any) -> Any:
+    """Convert the entries the JSON encoder does not know, such as FVals in tuples"""
+    if (converter := _get_converter(type(entry))) is _identity:
+        raise TypeError(f'Object of type {type(entry).__name__} is not JSON serializable')
+
+    return converter(entry)
+
+
+def result_to_json(result: Any) -> str:
+    """Serialize a result like process_result does and encode it as JSON
+
+    May raise:
+    - TypeError if the result contains entries that can't be serialized
+    """
+    return json.dumps(_process_entry(result), default=_json_default)
 
 
 def process_result(result: Any) -> dict[Any, Any]:
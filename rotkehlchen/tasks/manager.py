@@ -1,8 +1,10 @@
 import logging
 import random
+import time
 from collections import defaultdict
 from collections.abc import Callable
-from typing import TYPE_CHECKING, NamedTuple
+from functools import partial
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import gevent
 
@@ -63,6 +65,7 @@ from rotkehlchen.tasks.calendar import (
     maybe_create_calendar_reminders,
     notify_reminders,
 )
+from rotkehlchen.tasks.scheduling import DEFAULT_TASK_PRIORITY, TASK_PRIORITIES, TaskStats
 from rotkehlchen.tasks.utils import should_run_periodic_task
 from rotkehlchen.types import (
     EVM_CHAINS_WITH_TRANSACTIONS,
@@ -109,6 +112,17 @@ def exchange_fail_cb(error: str) -> None:
     log.error(error)
 
 
+def _maybe_finish_task(
+        _greenlet: gevent.Greenlet,
+        greenlets: list[gevent.Greenlet],
+        stats: TaskStats,
+) -> None:
+    """Called when a greenlet of a background task finishes. Records the run time of the
+    task once all of its greenlets have finished"""
+    if all(greenlet.ready() for greenlet in greenlets):
+        stats.mark_finished()
+
+
 class CCHistoQuery(NamedTuple):
     from_asset: AssetWithOracles
     to_asset: AssetWithOracles
@@ -147,6 +161,7 @@ class TaskManager:
         self.last_exchange_query_ts: defaultdict[ExchangeLocationID, int] = defaultdict(int)
         self.prepared_cryptocompare_query = False
         self.running_greenlets: dict[Callable, list[gevent.Greenlet]] = {}
+        self.task_stats: dict[str, TaskStats] = {}  # scheduling function name -> stats
         self.deactivate_premium = deactivate_premium
         self.activate_premium = activate_premium
         self.query_balances = query_balances
@@ -435,31 +450,29 @@ class TaskManager:
 
         The DB check happens first here to see if scheduling would even be needed.
         But the DB query will happen again inside the query task while having the
-        lock acquired.
+        lock acquired. All the chains with undecoded transactions are decoded
+        concurrently by a single task, each up to TX_DECODING_LIMIT transactions.
         """
         dbevmtx = DBEvmTx(self.database)
-        shuffled_chains = list(EVM_CHAINS_WITH_TRANSACTIONS)
-        random.shuffle(shuffled_chains)
-        for blockchain in shuffled_chains:
-            number_of_tx_to_decode = dbevmtx.count_hashes_not_decoded(
+        number_of_tx_to_decode = 0
+        for blockchain in EVM_CHAINS_WITH_TRANSACTIONS:
+            number_of_tx_to_decode += min(TX_DECODING_LIMIT, dbevmtx.count_hashes_not_decoded(
                 filter_query=EvmTransactionsNotDecodedFilterQuery.make(chain_id=blockchain.to_chain_id()),
-            )
-            if number_of_tx_to_decode == 0:
-                return None
+            ))
 
-            evm_inquirer = self.chains_aggregator.get_chain_manager(blockchain)
-            task_name = f'decode {min(number_of_tx_to_decode, TX_DECODING_LIMIT)} {blockchain!s} transactions'  # noqa: E501
-            log.debug(f'Scheduling periodic task to {task_name}')
-            # Since this task is heavy we spawn it only for one chain at a time.
-            return [self.greenlet_manager.spawn_and_track(
-                after_seconds=None,
-                task_name=task_name,
-                exception_is_error=True,
-                method=evm_inquirer.transactions_decoder.get_and_decode_undecoded_transactions,
-                limit=TX_DECODING_LIMIT,
-                send_ws_notifications=True,
-            )]
-        return None
+        if number_of_tx_to_decode == 0:
+            return None
+
+        task_name = f'decode {number_of_tx_to_decode} evm transactions'
+        log.debug(f'Scheduling periodic task to {task_name}')
+        return [self.greenlet_manager.spawn_and_track(
+            after_seconds=None,
+            task_name=task_name,
+            exception_is_error=True,
+            method=self.chains_aggregator.decode_undecoded_evm_transactions,
+            limit=TX_DECODING_LIMIT,
+            send_ws_notifications=True,
+        )]
 
     def _maybe_check_premium_status(self) -> None:
         """
@@ -1032,21 +1045,47 @@ class TaskManager:
         if not_proceed:
             return  # too busy
 
-        random.shuffle(self.potential_tasks)
-        max_tasks = min(self.max_tasks_num - current_greenlets, len(self.potential_tasks))
+        now = time.monotonic()
+        # check the most overdue high priority tasks first
+        tasks = sorted(
+            self.potential_tasks,
+            key=lambda fn: self._get_task_stats(fn).sort_key(now),
+        )
+        max_tasks = min(self.max_tasks_num - current_greenlets, len(tasks))
 
         spawned_new = 0
-        for scheduling_fn in self.potential_tasks:
-            if spawned_new >= max_tasks:
-                break  # no more task slots left
+        for scheduling_fn in tasks:
             if scheduling_fn in self.running_greenlets:
                 continue  # the specified task is already running
+            stats = self._get_task_stats(scheduling_fn)
+            if spawned_new >= max_tasks:
+                stats.mark_waiting(now)  # no more task slots left
+                continue
+            stats.mark_checked(now)
             new_greenlets = scheduling_fn()
             if new_greenlets is None:
                 continue  # The scheduling function for the specific task decided to not schedule it  # noqa: E501
             self.running_greenlets[scheduling_fn] = new_greenlets
+            stats.mark_started(now)
+            for greenlet in new_greenlets:
+                greenlet.rawlink(partial(_maybe_finish_task, greenlets=new_greenlets, stats=stats))
             spawned_new += 1
 
+    def _get_task_stats(self, scheduling_fn: Callable) -> TaskStats:
+        if (stats := self.task_stats.get(name := scheduling_fn.__name__)) is None:
+            stats = self.task_stats[name] = TaskStats(
+                priority=TASK_PRIORITIES.get(name, DEFAULT_TASK_PRIORITY),
+            )
+        return stats
+
+    def get_task_stats(self) -> dict[str, dict[str, Any]]:
+        """Return the scheduling stats of the background tasks that have been considered
+        for scheduling, keyed by the task name"""
+        return {
+            name.removeprefix('_maybe_'): stats.serialize()
+            for name, stats in self.task_stats.items()
+        }
+
     def schedule(self) -> None:
         """Schedules background task while holding the scheduling lock
 
@@ -0,0 +1,91 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Final
+
+from rotkehlchen.utils.misc import ts_now
+
+DEFAULT_TASK_PRIORITY: Final = 1
+# Priority of the background tasks whose work is user visible or that other tasks depend on.
+# When the task slots are not enough for all the tasks, higher priority tasks are checked
+# first. Tasks are identified by the name of their scheduling function.
+TASK_PRIORITIES: Final = {
+    '_maybe_check_premium_status': 4,
+    '_maybe_schedule_db_upload': 4,
+    '_maybe_update_snapshot_balances': 4,
+    '_maybe_trigger_calendar_reminder': 4,
+    '_maybe_decode_evm_transactions': 3,
+    '_maybe_query_evm_transactions': 3,
+    '_maybe_schedule_evm_txreceipts': 3,
+    '_maybe_schedule_exchange_history_query': 3,
+    '_maybe_run_events_processing': 2,
+    '_maybe_schedule_xpub_derivation': 2,
+    '_maybe_check_data_updates': 2,
+    '_maybe_detect_evm_accounts': 2,
+}
+# Seconds a task has to wait for a free task slot to have its priority raised by one.
+# Makes sure that low priority tasks are not starved when there are always higher
+# priority tasks to run.
+TASK_PRIORITY_AGING_SECS: Final = 60
+
+
+@dataclass(init=True, repr=True, eq=False, order=False, unsafe_hash=False, frozen=False)
+class TaskStats:
+    """Scheduling bookkeeping of a background task. Durations are in seconds."""
+    priority: int
+    waiting_since: float | None = None  # monotonic time since it waits for a task slot
+    started_at: float | None = None  # monotonic time its current run started
+    last_check_ts: int = 0
+    runs: int = 0
+    total_run_time: float = 0.0
+    last_run_time: float = 0.0
+    last_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    def average_run_time(self) -> float:
+        return self.total_run_time / self.runs if self.runs != 0 else 0.0
+
+    def sort_key(self, now: float) -> tuple[float, float]:
+        """Key to order the tasks by. The most overdue high priority tasks come first and
+        among tasks of the same priority the ones with the smallest expected run time."""
+        priority: float = self.priority
+        if self.waiting_since is not None:
+            priority += (now - self.waiting_since) / TASK_PRIORITY_AGING_SECS
+        return -priority, self.average_run_time()
+
+    def mark_waiting(self, now: float) -> None:
+        if self.waiting_since is None:
+            self.waiting_since = now
+
+    def mark_checked(self, now: float) -> None:
+        """Called when the scheduling function of the task is called"""
+        self.last_check_ts = ts_now()
+        if self.waiting_since is not None:
+            self.last_wait_time = now - self.waiting_since
+            self.max_wait_time = max(self.max_wait_time, self.last_wait_time)
+            self.waiting_since = None
+
+    def mark_started(self, now: float) -> None:
+        self.started_at = now
+
+    def mark_finished(self) -> None:
+        if self.started_at is None:
+            return
+
+        self.last_run_time = time.monotonic() - self.started_at
+        self.total_run_time += self.last_run_time
+        self.runs += 1
+        self.started_at = None
+
+    def serialize(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            'priority': self.priority,
+            'running': self.started_at is not None,
+            'waiting_time': now - self.waiting_since if self.waiting_since is not None else 0.0,
+            'last_check_ts': self.last_check_ts,
+            'runs': self.runs,
+            'last_run_time': self.last_run_time,
+            'average_run_time': self.average_run_time(),
+            'last_wait_time': self.last_wait_time,
+            'max_wait_time': self.max_wait_time,
+        }
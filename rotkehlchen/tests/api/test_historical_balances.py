@@ -590,6 +590,49 @@ def test_get_historical_netvalue_missing_prices(
     assert FVal(result['values'][0]) == FVal('10') * eth_price
 
 
+@pytest.mark.parametrize('start_with_valid_premium', [True])
+def test_get_historical_netvalue_closest_prices(
+        rotkehlchen_api_server: 'APIServer',
+        globaldb: 'GlobalDBHandler',
+        setup_historical_data: None,
+) -> None:
+    """Test that for each day the price closest to it within a day is used, and that
+    prices in other currencies are not considered"""
+    day1_ts = timestamp_to_daystart_timestamp(START_TS)
+    day3_ts = timestamp_to_daystart_timestamp(Timestamp(START_TS + DAY_IN_SECONDS * 2))
+    globaldb.add_historical_prices(entries=[HistoricalPrice(
+        from_asset=from_asset,
+        to_asset=to_asset,
+        source=HistoricalPriceOracle.CRYPTOCOMPARE,
+        timestamp=Timestamp(timestamp),
+        price=Price(FVal(price)),
+    ) for from_asset, to_asset, timestamp, price in (
+        (A_BTC, A_EUR, day1_ts - HOUR_IN_SECONDS * 20, 16000),
+        (A_BTC, A_EUR, day1_ts + HOUR_IN_SECONDS * 5, 17000),
+        (A_BTC, A_USD, day1_ts, 20000),
+        (A_ETH, A_EUR, day1_ts + HOUR_IN_SECONDS * 2, 1000),
+        (A_BTC, A_EUR, day3_ts + HOUR_IN_SECONDS * 23, 18000),
+    )])
+
+    response = requests.post(
+        api_url_for(
+            rotkehlchen_api_server,
+            'historicalnetvalueresource',
+        ),
+        json={
+            'from_timestamp': START_TS,
+            'to_timestamp': START_TS + DAY_IN_SECONDS * 3,
+        },
+    )
+    result = assert_proper_sync_response_with_result(response)
+    assert result['times'] == [day1_ts, day3_ts]
+    assert [FVal(x) for x in result['values']] == [
+        FVal('44000'),  # Day 1: (2 BTC * 17000) + (10 ETH * 1000)
+        FVal('27000'),  # Day 3: (1.5 BTC * 18000) and no ETH price
+    ]
+    assert result['missing_prices'] == [[A_ETH.identifier, day3_ts]]
+
+
 @pytest.mark.parametrize('start_with_valid_premium', [True])
 def test_get_historical_netvalue_with_negative_amount(
         rotkehlchen_api_server: 'APIServer',
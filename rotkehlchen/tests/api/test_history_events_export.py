@@ -1,4 +1,5 @@
 import csv
+import gzip
 import re
 from datetime import datetime
 from http import HTTPStatus
@@ -191,6 +192,28 @@ def test_history_export_csv_custom_delimiter(
     assert_csv_export_response(response, csv_dir / 'historyevents_until_20250430.csv', csv_delimiter=csv_delimiter)  # noqa: E501
 
 
+@pytest.mark.parametrize('default_mock_price_value', [ONE])
+@pytest.mark.freeze_time('2025-04-30')
+def test_history_export_csv_compressed_in_chunks(
+        rotkehlchen_api_server_with_exchanges: APIServer,
+        tmpdir_factory: pytest.TempdirFactory,
+) -> None:
+    """Test that events exported in many chunks are all written and that the csv can be
+    compressed"""
+    add_entries(events_db=DBHistoryEvents(rotkehlchen_api_server_with_exchanges.rest_api.rotkehlchen.data.db))
+    csv_dir = Path(tmpdir_factory.mktemp('test_csv_dir'))
+    with patch('rotkehlchen.history.events.export.HISTORY_EVENTS_EXPORT_CHUNK_SIZE', new=3):
+        response = requests.post(
+            api_url_for(rotkehlchen_api_server_with_exchanges, 'exporthistoryeventresource'),
+            json={'async_query': False, 'directory_path': str(csv_dir), 'compress': True},
+        )
+
+    csv_path = csv_dir / 'historyevents_until_20250430.csv'
+    assert not csv_path.exists()
+    csv_path.write_bytes(gzip.decompress((csv_dir / 'historyevents_until_20250430.csv.gz').read_bytes()))  # noqa: E501
+    assert_csv_export_response(response, csv_path)
+
+
 def test_history_export_csv_errors(
         rotkehlchen_api_server_with_exchanges: APIServer,
         tmpdir_factory: pytest.TempdirFactory,
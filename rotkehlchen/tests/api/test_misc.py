@@ -424,6 +424,36 @@ def test_update_log_level(
     assert 'Test trace message' in caplog.text
 
 
+def test_profiling(rotkehlchen_api_server: 'APIServer') -> None:
+    """Test that profiling can be started and stopped via the API and its data queried"""
+    url = api_url_for(rotkehlchen_api_server, 'profilingresource')
+    assert_error_response(
+        response=requests.put(url, json={'sample_interval': 0}),
+        contained_in_msg='sample_interval',
+    )
+    assert_proper_response(requests.put(url, json={'sample_interval': 0.005, 'window': 60}))
+    assert_error_response(
+        response=requests.put(url, json={}),
+        contained_in_msg='Profiling is already running',
+        status_code=HTTPStatus.CONFLICT,
+    )
+    # the requests of the test run on the greenlets of the api server
+    assert_proper_response(requests.get(api_url_for(rotkehlchen_api_server, 'configurationsresource')))  # noqa: E501
+    assert_proper_response(requests.delete(url))
+    result = assert_proper_sync_response_with_result(requests.get(url))
+    assert result['running'] is False and result['window'] == 60 and result['samples'] > 0
+    assert sum(result['flamegraph'].values()) > 0
+    assert all(
+        set(stats) == {'switches', 'run_time', 'cpu_time', 'blocking_time', 'max_run_time'}
+        for stats in result['greenlets'].values()
+    )
+    assert_error_response(
+        response=requests.delete(url),
+        contained_in_msg='Profiling is not running',
+        status_code=HTTPStatus.CONFLICT,
+    )
+
+
 def test_query_all_chain_ids(rotkehlchen_api_server: 'APIServer') -> None:
     response = requests.get(api_url_for(rotkehlchen_api_server, 'allevmchainsresource'))
     result = assert_proper_sync_response_with_result(response)
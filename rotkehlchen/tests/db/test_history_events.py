@@ -4,14 +4,17 @@ from unittest.mock import patch
 import pytest
 
 from rotkehlchen.api.v1.types import IncludeExcludeFilterData
+from rotkehlchen.assets.asset import Asset
+from rotkehlchen.balances.historical import HistoricalBalancesManager
 from rotkehlchen.chain.decoding.constants import CPT_GAS
 from rotkehlchen.chain.evm.decoding.oneinch.constants import CPT_ONEINCH_V6
 from rotkehlchen.chain.evm.types import string_to_evm_address
-from rotkehlchen.constants import ONE
+from rotkehlchen.constants import DAY_IN_SECONDS, ONE
 from rotkehlchen.constants.assets import A_BTC, A_DAI, A_ETH, A_USDC, A_USDT
 from rotkehlchen.constants.limits import FREE_HISTORY_EVENTS_LIMIT
 from rotkehlchen.constants.misc import ZERO
 from rotkehlchen.db.constants import HISTORY_MAPPING_KEY_STATE, HISTORY_MAPPING_STATE_CUSTOMIZED
+from rotkehlchen.db.daily_balances import DBDailyBalances, timestamp_to_day
 from rotkehlchen.db.dbhandler import DBHandler
 from rotkehlchen.db.filtering import (
     EthDepositEventFilterQuery,
@@ -26,6 +29,7 @@ from rotkehlchen.history.events.structures.eth2 import EthDepositEvent, EthWithd
 from rotkehlchen.history.events.structures.evm_event import EvmEvent
 from rotkehlchen.history.events.structures.evm_swap import EvmSwapEvent
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.history.price import PriceHistorian
 from rotkehlchen.tests.utils.factories import (
     make_ethereum_event,
     make_evm_address,
@@ -602,3 +606,81 @@ def test_match_exact_events(database: 'DBHandler', start_with_valid_premium: boo
         assert result_match_grouped[0][0] == 2 and result_no_match_grouped[0][0] == 4
         assert result_match_grouped[0][1].asset == A_DAI
         assert result_match_grouped[0][1].asset == A_DAI
+
+
+def test_daily_balances_index(database: DBHandler) -> None:
+    """Test that historical balances use the daily balances index and that changing
+    events in an already indexed day recalculates the index from that day on"""
+    day_ts, events_db = Timestamp(1672531200), DBHistoryEvents(database)
+    daily_balances, manager = DBDailyBalances(database), HistoricalBalancesManager(database)
+
+    def make_event(idx: int, days: int, event_type: HistoryEventType, amount: str) -> HistoryEvent:
+        return HistoryEvent(
+            event_identifier=f'event_{idx}',
+            sequence_index=0,
+            timestamp=TimestampMS((day_ts + days * DAY_IN_SECONDS + 10) * 1000),
+            location=Location.BLOCKCHAIN,
+            event_type=event_type,
+            event_subtype=HistoryEventSubType.NONE,
+            asset=A_ETH,
+            amount=FVal(amount),
+        )
+
+    with database.user_write() as write_cursor:
+        events_db.add_history_events(write_cursor=write_cursor, history=[
+            make_event(1, 0, HistoryEventType.RECEIVE, '10'),
+            make_event(2, 1, HistoryEventType.SPEND, '3'),
+            make_event(3, 3, HistoryEventType.RECEIVE, '1'),
+        ])
+
+    query_ts = Timestamp(day_ts + 5 * DAY_IN_SECONDS)
+    with patch.object(PriceHistorian, 'query_historical_price', return_value=ONE):
+        assert manager.get_asset_balance(asset=A_ETH, timestamp=query_ts)['amount'] == FVal(8)
+        assert daily_balances.refresh() == timestamp_to_day(query_ts)
+        assert daily_balances.get_balances(day_ts=Timestamp(day_ts + 2 * DAY_IN_SECONDS)) == {A_ETH.identifier: FVal(7)}  # noqa: E501
+
+        with database.user_write() as write_cursor:  # add an event in an indexed day
+            events_db.add_history_event(
+                write_cursor=write_cursor,
+                event=make_event(4, 2, HistoryEventType.RECEIVE, '5'),
+            )
+        assert manager.get_balances(timestamp=query_ts)[A_ETH]['amount'] == FVal(13)
+        assert daily_balances.get_balances(day_ts=Timestamp(day_ts + 3 * DAY_IN_SECONDS)) == {A_ETH.identifier: FVal(12)}  # noqa: E501
+
+        # deleting the first event creates a negative balance in the first indexed day
+        assert events_db.delete_history_events_by_identifier(identifiers=[1]) is None
+        assert daily_balances.refresh() == day_ts
+        assert manager.get_asset_balance(asset=A_ETH, timestamp=query_ts)['amount'] == ZERO
+        assert daily_balances.refresh() == Timestamp(day_ts + DAY_IN_SECONDS)
+
+
+def test_daily_balances_index_after_asset_merge(database: DBHandler) -> None:
+    """Test that merging two assets recalculates the daily balances index so that
+    it doesn't keep balances under the replaced asset identifier"""
+    day_ts, events_db = Timestamp(1672531200), DBHistoryEvents(database)
+    daily_balances, manager = DBDailyBalances(database), HistoricalBalancesManager(database)
+    with database.user_write() as write_cursor:
+        events_db.add_history_events(write_cursor=write_cursor, history=[HistoryEvent(
+            event_identifier=f'event_{idx}',
+            sequence_index=0,
+            timestamp=TimestampMS((day_ts + idx * DAY_IN_SECONDS) * 1000),
+            location=Location.BLOCKCHAIN,
+            event_type=HistoryEventType.RECEIVE,
+            event_subtype=HistoryEventSubType.NONE,
+            asset=asset,
+            amount=FVal(amount),
+        ) for idx, (asset, amount) in enumerate([(A_ETH, '10'), (A_BTC, '1')])])
+
+    query_ts = Timestamp(day_ts + 3 * DAY_IN_SECONDS)
+    with patch.object(PriceHistorian, 'query_historical_price', return_value=ONE):
+        assert manager.get_balances(timestamp=query_ts)[A_ETH]['amount'] == FVal(10)
+        assert daily_balances.get_balances(day_ts=query_ts) == {
+            A_ETH.identifier: FVal(10),
+            A_BTC.identifier: ONE,
+        }
+
+        database.replace_asset_identifier(source_identifier=A_ETH.identifier, target_asset=Asset(A_BTC.identifier))  # noqa: E501
+        assert daily_balances.refresh() == Timestamp(0)
+        balances = manager.get_balances(timestamp=query_ts)
+        assert A_ETH not in balances and balances[A_BTC]['amount'] == FVal(11)
+        assert daily_balances.get_balances(day_ts=query_ts) == {A_BTC.identifier: FVal(11)}
@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import gevent
+
+from rotkehlchen.db.drivers.gevent import (
+    DB_READ_POOL_FETCH_ROWS,
+    DBConnection,
+    DBConnectionType,
+    DBReadCursor,
+)
+
+SLOW_QUERY = 'WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 2000000) SELECT SUM(x) FROM c'  # noqa: E501
+
+
+def _make_connection(path: Path, wal: bool = True) -> DBConnection:
+    conn = DBConnection(
+        path=path,
+        connection_type=DBConnectionType.GLOBAL,
+        sql_vm_instructions_cb=0,
+    )
+    if wal:
+        with conn.read_ctx() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL;')
+    with conn.write_ctx() as write_cursor:
+        write_cursor.execute('CREATE TABLE a(b INTEGER PRIMARY KEY)')
+        write_cursor.executemany('INSERT INTO a VALUES (?)', [(x,) for x in range(1000)])
+    return conn
+
+
+def test_threaded_reads(tmp_path: Path):
+    """Test that reads of the read pool run in threads while other greenlets keep running
+    and that their cursors work like the ones of the main connection"""
+    conn = _make_connection(tmp_path / 'test.db')
+    conn.enable_read_pool(size=2)
+    assert conn.read_pool is not None
+    ticks = 0
+
+    def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            gevent.sleep(0.001)
+
+    def slow_read() -> int:
+        with conn.threaded_read_ctx() as cursor:
+            assert isinstance(cursor, DBReadCursor)
+            return cursor.execute(SLOW_QUERY).fetchone()[0]
+
+    ticker = gevent.spawn(tick)
+    readers = [gevent.spawn(slow_read) for _ in range(3)]
+    gevent.joinall(readers, raise_error=True)
+    ticker.kill()
+    assert all(x.value == 2000000 * 2000001 // 2 for x in readers)
+    assert ticks > 10  # the hub was not blocked while the queries ran
+    assert conn.read_pool.opened == 2 and conn.read_pool.idle.qsize() == 2
+
+    with conn.threaded_read_ctx() as cursor:
+        assert isinstance(cursor, DBReadCursor)
+        assert [x[0] for x in cursor.execute('SELECT b FROM a ORDER BY b')] == list(range(1000))
+        cursor.execute('SELECT b FROM a ORDER BY b')
+        assert cursor.fetchone() == (0,)
+        assert next(cursor) == (1,)  # fetches a batch of rows
+        assert len(cursor.rows) == DB_READ_POOL_FETCH_ROWS - 1  # pylint: disable=no-member  # checked to be a DBReadCursor
+        assert cursor.fetchmany(DB_READ_POOL_FETCH_ROWS) == [(x,) for x in range(2, DB_READ_POOL_FETCH_ROWS + 2)]  # noqa: E501
+        assert len(cursor.fetchall()) == 1000 - DB_READ_POOL_FETCH_ROWS - 2
+
+    conn.close()
+    assert conn.read_pool is None
+
+
+def test_threaded_read_ctx_fallback(tmp_path: Path):
+    """Test that the main connection is used if the DB is not in WAL mode or if the
+    greenlet has a write transaction open, so that it sees its own writes"""
+    conn = _make_connection(tmp_path / 'journal.db', wal=False)
+    conn.enable_read_pool()
+    assert conn.read_pool is None
+    with conn.threaded_read_ctx() as cursor:
+        assert not isinstance(cursor, DBReadCursor)
+    conn.close()
+
+    conn = _make_connection(tmp_path / 'wal.db')
+    conn.enable_read_pool()
+    with conn.write_ctx() as write_cursor:
+        write_cursor.execute('INSERT INTO a VALUES (1000)')
+        with conn.threaded_read_ctx() as cursor:
+            assert cursor.execute('SELECT COUNT(*) FROM a').fetchone()[0] == 1001
+
+        def count_from_pool() -> int:
+            with conn.threaded_read_ctx() as cursor:
+                return cursor.execute('SELECT COUNT(*) FROM a').fetchone()[0]
+
+        # other greenlets only see the committed data
+        assert gevent.spawn(count_from_pool).get() == 1000
+
+    assert gevent.spawn(count_from_pool).get() == 1001
+    conn.close()
@@ -1,11 +1,18 @@
+import csv
+from unittest.mock import patch
+
+import pytest
+
+from rotkehlchen.accounting.export.csv import FILENAME_ALL_CSV, CSVExporter
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.accounting.pnl import PNL, PnlTotals
 from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
 from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.assets import A_DAI, A_ETH
 from rotkehlchen.db.filtering import ReportDataFilterQuery
-from rotkehlchen.db.reports import DBAccountingReports
+from rotkehlchen.db.reports import DBAccountingReports, PnlEventsWriter
 from rotkehlchen.db.settings import DBSettings
+from rotkehlchen.errors.misc import InputError
 from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.constants import (
     A_GBP,
@@ -201,3 +208,100 @@ def test_report_events_sort_by_columns(database):
                 index = idx if is_ascending else len(results) - 1 - idx
                 expected_value = test_case['expected_values'][index]
                 assert field_value == expected_value
+
+
+def test_pnl_events_writer(database):
+    """Test that the pnl events writer writes the events in batches and that they
+    can be read back from the DB in pages in the order they were added"""
+    dbreport, settings = setup_db_account_settings(database)
+    report_id = dbreport.add_report(
+        first_processed_timestamp=Timestamp(1),
+        start_ts=Timestamp(1),
+        end_ts=Timestamp(100),
+        settings=settings,
+    )
+    events = [ProcessedAccountingEvent(
+        event_type=AccountingEventType.TRANSACTION_EVENT,
+        notes=f'Received {idx} DAI',
+        location=Location.ETHEREUM,
+        timestamp=Timestamp(idx),
+        asset=A_DAI,
+        free_amount=FVal(idx),
+        taxable_amount=ZERO,
+        price=Price(ONE),
+        pnl=PNL(taxable=ZERO, free=FVal(idx)),
+        cost_basis=None,
+        index=idx,
+        extra_data={},
+    ) for idx in range(1, 8)]
+
+    def count_events() -> int:
+        with database.conn_transient.read_ctx() as cursor:
+            return cursor.execute(
+                'SELECT COUNT(*) FROM pnl_events WHERE report_id=?', (report_id,),
+            ).fetchone()[0]
+
+    writer = PnlEventsWriter(
+        database=database,
+        report_id=report_id,
+        ts_converter=timestamp_to_date,
+        batch_size=3,
+    )
+    for event in events:
+        writer.add(event)
+    assert count_events() == 6
+    writer.flush()
+    assert count_events() == 7
+
+    with patch('rotkehlchen.db.reports.PNL_EVENTS_WRITE_BATCH_SIZE', new=2):
+        assert [x.notes for x in dbreport.iterate_report_data(report_id)] == [x.notes for x in events]  # noqa: E501
+
+    writer.report_id = 42  # report that does not exist
+    writer.add(events[0])
+    with pytest.raises(InputError):
+        writer.flush()
+    assert writer.rows == []
+
+
+def test_export_report_data_from_db(database, tmp_path):
+    """Test that the events of a report only kept in the DB are exported to CSV while
+    being read from it and that the summary covers all of them"""
+    dbreport, settings = setup_db_account_settings(database)
+    report_id = dbreport.add_report(
+        first_processed_timestamp=Timestamp(1),
+        start_ts=Timestamp(1),
+        end_ts=Timestamp(100),
+        settings=settings,
+    )
+    writer = PnlEventsWriter(database=database, report_id=report_id, ts_converter=timestamp_to_date)  # noqa: E501
+    for idx in range(1, 6):
+        writer.add(ProcessedAccountingEvent(
+            event_type=AccountingEventType.TRANSACTION_EVENT,
+            notes=f'Received {idx} DAI',
+            location=Location.ETHEREUM,
+            timestamp=Timestamp(idx),
+            asset=A_DAI,
+            free_amount=FVal(idx),
+            taxable_amount=ZERO,
+            price=Price(ONE),
+            pnl=PNL(taxable=ZERO, free=FVal(idx)),
+            cost_basis=None,
+            index=idx - 1,
+            extra_data={},
+        ))
+    writer.flush()
+
+    exporter = CSVExporter(database)
+    exporter.settings = DBSettings(pnl_csv_have_summary=True, pnl_csv_with_formulas=True)
+    with patch('rotkehlchen.db.reports.PNL_EVENTS_WRITE_BATCH_SIZE', new=2):
+        assert exporter.export(
+            events=dbreport.iterate_report_data(report_id),
+            pnls=PnlTotals({AccountingEventType.TRANSACTION_EVENT: PNL(taxable=ZERO, free=FVal(15))}),  # noqa: E501
+            directory=tmp_path,
+        ) == (True, '')
+
+    with open(tmp_path / FILENAME_ALL_CSV, encoding='utf8') as f:
+        rows = list(csv.DictReader(f))
+    assert [x['notes'] for x in rows[:5]] == [f'Received {idx} DAI' for idx in range(1, 6)]
+    assert rows[8]['free_amount'] == f'{AccountingEventType.TRANSACTION_EVENT!s} total'
+    assert rows[8]['price'] == f'=SUMIF(A2:A6;"{AccountingEventType.TRANSACTION_EVENT!s}";J2:J6)'
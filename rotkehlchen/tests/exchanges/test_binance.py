@@ -1,12 +1,14 @@
 import datetime
 import hashlib
 import hmac
+import json
 import os
 import warnings as test_warnings
 from typing import TYPE_CHECKING, cast
 from unittest.mock import call, patch
 from urllib.parse import urlencode
 
+import gevent
 import pytest
 import requests
 
@@ -22,7 +24,10 @@ from rotkehlchen.exchanges.binance import (
     API_TIME_INTERVAL_CONSTRAINT_TS,
     BINANCE_ASSETS_STARTING_WITH_LD,
     BINANCE_LAUNCH_TS,
+    MY_TRADES_LIMIT,
+    USED_WEIGHT_HEADER,
     Binance,
+    RequestWeightBudget,
     trade_from_binance,
 )
 from rotkehlchen.exchanges.data_structures import Location
@@ -1039,6 +1044,72 @@ def test_binance_query_trade_history_custom_markets(function_scope_binance):
     assert count == len(markets)
 
 
+def test_binance_query_trade_history_concurrently(function_scope_binance: 'Binance'):
+    """Test that markets are queried concurrently and that the trades of a market whose
+    query failed midway are kept and its next query continues after the last trade"""
+    binance = function_scope_binance
+    binance.edit_exchange_extras({BINANCE_MARKETS_KEY: ['BNBBTC', 'ETHBTC']})
+    in_flight = max_in_flight = 0
+    queried, bnb_fails = [], True
+
+    def mock_my_trades(url, params, **kwargs):  # pylint: disable=unused-argument
+        nonlocal in_flight, max_in_flight
+        if 'myTrades' not in url:
+            return MockResponse(200, '[]')
+
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        gevent.sleep(0.1)
+        in_flight -= 1
+        queried.append((symbol := params['symbol'], from_id := params['fromId']))
+        if symbol == 'BNBBTC' and from_id != 0 and bnb_fails:
+            return MockResponse(500, '{}')
+
+        trades = [] if symbol != 'BNBBTC' or from_id != 0 else [
+            json.loads(BINANCE_MYTRADES_RESPONSE)[0] | {'id': idx, 'time': 1499865549590 + idx}
+            for idx in range(1, MY_TRADES_LIMIT + 1)
+        ]
+        return MockResponse(200, json.dumps(trades), headers={USED_WEIGHT_HEADER: '100'})
+
+    with patch.object(binance.session, 'request', side_effect=mock_my_trades):
+        events, _ = binance.query_online_history_events(start_ts=Timestamp(0), end_ts=Timestamp(1564301134))  # noqa: E501
+        assert len(events) == MY_TRADES_LIMIT * 3  # spend, receive and fee
+        assert sorted(queried) == [('BNBBTC', 0), ('BNBBTC', MY_TRADES_LIMIT + 1), ('ETHBTC', 0)]
+        assert max_in_flight == 2 and binance.request_weight.used == 100
+        assert binance.msg_aggregator.consume_warnings() == [
+            'Failed to query all binance trades of the markets BNBBTC. '
+            'Their query will resume on the next sync.',
+        ]
+
+        queried.clear()
+        bnb_fails = False
+        events, _ = binance.query_online_history_events(start_ts=Timestamp(0), end_ts=Timestamp(1564301134))  # noqa: E501
+        assert events == []
+        assert sorted(queried) == [('BNBBTC', MY_TRADES_LIMIT), ('ETHBTC', 0)]
+        assert binance.msg_aggregator.consume_warnings() == []
+
+
+def test_request_weight_budget():
+    """Test that requests wait for the next minute when the weight budget is used"""
+    budget = RequestWeightBudget(limit=1200)
+    budget.acquire(weight=20)
+    budget.update({USED_WEIGHT_HEADER: '1170'})
+    budget.release(weight=20)
+    budget.acquire(weight=20)
+    assert budget.reserved == 20
+
+    def next_minute(seconds: float) -> None:
+        assert 0 < seconds <= 60
+        budget.minute -= 1
+
+    with patch('rotkehlchen.exchanges.binance.gevent.sleep', side_effect=next_minute) as sleep:
+        budget.acquire(weight=20)
+        assert sleep.call_count == 1 and budget.used == 0 and budget.reserved == 40
+        budget.exhaust()
+        budget.acquire(weight=20, ratio=0.5)
+        assert sleep.call_count == 2
+
+
 @pytest.mark.parametrize('default_mock_price_value', [ONE])
 def test_binance_query_lending_interests_history(
         function_scope_binance: 'Binance',
@@ -27,6 +27,7 @@ from rotkehlchen.types import (
     Timestamp,
     deserialize_evm_tx_hash,
 )
+from rotkehlchen.utils.rate_limiter import RateLimiter
 
 
 @pytest.fixture(name='temp_etherscan')
@@ -56,12 +57,12 @@ def fixture_temp_etherscan(function_scope_messages_aggregator, tmpdir_factory, s
     return Etherscan(database=db, msg_aggregator=function_scope_messages_aggregator)
 
 
-def patch_etherscan(etherscan, response_msg):
+def patch_etherscan(etherscan, response_msg, failures=1):
     count = 0
 
     def mock_requests_get(*args, **kwargs):  # pylint: disable=unused-argument
         nonlocal count
-        if count == 0:
+        if count < failures:
             response = f'{{"status":"0","message":"NOTOK","result":"{response_msg}"}}'
         else:
             response = '{"jsonrpc":"2.0","id":1,"result":"0x1337"}'
@@ -93,6 +94,25 @@ def test_maximum_rate_limit_reached(temp_etherscan, **kwargs):  # pylint: disabl
     assert result == '0x1337'
 
 
+def test_rate_limit_backoff_doubles(temp_etherscan):
+    """Test that the pause after each of etherscan's rate limit responses doubles even though
+    they come with a 200 status, which resets the backoff of the rate limiter"""
+    etherscan_patch = patch_etherscan(
+        etherscan=temp_etherscan,
+        response_msg='Max calls per sec rate limit reached (5/sec)',
+        failures=2,
+    )
+    with etherscan_patch, patch.object(RateLimiter, 'throttle') as throttle:
+        result = temp_etherscan.eth_call(
+            SupportedBlockchain.ETHEREUM,
+            '0x4678f0a6958e4D2Bc4F1BAF7Bc52E8F3564f3fE4',
+            '0xc455279100000000000000000000000027a2eaaa8bebea8d23db486fb49627c165baacb5',
+        )
+
+    assert result == '0x1337'
+    assert [x.kwargs['retry_after'] for x in throttle.call_args_list] == [1, 2]
+
+
 def test_maximum_daily_rate_limit_reached(temp_etherscan, **kwargs):  # pylint: disable=unused-argument
     """Test that etherscan's daily rate limit raises a RemoteError"""
     etherscan_patch = patch_etherscan(
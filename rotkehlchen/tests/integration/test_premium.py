@@ -38,6 +38,7 @@ from rotkehlchen.tests.utils.mock import MockResponse
 from rotkehlchen.tests.utils.premium import (
     VALID_PREMIUM_KEY,
     VALID_PREMIUM_SECRET,
+    MockChunkedBackupServer,
     assert_db_got_replaced,
     create_patched_requests_get_for_premium,
     get_different_hash,
@@ -185,6 +186,51 @@ def test_upload_data_to_server(
         assert last_ts == rotkehlchen_instance.data.db.get_static_cache(cursor=cursor, name=DBCacheStatic.LAST_DATA_UPLOAD_TS)  # noqa: E501
 
 
+@pytest.mark.parametrize('start_with_valid_premium', [True])
+def test_chunked_backup_upload_and_pull(rotkehlchen_instance: 'Rotkehlchen') -> None:
+    """Test that with a server storing backups in chunks only the changed chunks of the DB
+    are uploaded and that the DB is reassembled from the chunks when pulling"""
+    db = rotkehlchen_instance.data.db
+    sync_manager = rotkehlchen_instance.premium_sync_manager
+    assert rotkehlchen_instance.premium is not None
+    server = MockChunkedBackupServer()
+    with db.user_write() as write_cursor:
+        db.set_settings(write_cursor, ModifiableDBSettings(main_currency=A_GBP.resolve_to_fiat_asset()))  # noqa: E501
+
+    with (
+        patch.object(rotkehlchen_instance.premium.session, 'get', side_effect=server.get),
+        patch.object(rotkehlchen_instance.premium.session, 'post', side_effect=server.post),
+    ):
+        assert sync_manager.maybe_upload_data_to_server() == (True, None)
+        assert server.manifest is not None
+        first_upload_chunks = len(server.uploaded_chunk_ids)
+        assert first_upload_chunks == len(server.chunks) > 1
+
+        # uploading again the same DB uploads nothing
+        server.metadata['last_modify_ts'] = 0
+        assert sync_manager.maybe_upload_data_to_server() == (False, 'Remote database is up to date')  # noqa: E501
+        assert len(server.uploaded_chunk_ids) == first_upload_chunks
+
+        # after a small change only some of the chunks are uploaded
+        with db.user_write() as write_cursor:
+            db.set_settings(write_cursor, ModifiableDBSettings(main_currency=A_EUR.resolve_to_fiat_asset()))  # noqa: E501
+        server.metadata['last_modify_ts'] = 0
+        assert sync_manager.maybe_upload_data_to_server() == (True, None)
+        assert 0 < len(server.uploaded_chunk_ids) - first_upload_chunks < first_upload_chunks
+
+        # change the local DB and make sure that pulling restores the uploaded one
+        with db.user_write() as write_cursor:
+            db.set_settings(write_cursor, ModifiableDBSettings(main_currency=A_GBP.resolve_to_fiat_asset()))  # noqa: E501
+        assert sync_manager.remote_supports_chunks is True
+        # pulling via the API checks first whether the server stores backups in chunks
+        sync_manager.remote_supports_chunks = False
+        assert sync_manager.sync_data(action='download', perform_migrations=False) == (True, '')
+        assert sync_manager.remote_supports_chunks is True
+
+    with rotkehlchen_instance.data.db.conn.read_ctx() as cursor:
+        assert rotkehlchen_instance.data.db.get_setting(cursor, 'main_currency') == A_EUR
+
+
 @pytest.mark.parametrize('start_with_valid_premium', [True])
 def test_upload_data_to_server_same_hash(rotkehlchen_instance):
     """Test that if the server has same data hash as we no upload happens"""
@@ -0,0 +1,137 @@
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from rotkehlchen.accounting.checkpoints import calculate_pnl_settings_hash
+from rotkehlchen.constants import ONE
+from rotkehlchen.constants.assets import A_ETH, A_EUR
+from rotkehlchen.db.reports import DBAccountingReports
+from rotkehlchen.fval import FVal
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.events.structures.swap import create_swap_events
+from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
+from rotkehlchen.tests.utils.accounting import accounting_history_process
+from rotkehlchen.tests.utils.history import prices
+from rotkehlchen.types import AssetAmount, Location, Price, Timestamp, TimestampMS
+
+if TYPE_CHECKING:
+    from rotkehlchen.accounting.accountant import Accountant
+    from rotkehlchen.history.events.structures.swap import SwapEvent
+
+
+def _make_history() -> list['SwapEvent']:
+    return [*create_swap_events(
+        timestamp=TimestampMS(1609537953000),
+        location=Location.KRAKEN,
+        event_identifier='1xyz',
+        spend=AssetAmount(asset=A_EUR, amount=FVal('598.26')),
+        receive=AssetAmount(asset=A_ETH, amount=ONE),
+    ), *create_swap_events(
+        timestamp=TimestampMS(1624395186000),
+        location=Location.KRAKEN,
+        event_identifier='2xyz',
+        spend=AssetAmount(asset=A_ETH, amount=FVal('0.5')),
+        receive=AssetAmount(asset=A_EUR, amount=FVal('0.5') * FVal('1862.06')),
+    ), *create_swap_events(
+        timestamp=TimestampMS(1625001464000),
+        location=Location.KRAKEN,
+        event_identifier='3xyz',
+        spend=AssetAmount(asset=A_ETH, amount=FVal('0.5')),
+        receive=AssetAmount(asset=A_EUR, amount=FVal('0.5') * FVal('1837.31')),
+    )]
+
+
+def _count_checkpoints(accountant: 'Accountant') -> int:
+    with accountant.db.conn_transient.read_ctx() as cursor:
+        return cursor.execute('SELECT COUNT(*) FROM pnl_checkpoints').fetchone()[0]
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+def test_report_resumes_from_checkpoint(accountant: 'Accountant') -> None:
+    """Test that a report starting after a saved checkpoint resumes from it and
+    gets the same results as processing the whole history"""
+    history = _make_history()
+    start_ts, end_ts = Timestamp(1625001464), Timestamp(1625001466)
+    with patch('rotkehlchen.accounting.checkpoints.PNL_CHECKPOINT_INTERVAL', 1):
+        accounting_history_process(  # full report that saves the checkpoints
+            accountant=accountant,
+            start_ts=Timestamp(0),
+            end_ts=end_ts,
+            history_list=history,
+        )
+        assert _count_checkpoints(accountant) != 0
+
+        accounting_history_process(
+            accountant=accountant,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            history_list=history,
+        )
+        resumed_taxable, resumed_free = accountant.pots[0].pnls.taxable, accountant.pots[0].pnls.free  # noqa: E501
+        # only the events after the checkpoint were processed
+        assert all(x.timestamp >= start_ts for x in accountant.pots[0].processed_events)
+
+        DBAccountingReports(accountant.db).delete_checkpoints()
+        accounting_history_process(
+            accountant=accountant,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            history_list=history,
+        )
+        assert any(x.timestamp < start_ts for x in accountant.pots[0].processed_events)
+        assert accountant.pots[0].pnls.taxable == resumed_taxable
+        assert accountant.pots[0].pnls.free == resumed_free
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+def test_changed_history_invalidates_checkpoints(accountant: 'Accountant') -> None:
+    """Test that checkpoints covering a changed event are not used and get deleted"""
+    history = _make_history()
+    start_ts, end_ts = Timestamp(1625001464), Timestamp(1625001466)
+    with patch('rotkehlchen.accounting.checkpoints.PNL_CHECKPOINT_INTERVAL', 1):
+        accounting_history_process(
+            accountant=accountant,
+            start_ts=Timestamp(0),
+            end_ts=end_ts,
+            history_list=history,
+        )
+        assert _count_checkpoints(accountant) != 0
+
+        history[0].amount = FVal('600')  # edit the very first event
+        accounting_history_process(
+            accountant=accountant,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            history_list=history,
+        )
+        # everything was processed again and only the new checkpoints are kept
+        assert any(x.timestamp < start_ts for x in accountant.pots[0].processed_events)
+        with accountant.db.conn_transient.read_ctx() as cursor:
+            assert cursor.execute(
+                'SELECT COUNT(DISTINCT settings_hash) FROM pnl_checkpoints',
+            ).fetchone()[0] == 1
+
+
+def test_manual_prices_change_settings_hash(accountant: 'Accountant') -> None:
+    """Test that adding a manual historical price changes the settings hash so that
+    checkpoints saved with the old prices are not used"""
+    def get_hash() -> str:
+        with accountant.db.conn.read_ctx() as cursor:
+            return calculate_pnl_settings_hash(
+                cursor=cursor,
+                settings=accountant.db.get_settings(cursor),
+                start_ts=Timestamp(0),
+                ignored_asset_ids=set(),
+                ignored_action_ids=set(),
+            )
+
+    old_hash = get_hash()
+    GlobalDBHandler.add_single_historical_price(HistoricalPrice(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.MANUAL,
+        timestamp=Timestamp(1609537953),
+        price=Price(FVal('600')),
+    ))
+    assert get_hash() != old_hash
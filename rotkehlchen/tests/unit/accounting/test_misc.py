@@ -1,9 +1,11 @@
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.accounting.pnl import PNL, PnlTotals
+from rotkehlchen.accounting.prices import prefetch_historical_prices
 from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
 from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.assets import A_ETH, A_ETH2, A_EUR, A_KFEE, A_USD, A_USDT
@@ -394,3 +396,50 @@ def test_deposit_asset_is_neutral(rotkehlchen_api_server: 'APIServer') -> None:
     assert len(used_acquisitions := rotki.accountant.pots[0].cost_basis.get_events(asset=A_ETH).used_acquisitions) == 1  # noqa: E501
     assert used_acquisitions[0].amount == eth_amount
     assert used_acquisitions[0].timestamp == ts_ms_to_sec(acquisition_ts)
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+def test_prices_prefetched_before_processing(accountant: 'Accountant', price_historian) -> None:
+    """Test that the prices needed by the report are found once before processing
+    and that the pot uses them instead of querying again"""
+    history = create_swap_events(
+        timestamp=TimestampMS(1609537953000),
+        location=Location.KRAKEN,
+        event_identifier='1xyz',
+        spend=AssetAmount(asset=A_EUR, amount=FVal('598.26')),
+        receive=AssetAmount(asset=A_ETH, amount=ONE),
+    ) + create_swap_events(
+        timestamp=TimestampMS(1624395186000),
+        location=Location.KRAKEN,
+        event_identifier='2xyz',
+        spend=AssetAmount(asset=A_ETH, amount=FVal('0.5')),
+        receive=AssetAmount(asset=A_EUR, amount=FVal('0.5') * FVal('1862.06')),
+    )
+    queried_prices = []
+    original_query = price_historian.query_historical_price
+
+    def query_price(from_asset, to_asset, timestamp):
+        queried_prices.append((from_asset, to_asset, timestamp))
+        return original_query(from_asset=from_asset, to_asset=to_asset, timestamp=timestamp)
+
+    with (
+        patch.object(price_historian, 'query_historical_price', side_effect=query_price),
+        patch(
+            'rotkehlchen.accounting.accountant.prefetch_historical_prices',
+            wraps=prefetch_historical_prices,
+        ) as prefetch,
+    ):
+        accounting_history_process(
+            accountant=accountant,
+            start_ts=Timestamp(0),
+            end_ts=Timestamp(1624395187),
+            history_list=history,
+        )
+
+    assert prefetch.call_count == 1
+    assert len(queried_prices) == 2  # each price was queried only once
+    assert set(queried_prices) == {
+        (A_ETH, A_EUR, Timestamp(1609537953)),
+        (A_ETH, A_EUR, Timestamp(1624395186)),
+    }
+    assert accountant.pots[0].pnls.taxable != ZERO
@@ -1,14 +1,17 @@
+import pkgutil
 from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from rotkehlchen.chain.decoding.constants import CPT_GAS
+from rotkehlchen.chain.decoding.decoder import discover_decoder_packages
 from rotkehlchen.chain.ethereum.constants import CPT_KRAKEN
 from rotkehlchen.chain.ethereum.decoding.decoder import EthereumTransactionDecoder
 from rotkehlchen.chain.ethereum.transactions import EthereumTransactions
 from rotkehlchen.chain.evm.constants import GENESIS_HASH, ZERO_ADDRESS
-from rotkehlchen.chain.evm.decoding.utils import maybe_reshuffle_events
+from rotkehlchen.chain.evm.decoding.decoder import EvmDecodingRules
+from rotkehlchen.chain.evm.decoding.utils import event_rule_topics, maybe_reshuffle_events
 from rotkehlchen.chain.evm.l2_with_l1_fees.types import L2WithL1FeesTransaction
 from rotkehlchen.chain.evm.structures import EvmTxReceipt, EvmTxReceiptLog
 from rotkehlchen.chain.evm.types import string_to_evm_address
@@ -1111,3 +1114,54 @@ def test_post_decoding_rules_break_on_new_event(
     # Verify that an event was added
     assert len(result_events) == 2, 'Should have 2 events (original + added by rule 1)'
     assert maybe_modified is True, 'maybe_modified should be True'
+
+
+def test_index_event_rules():
+    """Test that event rules are indexed by their declared topics keeping the rules
+    without declared topics as a fallback for all logs and the original rules order"""
+    topic_a, topic_b, topic_c = b'a' * 32, b'b' * 32, b'c' * 32
+
+    def fallback_rule(**kwargs):  # dummy rules
+        ...
+
+    @event_rule_topics(topic_a)
+    def rule_a(**kwargs):
+        ...
+
+    @event_rule_topics(topic_a, topic_b)
+    def rule_a_b(**kwargs):
+        ...
+
+    def last_fallback_rule(**kwargs):
+        ...
+
+    rules = EvmDecodingRules(
+        address_mappings={},
+        event_rules=[rule_a, fallback_rule, rule_a_b, last_fallback_rule],
+        input_data_rules={},
+        token_enricher_rules=[],
+        post_decoding_rules={},
+        post_processing_rules={},
+        all_counterparties=set(),
+        addresses_to_counterparties={},
+    )
+    rules_by_topic, fallback_rules = rules.index_event_rules()
+    assert rules_by_topic == {
+        topic_a: [rule_a, fallback_rule, rule_a_b, last_fallback_rule],
+        topic_b: [fallback_rule, rule_a_b, last_fallback_rule],
+    }
+    assert rules_by_topic.get(topic_c, fallback_rules) == [fallback_rule, last_fallback_rule]
+
+
+def test_discover_decoder_packages():
+    """Test that the decoder packages are discovered only once and then read from the cache"""
+    package = 'rotkehlchen.chain.scroll.modules'
+    with patch('rotkehlchen.chain.decoding.decoder._DECODER_PACKAGES', new={}), patch(
+        'rotkehlchen.chain.decoding.decoder.pkgutil.walk_packages',
+        side_effect=pkgutil.walk_packages,
+    ) as walk_packages:
+        subpackages = discover_decoder_packages(package)
+        assert discover_decoder_packages(package) is subpackages
+
+    assert walk_packages.call_count == 1
+    assert (f'{package}.scroll_airdrop', True) in subpackages
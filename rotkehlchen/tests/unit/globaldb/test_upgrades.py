@@ -1459,6 +1459,40 @@ def test_upgrade_v13_v14(globaldb: GlobalDBHandler, messages_aggregator):
         ]
 
 
+@pytest.mark.parametrize('globaldb_upgrades', [[]])
+@pytest.mark.parametrize('reload_user_assets', [False])
+def test_upgrade_v14_v15(globaldb: GlobalDBHandler, messages_aggregator):
+    """Test the global DB upgrade from v14 to v15 (covering price history index)"""
+    with globaldb.conn.write_ctx() as write_cursor:  # bring the DB to the v14 state
+        write_cursor.execute('DROP INDEX IF EXISTS idx_price_history_pair_timestamp')
+        write_cursor.execute('CREATE INDEX IF NOT EXISTS idx_price_history_identifier ON price_history (from_asset, to_asset);')  # noqa: E501
+        write_cursor.execute("UPDATE settings SET value='14' WHERE name='version'")
+
+    with globaldb.conn.read_ctx() as cursor:
+        assert index_exists(cursor=cursor, name='idx_price_history_identifier') is True
+        assert index_exists(cursor=cursor, name='idx_price_history_pair_timestamp') is False
+
+    with ExitStack() as stack:
+        patch_for_globaldb_upgrade_to(stack, 15)
+        maybe_upgrade_globaldb(
+            connection=globaldb.conn,
+            global_dir=globaldb._data_directory / GLOBALDIR_NAME,  # type: ignore
+            db_filename=GLOBALDB_NAME,
+            msg_aggregator=messages_aggregator,
+        )
+
+    assert globaldb.get_setting_value('version', 0) == 15
+    with globaldb.conn.read_ctx() as cursor:
+        assert index_exists(cursor=cursor, name='idx_price_history_identifier') is False
+        assert index_exists(cursor=cursor, name='idx_price_history_pair_timestamp') is True
+        # the nearest price lookups are answered from the index alone
+        assert 'COVERING INDEX idx_price_history_pair_timestamp' in ' '.join(str(row) for row in cursor.execute(  # noqa: E501
+            'EXPLAIN QUERY PLAN SELECT timestamp, source_type, price FROM price_history '
+            'WHERE from_asset=? AND to_asset=? AND timestamp BETWEEN ? AND ?',
+            ('BTC', 'USD', 0, 100),
+        ))
+
+
 @pytest.mark.parametrize('custom_globaldb', ['v2_global.db'])
 @pytest.mark.parametrize('target_globaldb_version', [2])
 @pytest.mark.parametrize('reload_user_assets', [False])
@@ -27,3 +27,8 @@ def test_arg_sql_vm_instructions_cb(argparser):
     assert args.sqlite_instructions == 200
     args = argparser.parse_args(['--sqlite-instructions', '0'])
     assert args.sqlite_instructions == 0
+
+
+def test_arg_profiling(argparser):
+    assert argparser.parse_args([]).profiling is False
+    assert argparser.parse_args(['--profiling']).profiling is True
@@ -0,0 +1,71 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from rotkehlchen.errors.misc import UnableToDecryptRemoteData
+from rotkehlchen.premium.backup_chunks import (
+    BackupManifest,
+    build_backup_manifest,
+    compress_and_encrypt_chunk,
+    decrypt_and_decompress_chunk,
+)
+
+PASSWORD = '123'
+
+
+def _create_db(path: Path, rows_per_table: dict[str, int]) -> None:
+    """Create a DB and export it to the given path like sqlcipher_export does"""
+    conn = sqlite3.connect(':memory:')
+    for table, rows in rows_per_table.items():
+        conn.execute(f'CREATE TABLE {table} (id INTEGER PRIMARY KEY, data BLOB)')
+        conn.executemany(
+            f'INSERT INTO {table}(id, data) VALUES(?, ?)',
+            # deterministic contents so that the same rows give the same pages
+            [(idx, (f'{table}{idx}' * 40).encode()[:300]) for idx in range(rows)],
+        )
+    conn.commit()
+    conn.execute(f"VACUUM INTO '{path}'")
+    conn.close()
+
+
+def test_backup_chunks_are_reused(tmp_path: Path) -> None:
+    """Test that after adding data to a table of the DB only the chunks around the change
+    are new even though all the pages after the change moved, and that the DB can be
+    reassembled from its chunks"""
+    old_path, new_path = tmp_path / 'old.db', tmp_path / 'new.db'
+    _create_db(old_path, {'a_table': 2000, 'b_table': 30000, 'c_table': 30000})
+    _create_db(new_path, {'a_table': 2500, 'b_table': 30000, 'c_table': 30000})
+
+    old_manifest = build_backup_manifest(old_path, PASSWORD)
+    new_manifest = build_backup_manifest(new_path, PASSWORD)
+    assert old_manifest.total_size == os.path.getsize(old_path)
+    assert new_manifest.total_size == os.path.getsize(new_path)
+    assert len(new_manifest.chunks) > 100
+
+    old_ids = {chunk.chunk_id for chunk in old_manifest.chunks}
+    new_chunks = [x for x in new_manifest.chunks if x.chunk_id not in old_ids]
+    assert len(new_chunks) < len(new_manifest.chunks) / 5
+    assert sum(chunk.size for chunk in new_chunks) < new_manifest.total_size / 5
+
+    # reassemble the DB from the encrypted chunks and the serialized manifest
+    encrypted_chunks = {
+        chunk.chunk_id: compress_and_encrypt_chunk(new_path, chunk, PASSWORD)
+        for chunk in new_manifest.chunks
+    }
+    manifest = BackupManifest.deserialize(new_manifest.serialize())
+    assert manifest == new_manifest
+    assert manifest.get_hash() == new_manifest.get_hash() != old_manifest.get_hash()
+    assert b''.join(
+        decrypt_and_decompress_chunk(encrypted_chunks[x.chunk_id], x.chunk_id, PASSWORD)
+        for x in manifest.chunks
+    ) == new_path.read_bytes()
+
+    chunk = new_manifest.chunks[0]
+    with pytest.raises(UnableToDecryptRemoteData):
+        decrypt_and_decompress_chunk(
+            encrypted_data=encrypted_chunks[chunk.chunk_id],
+            chunk_id=new_manifest.chunks[1].chunk_id,
+            password=PASSWORD,
+        )
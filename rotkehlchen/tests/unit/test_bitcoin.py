@@ -17,8 +17,9 @@ from rotkehlchen.chain.bitcoin.utils import (
     scriptpubkey_to_p2sh_address,
 )
 from rotkehlchen.chain.bitcoin.validation import is_valid_btc_address
-from rotkehlchen.chain.bitcoin.xpub import XpubData
+from rotkehlchen.chain.bitcoin.xpub import XpubData, XpubManager
 from rotkehlchen.chain.constants import NON_BITCOIN_CHAINS, SupportedBlockchain
+from rotkehlchen.constants import ZERO
 from rotkehlchen.errors.misc import RemoteError, XPUBError
 from rotkehlchen.tests.utils.ens import ENS_BRUNO_BTC_ADDR, ENS_BRUNO_BTC_BYTES
 from rotkehlchen.tests.utils.factories import (
@@ -284,6 +285,45 @@ def test_zpub_to_addresses():
         assert child.address() == expected_addresses[i]
 
 
+def test_derive_addresses():
+    """Test that bulk derivation of addresses gives the same addresses as deriving
+    each child and that the xpub manager finds the used receiving and change addresses"""
+    for xpub in (
+        'xpub68V4ZQQ62mea7ZUKn2urQu47Bdn2Wr7SxrBxBDDwE3kjytj361YBGSKDT4WoBrE5htrSB8eAMe59NPnKrcAbiv2veN5GQUmfdjRddD1Hxrk',
+        'ypub6WkRUvNhspMCJLiLgeP7oL1pzrJ6wA2tpwsKtXnbmpdAGmHHcC6FeZeF4VurGU14dSjGpF2xLavPhgvCQeXd6JxYgSfbaD1wSUi2XmEsx33',
+        'zpub6quTRdxqWmerHdiWVKZdLMp9FY641F1F171gfT2RS4D1FyHnutwFSMiab58Nbsdu4fXBaFwpy5xyGnKZ8d6xn2j4r4yNmQ3Yp3yDDxQUo3q',
+    ):
+        root = HDKey.from_xpub(xpub=xpub, path='m').derive_child(0)
+        assert root.derive_addresses(start_index=3, count=20) == [
+            (idx, root.derive_child(idx).address()) for idx in range(3, 23)
+        ]
+
+    xpub = HDKey.from_xpub('xpub68V4ZQQ62mea7ZUKn2urQu47Bdn2Wr7SxrBxBDDwE3kjytj361YBGSKDT4WoBrE5htrSB8eAMe59NPnKrcAbiv2veN5GQUmfdjRddD1Hxrk', path='m')  # noqa: E501
+    used_addresses = {
+        xpub.derive_path('m/0/1').address(),
+        xpub.derive_path('m/0/22').address(),
+        xpub.derive_path('m/1/0').address(),
+    }
+    queried_batches = []
+
+    def mock_have_transactions(accounts):
+        queried_batches.append(accounts)
+        return {x: (x in used_addresses, ZERO) for x in accounts}
+
+    chains_aggregator = MagicMock()
+    chains_aggregator.get_chain_manager.return_value.have_transactions = mock_have_transactions
+    derived_addresses = XpubManager(chains_aggregator)._derive_addresses_from_xpub_data(
+        xpub_data=XpubData(xpub=xpub, blockchain=SupportedBlockchain.BITCOIN),
+        start_receiving_index=0,
+        start_change_index=0,
+        gap_limit=20,
+    )
+    assert {(x.account_index, x.derived_index) for x in derived_addresses if x.address in used_addresses} == {(0, 1), (0, 22), (1, 0)}  # noqa: E501
+    # two batches of receiving and one of change addresses had activity
+    assert len(queried_batches) == 5
+    assert all(len(batch) == 20 for batch in queried_batches)
+
+
 def test_from_bad_xpub():
     with pytest.raises(XPUBError):
         HDKey.from_xpub('ddodod')
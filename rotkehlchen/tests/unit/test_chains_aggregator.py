@@ -1,10 +1,12 @@
 import datetime
 from contextlib import ExitStack
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from unittest.mock import patch
 
+import gevent
 import pytest
 
+from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.assets.asset import Asset
 from rotkehlchen.assets.utils import get_or_create_evm_token
 from rotkehlchen.chain.accounts import BlockchainAccountData
@@ -18,8 +20,11 @@ from rotkehlchen.chain.evm.types import (
     string_to_evm_address,
 )
 from rotkehlchen.constants import ONE
+from rotkehlchen.constants.assets import A_BTC
+from rotkehlchen.constants.misc import DEFAULT_BALANCE_LABEL
 from rotkehlchen.db.addressbook import DBAddressbook
 from rotkehlchen.db.cache import DBCacheDynamic
+from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.tests.utils.blockchain import setup_evm_addresses_activity_mock
 from rotkehlchen.tests.utils.factories import make_evm_address
 from rotkehlchen.tests.utils.polygon_pos import ALCHEMY_RPC_ENDPOINT
@@ -27,6 +32,7 @@ from rotkehlchen.types import (
     AVAILABLE_MODULES_MAP,
     SPAM_PROTOCOL,
     AddressbookType,
+    BTCAddress,
     ChainID,
     ChecksumEvmAddress,
     OptionalChainAddress,
@@ -69,6 +75,46 @@ def test_module_deactivation(blockchain):
         assert module_name not in blockchain.eth_modules
 
 
+def test_query_balances_concurrently(blockchain: 'ChainsAggregator') -> None:
+    """Test that the balances of all chains are queried concurrently and that when
+    some chains fail or time out the balances of the rest are still in the totals"""
+    running: list[SupportedBlockchain] = []
+    max_running = 0
+    btc_address = BTCAddress('bc1qhkje0xfvhmgk6mvanxwy09n45df03tj3h3jtnf')
+
+    def mock_query_chain_balances(blockchain: SupportedBlockchain, **kwargs: Any) -> None:
+        nonlocal max_running
+        running.append(blockchain)
+        max_running = max(max_running, len(running))
+        try:
+            gevent.sleep(.1)
+            if blockchain == SupportedBlockchain.OPTIMISM:
+                raise RemoteError('node is down')
+            if blockchain == SupportedBlockchain.GNOSIS:
+                gevent.sleep(5)
+            if blockchain == SupportedBlockchain.BITCOIN:
+                aggregator.balances.btc[btc_address] = Balance(amount=ONE, usd_value=ONE)
+        finally:
+            running.remove(blockchain)
+
+    aggregator = blockchain
+    with (
+        patch('rotkehlchen.chain.aggregator.BALANCE_QUERY_CONCURRENCY', new=3),
+        patch('rotkehlchen.chain.aggregator.CHAIN_BALANCE_QUERY_TIMEOUT', new=1),
+        patch.object(aggregator, '_query_chain_balances', side_effect=mock_query_chain_balances),
+        patch.object(aggregator, 'query_eth2_balances'),
+        pytest.raises(RemoteError) as e,
+    ):
+        aggregator.query_balances()
+
+    assert max_running == 3
+    assert str(e.value) == (
+        'Querying optimism balances failed due to: node is down. '
+        'Querying Gnosis balances failed due to: Did not finish within 1 seconds'
+    )
+    assert aggregator.totals.assets[A_BTC][DEFAULT_BALANCE_LABEL] == Balance(amount=ONE, usd_value=ONE)  # noqa: E501
+
+
 @pytest.mark.parametrize('ethereum_accounts', [[]])
 def test_detect_evm_accounts(blockchain: 'ChainsAggregator') -> None:
     """
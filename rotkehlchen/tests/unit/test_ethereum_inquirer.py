@@ -12,6 +12,7 @@ from rotkehlchen.chain.ethereum.modules.thegraph.constants import CONTRACT_STAKI
 from rotkehlchen.chain.evm.constants import SWAPPED_TOPIC, ZERO_ADDRESS
 from rotkehlchen.chain.evm.decoding.constants import ERC20_OR_ERC721_TRANSFER
 from rotkehlchen.chain.evm.decoding.thegraph.constants import GRAPH_DELEGATION_TRANSFER_ABI
+from rotkehlchen.chain.evm.node_health import NodesHealth
 from rotkehlchen.chain.evm.node_inquirer import _query_web3_get_logs
 from rotkehlchen.chain.evm.structures import EvmTxReceipt, EvmTxReceiptLog
 from rotkehlchen.chain.evm.types import EvmIndexer, WeightedNode, string_to_evm_address
@@ -237,6 +238,7 @@ def test_rpc_request_timeout(
 
     for exception in (requests.ReadTimeout, requests.ConnectTimeout):  # test both read and connect timeouts  # noqa: E501
         ethereum_inquirer.failed_to_connect_nodes = set()  # reset failed nodes
+        ethereum_inquirer.nodes_health = NodesHealth(chain_name=ethereum_inquirer.chain_name)
         with patch('requests.sessions.Session.post', side_effect=make_mock_post(exception)):
             ethereum_inquirer.call_contract(
                 contract_address=yearn_ycrv_vault.address,
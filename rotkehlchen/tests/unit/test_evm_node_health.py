@@ -0,0 +1,219 @@
+import time
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import gevent
+import pytest
+import requests
+
+from rotkehlchen.chain.ethereum.constants import (
+    ETHEREUM_ETHERSCAN_NODE,
+    ETHEREUM_ETHERSCAN_NODE_NAME,
+)
+from rotkehlchen.chain.evm.node_health import (
+    CIRCUIT_BREAKER_COOLDOWN,
+    CIRCUIT_BREAKER_FAILURES,
+    NodesHealth,
+)
+from rotkehlchen.chain.evm.types import NodeName, WeightedNode, string_to_evm_address
+from rotkehlchen.chain.mixins.rpc_nodes import RPCNode
+from rotkehlchen.constants import ONE
+from rotkehlchen.db.settings import CachedSettings
+from rotkehlchen.errors.misc import NodeQueryError, RemoteError
+from rotkehlchen.types import ChecksumEvmAddress, SupportedBlockchain
+
+if TYPE_CHECKING:
+    from rotkehlchen.chain.ethereum.node_inquirer import EthereumInquirer
+
+
+def _make_node(name: str, owned: bool = False) -> WeightedNode:
+    return WeightedNode(
+        node_info=NodeName(
+            name=name,
+            endpoint=f'https://{name}.test',
+            owned=owned,
+            blockchain=SupportedBlockchain.ETHEREUM,
+        ),
+        active=True,
+        weight=ONE,
+    )
+
+
+def _connect_nodes(ethereum_inquirer: 'EthereumInquirer', nodes: list[WeightedNode]) -> None:
+    """Add the given nodes to the connected nodes with their name as their client"""
+    for node in nodes:
+        ethereum_inquirer.rpc_mapping[node.node_info] = RPCNode(
+            rpc_client=node.node_info.name,  # type: ignore[arg-type]  # the name identifies the node in the queried method
+            is_pruned=False,
+            is_archive=True,
+        )
+
+
+def test_nodes_order_and_circuit_breaker():
+    """Test that nodes are sorted by their latency and errors except for owned nodes and
+    etherscan, and that failing nodes are skipped until their cooldown passes"""
+    nodes_health = NodesHealth(chain_name='ethereum')
+    own, fast, slow, untried = (_make_node('own', owned=True), _make_node('fast'), _make_node('slow'), _make_node('untried'))  # noqa: E501
+    nodes_health.record_success('slow', latency=3)
+    nodes_health.record_success('fast', latency=0.2)
+    call_order = [own, slow, untried, fast, ETHEREUM_ETHERSCAN_NODE]
+    assert nodes_health.order(call_order) == [own, fast, untried, slow, ETHEREUM_ETHERSCAN_NODE]
+
+    for _ in range(CIRCUIT_BREAKER_FAILURES - 1):
+        nodes_health.record_failure('fast', latency=0.2)
+    assert nodes_health.is_available('fast') is True
+    assert nodes_health.order(call_order) == [own, untried, slow, fast, ETHEREUM_ETHERSCAN_NODE]
+    nodes_health.record_failure('fast', latency=0.2)
+    assert nodes_health.is_available('fast') is False
+
+    # after the cooldown a single query is let through and since it fails the breaker opens
+    # again for longer
+    health = nodes_health.get('fast')
+    health.open_until = time.monotonic()
+    assert nodes_health.is_available('fast') is True
+    nodes_health.start_query('fast')
+    assert nodes_health.is_available('fast') is False
+    nodes_health.record_failure('fast', latency=0.2)
+    nodes_health.finish_query('fast')
+    assert health.cooldown == CIRCUIT_BREAKER_COOLDOWN * 2
+    assert nodes_health.is_available('fast') is False
+
+    health.open_until = time.monotonic()
+    nodes_health.start_query('fast')
+    nodes_health.record_success('fast', latency=0.2)
+    nodes_health.finish_query('fast')
+    assert nodes_health.is_available('fast') is True
+    assert health.cooldown == CIRCUIT_BREAKER_COOLDOWN and health.consecutive_failures == 0
+
+
+def test_etherscan_circuit_breaker_never_opens():
+    """Test that etherscan, the last resort for most queries, is never skipped even though
+    it reports the calls that revert as errors"""
+    nodes_health = NodesHealth(chain_name='ethereum')
+    for _ in range(CIRCUIT_BREAKER_FAILURES * 2):
+        nodes_health.start_query(ETHEREUM_ETHERSCAN_NODE_NAME)
+        nodes_health.record_failure(ETHEREUM_ETHERSCAN_NODE_NAME, latency=0.2, open_circuit=True)
+        nodes_health.finish_query(ETHEREUM_ETHERSCAN_NODE_NAME)
+        assert nodes_health.is_available(ETHEREUM_ETHERSCAN_NODE_NAME) is True
+
+    assert nodes_health.get(ETHEREUM_ETHERSCAN_NODE_NAME).open_until is None
+
+
+def test_timed_out_node_recovers(ethereum_inquirer: 'EthereumInquirer'):
+    """Test that a node that timed out is skipped until its cooldown passes and that it's
+    queried again after reconnecting to it"""
+    first, second = _make_node('first'), _make_node('second')
+    _connect_nodes(ethereum_inquirer, [first, second])
+    ethereum_inquirer.nodes_health.record_success('first', latency=0.1)
+    ethereum_inquirer.nodes_health.record_success('second', latency=0.2)
+    first_is_down, queried = True, []
+
+    def _get_node_name(web3: str) -> str:
+        queried.append(web3)
+        if web3 == 'first' and first_is_down:
+            raise requests.ReadTimeout
+        return web3
+
+    assert ethereum_inquirer._query(method=_get_node_name, call_order=[first, second]) == 'second'
+    assert ethereum_inquirer.failed_to_connect_nodes == {'first'}
+    assert first.node_info not in ethereum_inquirer.rpc_mapping
+
+    with patch.object(ethereum_inquirer, 'attempt_connect') as attempt_connect:
+        queried.clear()
+        with pytest.raises(RemoteError):
+            ethereum_inquirer._query(method=_get_node_name, call_order=[first])
+        assert queried == [] and attempt_connect.call_count == 0
+
+        first_is_down = False
+        ethereum_inquirer.nodes_health.get('first').open_until = time.monotonic()
+
+        def reconnect(node: NodeName) -> tuple[bool, str]:
+            _connect_nodes(ethereum_inquirer, [first])
+            return True, ''
+
+        attempt_connect.side_effect = reconnect
+        assert ethereum_inquirer._query(method=_get_node_name, call_order=[first]) == 'first'
+        assert attempt_connect.call_count == 1
+
+    assert ethereum_inquirer.failed_to_connect_nodes == set()
+
+
+def test_hedged_rpc_requests(ethereum_inquirer: 'EthereumInquirer'):
+    """Test that with hedged requests enabled a node that is slower than usual is raced
+    against the next node and the first answer is used"""
+    usually_fast, other = _make_node('usually_fast'), _make_node('other')
+    _connect_nodes(ethereum_inquirer, [usually_fast, other])
+    for _ in range(20):
+        ethereum_inquirer.nodes_health.record_success('usually_fast', latency=0.05)
+        ethereum_inquirer.nodes_health.record_success('other', latency=0.1)
+
+    def _get_node_name(web3: str) -> str:
+        gevent.sleep(1 if web3 == 'usually_fast' else 0.01)
+        return web3
+
+    cached_settings = CachedSettings()
+    start = time.monotonic()
+    assert ethereum_inquirer._query(method=_get_node_name, call_order=[other, usually_fast]) == 'usually_fast'  # noqa: E501
+    assert time.monotonic() - start >= 1
+
+    cached_settings.update_entry('hedge_rpc_requests', True)
+    try:
+        start = time.monotonic()
+        assert ethereum_inquirer._query(method=_get_node_name, call_order=[other, usually_fast]) == 'other'  # noqa: E501
+        assert time.monotonic() - start < 0.5
+    finally:
+        cached_settings.update_entry('hedge_rpc_requests', False)
+
+
+def test_multicall_chunks(ethereum_inquirer: 'EthereumInquirer'):
+    """Test that multicall chunks are queried concurrently, that chunks the nodes fail to
+    respond to are split and that identical calls are queried once, even across callers"""
+    calls: list[tuple[ChecksumEvmAddress, str]] = [(string_to_evm_address(f'0x{idx:040x}'), f'0x{idx:02x}') for idx in range(8)]  # noqa: E501
+    queried: list[list[tuple[ChecksumEvmAddress, str]]] = []
+
+    def mock_call(arguments: list[Any], **kwargs: Any) -> Any:
+        queried.append(chunk := arguments[0])
+        gevent.sleep(0.2)
+        if len(chunk) > 2:
+            raise NodeQueryError('response too big')
+        return 1, [data for _, data in chunk]
+
+    with patch.object(ethereum_inquirer.contract_multicall, 'call', side_effect=mock_call):
+        start = time.monotonic()
+        greenlets = [
+            gevent.spawn(ethereum_inquirer.multicall, calls=calls + calls[:2], calls_chunk_size=4),
+            gevent.spawn(ethereum_inquirer.multicall, calls=calls[::-1], calls_chunk_size=4),
+        ]
+        gevent.joinall(greenlets, raise_error=True)
+        # 2 failing chunks of 4 calls in parallel followed by 4 chunks of 2 calls in parallel
+        assert time.monotonic() - start < 0.7
+
+    assert greenlets[0].value == [data for _, data in calls + calls[:2]]
+    assert greenlets[1].value == [data for _, data in calls[::-1]]
+    assert len(queried) == 6 and sorted(x for chunk in queried[2:] for x in chunk) == calls
+    assert ethereum_inquirer._multicalls_in_flight == {}
+
+
+def test_multicall_chunk_with_reverted_call_fails_fast(ethereum_inquirer: 'EthereumInquirer'):
+    """Test that a multicall chunk failing due to a reverted call is not split, since the
+    revert would fail a part of it as well, while tryAggregate chunks still are"""
+    calls: list[tuple[ChecksumEvmAddress, str]] = [(string_to_evm_address(f'0x{idx:040x}'), f'0x{idx:02x}') for idx in range(8)]  # noqa: E501
+    queried: list[list[tuple[ChecksumEvmAddress, str]]] = []
+
+    def mock_call(arguments: list[Any], **kwargs: Any) -> Any:
+        queried.append(chunk := arguments[-1])
+        if calls[5] in chunk:
+            raise NodeQueryError('execution reverted')
+        return [(True, data) for _, data in chunk]
+
+    with patch.object(ethereum_inquirer.contract_multicall, 'call', side_effect=mock_call):
+        with pytest.raises(NodeQueryError):
+            ethereum_inquirer.multicall(calls=calls, calls_chunk_size=8)
+        assert len(queried) == 1
+
+        queried.clear()
+        with pytest.raises(NodeQueryError):  # the reverting call fails on its own
+            ethereum_inquirer.multicall_2(calls=calls, require_success=False, calls_chunk_size=8)
+        assert [len(x) for x in queried] == [8, 4, 4, 2, 1, 1]
+
+    assert ethereum_inquirer._multicalls_in_flight == {}
@@ -21,6 +21,7 @@ from rotkehlchen.db.filtering import (
 )
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.db.l2withl1feestx import DBL2WithL1FeesTx
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import (
     HistoryBaseEntry,
@@ -200,6 +201,90 @@ def test_tx_decode(ethereum_transaction_decoder, database):
         assert write_cursor.execute('SELECT COUNT(*) from evm_tx_mappings').fetchone()[0] == 0
 
 
+@pytest.mark.parametrize('use_custom_database', ['ethtxs.db'])
+def test_decoded_events_written_in_batches(
+        ethereum_transaction_decoder: 'EthereumTransactionDecoder',
+        database: 'DBHandler',
+) -> None:
+    """Test that the events of the decoded transactions are written to the DB in batches and
+    that if a transaction in the middle of a batch fails to be written the other transactions
+    of the batch and of the next batches are still saved"""
+    with database.conn.read_ctx() as cursor:
+        tx_ids, tx_hashes = zip(*((x[0], deserialize_evm_tx_hash(x[1])) for x in cursor.execute(
+            'SELECT identifier, tx_hash FROM evm_transactions WHERE chain_id=? '
+            'ORDER BY timestamp LIMIT 5',
+            (ChainID.ETHEREUM.serialize_for_db(),),
+        )), strict=True)
+    assert len(tx_hashes) == 5
+
+    decoder = ethereum_transaction_decoder
+    write_tx_events = decoder._write_tx_events
+
+    def mock_write_tx_events(write_cursor, events, action_id, db_id):
+        if db_id == tx_ids[1]:
+            raise DeserializationError('Failed to serialize event')
+        write_tx_events(write_cursor=write_cursor, events=events, action_id=action_id, db_id=db_id)
+
+    with (
+        patch('rotkehlchen.chain.decoding.decoder.DECODING_BATCH_SIZE', new=3),
+        patch.object(decoder, '_write_tx_events', side_effect=mock_write_tx_events),
+        patch.object(decoder, '_flush_pending_tx_events', wraps=decoder._flush_pending_tx_events) as flush_mock,  # noqa: E501
+    ):
+        decoder.decode_transaction_hashes(ignore_cache=True, tx_hashes=list(tx_hashes))
+
+    assert flush_mock.call_count == 2  # the full batch and the final flush of the rest
+    with database.conn.read_ctx() as cursor:
+        decoded_hashes = {deserialize_evm_tx_hash(x[0]) for x in cursor.execute(
+            'SELECT tx_hash FROM evm_transactions E INNER JOIN evm_tx_mappings M ON '
+            'E.identifier=M.tx_id WHERE M.value=?',
+            (TX_DECODED,),
+        )}
+        assert decoded_hashes == set(tx_hashes) - {tx_hashes[1]}
+        assert cursor.execute(
+            'SELECT COUNT(*) FROM chain_events_info WHERE tx_ref=?', (tx_hashes[1],),
+        ).fetchone()[0] == 0
+
+
+@pytest.mark.parametrize('use_custom_database', ['ethtxs.db'])
+def test_decoded_events_written_before_reloading_decoders(
+        ethereum_transaction_decoder: 'EthereumTransactionDecoder',
+        database: 'DBHandler',
+) -> None:
+    """Test that the events decoded so far in a batch are written to the DB before decoders
+    are reloaded, since they reload their data from the DB for the next transactions"""
+    with database.conn.read_ctx() as cursor:
+        tx_hashes = [deserialize_evm_tx_hash(x[0]) for x in cursor.execute(
+            'SELECT tx_hash FROM evm_transactions WHERE chain_id=? ORDER BY timestamp LIMIT 3',
+            (ChainID.ETHEREUM.serialize_for_db(),),
+        )]
+    assert len(tx_hashes) == 3
+
+    decoder = ethereum_transaction_decoder
+    decode_transaction_from_context = decoder._decode_transaction_from_context
+    decoded_before_reload = []
+
+    def mock_decode_transaction_from_context(context, **kwargs):
+        events, refresh_balances, _ = decode_transaction_from_context(context=context, **kwargs)
+        # e.g. eigenlayer reloads its pods mapping from the DB once a pod is created
+        return events, refresh_balances, {'Eigenlayer'} if context.transaction.tx_hash == tx_hashes[1] else None  # noqa: E501
+
+    def mock_reload_specific_decoders(cursor, decoders):
+        decoded_before_reload.extend(deserialize_evm_tx_hash(x[0]) for x in cursor.execute(
+            'SELECT tx_hash FROM evm_transactions E INNER JOIN evm_tx_mappings M ON '
+            'E.identifier=M.tx_id WHERE M.value=?',
+            (TX_DECODED,),
+        ))
+
+    with (
+        patch.object(decoder, '_decode_transaction_from_context', side_effect=mock_decode_transaction_from_context),  # noqa: E501
+        patch.object(decoder, 'reload_specific_decoders', side_effect=mock_reload_specific_decoders) as reload_mock,  # noqa: E501
+    ):
+        decoder.decode_transaction_hashes(ignore_cache=True, tx_hashes=tx_hashes)
+
+    assert reload_mock.call_count == 1
+    assert set(decoded_before_reload) == set(tx_hashes[:2])
+
+
 @pytest.mark.vcr(filter_query_parameters=['apikey'])
 @pytest.mark.parametrize('ethereum_accounts', [['0x9531C059098e3d194fF87FebB587aB07B30B1306', '0xc37b40ABdB939635068d3c5f13E7faF686F03B65']])  # noqa: E501
 @pytest.mark.parametrize('optimism_accounts', [['0x9531C059098e3d194fF87FebB587aB07B30B1306']])
@@ -9,6 +9,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
+from eth_abi import encode
 from freezegun import freeze_time
 from web3 import HTTPProvider, Web3
 
@@ -16,7 +17,7 @@ from rotkehlchen.assets.asset import Asset, CustomAsset, EvmToken, FiatAsset, Un
 from rotkehlchen.assets.resolver import AssetResolver
 from rotkehlchen.assets.utils import get_or_create_evm_token
 from rotkehlchen.chain.ethereum.modules.sushiswap.constants import CPT_SUSHISWAP_V2
-from rotkehlchen.chain.ethereum.modules.yearn.constants import CPT_YEARN_V3
+from rotkehlchen.chain.ethereum.modules.yearn.constants import CPT_YEARN_V2, CPT_YEARN_V3
 from rotkehlchen.chain.ethereum.node_inquirer import EthereumInquirer
 from rotkehlchen.chain.evm.contracts import find_matching_event_abi
 from rotkehlchen.chain.evm.decoding.balancer.constants import (
@@ -81,6 +82,8 @@ from rotkehlchen.inquirer import (
     BTC_PER_BSQ,
     CURRENT_PRICE_CACHE_SECS,
     DEFAULT_RATE_LIMIT_WAITING_TIME,
+    CachedPriceEntry,
+    CurrentPriceCache,
     CurrentPriceOracle,
     Inquirer,
 )
@@ -92,6 +95,7 @@ from rotkehlchen.tests.unit.decoders.test_curve_lend import (
 )
 from rotkehlchen.tests.unit.test_cost_basis import ONE_PRICE
 from rotkehlchen.tests.utils.constants import A_CNY, A_JPY
+from rotkehlchen.tests.utils.factories import make_evm_address
 from rotkehlchen.tests.utils.mock import MockResponse
 from rotkehlchen.tests.utils.morpho import create_ethereum_morpho_vault_token
 from rotkehlchen.types import (
@@ -835,11 +839,69 @@ def test_find_protocol_price_fallback_to_oracle(inquirer_defi):
     """
     yvusdc = EvmToken('eip155:1/erc20:0x5f18C75AbDAe578b483E5F43f12a39cF75b973a9')
     yearn_patch = patch('rotkehlchen.inquirer.get_underlying_asset_price', side_effect=lambda *args: (None, None))  # noqa: E501
-    with yearn_patch:
+    batch_patch = patch.object(Inquirer, '_find_batched_evm_token_usd_prices', return_value={})
+    with yearn_patch, batch_patch:
         price = inquirer_defi.find_usd_price(yvusdc)
     assert price is not None and price != ZERO
 
 
+@pytest.mark.parametrize('should_mock_current_price_queries', [False])
+def test_batched_vault_token_prices(database: 'DBHandler', inquirer_defi: 'Inquirer') -> None:
+    """Test that the prices of many vault tokens are found with one multicall and one
+    oracle query for all of their underlying tokens"""
+    vaults = {}
+    for idx, (protocol, underlying_token) in enumerate((
+            (CPT_YEARN_V2, A_USDC.resolve_to_evm_token()),
+            (CPT_YEARN_V3, A_DAI.resolve_to_evm_token()),
+            (CPT_YEARN_V2, A_DAI.resolve_to_evm_token()),
+    )):
+        vault = get_or_create_evm_token(
+            userdb=database,
+            evm_address=make_evm_address(),
+            chain_id=ChainID.ETHEREUM,
+            token_kind=TokenKind.ERC20,
+            symbol=f'yv{idx}',
+            decimals=underlying_token.decimals,
+            protocol=protocol,
+            underlying_tokens=[UnderlyingToken(
+                address=underlying_token.evm_address,
+                token_kind=TokenKind.ERC20,
+                weight=ONE,
+            )],
+        )
+        vaults[vault] = (10 ** underlying_token.get_decimals()) * (idx + 2) // 2
+
+    def mock_multicall(calls, **kwargs):
+        return [
+            (True, encode(['uint256'], [vaults[next(x for x in vaults if x.evm_address == address)]]))  # noqa: E501
+            for address, _ in calls
+        ]
+
+    def mock_oracles(from_assets, to_asset, skip_onchain=False):
+        return {
+            asset: ({A_USDC: Price(FVal('0.99')), A_DAI: Price(FVal('1.01'))}[asset], CurrentPriceOracle.COINGECKO)  # noqa: E501
+            for asset in from_assets
+        }
+
+    ethereum = inquirer_defi.get_evm_manager(chain_id=ChainID.ETHEREUM)
+    with (
+        patch.object(ethereum.node_inquirer, 'multicall_2', side_effect=mock_multicall) as multicall,  # noqa: E501
+        patch.object(Inquirer, '_query_oracle_instances', side_effect=mock_oracles) as oracles,
+    ):
+        prices = inquirer_defi.find_usd_prices_and_oracles(list(vaults))
+
+    assert multicall.call_count == 1
+    assert oracles.call_count == 1
+    assert set(oracles.call_args.kwargs['from_assets']) == {A_USDC, A_DAI}
+    assert prices == {
+        vault: (Price(expected_price), CurrentPriceOracle.BLOCKCHAIN)
+        for vault, expected_price in zip(vaults, (FVal('0.99'), FVal('1.515'), FVal('2.02')), strict=True)  # noqa: E501
+    }
+    # the prices are cached so querying them again does not hit the chain
+    assert inquirer_defi.find_usd_price(next(iter(vaults))) == FVal('0.99')
+    assert multicall.call_count == 1
+
+
 @pytest.mark.vcr(filter_query_parameters=['apikey'])
 @pytest.mark.parametrize('use_clean_caching_directory', [True])
 @pytest.mark.parametrize('should_mock_current_price_queries', [False])
@@ -870,6 +932,74 @@ def test_cache_is_hit_for_collection(inquirer: Inquirer):
     assert oracle_query.call_count == 1
 
 
+def test_current_price_cache():
+    """Test that the current prices cache invalidates the pairs of an asset via its index
+    and that fresh prices are not evicted until the cache reaches its hard maximum size"""
+    cache = CurrentPriceCache(maxsize=2, hard_maxsize=4)
+    now = ts_now()
+    stale = CachedPriceEntry(price=ONE_PRICE, time=Timestamp(now - CURRENT_PRICE_CACHE_SECS - 1), oracle=CurrentPriceOracle.COINGECKO)  # noqa: E501
+    fresh = CachedPriceEntry(price=ONE_PRICE, time=now, oracle=CurrentPriceOracle.COINGECKO)
+    cache.add((A_BTC, A_USD), stale)
+    cache.add((A_ETH, A_USD), fresh)
+    cache.add((A_ETH, A_BTC), fresh)  # evicts the stale BTC price
+    assert list(cache) == [(A_ETH, A_USD), (A_ETH, A_BTC)]
+    cache.add((A_EUR, A_USD), fresh)
+    cache.add((A_CNY, A_USD), fresh)  # fresh prices are kept until the hard maxsize
+    assert len(cache.cache) == 4
+    cache.add((A_JPY, A_USD), fresh)  # evicts the least recently used fresh price
+    assert list(cache) == [(A_ETH, A_BTC), (A_EUR, A_USD), (A_CNY, A_USD), (A_JPY, A_USD)]
+
+    cache.remove_assets({A_BTC, A_EUR})
+    assert list(cache) == [(A_CNY, A_USD), (A_JPY, A_USD)]
+    assert A_ETH not in cache.asset_pairs
+    assert cache.asset_pairs[A_USD] == {(A_CNY, A_USD), (A_JPY, A_USD)}
+    assert cache.get_fresh((A_CNY, A_USD)) == fresh
+    assert cache.get_fresh((A_BTC, A_USD)) is None
+    assert cache.stats() == {
+        'entries': 2,
+        'maxsize': 2,
+        'hard_maxsize': 4,
+        'hits': 1,
+        'misses': 1,
+        'evictions': 2,
+    }
+
+
+def test_warm_up_current_price_cache(inquirer: Inquirer, database: 'DBHandler'):
+    """Test that the prices of a recent balance snapshot are used to fill the cache on login"""
+    snapshot_ts = Timestamp(ts_now() - 10)
+    with database.user_write() as write_cursor:
+        database.add_asset_identifiers(write_cursor, [A_BTC.identifier, A_ETH.identifier, A_EUR.identifier])  # noqa: E501
+        write_cursor.execute(
+            'INSERT INTO timed_location_data(timestamp, location, usd_value) VALUES(?, ?, ?)',
+            (snapshot_ts, 'A', '1500'),
+        )
+        write_cursor.executemany(
+            'INSERT INTO timed_balances(category, timestamp, currency, amount, usd_value) '
+            'VALUES(?, ?, ?, ?, ?)',
+            [
+                ('A', snapshot_ts, A_BTC.identifier, '0.5', '1000'),
+                ('A', snapshot_ts, A_ETH.identifier, '0', '0'),
+                ('B', snapshot_ts, A_EUR.identifier, '500', '550'),
+            ],
+        )
+
+    inquirer._cached_current_price.clear()
+    Inquirer.warm_up_cache(database)
+    assert inquirer._cached_current_price.get_fresh((A_BTC, A_USD)) == CachedPriceEntry(
+        price=Price(FVal(2000)),
+        time=snapshot_ts,
+        oracle=CurrentPriceOracle.BLOCKCHAIN,
+    )
+    assert inquirer._cached_current_price.get_fresh((A_EUR, A_USD)).price == Price(FVal('1.1'))  # type: ignore[union-attr]
+    assert (A_ETH, A_USD) not in inquirer._cached_current_price
+
+    inquirer._cached_current_price.clear()
+    with patch('rotkehlchen.inquirer.ts_now', return_value=snapshot_ts + CURRENT_PRICE_CACHE_SECS + 1):  # noqa: E501
+        Inquirer.warm_up_cache(database)
+    assert len(inquirer._cached_current_price.cache) == 0
+
+
 @pytest.mark.parametrize('should_mock_current_price_queries', [False])
 @requires_env([TestEnvironment.NIGHTLY])
 def test_usd_price(inquirer: Inquirer, globaldb: GlobalDBHandler):
@@ -1650,3 +1780,34 @@ def test_batch_price_query(inquirer: 'Inquirer'):
         A_AAVE: (FVal('212.45'), CurrentPriceOracle.COINGECKO),
         a_air: (FVal('0.01054'), CurrentPriceOracle.CRYPTOCOMPARE),
     }
+
+
+@pytest.mark.parametrize('should_mock_current_price_queries', [False])
+def test_batched_prices_of_tokens_on_chains_without_evm_manager(
+        database: 'DBHandler',
+        inquirer: 'Inquirer',
+) -> None:
+    """Test that tokens of chains without an injected evm manager are priced by the oracles
+    instead of breaking the batched price query of all the given assets"""
+    tokens: list[Asset] = [get_or_create_evm_token(
+        userdb=database,
+        evm_address=make_evm_address(),
+        chain_id=ChainID.AVALANCHE,
+        token_kind=TokenKind.ERC20,
+        symbol=symbol,
+        decimals=18,
+        protocol=protocol,
+        underlying_tokens=[UnderlyingToken(
+            address=A_USDC.resolve_to_evm_token().evm_address,
+            token_kind=TokenKind.ERC20,
+            weight=ONE,
+        )] if protocol is not None else None,
+    ) for symbol, protocol in (('TKN', None), ('yvTKN', CPT_YEARN_V2))]
+
+    def mock_oracles(from_assets, to_asset, skip_onchain=False):
+        return {asset: (Price(FVal('1.5')), CurrentPriceOracle.COINGECKO) for asset in from_assets}
+
+    with patch.object(Inquirer, '_query_oracle_instances', side_effect=mock_oracles):
+        prices = inquirer.find_usd_prices(tokens)
+
+    assert prices == dict.fromkeys(tokens, Price(FVal('1.5')))
@@ -331,6 +331,31 @@ def test_get_historical_prices(globaldb: 'GlobalDBHandler') -> None:
     assert single_price.price == batch_result[0].price == FVal(3)
     assert batch_result[0].source == HistoricalPriceOracle.MANUAL
 
+    # check that the prices of a pair at many timestamps are found in the same way
+    assert globaldb.get_historical_prices_for_timestamps(
+        from_asset=A_BTC,
+        to_asset=A_USD,
+        timestamps=[
+            Timestamp(ts1 - 3600),
+            Timestamp(ts1 + 3600 * 6),
+            Timestamp(ts1 + DAY_IN_SECONDS - 3600 * 2),
+            Timestamp(ts1 + 2 * DAY_IN_SECONDS + 3600 * 4),
+            Timestamp(ts1 + 4 * DAY_IN_SECONDS - 3600),
+        ],
+        max_seconds_distance=DAY_IN_SECONDS,
+    ) == {
+        ts1 - 3600: price1,
+        ts1 + 3600 * 6: price2,
+        ts1 + DAY_IN_SECONDS - 3600 * 2: price3,
+        ts1 + 4 * DAY_IN_SECONDS - 3600: price4,
+    }
+    assert globaldb.get_historical_prices_for_timestamps(
+        from_asset=A_AAVE,
+        to_asset=A_USD,
+        timestamps=[Timestamp(ts1 + 10)],
+        max_seconds_distance=DAY_IN_SECONDS,
+    ) == {ts1 + 10: FVal(3)}
+
 
 @pytest.mark.parametrize('should_mock_price_queries', [False])
 def test_oracle_instance_caches_price(price_historian):
@@ -0,0 +1,67 @@
+import sys
+import time
+from collections import deque
+
+import gevent
+import greenlet
+
+from rotkehlchen.utils.profiling import Profiler, collapse_stack, stack_key
+
+
+def busy_loop() -> None:
+    end = time.perf_counter() + 0.3
+    while time.perf_counter() < end:
+        pass
+
+
+def sleep_often() -> None:
+    for _ in range(20):
+        gevent.sleep(0.01)
+
+
+def test_profiler():
+    """Test that the profiler samples the stacks of the greenlets and measures for how
+    long each of them runs between switches"""
+    profiler = Profiler()
+    assert profiler.start(sample_interval=0.005) is True
+    try:
+        assert profiler.start() is False
+        gevent.joinall([gevent.spawn(busy_loop), gevent.spawn(sleep_often)], raise_error=True)
+    finally:
+        assert profiler.stop() is True
+
+    assert profiler.stop() is False
+    assert greenlet.gettrace() is None  # the trace function was removed
+    result = profiler.serialize()
+    assert result['running'] is False and result['samples'] > 0
+    busy_stacks = [stack for stack in result['flamegraph'] if stack.endswith(f'busy_loop({__name__})')]  # noqa: E501
+    assert len(busy_stacks) != 0
+    assert 0.2 < sum(result['flamegraph'][stack] for stack in busy_stacks) < 0.4
+
+    busy, sleeper = result['greenlets']['busy_loop'], result['greenlets']['sleep_often']
+    assert busy['switches'] == 1 and busy['max_run_time'] >= 0.3
+    assert busy['cpu_time'] > 0.2 and busy['blocking_time'] < 0.1
+    assert sleeper['switches'] == 21 and sleeper['max_run_time'] < 0.1
+
+
+def test_profiler_stores_each_stack_once():
+    """Test that the samples of a stack are aggregated per bucket, that each stack is stored
+    once and that the stacks are removed once no bucket of the window has them"""
+    profiler = Profiler()
+    profiler.window, profiler.buckets, profiler.stacks = 10, deque(), {}
+    frame = sys._getframe()
+    stack = collapse_stack(frame)
+    for now in (100, 100.5, 101, 111):
+        profiler._add_sample(now, stack_key(frame), frame, 0.5)
+        profiler._add_sample(now, stack_key(frame.f_back), frame.f_back, 0.25)
+        profiler._remove_old_samples(now)
+        if now == 101:  # 2 buckets with the same 2 stacks
+            assert len(profiler.stacks) == 2
+            assert profiler.flamegraph()[stack] == 1.5
+            assert profiler.serialize()['samples'] == 6
+
+    assert len(profiler.buckets) == 2 and profiler.stacks[stack_key(frame)] == (stack, 2)
+    profiler._remove_old_samples(112)
+    assert len(profiler.buckets) == 1 and profiler.stacks[stack_key(frame)] == (stack, 1)
+    profiler._remove_old_samples(122)
+    assert profiler.stacks == {} and profiler.flamegraph() == {}
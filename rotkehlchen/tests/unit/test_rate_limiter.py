@@ -0,0 +1,101 @@
+import time
+from http import HTTPStatus
+from unittest.mock import patch
+
+import gevent
+import requests
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from rotkehlchen.utils.network import create_session
+from rotkehlchen.utils.rate_limiter import (
+    RATE_LIMIT_MAX_RATE,
+    RateLimiter,
+    TokenBucket,
+    get_rate_limit_key,
+)
+
+
+def _make_response(status_code: int, headers: dict[str, str] | None = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = b'{}'
+    return response
+
+
+def test_rate_limit_key():
+    assert get_rate_limit_key('https://api.etherscan.io/v2/api?module=account') == 'api.etherscan.io'  # noqa: E501
+    key_a = get_rate_limit_key('https://api.etherscan.io/v2/api?module=account&apikey=a')
+    key_b = get_rate_limit_key('https://api.etherscan.io/v2/api?apikey=b&module=logs')
+    assert key_a.startswith('api.etherscan.io (') and 'apikey' not in key_a
+    assert key_a != key_b == get_rate_limit_key('https://api.etherscan.io/v2/api?apikey=b')
+    assert get_rate_limit_key('https://api.binance.com/api/v3/myTrades', {'X-MBX-APIKEY': 'b'}) == key_b.replace('api.etherscan.io', 'api.binance.com')  # noqa: E501
+
+
+def test_token_bucket_learns_rate():
+    """Test that the rate of a bucket is halved on too many requests responses, that it
+    pauses for the requested time and that it respects the rate limit headers"""
+    bucket = TokenBucket('test')
+    bucket.update(HTTPStatus.TOO_MANY_REQUESTS, {'Retry-After': '2'})
+    assert bucket.rate == RATE_LIMIT_MAX_RATE / 2
+    assert 1.9 < bucket.serialize()['paused_for'] <= 2
+    bucket.update(HTTPStatus.TOO_MANY_REQUESTS, {})
+    assert bucket.rate == RATE_LIMIT_MAX_RATE / 4
+    assert bucket.throttled == bucket.consecutive_throttles == 2
+
+    bucket.paused_until = 0
+    bucket.update(HTTPStatus.OK, {})
+    assert bucket.rate == RATE_LIMIT_MAX_RATE / 4 + 0.5
+    assert bucket.consecutive_throttles == 0
+    # 10 requests remaining for the next 20 seconds
+    bucket.update(HTTPStatus.OK, {'X-RateLimit-Remaining': '10', 'X-RateLimit-Reset': '20'})
+    assert bucket.rate == 0.5
+    # no requests remaining until the given timestamp
+    bucket.update(HTTPStatus.OK, CaseInsensitiveDict({'x-ratelimit-remaining': '0', 'x-ratelimit-reset': str(int(time.time()) + 5)}))  # noqa: E501
+    assert 3.9 < bucket.serialize()['paused_for'] <= 5
+
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket('test')
+    bucket.rate = bucket.tokens = 10
+    start = time.monotonic()
+    gevent.joinall([gevent.spawn(bucket.acquire) for _ in range(20)], raise_error=True)
+    # the first 10 requests are sent at once and the other 10 in the next second
+    assert 0.9 < time.monotonic() - start < 1.5
+    assert bucket.requests == 20 and bucket.max_queued >= 10 and bucket.queued == 0
+
+
+def test_rate_limiter_coalesces_requests():
+    """Test that identical GET requests in flight at the same time are sent once"""
+    rate_limiter, calls = RateLimiter(), []
+
+    def send_function() -> Response:
+        calls.append(1)
+        gevent.sleep(0.1)
+        return _make_response(HTTPStatus.OK)
+
+    request = requests.Request('GET', 'https://coalesce.test/api?a=1').prepare()
+    other_request = requests.Request('GET', 'https://coalesce.test/api?a=2').prepare()
+    greenlets = [
+        gevent.spawn(rate_limiter.send, x, send_function, True)
+        for x in (request, request.copy(), request.copy(), other_request)
+    ]
+    gevent.joinall(greenlets, raise_error=True)
+    assert len(calls) == 2
+    assert all(x.value.status_code == HTTPStatus.OK and x.value.json() == {} for x in greenlets)
+    assert rate_limiter.stats()['coalesce.test']['coalesced'] == 2
+    assert rate_limiter.in_flight == {}
+
+
+def test_session_requests_are_rate_limited():
+    """Test that sessions created by create_session send requests via the rate limiter"""
+    session = create_session()
+    with patch(
+        'requests.adapters.HTTPAdapter.send',
+        return_value=_make_response(HTTPStatus.TOO_MANY_REQUESTS, {'Retry-After': '3'}),
+    ):
+        assert session.get('https://limited.test/api').status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+    stats = RateLimiter().stats()['limited.test']
+    assert stats['throttled'] == 1 and stats['requests'] == 1 and stats['paused_for'] > 2
@@ -1,4 +1,5 @@
 import datetime
+from contextlib import ExitStack
 from typing import TYPE_CHECKING, Any, cast
 from unittest.mock import MagicMock, patch
 
@@ -45,6 +46,7 @@ from rotkehlchen.premium.premium import (
 from rotkehlchen.serialization.deserialize import deserialize_timestamp
 from rotkehlchen.tasks.assets import _find_missing_tokens
 from rotkehlchen.tasks.manager import PREMIUM_STATUS_CHECK, TaskManager
+from rotkehlchen.tasks.scheduling import TASK_PRIORITY_AGING_SECS
 from rotkehlchen.tasks.utils import should_run_periodic_task
 from rotkehlchen.tests.fixtures.websockets import WebsocketReader
 from rotkehlchen.tests.utils.ethereum import (
@@ -90,6 +92,71 @@ def test_potential_maybe_schedule_task(task_manager: TaskManager):
     assert all(func in tasks for func in dir(task_manager) if func.startswith('_maybe_'))
 
 
+@pytest.mark.parametrize('max_tasks_num', [1])
+def test_schedule_by_priority(task_manager: TaskManager) -> None:
+    """Test that tasks are scheduled by priority, that tasks waiting for a task slot
+    for long enough get ahead of higher priority tasks and that their stats are kept"""
+    scheduled = []
+
+    def make_task(name: str):
+        def task() -> list[gevent.Greenlet]:
+            scheduled.append(name)
+            return [task_manager.greenlet_manager.spawn_and_track(
+                after_seconds=None,
+                task_name=name,
+                exception_is_error=True,
+                method=lambda: gevent.sleep(0.1),
+            )]
+
+        task.__name__ = name
+        return task
+
+    task_manager.potential_tasks = [make_task('low_task'), make_task('high_task')]
+    with patch.dict('rotkehlchen.tasks.manager.TASK_PRIORITIES', {'high_task': 3}):
+        task_manager.schedule()
+        assert scheduled == ['high_task']  # only one slot and low_task has to wait
+        task_manager.schedule()  # no free slot while high_task runs
+        assert scheduled == ['high_task']
+        gevent.joinall(task_manager.running_greenlets[task_manager.potential_tasks[1]])
+
+        # make low_task wait long enough to get ahead of high_task
+        low_task_stats = task_manager.task_stats['low_task']
+        assert low_task_stats.waiting_since is not None
+        low_task_stats.waiting_since -= TASK_PRIORITY_AGING_SECS * 3
+        task_manager.schedule()
+        assert scheduled == ['high_task', 'low_task']
+
+    stats = task_manager.get_task_stats()
+    assert stats['high_task']['priority'] == 3
+    assert stats['high_task']['runs'] == 1
+    assert stats['high_task']['running'] is False
+    assert stats['high_task']['last_run_time'] >= 0.1
+    assert stats['low_task']['priority'] == 1
+    assert stats['low_task']['running'] is True
+    assert stats['low_task']['last_wait_time'] >= TASK_PRIORITY_AGING_SECS * 3
+
+
+@pytest.mark.parametrize('max_tasks_num', [1])
+def test_busy_scheduling_does_not_mark_tasks_waiting(task_manager: TaskManager) -> None:
+    """Test that tasks are not counted as waiting for a task slot when no slot is free
+    since it's not known whether they have anything to do"""
+    def idle_task() -> None:
+        return None
+
+    task_manager.potential_tasks = [idle_task]
+    busy = task_manager.greenlet_manager.spawn_and_track(
+        after_seconds=None,
+        task_name='busy',
+        exception_is_error=True,
+        method=lambda: gevent.sleep(0.1),
+    )
+    task_manager.schedule()
+    assert 'idle_task' not in task_manager.task_stats
+    busy.join()
+    task_manager.schedule()
+    assert task_manager.task_stats['idle_task'].waiting_since is None
+
+
 @pytest.mark.parametrize('number_of_eth_accounts', [2])
 @pytest.mark.parametrize('max_tasks_num', [5])
 def test_maybe_query_ethereum_transactions(task_manager, ethereum_accounts):
@@ -248,6 +315,40 @@ def test_maybe_schedule_ethereum_txreceipts(
     assert receipt2 == receipts[1]
 
 
+@pytest.mark.parametrize('max_tasks_num', [5])
+def test_maybe_decode_evm_transactions(task_manager: TaskManager) -> None:
+    """Test that a single decoding task is scheduled which decodes all the chains
+    with undecoded transactions concurrently"""
+    chains = (SupportedBlockchain.ETHEREUM, SupportedBlockchain.OPTIMISM)
+    decoding_chains: list[SupportedBlockchain] = []
+
+    def make_decode_mock(blockchain: SupportedBlockchain) -> Any:
+        def decode_mock(limit: int, send_ws_notifications: bool) -> list[EVMTxHash]:
+            decoding_chains.append(blockchain)
+            gevent.sleep(.1)  # give the other chain the chance to start decoding
+            assert len(decoding_chains) == 2
+            return [make_evm_tx_hash()] * 2
+
+        return decode_mock
+
+    with ExitStack() as stack:
+        stack.enter_context(patch('rotkehlchen.tasks.manager.EVM_CHAINS_WITH_TRANSACTIONS', new=chains))  # noqa: E501
+        stack.enter_context(patch('rotkehlchen.chain.aggregator.EVM_CHAINS_WITH_TRANSACTIONS', new=chains))  # noqa: E501
+        stack.enter_context(patch.object(DBEvmTx, 'count_hashes_not_decoded', return_value=2))
+        for blockchain in chains:
+            stack.enter_context(patch.object(
+                task_manager.chains_aggregator.get_chain_manager(blockchain).transactions_decoder,  # type: ignore[call-overload]  # evm chains
+                'get_and_decode_undecoded_transactions',
+                side_effect=make_decode_mock(blockchain),
+            ))
+
+        greenlets = task_manager._maybe_decode_evm_transactions()
+        assert greenlets is not None and len(greenlets) == 1
+        assert greenlets[0].get() == dict.fromkeys(chains, 2)
+
+    assert set(decoding_chains) == set(chains)
+
+
 @pytest.mark.parametrize('max_tasks_num', [7])
 @pytest.mark.parametrize('start_with_valid_premium', [True])
 def test_check_premium_status(rotkehlchen_api_server, username):
@@ -18,7 +18,7 @@ from rotkehlchen.constants.assets import A_CRV, A_DAI, A_ETH, A_OMG, A_WETH
 from rotkehlchen.constants.resolver import evm_address_to_identifier
 from rotkehlchen.db.constants import EVM_ACCOUNTS_DETAILS_TOKENS
 from rotkehlchen.db.history_events import DBHistoryEvents
-from rotkehlchen.errors.misc import InputError
+from rotkehlchen.errors.misc import InputError, RemoteError
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.history.events.structures.base import HistoryEvent
@@ -678,3 +678,27 @@ def test_superfluid_constant_flow_nfts_are_in_token_exceptions(
             exceptions=(exceptions := manager.tokens._per_chain_token_exceptions()),
         )
         assert all(i.address not in exceptions for i in erc721_tokens)
+
+
+@pytest.mark.parametrize('number_of_eth_accounts', [2])
+def test_detect_tokens_does_not_save_partial_results(
+        database: 'DBHandler',
+        ethereum_inquirer: 'EthereumInquirer',
+        ethereum_accounts: list[ChecksumEvmAddress],
+) -> None:
+    """Test that if the balances of a chunk of tokens fail to be queried the detection raises
+    instead of saving incomplete token lists for the addresses"""
+    def mock_get_token_balances(address, tokens, call_order):
+        if address == ethereum_accounts[1]:
+            raise RemoteError('All nodes failed')
+        return {A_DAI: ONE}
+
+    tokens = EthereumTokens(database, ethereum_inquirer)
+    with (
+        patch.object(tokens, 'get_token_balances', side_effect=mock_get_token_balances),
+        patch.object(database, 'save_tokens_for_address') as save_mock,
+        pytest.raises(RemoteError),
+    ):
+        tokens.detect_tokens(only_cache=False, addresses=ethereum_accounts)
+
+    assert save_mock.call_count == 0
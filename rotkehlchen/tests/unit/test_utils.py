@@ -18,10 +18,16 @@ from rotkehlchen.constants.resolver import identifier_to_evm_address
 from rotkehlchen.errors.serialization import ConversionError
 from rotkehlchen.externalapis.github import Github
 from rotkehlchen.fval import FVal
+from rotkehlchen.history.events.structures.types import HistoryEventType
 from rotkehlchen.serialization.deserialize import deserialize_timestamp_from_date
-from rotkehlchen.serialization.serialize import process_result
+from rotkehlchen.serialization.serialize import (
+    process_result,
+    process_result_list,
+    result_to_json,
+)
 from rotkehlchen.tests.utils.factories import make_evm_address
 from rotkehlchen.tests.utils.mock import MockResponse
+from rotkehlchen.types import ChainID, Location, Timestamp
 from rotkehlchen.utils.misc import (
     combine_dicts,
     combine_nested_dicts_inplace,
@@ -31,8 +37,14 @@ from rotkehlchen.utils.misc import (
     pairwise,
     pairwise_longest,
     timestamp_to_date,
+    ts_now,
+)
+from rotkehlchen.utils.mixins.cacheable import (
+    CacheableMixIn,
+    PersistedMethod,
+    ResultsCache,
+    cache_response_timewise,
 )
-from rotkehlchen.utils.mixins.cacheable import CacheableMixIn, cache_response_timewise
 from rotkehlchen.utils.serialization import jsonloads_dict, jsonloads_list
 from rotkehlchen.utils.version_check import get_current_version
 
@@ -64,6 +76,26 @@ def test_hexbytes_in_process_result():
     assert json.dumps(process_result(d)) == expected_str
 
 
+def test_process_result_by_type():
+    """Test that entries are converted by the serializer of their type or of its closest
+    registered base class and that JSON native values are kept as they are"""
+    result = {
+        Location.KRAKEN: [Timestamp(1), 1.5, True, None, 'a', (FVal('0.1'), 2)],
+        HistoryEventType.TRADE: defaultdict(list, {A_USDC: ChainID.ETHEREUM}),
+        'unknown': 3j,
+    }
+    assert process_result(result) == {
+        'kraken': [1, 1.5, True, None, 'a', [FVal('0.1'), 2]],
+        'trade': {A_USDC.identifier: 'ethereum'},
+        'unknown': 3j,
+    }
+    assert process_result_list([A_USDC, Version('1.2')]) == [A_USDC.identifier, '1.2']
+    # FVals left in tuples are converted by the JSON encoder
+    assert json.loads(result_to_json({'a': (FVal('0.1'), Location.KRAKEN)})) == {'a': ['0.1', 'kraken']}  # noqa: E501
+    with pytest.raises(TypeError):
+        result_to_json(result)
+
+
 def test_iso8601ts_to_timestamp():
     assert iso8601ts_to_timestamp('2018-09-09T12:00:00.000Z') == 1536494400
     assert iso8601ts_to_timestamp('2011-01-01T04:13:22.220Z') == 1293855202
@@ -189,6 +221,7 @@ class Foo(CacheableMixIn):
         self.do_sum_call_count = 0
         self.do_something_call_count = 0
         self.do_something_arguments_dont_matter_count = 0
+        self.do_double_call_count = 0
 
     @cache_response_timewise()
     def do_sum(self, arg1, arg2, **kwargs):  # pylint: disable=unused-argument
@@ -205,6 +238,11 @@ class Foo(CacheableMixIn):
         self.do_something_arguments_dont_matter_count += 1
         return arg1 + arg2
 
+    @cache_response_timewise(ttl_secs=5)
+    def do_double(self, arg1, **kwargs):  # pylint: disable=unused-argument
+        self.do_double_call_count += 1
+        return {'result': arg1 * 2}
+
 
 def test_cache_response_timewise():
     """Test that cached value is called and not the function again"""
@@ -254,6 +292,73 @@ def test_cache_response_timewise_with_arguments_matter_false():
     assert instance.do_something_arguments_dont_matter_count == 2
 
 
+def test_cache_response_timewise_ttl_and_eviction():
+    """Test that per method ttls are respected, that least recently used results are
+    evicted when the cache is full and that hits and misses are counted"""
+    instance = Foo()
+    instance.results_cache = ResultsCache(max_entries=2)
+    with patch('rotkehlchen.utils.mixins.cacheable.ts_now', side_effect=lambda: now):
+        now = 1000
+        assert instance.do_double(1) == {'result': 2}
+        assert instance.do_double(2) == {'result': 4}
+        assert instance.do_double(1) == {'result': 2}  # cached and now most recently used
+        assert instance.do_double_call_count == 2
+        now = 1004
+        assert instance.do_something() == 5  # evicts do_double(2)
+        assert instance.do_double(1) == {'result': 2}
+        assert instance.do_double(2) == {'result': 4}
+        assert instance.do_double_call_count == 3
+        now = 1005  # the 5 seconds of do_double(1) passed but not the default ttl
+        assert instance.do_double(1) == {'result': 2}
+        assert instance.do_double_call_count == 4
+        assert instance.do_something() == 5
+        assert instance.do_something_call_count == 2  # was evicted by do_double(2)
+
+    assert instance.results_cache.stats() == {
+        'entries': 2,
+        'hits': 2,
+        'misses': 6,
+        'evictions': 3,
+    }
+
+
+def test_cache_response_timewise_persisted(database):
+    """Test that the results of persisted methods are used by a new object after a restart
+    while they are fresh and that clearing the cache removes them from the DB"""
+    def create_instance():
+        instance = Foo()
+        instance.results_cache.enable_persistence(
+            database=database,
+            namespace=lambda: 'foo',
+            methods={'do_double': PersistedMethod(
+                serialize=lambda result: None if result['result'] == 0 else result,
+                deserialize=lambda data: {'result': int(data['result'])},
+            )},
+        )
+        return instance
+
+    instance = create_instance()
+    assert instance.do_double(2) == {'result': 4}
+    assert instance.do_double(0) == {'result': 0}
+    assert instance.do_sum(1, 2) == 3
+    instance = create_instance()
+    assert instance.do_double(2) == {'result': 4}
+    assert instance.do_double(0) == {'result': 0}
+    assert instance.do_sum(1, 2) == 3
+    assert (instance.do_double_call_count, instance.do_sum_call_count) == (1, 1)
+
+    instance.flush_cache('do_double', 2)
+    assert create_instance().do_double(2) == {'result': 4}
+    with patch('rotkehlchen.utils.mixins.cacheable.ts_now', return_value=ts_now() + 5):
+        instance = create_instance()
+        assert instance.do_double(2) == {'result': 4}  # saved result is too old
+        assert instance.do_double_call_count == 1
+
+    instance.results_cache.clear()
+    with database.conn_transient.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM cached_results').fetchone()[0] == 0
+
+
 def test_convert_to_int():
     assert convert_to_int('5') == 5
     assert convert_to_int('37451082560000003241000000000003221111111111') == 37451082560000003241000000000003221111111111  # noqa: E501
@@ -18,6 +18,7 @@ class ConfigurationArgs(NamedTuple):
     max_logfiles_num: int = DEFAULT_MAX_LOG_BACKUP_FILES
     sqlite_instructions: int = DEFAULT_SQL_VM_INSTRUCTIONS_CB
     disable_task_manager: bool = False
+    profiling: bool = False
 
 
 def default_args(
@@ -37,4 +38,5 @@ def default_args(
         logfile=None,
         logtarget=None,
         disable_task_manager=False,
+        profiling=False,
     )
@@ -1,7 +1,8 @@
+import json
 import os
 import tempfile
 from http import HTTPStatus
-from typing import Literal
+from typing import Any, Literal
 from unittest.mock import patch
 
 from rotkehlchen.constants import ROTKEHLCHEN_SERVER_TIMEOUT
@@ -90,6 +91,58 @@ def create_patched_requests_get_for_premium(
     return patch.object(session, 'get', side_effect=mocked_get)
 
 
+class MockChunkedBackupServer:
+    """Stand-in for the server side of the chunked DB backups. Its get and post methods
+    are meant to replace the ones of the premium session."""
+
+    def __init__(self) -> None:
+        self.chunks: dict[str, bytes] = {}
+        self.uploaded_chunk_ids: list[str] = []
+        self.manifest: bytes | None = None
+        self.metadata = {'upload_ts': 0, 'last_modify_ts': 0, 'data_hash': '', 'data_size': 0}
+
+    def get(self, url: str, params: dict[str, Any] | None = None, **kwargs: Any) -> MockResponse:
+        if 'last_data_metadata' in url:
+            return MockResponse(HTTPStatus.OK, json.dumps(self.metadata | {'supports_chunks': True}))  # noqa: E501
+        if url.endswith('backup/manifest'):
+            if self.manifest is None:
+                return MockResponse(HTTPStatus.NOT_FOUND, '{"error": "No backup found"}')
+            return MockResponse(HTTPStatus.OK, '', content=self.manifest)
+        if url.endswith('backup/chunks'):
+            assert params is not None
+            return MockResponse(HTTPStatus.OK, '', content=self.chunks[params['chunk_id']])
+
+        raise ValueError(f'Unmocked url {url} in session get for chunked backups')
+
+    def post(
+            self,
+            url: str,
+            data: dict[str, Any],
+            files: dict[str, tuple[str, bytes]] | None = None,
+            **kwargs: Any,
+    ) -> MockResponse:
+        if url.endswith('backup/chunks/missing'):
+            missing = [x for x in data['chunk_ids'].split(',') if x not in self.chunks]
+            return MockResponse(HTTPStatus.OK, json.dumps({'missing': missing}))
+        if url.endswith('backup/chunks'):
+            assert files is not None
+            self.chunks[data['chunk_id']] = files['chunk_data'][1]
+            self.uploaded_chunk_ids.append(data['chunk_id'])
+            return MockResponse(HTTPStatus.OK, '{"success": true}')
+        if url.endswith('backup/manifest'):
+            assert files is not None
+            self.manifest = files['manifest_data'][1]
+            self.metadata = {
+                'upload_ts': data['nonce'] // 1000,
+                'last_modify_ts': data['last_modify_ts'],
+                'data_hash': data['file_hash'],
+                'data_size': data['total_size'],
+            }
+            return MockResponse(HTTPStatus.OK, '{"success": true}')
+
+        raise ValueError(f'Unmocked url {url} in session post for chunked backups')
+
+
 def create_patched_premium(
         premium_credentials: PremiumCredentials,
         username: str,
@@ -1,11 +1,10 @@
-import json
 import logging
 from collections import deque
 from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.logging import RotkehlchenLogsAdapter
-from rotkehlchen.serialization.serialize import process_result
+from rotkehlchen.serialization.serialize import result_to_json
 
 if TYPE_CHECKING:
     from rotkehlchen.api.websockets.notifier import RotkiNotifier
@@ -77,7 +76,7 @@ class MessagesAggregator:
         `wait_on_send` is used to determine if the message should be sent asynchronously
         by spawning a greenlet or if it should just do it synchronously.
         """
-        fallback_msg = json.dumps(process_result({'type': message_type, 'data': data}))  # kind of silly to repeat it here. Same code in broadcast  # noqa: E501
+        fallback_msg = result_to_json({'type': message_type, 'data': data})
 
         if self.rotki_notifier is not None:
             self.rotki_notifier.broadcast(
@@ -85,6 +84,7 @@ class MessagesAggregator:
                 to_send_data=data,
                 failure_callback=self._append_error,
                 failure_callback_args={'msg': fallback_msg},
+                message=fallback_msg,
             )
 
         elif message_type in ERROR_MESSAGE_TYPES:  # Fallback to polling for error messages
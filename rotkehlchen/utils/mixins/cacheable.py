@@ -1,26 +1,173 @@
+import json
+import logging
+from collections import OrderedDict
 from collections.abc import Callable
 from copy import deepcopy
 from functools import wraps
-from typing import TYPE_CHECKING, Any, NamedTuple
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
 
+from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.utils.misc import ts_now
 
-from .common import function_sig_key
+from .common import function_sig
 
 if TYPE_CHECKING:
+    from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.types import Timestamp
 
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
 
 class ResultCache(NamedTuple):
     """Represents a time-cached result of some API query"""
-    result: dict
+    result: Any
     timestamp: 'Timestamp'
 
 
+class PersistedMethod(NamedTuple):
+    """How the results of a method are saved in the transient DB so that they survive
+    restarts. `serialize` should return a json serializable value or None if the result
+    should not be persisted. `deserialize` may raise any exception for data that can't be
+    used anymore, in which case the saved result is ignored."""
+    serialize: Callable[[Any], Any]
+    deserialize: Callable[[Any], Any]
+
+
 # Seconds for which cached api queries will be cached
-# By default 10 minutes.
-# TODO: Make configurable!
+# By default 10 minutes. Can be changed per method by the decorators.
 CACHE_RESPONSE_FOR_SECS = 600
+# Maximum number of results kept in memory for each object. Least recently used results
+# are evicted first.
+RESULTS_CACHE_MAX_ENTRIES: Final = 256
+
+
+class ResultsCache:
+    """LRU cache of the results of the methods of an object.
+
+    Results of some methods can also be kept in the transient DB so that they are
+    used after a restart if they are still fresh. Keys are the call signatures of the
+    methods as given by function_sig.
+    """
+
+    def __init__(self, max_entries: int = RESULTS_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, ResultCache] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.database: DBHandler | None = None
+        self.namespace: Callable[[], str] | None = None
+        self.persisted_methods: dict[str, PersistedMethod] = {}
+
+    def enable_persistence(
+            self,
+            database: 'DBHandler',
+            namespace: Callable[[], str],
+            methods: dict[str, PersistedMethod],
+    ) -> None:
+        """Keep the results of the given methods in the transient DB too. The namespace
+        is called to get the string that distinguishes the object's saved results from
+        the ones of other objects."""
+        self.database = database
+        self.namespace = namespace
+        self.persisted_methods = methods
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, name: str, key: str, ttl_secs: int, now: 'Timestamp') -> ResultCache | None:
+        """Get the cached result of the call with the given key if it's not older than ttl_secs"""
+        if (
+            (entry := self.entries.get(key)) is None and
+            name in self.persisted_methods and
+            (entry := self._load(name=name, key=key)) is not None
+        ):
+            self._add(key, entry)
+
+        if entry is None or now - entry.timestamp >= ttl_secs:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, name: str, key: str, entry: ResultCache) -> None:
+        self._add(key, entry)
+        if name in self.persisted_methods:
+            self._save(name=name, key=key, entry=entry)
+
+    def pop(self, name: str, key: str) -> None:
+        self.entries.pop(key, None)
+        if name in self.persisted_methods and (db_key := self._db_key()) is not None:
+            with db_key[0].conn_transient.write_ctx() as write_cursor:
+                write_cursor.execute(
+                    'DELETE FROM cached_results WHERE namespace=? AND signature=?',
+                    (db_key[1], key),
+                )
+
+    def clear(self) -> None:
+        """Remove all cached results of the object, including the ones saved in the DB"""
+        self.entries.clear()
+        if (db_key := self._db_key()) is not None:
+            with db_key[0].conn_transient.write_ctx() as write_cursor:
+                write_cursor.execute(
+                    'DELETE FROM cached_results WHERE namespace=?', (db_key[1],),
+                )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _add(self, key: str, entry: ResultCache) -> None:
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _db_key(self) -> tuple['DBHandler', str] | None:
+        if self.database is None or self.namespace is None or self.database.conn_transient is None:
+            return None
+        return self.database, self.namespace()
+
+    def _load(self, name: str, key: str) -> ResultCache | None:
+        if (db_key := self._db_key()) is None:
+            return None
+
+        with db_key[0].conn_transient.read_ctx() as cursor:
+            if (row := cursor.execute(
+                'SELECT timestamp, result FROM cached_results WHERE namespace=? AND signature=?',
+                (db_key[1], key),
+            ).fetchone()) is None:
+                return None
+
+        try:
+            result = self.persisted_methods[name].deserialize(json.loads(row[1]))
+        except Exception as e:  # pylint: disable=broad-except  # any error means it's unusable
+            log.debug(f'Ignoring saved result of {key} for {db_key[1]} due to {e!s}')
+            return None
+
+        return ResultCache(result=result, timestamp=row[0])
+
+    def _save(self, name: str, key: str, entry: ResultCache) -> None:
+        if (
+            (db_key := self._db_key()) is None or
+            (data := self.persisted_methods[name].serialize(entry.result)) is None
+        ):
+            return
+
+        with db_key[0].conn_transient.write_ctx() as write_cursor:
+            write_cursor.execute(
+                'INSERT OR REPLACE INTO cached_results(namespace, signature, timestamp, result) '
+                'VALUES(?, ?, ?, ?)',
+                (db_key[1], key, entry.timestamp, json.dumps(data, separators=(',', ':'))),
+            )
 
 
 class CacheableMixIn:
@@ -32,19 +179,19 @@ class CacheableMixIn:
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
-        self.results_cache: dict[int, ResultCache] = {}
-        # Can also be 0 which means cache is disabled.
+        self.results_cache = ResultsCache()
+        # Can also be 0 which means cache is disabled, even for methods with their own ttl.
         self.cache_ttl_secs = CACHE_RESPONSE_FOR_SECS
 
     def flush_cache(self, name: str, *args: Any, **kwargs: Any) -> None:
-        cache_key = function_sig_key(
+        cache_key = function_sig(
             name,
             True,  # arguments_matter
             True,  # skip_ignore_cache
             *args,
             **kwargs,
         )
-        self.results_cache.pop(cache_key, None)
+        self.results_cache.pop(name, cache_key)
 
 
 def _cache_response_timewise_base(
@@ -52,15 +199,20 @@ def _cache_response_timewise_base(
         f: Callable,
         arguments_matter: bool,
         forward_ignore_cache: bool,
+        ttl_secs: int | None,
         *args: Any,
         **kwargs: Any,
-) -> tuple[bool, int, 'Timestamp', dict]:
-    """Base code used in the 2 cache_response_timewise decorators"""
+) -> tuple[ResultCache | None, str, 'Timestamp', dict]:
+    """Base code used in the 2 cache_response_timewise decorators.
+
+    Returns the cached entry, or None for a cache miss, along with the cache key,
+    the current timestamp and the kwargs to call the function with.
+    """
     if forward_ignore_cache:
         ignore_cache = kwargs.get('ignore_cache', False)
     else:
         ignore_cache = kwargs.pop('ignore_cache', False)
-    cache_key = function_sig_key(
+    cache_key = function_sig(
         f.__name__,        # name
         arguments_matter,  # arguments_matter
         True,              # skip_ignore_cache
@@ -68,17 +220,23 @@ def _cache_response_timewise_base(
         **kwargs,
     )
     now = ts_now()
-    cache_miss = (
-        ignore_cache is True or
-        cache_key not in wrappingobj.results_cache or
-        now - wrappingobj.results_cache[cache_key].timestamp >= wrappingobj.cache_ttl_secs
+    if ignore_cache is True:
+        wrappingobj.results_cache.misses += 1
+        return None, cache_key, now, kwargs
+
+    entry = wrappingobj.results_cache.get(
+        name=f.__name__,
+        key=cache_key,
+        ttl_secs=wrappingobj.cache_ttl_secs if ttl_secs is None or wrappingobj.cache_ttl_secs == 0 else ttl_secs,  # noqa: E501
+        now=now,
     )
-    return cache_miss, cache_key, now, kwargs
+    return entry, cache_key, now, kwargs
 
 
 def cache_response_timewise(
         arguments_matter: bool = True,
         forward_ignore_cache: bool = False,
+        ttl_secs: int | None = None,
 ) -> Callable:
     """ This is a decorator for caching results of functions of objects.
     The objects must adhere to the CacheableObject interface.
@@ -102,26 +260,30 @@ def cache_response_timewise(
 
     if forward_ignore_cache is True then if the ignore_cache argument is given it's
     forward to the decorated function instead of being silently consumed.
+
+    If ttl_secs is given the results of the function are cached for that many seconds
+    instead of the object's cache_ttl_secs.
     """
     def _cache_response_timewise(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(wrappingobj: CacheableMixIn, *args: Any, **kwargs: Any) -> Any:
-            cache_miss, cache_key, now, kwargs = _cache_response_timewise_base(
+            entry, cache_key, now, kwargs = _cache_response_timewise_base(
                 wrappingobj,
                 f,
                 arguments_matter,
                 forward_ignore_cache,
+                ttl_secs,
                 *args,
                 **kwargs,
             )
-            if cache_miss:
+            if entry is None:
                 # Call the function, write the result in cache and return it
                 result = f(wrappingobj, *args, **kwargs)
-                wrappingobj.results_cache[cache_key] = ResultCache(result, now)
+                wrappingobj.results_cache.set(f.__name__, cache_key, ResultCache(result, now))
                 return result
 
             # else hit the cache and return it
-            return wrappingobj.results_cache[cache_key].result
+            return entry.result
 
         return wrapper
     return _cache_response_timewise
@@ -130,6 +292,7 @@ def cache_response_timewise(
 def cache_response_timewise_immutable(
         arguments_matter: bool = True,
         forward_ignore_cache: bool = False,
+        ttl_secs: int | None = None,
 ) -> Callable:
     """ Same as cache_response_timewise but resulting dict is a copy so, the cache
     itself can't be mutated.
@@ -137,21 +300,22 @@ def cache_response_timewise_immutable(
     def _cache_response_timewise_immutable(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(wrappingobj: CacheableMixIn, *args: Any, **kwargs: Any) -> Any:
-            cache_miss, cache_key, now, kwargs = _cache_response_timewise_base(
+            entry, cache_key, now, kwargs = _cache_response_timewise_base(
                 wrappingobj,
                 f,
                 arguments_matter,
                 forward_ignore_cache,
+                ttl_secs,
                 *args,
                 **kwargs,
             )
-            if cache_miss:
+            if entry is None:
                 # Call the function, and write the result in cache
-                result = f(wrappingobj, *args, **kwargs)
-                wrappingobj.results_cache[cache_key] = ResultCache(result, now)
+                entry = ResultCache(f(wrappingobj, *args, **kwargs), now)
+                wrappingobj.results_cache.set(f.__name__, cache_key, entry)
 
             # in any case return a copy of the cache to avoid potential mutation
-            return deepcopy(wrappingobj.results_cache[cache_key].result)
+            return deepcopy(entry.result)
 
         return wrapper
     return _cache_response_timewise_immutable
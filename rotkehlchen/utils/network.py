@@ -6,13 +6,13 @@ from typing import Any, Literal, overload
 
 import gevent
 import requests
-from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 
 from rotkehlchen.constants import GLOBAL_REQUESTS_TIMEOUT
 from rotkehlchen.db.settings import CachedSettings
 from rotkehlchen.errors.misc import RemoteError, UnableToDecryptRemoteData
 from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.utils.rate_limiter import RateLimitedHTTPAdapter
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -20,7 +20,7 @@ log = RotkehlchenLogsAdapter(logger)
 
 def create_session(max_backoff_secs: float = 30) -> requests.Session:
     """Create a requests session configured to retry on connection, read, and
-    specific server errors.
+    specific server errors. All requests of the session are paced by the RateLimiter.
 
     Retries up to 3 times for connection errors (e.g., timeouts, DNS failures), 2 times for
     read errors, and 1 time for specified server errors (502, 503, 504). Users must check
@@ -36,7 +36,7 @@ def create_session(max_backoff_secs: float = 30) -> requests.Session:
     # we don't use total in the adapter because it seems to trigger on certain bad status codes
     # like too many requests even when status_forcelist is set to an empty list. This
     # configuration worked fine for what we could test in real scenarios in the e2e tests.
-    adapter = HTTPAdapter(max_retries=Retry(
+    adapter = RateLimitedHTTPAdapter(max_retries=Retry(
         # Total retry attempts across all error types (connection, read, status, etc.). As
         # mentioned in the docs:
         # Set to None to remove this constraint and fall back on other counts.
@@ -0,0 +1,263 @@
+"""Opt-in sampling profiler of the running backend.
+
+A native thread samples the stack of whatever runs in the main thread at a fixed
+interval. The samples are aggregated to the seconds spent in each stack per second of a
+rolling window, storing each stack once while it appears in the window. The stacks are
+served as collapsed stacks, the format used by flame graph tools. A greenlet trace
+function measures for how long each greenlet runs between its switches, how much of
+that is CPU time and for how long it blocked the other greenlets.
+
+This follows the flame graph format of tools/profiling, which is not shipped with rotki
+and needs the profiling dependencies, so that it can be enabled in any installation.
+"""
+import logging
+import sys
+import time
+from collections import deque
+from types import CodeType, FrameType
+from typing import Any, Final
+from weakref import WeakKeyDictionary
+
+import greenlet
+from gevent.hub import Hub
+from gevent.monkey import get_original
+
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+DEFAULT_SAMPLE_INTERVAL: Final = 0.01
+DEFAULT_PROFILING_WINDOW: Final = 300
+# Frames of a stack above this are dropped to keep the cost of a sample bounded
+MAX_STACK_DEPTH: Final = 200
+# The samples of each this many seconds are aggregated together
+SAMPLES_BUCKET_SECS: Final = 1
+
+# The sampler must run in a real thread to see what the main thread does while a
+# greenlet blocks the event loop
+_start_new_thread = get_original('_thread', 'start_new_thread')
+_get_ident = get_original('_thread', 'get_ident')
+_sleep = get_original('time', 'sleep')
+
+
+def frame_format(frame: FrameType) -> str:
+    return f'{frame.f_code.co_name}({frame.f_globals.get("__name__")})'
+
+
+def collapse_stack(frame: FrameType | None) -> str:
+    """Format the stack of the frame from its outermost frame, separated by ;"""
+    callstack: list[str] = []
+    while frame is not None and len(callstack) < MAX_STACK_DEPTH:
+        callstack.append(frame_format(frame))
+        frame = frame.f_back
+
+    return ';'.join(reversed(callstack))
+
+
+def stack_key(frame: FrameType | None) -> tuple[CodeType, ...]:
+    """Identify the stack of the frame by its code objects, which is cheaper than
+    formatting it"""
+    codes: list[CodeType] = []
+    while frame is not None and len(codes) < MAX_STACK_DEPTH:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+
+    return tuple(codes)
+
+
+def greenlet_name(glet: greenlet.greenlet) -> str:
+    if isinstance(glet, Hub):
+        return 'hub'
+    if glet.parent is None:
+        return 'main'
+    if (task_name := getattr(glet, 'task_name', None)) is not None:
+        return task_name  # greenlets spawned by the greenlet manager
+
+    run = getattr(glet, '_run', None) or getattr(glet, 'run', None)
+    run = getattr(run, 'func', run)  # functools.partial
+    return getattr(run, '__qualname__', None) or type(glet).__name__
+
+
+class GreenletStats:
+    """Time a greenlet ran without switching to another one. All times are seconds."""
+
+    def __init__(self) -> None:
+        self.switches = 0
+        self.run_time = 0.0
+        self.cpu_time = 0.0
+        self.max_run_time = 0.0
+
+    def add_run(self, run_time: float, cpu_time: float) -> None:
+        self.switches += 1
+        self.run_time += run_time
+        self.cpu_time += cpu_time
+        self.max_run_time = max(self.max_run_time, run_time)
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            'switches': self.switches,
+            'run_time': self.run_time,
+            'cpu_time': self.cpu_time,
+            # time it ran without using the CPU, such as blocking IO that did not yield
+            'blocking_time': max(self.run_time - self.cpu_time, 0.0),
+            'max_run_time': self.max_run_time,
+        }
+
+
+class SamplesBucket:
+    """Samples of the stacks taken during SAMPLES_BUCKET_SECS seconds"""
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.samples = 0
+        self.seconds: dict[tuple[CodeType, ...], float] = {}
+
+
+class Profiler:
+    """Singleton sampling profiler of the backend"""
+    __instance: 'Profiler | None' = None
+    running: bool
+    sample_interval: float
+    window: int
+    # the buckets of the samples of the window, the oldest first
+    buckets: deque[SamplesBucket]
+    # collapsed stack of each stack in the buckets and the number of buckets it is in
+    stacks: dict[tuple[CodeType, ...], tuple[str, int]]
+    greenlets: dict[str, GreenletStats]
+    # increased on each start so that the sampler thread of a previous run exits
+    generation: int
+
+    def __new__(cls) -> 'Profiler':
+        if Profiler.__instance is not None:
+            return Profiler.__instance
+
+        instance = object.__new__(cls)
+        instance.running = False
+        instance.sample_interval = DEFAULT_SAMPLE_INTERVAL
+        instance.window = DEFAULT_PROFILING_WINDOW
+        instance.buckets = deque()
+        instance.stacks = {}
+        instance.greenlets = {}
+        instance.generation = 0
+        Profiler.__instance = instance
+        return instance
+
+    def start(
+            self,
+            sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+            window: int = DEFAULT_PROFILING_WINDOW,
+    ) -> bool:
+        """Start sampling the stacks every sample_interval seconds, keeping the samples
+        of the last window seconds. Returns False if the profiler already runs."""
+        if self.running is True:
+            return False
+
+        self.running = True
+        self.generation += 1
+        self.sample_interval = sample_interval
+        self.window = window
+        self.buckets = deque()
+        self.stacks = {}
+        self.greenlets = {}
+        self.names: WeakKeyDictionary[greenlet.greenlet, str] = WeakKeyDictionary()
+        self.last_switch = (time.perf_counter(), time.thread_time())
+        self.previous_trace = greenlet.gettrace()
+        # bound methods are created on each access, so keep the one that is set to compare it
+        self.trace_function = self._trace
+        greenlet.settrace(self.trace_function)
+        _start_new_thread(self._sample, (_get_ident(), self.generation))
+        log.info(f'Started profiling with a sample interval of {sample_interval} seconds')
+        return True
+
+    def stop(self) -> bool:
+        """Stop profiling. The collected data can still be queried until the profiler
+        starts again. Returns False if the profiler did not run."""
+        if self.running is False:
+            return False
+
+        self.running = False  # the sampler thread exits after its next sample
+        if greenlet.gettrace() is self.trace_function:
+            greenlet.settrace(self.previous_trace)
+        log.info('Stopped profiling')
+        return True
+
+    def _trace(self, event: str, args: Any) -> None:
+        if event in {'switch', 'throw'}:
+            now, cpu_now = time.perf_counter(), time.thread_time()
+            origin, target = args
+            # gevent forgets the function of a greenlet once it runs, so name it on its start
+            if target not in self.names:
+                self.names[target] = greenlet_name(target)
+            if (name := self.names.get(origin) or greenlet_name(origin)) not in self.greenlets:
+                self.greenlets[name] = GreenletStats()
+            self.greenlets[name].add_run(
+                run_time=now - self.last_switch[0],
+                cpu_time=cpu_now - self.last_switch[1],
+            )
+            self.last_switch = (now, cpu_now)
+
+        if self.previous_trace is not None:
+            self.previous_trace(event, args)
+
+    def _sample(self, thread_id: int, generation: int) -> None:
+        """Runs in a native thread and samples the stack of the given thread"""
+        last_sample = time.monotonic()
+        while self.running is True and self.generation == generation:
+            _sleep(self.sample_interval)
+            now = time.monotonic()
+            if (frame := sys._current_frames().get(thread_id)) is not None:
+                self._add_sample(now, stack_key(frame), frame, now - last_sample)
+            last_sample = now
+            self._remove_old_samples(now)
+
+    def _add_sample(
+            self,
+            now: float,
+            key: tuple[CodeType, ...],
+            frame: FrameType,
+            seconds: float,
+    ) -> None:
+        if len(self.buckets) == 0 or now - self.buckets[-1].start >= SAMPLES_BUCKET_SECS:
+            self.buckets.append(SamplesBucket(start=now))
+
+        bucket = self.buckets[-1]
+        bucket.samples += 1
+        if key in bucket.seconds:
+            bucket.seconds[key] += seconds
+            return
+
+        bucket.seconds[key] = seconds
+        if (stack := self.stacks.get(key)) is None:
+            self.stacks[key] = (collapse_stack(frame), 1)
+        else:
+            self.stacks[key] = (stack[0], stack[1] + 1)
+
+    def _remove_old_samples(self, now: float) -> None:
+        """Remove the buckets that left the window along with the stacks only they had"""
+        while len(self.buckets) != 0 and self.buckets[0].start < now - self.window:
+            for key in self.buckets.popleft().seconds:
+                if (refs := self.stacks[key][1]) == 1:
+                    del self.stacks[key]
+                else:
+                    self.stacks[key] = (self.stacks[key][0], refs - 1)
+
+    def flamegraph(self) -> dict[str, float]:
+        """Seconds spent in each collapsed stack during the window"""
+        stacks: dict[str, float] = {}
+        for bucket in list(self.buckets):
+            for key, seconds in dict(bucket.seconds).items():
+                if (stack := self.stacks.get(key)) is not None:  # else just left the window
+                    stacks[stack[0]] = stacks.get(stack[0], 0.0) + seconds
+
+        return stacks
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            'running': self.running,
+            'sample_interval': self.sample_interval,
+            'window': self.window,
+            'samples': sum(bucket.samples for bucket in list(self.buckets)),
+            'flamegraph': self.flamegraph(),
+            'greenlets': {name: stats.serialize() for name, stats in list(self.greenlets.items())},
+        }
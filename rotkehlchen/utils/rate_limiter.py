@@ -0,0 +1,314 @@
+"""Central rate limiting of the requests made to external services.
+
+All sessions created with create_session send their requests through the RateLimiter.
+Each service is identified by its host and the api key used, if any, and has a token
+bucket that paces the requests sent to it. The rate of each bucket is learned from the
+responses. It is halved and the bucket is paused on too many requests errors and it
+slowly increases on successful responses. Rate limit headers of the responses also
+lower it so that the remaining requests are spread until the limit resets.
+
+Identical GET requests that are in flight at the same time are sent only once and all
+callers get the same response.
+"""
+import copy
+import hashlib
+import logging
+import time
+from collections.abc import Callable, Mapping
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Any, Final, Optional
+from urllib.parse import parse_qsl, urlparse
+
+import gevent
+from gevent.event import AsyncResult
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Requests per second. Services start at the max rate and their rate is lowered when
+# they respond that they get too many requests.
+RATE_LIMIT_MAX_RATE: Final = 50.0
+RATE_LIMIT_MIN_RATE: Final = 0.1
+# Requests per second the rate is increased by after each successful request
+RATE_LIMIT_RECOVERY: Final = 0.5
+# Pause after the first too many requests error without a Retry-After. Doubles for each
+# consecutive one.
+RATE_LIMIT_BASE_PAUSE_SECS: Final = 1.0
+RATE_LIMIT_MAX_PAUSE_SECS: Final = 60.0
+# Names of the query parameters and headers that hold api keys. Requests with a different
+# api key for the same host have a different rate limit.
+API_KEY_QUERY_PARAMS: Final = {'apikey', 'api_key', 'key', 'x_cg_pro_api_key', 'x_cg_demo_api_key'}
+API_KEY_HEADERS: Final = (
+    'Authorization',
+    'X-API-Key',
+    'API-Key',
+    'X-MBX-APIKEY',
+    'x-cg-pro-api-key',
+    'x-cg-demo-api-key',
+    'CB-ACCESS-KEY',
+    'KC-API-KEY',
+    'OK-ACCESS-KEY',
+)
+RATE_LIMIT_REMAINING_HEADERS: Final = ('X-RateLimit-Remaining', 'RateLimit-Remaining')
+RATE_LIMIT_RESET_HEADERS: Final = ('X-RateLimit-Reset', 'RateLimit-Reset', 'X-RateLimit-Reset-After')  # noqa: E501
+
+
+def get_rate_limit_key(url: str, headers: Mapping[str, str] | None = None) -> str:
+    """Get the key of the rate limit the request to the given url with the given headers
+    counts against. It's the host and a hash of the api key if the request has one."""
+    parsed_url = urlparse(url)
+    api_key = next((value for name, value in parse_qsl(parsed_url.query) if name.lower() in API_KEY_QUERY_PARAMS), None)  # noqa: E501
+    if api_key is None and headers is not None:
+        api_key = next((headers[name] for name in API_KEY_HEADERS if name in headers), None)
+
+    if api_key is None or api_key == '':
+        return parsed_url.netloc
+
+    return f'{parsed_url.netloc} ({hashlib.sha256(str(api_key).encode()).hexdigest()[:8]})'
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse the seconds or http date of a Retry-After header"""
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_header_number(headers: Mapping[str, str], names: tuple[str, ...]) -> float | None:
+    for name in names:
+        if (value := headers.get(name)) is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+
+    return None
+
+
+class TokenBucket:
+    """Paces the requests sent to a service. Times are monotonic seconds."""
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.rate = RATE_LIMIT_MAX_RATE
+        self.tokens = self.rate
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.consecutive_throttles = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.coalesced = 0
+        self.total_wait_time = 0.0
+
+    def _refill(self, now: float) -> None:
+        # up to one second of requests can be sent at once
+        self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        """Wait until a request can be sent to the service"""
+        start = time.monotonic()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            while True:
+                if (now := time.monotonic()) < self.paused_until:
+                    gevent.sleep(self.paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+
+                gevent.sleep((1 - self.tokens) / self.rate)
+        finally:
+            self.queued -= 1
+
+        self.requests += 1
+        self.total_wait_time += time.monotonic() - start
+
+    def pause(self, seconds: float) -> None:
+        """Don't send any request to the service for the given seconds"""
+        self.paused_until = max(
+            self.paused_until,
+            time.monotonic() + min(seconds, RATE_LIMIT_MAX_PAUSE_SECS),
+        )
+        self.tokens = min(self.tokens, 0)
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        """Called when the service responds that it gets too many requests. Halves the rate
+        and pauses for retry_after seconds or for an increasing time if it's not known."""
+        self.throttled += 1
+        self.rate = max(RATE_LIMIT_MIN_RATE, self.rate / 2)
+        if retry_after is None:
+            retry_after = RATE_LIMIT_BASE_PAUSE_SECS * 2 ** self.consecutive_throttles
+
+        self.consecutive_throttles += 1
+        log.debug(f'Rate limited by {self.key}. Pausing for {retry_after} seconds with a new rate of {self.rate} requests per second')  # noqa: E501
+        self.pause(retry_after)
+
+    def update(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Learn the rate limit of the service from the response to a request"""
+        if status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            self.throttle(retry_after=_parse_retry_after(headers.get('Retry-After')))
+            return
+
+        self.consecutive_throttles = 0
+        self.rate = min(RATE_LIMIT_MAX_RATE, self.rate + RATE_LIMIT_RECOVERY)
+        if (
+            (remaining := _get_header_number(headers, RATE_LIMIT_REMAINING_HEADERS)) is None or
+            (reset := _get_header_number(headers, RATE_LIMIT_RESET_HEADERS)) is None
+        ):
+            return
+
+        if reset > 10 ** 12:  # timestamp in milliseconds
+            reset = reset / 1000 - time.time()
+        elif reset > 10 ** 9:  # timestamp
+            reset -= time.time()
+
+        if remaining < 1:
+            self.pause(max(reset, RATE_LIMIT_BASE_PAUSE_SECS))
+        elif reset > 0:  # spread the remaining requests until the limit resets
+            self.rate = max(RATE_LIMIT_MIN_RATE, min(self.rate, remaining / reset))
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            'rate': self.rate,
+            'paused_for': max(self.paused_until - time.monotonic(), 0.0),
+            'queued': self.queued,
+            'max_queued': self.max_queued,
+            'in_flight': self.in_flight,
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'coalesced': self.coalesced,
+            'average_wait_time': self.total_wait_time / self.requests if self.requests != 0 else 0.0,  # noqa: E501
+        }
+
+
+class RateLimiter:
+    """Singleton holding the token buckets of all the services requests are sent to"""
+    __instance: Optional['RateLimiter'] = None
+    buckets: dict[str, TokenBucket]
+    in_flight: dict[tuple[str, tuple[tuple[str, str], ...]], AsyncResult]
+
+    def __new__(cls) -> 'RateLimiter':
+        if RateLimiter.__instance is not None:
+            return RateLimiter.__instance
+
+        instance = object.__new__(cls)
+        instance.buckets = {}
+        instance.in_flight = {}
+        RateLimiter.__instance = instance
+        return instance
+
+    def get_bucket(self, key: str) -> TokenBucket:
+        if (bucket := self.buckets.get(key)) is None:
+            bucket = self.buckets[key] = TokenBucket(key)
+        return bucket
+
+    def throttle(
+            self,
+            url: str,
+            headers: Mapping[str, str] | None = None,
+            retry_after: float | None = None,
+    ) -> None:
+        """For services that report that they get too many requests in the response body
+        instead of the status code"""
+        self.get_bucket(get_rate_limit_key(url, headers)).throttle(retry_after=retry_after)
+
+    def pause(self, url: str, seconds: float, headers: Mapping[str, str] | None = None) -> None:
+        """For services that report when their rate limit resets in a non standard way"""
+        self.get_bucket(get_rate_limit_key(url, headers)).pause(seconds)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {key: bucket.serialize() for key, bucket in self.buckets.items()}
+
+    def send(
+            self,
+            request: PreparedRequest,
+            send_function: Callable[[], Response],
+            coalesce: bool,
+    ) -> Response:
+        """Send the request with the given function once the rate limit of its service
+        allows it. If coalesce is True and the same GET request is already in flight, wait
+        for it and return a copy of its response instead.
+
+        May raise any of the exceptions of requests.
+        """
+        bucket = self.get_bucket(get_rate_limit_key(str(request.url), request.headers))
+        if coalesce is False or request.method != 'GET' or request.body is not None:
+            return self._send(bucket, send_function, read_content=False)
+
+        key = (str(request.url), tuple(sorted(request.headers.items())))
+        if (in_flight := self.in_flight.get(key)) is not None:
+            bucket.coalesced += 1
+            return copy.copy(in_flight.get())
+
+        self.in_flight[key] = result = AsyncResult()
+        try:
+            response = self._send(bucket, send_function, read_content=True)
+        except Exception as e:
+            result.set_exception(e)
+            raise
+        else:
+            result.set(response)
+        finally:
+            del self.in_flight[key]
+            if not result.ready():  # the greenlet was killed
+                result.set_exception(RequestsConnectionError(f'Request to {bucket.key} was cancelled'))  # noqa: E501
+
+        return response
+
+    @staticmethod
+    def _send(
+            bucket: TokenBucket,
+            send_function: Callable[[], Response],
+            read_content: bool,
+    ) -> Response:
+        bucket.acquire()
+        bucket.in_flight += 1
+        try:
+            response = send_function()
+            if read_content:
+                _ = response.content  # so that the response can be shared
+        finally:
+            bucket.in_flight -= 1
+
+        bucket.update(response.status_code, response.headers)
+        return response
+
+
+class RateLimitedHTTPAdapter(HTTPAdapter):
+    """HTTP adapter that sends all requests through the RateLimiter"""
+
+    def send(  # type: ignore[override]  # only the used arguments are named
+            self,
+            request: PreparedRequest,
+            stream: bool = False,
+            **kwargs: Any,
+    ) -> Response:
+        return RateLimiter().send(
+            request=request,
+            send_function=lambda: super(RateLimitedHTTPAdapter, self).send(request, stream=stream, **kwargs),  # noqa: E501
+            coalesce=stream is False,
+        )